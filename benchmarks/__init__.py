@@ -0,0 +1 @@
+"""Tiferet Flask Benchmarks."""
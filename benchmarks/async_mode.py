@@ -0,0 +1,259 @@
+'''Benchmark: sync WSGI views vs. the ASGI app under concurrent I/O-bound load.
+
+Run from the repository root:
+
+    python -m benchmarks.async_mode --requests 400 --concurrency 100 --threads 8 --delay 0.02
+'''
+
+# *** imports
+
+# ** core
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+# ** infra
+from flask import Flask
+from tiferet_openapi import ApiRoute, ApiRouter
+
+# ** app
+from tiferet_flask.blueprints import build_asgi_app, build_blueprint, build_view_func
+from tiferet_flask.contexts import FlaskApiContext, RouteTables
+
+
+# *** classes
+
+# ** class: io_features
+class IoFeatures(object):
+    '''
+    A feature context whose single command waits on simulated I/O.
+    '''
+
+    # * init
+    def __init__(self, delay: float):
+        '''
+        Initialize the feature context.
+
+        :param delay: The simulated I/O wait, in seconds.
+        :type delay: float
+        '''
+
+        # Set the simulated I/O wait.
+        self.delay = delay
+
+    # * method: execute_feature
+    def execute_feature(self, feature_id: str, request: Any, **kwargs):
+        '''
+        Execute the feature, blocking the worker thread on I/O.
+        '''
+
+        # Block on the simulated I/O.
+        time.sleep(self.delay)
+        request.set_result({'ok': True})
+
+    # * method: execute_feature_async
+    async def execute_feature_async(self, feature_id: str, request: Any, **kwargs):
+        '''
+        Execute the feature, yielding to the event loop on I/O.
+        '''
+
+        # Await the simulated I/O.
+        await asyncio.sleep(self.delay)
+        request.set_result({'ok': True})
+
+
+# ** class: null_logging
+class NullLogging(object):
+    '''
+    A logging context that discards all records.
+    '''
+
+    # * method: build_logger
+    def build_logger(self) -> logging.Logger:
+        '''
+        Build a logger with logging disabled.
+        '''
+
+        # Return a disabled logger.
+        logger = logging.getLogger('tiferet_flask.benchmarks')
+        logger.disabled = True
+        return logger
+
+
+# ** class: static_event
+class StaticEvent(object):
+    '''
+    A domain event stand-in returning a fixed value.
+    '''
+
+    # * init
+    def __init__(self, value: Any = None):
+        '''
+        Initialize the event.
+
+        :param value: The value to return.
+        :type value: Any
+        '''
+
+        # Set the value.
+        self.value = value
+
+    # * method: execute
+    def execute(self, **kwargs) -> Any:
+        '''
+        Return the fixed value.
+        '''
+
+        # Return the value.
+        return self.value
+
+
+# *** functions
+
+# ** function: build_app
+def build_app(delay: float) -> Flask:
+    '''
+    Build a Flask app with one I/O-bound feature route.
+
+    :param delay: The simulated I/O wait, in seconds.
+    :type delay: float
+    :return: The Flask app.
+    :rtype: Flask
+    '''
+
+    # Create the router and the context.
+    router = ApiRouter(
+        name='io',
+        prefix='/io',
+        routes=[ApiRoute(id='wait', endpoint='io.wait', path='/wait', methods=['GET'], status_code=200)],
+    )
+    context = FlaskApiContext(
+        interface_id='benchmark',
+        features=IoFeatures(delay),
+        errors=None,
+        logging=NullLogging(),
+        get_route_evt=StaticEvent(),
+        get_status_code_evt=StaticEvent(500),
+        get_routers_evt=StaticEvent([router]),
+    )
+    context.compile_dispatch(errors={})
+
+    # Assemble the Flask app as build_flask_app does.
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(build_blueprint(router, build_view_func(context)))
+    flask_app.extensions['tiferet_flask'] = dict(
+        context=context,
+        tables=RouteTables(routers=(router,), dispatch=context.dispatch, cors=None, limits=None, schemas=None, url_map=flask_app.url_map),
+    )
+    return flask_app
+
+
+# ** function: summarize
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    '''
+    Summarize request latencies.
+
+    :param latencies: The per-request latencies, in seconds.
+    :type latencies: List[float]
+    :param elapsed: The wall time of the whole run, in seconds.
+    :type elapsed: float
+    :return: Throughput and latency percentiles.
+    :rtype: Dict[str, float]
+    '''
+
+    # Compute the percentiles in milliseconds.
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'rps': round(len(ordered) / elapsed, 1),
+        'p50_ms': round(statistics.median(ordered) * 1000, 2),
+        'p99_ms': round(ordered[int(len(ordered) * 0.99) - 1] * 1000, 2),
+    }
+
+
+# ** function: bench_sync
+def bench_sync(flask_app: Flask, requests: int, threads: int) -> Dict[str, float]:
+    '''
+    Drive the WSGI app from a fixed pool of worker threads.
+    '''
+
+    # Issue one request and time it.
+    def call(_):
+        client = flask_app.test_client()
+        start = time.perf_counter()
+        client.get('/io/wait')
+        return time.perf_counter() - start
+
+    # Run all requests across the worker threads.
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(call, range(requests)))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+# ** function: bench_async
+def bench_async(flask_app: Flask, requests: int, concurrency: int) -> Dict[str, float]:
+    '''
+    Drive the ASGI app with concurrent requests on a single event loop.
+    '''
+
+    # Build the ASGI app.
+    asgi_app = build_asgi_app(flask_app)
+    scope = {'type': 'http', 'method': 'GET', 'path': '/io/wait', 'query_string': b'', 'headers': []}
+
+    # Issue one request and time it.
+    async def call(semaphore: asyncio.Semaphore) -> float:
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            pass
+
+        async with semaphore:
+            start = time.perf_counter()
+            await asgi_app(scope, receive, send)
+            return time.perf_counter() - start
+
+    # Run all requests with bounded concurrency.
+    async def main() -> List[float]:
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(call(semaphore) for _ in range(requests)))
+
+    start = time.perf_counter()
+    latencies = asyncio.run(main())
+    return summarize(latencies, time.perf_counter() - start)
+
+
+# ** function: main
+def main():
+    '''
+    Run the benchmark and print the results as JSON.
+    '''
+
+    # Parse the benchmark options.
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--delay', type=float, default=0.02)
+    args = parser.parse_args()
+
+    # Run both modes against the same app.
+    flask_app = build_app(args.delay)
+    results = {
+        'options': vars(args),
+        'sync_wsgi': bench_sync(flask_app, args.requests, args.threads),
+        'async_asgi': bench_async(flask_app, args.requests, args.concurrency),
+    }
+    print(json.dumps(results, indent=2))
+
+
+# *** exec
+
+if __name__ == '__main__':
+    main()
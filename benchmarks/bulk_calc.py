@@ -0,0 +1,200 @@
+'''Benchmark: scalar vs. NumPy bulk calc events of the example app.
+
+Computes the same operand pairs one pair per event call (the scalar path,
+with its str() round trip through CalcUtil.verify_number) and as arrays in
+one bulk event call, and reports the throughput of each in operations per
+second. With --pipeline, the same comparison also runs through the example
+app built by build_flask_app: one request per pair vs. one bulk request.
+
+Run from the repository root:
+
+    python -m benchmarks.bulk_calc --size 100000 --repeat 5 --pipeline
+'''
+
+# *** imports
+
+# ** core
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+# ** infra
+from tiferet.assets.exceptions import TiferetError
+
+# ** app
+from tiferet_flask.blueprints import build_flask_app
+
+
+# *** functions
+
+# ** function: run_scalar
+def run_scalar(event: Any, a: List[Any], b: List[Any]) -> List[Any]:
+    '''
+    Run a scalar event once per operand pair, collecting the errors like the bulk events do.
+
+    :param event: The scalar calc event.
+    :type event: Any
+    :param a: The first operands.
+    :type a: List[Any]
+    :param b: The second operands.
+    :type b: List[Any]
+    :return: The results, with None for each failed pair.
+    :rtype: List[Any]
+    '''
+
+    # Execute each pair, keeping None for the pairs that raise.
+    results = []
+    for x, y in zip(a, b):
+        try:
+            results.append(event.execute(a=x, b=y))
+        except TiferetError:
+            results.append(None)
+    return results
+
+
+# ** function: best_time
+def best_time(run: Callable[[], Any], repeat: int) -> float:
+    '''
+    Time a function, keeping the best of several runs.
+
+    :param run: The function to time.
+    :type run: Callable[[], Any]
+    :param repeat: The number of runs.
+    :type repeat: int
+    :return: The best run time, in seconds.
+    :rtype: float
+    '''
+
+    # Time each run.
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+# ** function: bench_events
+def bench_events(a: List[Any], b: List[Any], repeat: int) -> Dict[str, Dict[str, float]]:
+    '''
+    Compare the scalar and bulk events of each operation.
+
+    :param a: The first operands.
+    :type a: List[Any]
+    :param b: The second operands.
+    :type b: List[Any]
+    :param repeat: The number of runs to keep the best of.
+    :type repeat: int
+    :return: The operations per second of each path, and the speedup, per operation.
+    :rtype: Dict[str, Dict[str, float]]
+    '''
+
+    # Import the example events from the app directory.
+    from app.events import bulk, calc
+
+    # Pair each scalar event with its bulk variant, fixing the square root exponent like the feature config.
+    events = dict(
+        add=(calc.AddNumber(), bulk.BulkAddNumbers(), b, b),
+        subtract=(calc.SubtractNumber(), bulk.BulkSubtractNumbers(), b, b),
+        multiply=(calc.MultiplyNumber(), bulk.BulkMultiplyNumbers(), b, b),
+        divide=(calc.DivideNumber(), bulk.BulkDivideNumbers(), b, b),
+        sqrt=(calc.ExponentiateNumber(), bulk.BulkExponentiateNumbers(), ['0.5'] * len(a), '0.5'),
+    )
+
+    # Time the scalar path (one call per pair) and the bulk path (one call per array).
+    results = {}
+    for operation, (scalar_event, bulk_event, scalar_b, bulk_b) in events.items():
+        scalar = best_time(lambda: run_scalar(scalar_event, a, scalar_b), repeat)
+        bulk = best_time(lambda: bulk_event.execute(a=a, b=bulk_b), repeat)
+        results[operation] = {
+            'scalar_ops_per_sec': round(len(a) / scalar),
+            'bulk_ops_per_sec': round(len(a) / bulk),
+            'speedup': round(scalar / bulk, 1),
+        }
+    return results
+
+
+# ** function: bench_pipeline
+def bench_pipeline(interface_id: str, a: List[Any], b: List[Any], requests: int) -> Dict[str, Dict[str, float]]:
+    '''
+    Compare one request per pair with one bulk request through the example app.
+
+    :param interface_id: The interface ID to build.
+    :type interface_id: str
+    :param a: The first operands.
+    :type a: List[Any]
+    :param b: The second operands.
+    :type b: List[Any]
+    :param requests: The number of scalar requests to time.
+    :type requests: int
+    :return: The operations per second of each path, and the speedup, per operation.
+    :rtype: Dict[str, Dict[str, float]]
+    '''
+
+    # Build the app and warm up both paths.
+    client = build_flask_app(interface_id).test_client()
+    results = {}
+    for operation in ('add', 'divide'):
+        client.post(f'/calc/{operation}', json={'a': a[0], 'b': b[0]})
+        client.post(f'/calc/bulk/{operation}', json={'a': a[:10], 'b': b[:10]})
+
+        # Time the scalar requests, then one bulk request with all the pairs.
+        start = time.perf_counter()
+        for x, y in zip(a[:requests], b[:requests]):
+            client.post(f'/calc/{operation}', json={'a': x, 'b': y})
+        scalar = (time.perf_counter() - start) / min(requests, len(a))
+        start = time.perf_counter()
+        response = client.post(f'/calc/bulk/{operation}', json={'a': a, 'b': b})
+        bulk = (time.perf_counter() - start) / len(a)
+        assert response.status_code == 200, response.data
+        results[operation] = {
+            'scalar_ops_per_sec': round(1 / scalar),
+            'bulk_ops_per_sec': round(1 / bulk),
+            'speedup': round(scalar / bulk, 1),
+        }
+    return results
+
+
+# ** function: main
+def main():
+    '''
+    Run the benchmark and print the results as JSON.
+    '''
+
+    # Parse the benchmark options.
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--app-dir', default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'example'))
+    parser.add_argument('--interface', default='calc_flask_api')
+    parser.add_argument('--size', type=int, default=100000, help='operand pairs per bulk call')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--pipeline', action='store_true', help='also compare the HTTP paths through the Flask test client')
+    parser.add_argument('--requests', type=int, default=2000, help='scalar requests to time with --pipeline')
+    args = parser.parse_args()
+
+    # Load the example app relative to its directory.
+    os.chdir(args.app_dir)
+    sys.path.insert(0, os.getcwd())
+
+    # Generate JSON-like operands, with a zero denominator in every hundred pairs.
+    generator = random.Random(0)
+    a = [generator.choice([generator.randint(0, 1000), round(generator.uniform(0, 1000), 3)]) for _ in range(args.size)]
+    b = [0 if index % 100 == 0 else generator.randint(1, 1000) for index in range(args.size)]
+
+    # Run the event comparison, and the pipeline comparison if asked.
+    results = {
+        'options': {key: value for key, value in vars(args).items() if key != 'app_dir'},
+        'events': bench_events(a, b, args.repeat),
+    }
+    if args.pipeline:
+        results['pipeline'] = bench_pipeline(args.interface, a, b, args.requests)
+    print(json.dumps(results, indent=2))
+
+
+# *** exec
+
+if __name__ == '__main__':
+    main()
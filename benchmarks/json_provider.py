@@ -0,0 +1,178 @@
+'''Benchmark: default Flask JSON vs. the fast JSON provider on list-of-models responses.
+
+Run from the repository root:
+
+    python -m benchmarks.json_provider --items 10000 --repeat 20
+'''
+
+# *** imports
+
+# ** core
+import argparse
+import datetime
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+# ** infra
+from flask import Flask
+from pydantic import BaseModel
+from tiferet_openapi import ApiRoute, ApiRouter
+
+# ** app
+from tiferet_flask.blueprints import build_blueprint, build_view_func
+from tiferet_flask.contexts import FlaskApiContext, FlaskJsonProvider
+from tiferet_flask.contexts.json import orjson
+from .async_mode import NullLogging, StaticEvent
+
+
+# *** classes
+
+# ** class: item
+class Item(BaseModel):
+    '''
+    A sample response model.
+    '''
+
+    id: int
+    name: str
+    price: float
+    tags: List[str]
+    created: datetime.datetime
+
+
+# ** class: model_features
+class ModelFeatures(object):
+    '''
+    A feature context whose single command returns a prebuilt list of models.
+    '''
+
+    # * init
+    def __init__(self, items: List[Item]):
+        '''
+        Initialize the feature context.
+
+        :param items: The models to return.
+        :type items: List[Item]
+        '''
+
+        # Set the models.
+        self.items = items
+
+    # * method: execute_feature
+    def execute_feature(self, feature_id: str, request: Any, **kwargs):
+        '''
+        Execute the feature, returning the models.
+        '''
+
+        # Set the models as the result.
+        request.set_result(self.items)
+
+
+# *** functions
+
+# ** function: build_app
+def build_app(items: List[Item], fast_json: bool) -> Flask:
+    '''
+    Build a Flask app with one route returning the models.
+
+    :param items: The models to return.
+    :type items: List[Item]
+    :param fast_json: Whether to install the fast JSON provider as FlaskAppOptions(fast_json=True) does.
+    :type fast_json: bool
+    :return: The Flask app.
+    :rtype: Flask
+    '''
+
+    # Create the router and the context.
+    router = ApiRouter(
+        name='items',
+        prefix='/items',
+        routes=[ApiRoute(id='list', endpoint='items.list', path='/list', methods=['GET'], status_code=200)],
+    )
+    context = FlaskApiContext(
+        interface_id='benchmark',
+        features=ModelFeatures(items),
+        errors=None,
+        logging=NullLogging(),
+        get_route_evt=StaticEvent(),
+        get_status_code_evt=StaticEvent(500),
+        get_routers_evt=StaticEvent([router]),
+    )
+    context.compile_dispatch(errors={})
+
+    # Assemble the Flask app, optionally with the fast JSON provider.
+    flask_app = Flask(__name__)
+    if fast_json:
+        flask_app.json = FlaskJsonProvider(flask_app)
+        context.raw_models = True
+    flask_app.register_blueprint(build_blueprint(router, build_view_func(context)))
+    return flask_app
+
+
+# ** function: bench
+def bench(flask_app: Flask, repeat: int) -> Dict[str, float]:
+    '''
+    Time repeated requests for the list response.
+
+    :param flask_app: The Flask app.
+    :type flask_app: Flask
+    :param repeat: The number of requests.
+    :type repeat: int
+    :return: The median and best request time, and the body size.
+    :rtype: Dict[str, float]
+    '''
+
+    # Warm up once, then time each request.
+    client = flask_app.test_client()
+    body = client.get('/items/list').data
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get('/items/list')
+        timings.append(time.perf_counter() - start)
+
+    # Summarize in milliseconds.
+    return {
+        'median_ms': round(statistics.median(timings) * 1000, 2),
+        'best_ms': round(min(timings) * 1000, 2),
+        'body_bytes': len(body),
+    }
+
+
+# ** function: main
+def main():
+    '''
+    Run the benchmark and print the results as JSON.
+    '''
+
+    # Parse the benchmark options.
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    # Build the models once.
+    created = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    items = [
+        Item(id=i, name=f'item {i}', price=i * 0.5, tags=['a', 'b'], created=created)
+        for i in range(args.items)
+    ]
+
+    # Run both providers against the same models.
+    default_json = bench(build_app(items, fast_json=False), args.repeat)
+    fast_json = bench(build_app(items, fast_json=True), args.repeat)
+    results = {
+        'options': dict(vars(args), orjson=orjson is not None),
+        'default_json': default_json,
+        'fast_json': fast_json,
+        'speedup': round(default_json['median_ms'] / fast_json['median_ms'], 2),
+    }
+    print(json.dumps(results, indent=2))
+
+
+# *** exec
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+'''Benchmark: the full request pipeline of the example calc app.
+
+Builds the example app via build_flask_app and drives the success paths,
+the DIVISION_BY_ZERO and INVALID_INPUT error paths and the Swagger spec
+fetch, first through the Flask test client and then through a real
+threaded WSGI server (werkzeug). App startup is measured separately.
+Results are printed as JSON to compare between releases.
+
+Run from the repository root:
+
+    python -m benchmarks.pipeline --requests 2000 --concurrency 8 --output results.json
+'''
+
+# *** imports
+
+# ** core
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple
+
+# ** infra
+from flask import Flask
+from werkzeug.serving import make_server
+
+# ** app
+import tiferet_flask
+from tiferet_flask.blueprints import build_flask_app, get_startup_report
+
+
+# *** classes
+
+# ** class: scenario
+class Scenario(NamedTuple):
+    '''
+    A request to benchmark and the status code it must return.
+    '''
+
+    name: str
+    method: str
+    path: str
+    body: Dict[str, Any] | None
+    status_code: int
+
+
+# *** constants
+
+# ** constant: scenarios
+SCENARIOS = [
+    Scenario('add', 'POST', '/calc/add', {'a': 1, 'b': 2}, 200),
+    Scenario('divide', 'POST', '/calc/divide', {'a': 6, 'b': 3}, 200),
+    Scenario('sqrt_cached', 'POST', '/calc/sqrt', {'a': 16}, 200),
+    Scenario('division_by_zero', 'POST', '/calc/divide', {'a': 1, 'b': 0}, 400),
+    Scenario('invalid_input', 'POST', '/calc/add', {'a': 'one', 'b': 2}, 422),
+    Scenario('swagger_spec', 'GET', '/docs/openapi.json', None, 200),
+]
+
+
+# *** functions
+
+# ** function: summarize
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    '''
+    Summarize request latencies.
+
+    :param latencies: The request latencies, in seconds.
+    :type latencies: List[float]
+    :param elapsed: The wall time of the whole run, in seconds.
+    :type elapsed: float
+    :return: The request count, requests/sec and p50/p99 latency in milliseconds.
+    :rtype: Dict[str, float]
+    '''
+
+    # Compute the throughput and latency percentiles.
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(cuts[49] * 1000, 3),
+        'p99_ms': round(cuts[98] * 1000, 3),
+    }
+
+
+# ** function: bench_startup
+def bench_startup(interface_id: str, runs: int) -> Dict[str, Any]:
+    '''
+    Time building the app, and the memory it allocates.
+
+    :param interface_id: The interface ID to build.
+    :type interface_id: str
+    :param runs: The number of builds.
+    :type runs: int
+    :return: The p50 and best build time, the startup profile of the last build and its allocations.
+    :rtype: Dict[str, Any]
+    '''
+
+    # Time each build.
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        flask_app = build_flask_app(interface_id, swagger=True)
+        timings.append(time.perf_counter() - start)
+
+    # Trace the allocations of one more build.
+    tracemalloc.start()
+    build_flask_app(interface_id, swagger=True)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'runs': runs,
+        'p50_ms': round(statistics.median(timings) * 1000, 3),
+        'best_ms': round(min(timings) * 1000, 3),
+        'retained_kib': round(current / 1024, 1),
+        'peak_kib': round(peak / 1024, 1),
+        'profile_ms': get_startup_report(flask_app),
+    }
+
+
+# ** function: bench_allocations
+def bench_allocations(flask_app: Flask, scenario: Scenario, requests: int) -> Dict[str, float]:
+    '''
+    Measure the memory a scenario allocates per request through the test client.
+
+    :param flask_app: The Flask app.
+    :type flask_app: Flask
+    :param scenario: The scenario.
+    :type scenario: Scenario
+    :param requests: The number of traced requests.
+    :type requests: int
+    :return: The mean peak allocation per request and the memory retained over the run.
+    :rtype: Dict[str, float]
+    '''
+
+    # Trace each request's peak, starting from the current usage.
+    client = flask_app.test_client()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    peaks = []
+    for _ in range(requests):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        client.open(scenario.path, method=scenario.method, json=scenario.body)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return {
+        'peak_bytes_per_request': round(statistics.mean(peaks)),
+        'retained_bytes': retained,
+    }
+
+
+# ** function: bench_test_client
+def bench_test_client(flask_app: Flask, scenario: Scenario, requests: int) -> Dict[str, Any]:
+    '''
+    Drive a scenario sequentially through the Flask test client.
+
+    :param flask_app: The Flask app.
+    :type flask_app: Flask
+    :param scenario: The scenario.
+    :type scenario: Scenario
+    :param requests: The number of requests.
+    :type requests: int
+    :return: The latency summary.
+    :rtype: Dict[str, Any]
+    '''
+
+    # Warm up and check the expected status code.
+    client = flask_app.test_client()
+    status_code = client.open(scenario.path, method=scenario.method, json=scenario.body).status_code
+    if status_code != scenario.status_code:
+        raise RuntimeError(f'{scenario.name}: expected {scenario.status_code}, got {status_code}')
+
+    # Time each request.
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.open(scenario.path, method=scenario.method, json=scenario.body)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+# ** function: bench_wsgi_server
+def bench_wsgi_server(port: int, scenario: Scenario, requests: int, concurrency: int) -> Dict[str, Any]:
+    '''
+    Drive a scenario over HTTP against a running WSGI server, one keep-alive connection per client thread.
+
+    :param port: The server port on 127.0.0.1.
+    :type port: int
+    :param scenario: The scenario.
+    :type scenario: Scenario
+    :param requests: The total number of requests.
+    :type requests: int
+    :param concurrency: The number of concurrent client threads.
+    :type concurrency: int
+    :return: The latency summary.
+    :rtype: Dict[str, Any]
+    '''
+
+    # Encode the request once.
+    body = json.dumps(scenario.body).encode('utf-8') if scenario.body is not None else None
+    headers = {'Content-Type': 'application/json'} if body else {}
+
+    # Send a share of the requests on one connection, timing each.
+    def client(count: int) -> List[float]:
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        latencies = []
+        try:
+            for _ in range(count):
+                start = time.perf_counter()
+                connection.request(scenario.method, scenario.path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                latencies.append(time.perf_counter() - start)
+                if response.status != scenario.status_code:
+                    raise RuntimeError(f'{scenario.name}: expected {scenario.status_code}, got {response.status}')
+        finally:
+            connection.close()
+        return latencies
+
+    # Run the clients concurrently.
+    shares = [requests // concurrency + (1 if index < requests % concurrency else 0) for index in range(concurrency)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = [latency for result in executor.map(client, shares) for latency in result]
+    return summarize(latencies, time.perf_counter() - started)
+
+
+# ** function: main
+def main():
+    '''
+    Run the benchmark and print the results as JSON.
+    '''
+
+    # Parse the benchmark options.
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--app-dir', default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'example'))
+    parser.add_argument('--interface', default='calc_flask_api')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--alloc-requests', type=int, default=200)
+    parser.add_argument('--startup-runs', type=int, default=5)
+    parser.add_argument('--scenario', action='append', choices=[scenario.name for scenario in SCENARIOS])
+    parser.add_argument('--no-server', action='store_true', help='skip the WSGI server runs')
+    parser.add_argument('--output', help='also write the results to this file')
+    args = parser.parse_args()
+
+    # Load the example app configuration relative to its directory.
+    output_path = os.path.abspath(args.output) if args.output else None
+    os.chdir(args.app_dir)
+    sys.path.insert(0, os.getcwd())
+    scenarios = [scenario for scenario in SCENARIOS if not args.scenario or scenario.name in args.scenario]
+
+    # Measure startup, then build the app under test.
+    results = {
+        'environment': {
+            'tiferet_flask': tiferet_flask.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'options': {key: value for key, value in vars(args).items() if key != 'output'},
+        'startup': bench_startup(args.interface, args.startup_runs),
+        'test_client': {},
+        'wsgi_server': {},
+    }
+    flask_app = build_flask_app(args.interface, swagger=True)
+
+    # Drive each scenario through the test client and trace its allocations.
+    for scenario in scenarios:
+        results['test_client'][scenario.name] = dict(
+            bench_test_client(flask_app, scenario, args.requests),
+            **bench_allocations(flask_app, scenario, args.alloc_requests),
+        )
+
+    # Drive each scenario through a threaded WSGI server on an ephemeral port.
+    if not args.no_server:
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = make_server('127.0.0.1', 0, flask_app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            for scenario in scenarios:
+                results['wsgi_server'][scenario.name] = bench_wsgi_server(server.server_port, scenario, args.requests, args.concurrency)
+        finally:
+            server.shutdown()
+
+    # Print and optionally save the results.
+    output = json.dumps(results, indent=2)
+    print(output)
+    if output_path:
+        with open(output_path, 'w') as output_file:
+            output_file.write(output + '\n')
+
+
+# *** exec
+
+if __name__ == '__main__':
+    main()
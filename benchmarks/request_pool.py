@@ -0,0 +1,152 @@
+'''Benchmark: per-request FlaskRequestContext allocation vs. the pooled request contexts.
+
+Drives FlaskApiContext.run directly, so the request context dominates the
+measured allocations, and reports the time and the peak traced memory per
+run.
+
+Run from the repository root:
+
+    python -m benchmarks.request_pool --requests 50000
+'''
+
+# *** imports
+
+# ** core
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from typing import Any, Dict
+
+# ** infra
+from tiferet_openapi import ApiRoute, ApiRouter
+
+# ** app
+from tiferet_flask.contexts import FlaskApiContext, RequestContextPool
+from .async_mode import NullLogging, StaticEvent
+
+
+# *** classes
+
+# ** class: echo_features
+class EchoFeatures(object):
+    '''
+    A feature context whose single command echoes the request data.
+    '''
+
+    # * method: execute_feature
+    def execute_feature(self, feature_id: str, request: Any, **kwargs):
+        '''
+        Execute the feature, echoing the request data.
+        '''
+
+        # Set the request data as the result.
+        request.set_result(request.data)
+
+
+# *** functions
+
+# ** function: build_context
+def build_context(pooled: bool) -> FlaskApiContext:
+    '''
+    Build a FlaskApiContext with one feature route.
+
+    :param pooled: Whether to reuse request contexts as FlaskAppOptions(pool_requests=True) does.
+    :type pooled: bool
+    :return: The context.
+    :rtype: FlaskApiContext
+    '''
+
+    # Create the router and the context.
+    router = ApiRouter(
+        name='echo',
+        prefix='/echo',
+        routes=[ApiRoute(id='run', endpoint='echo.run', path='/run', methods=['POST'], status_code=200)],
+    )
+    context = FlaskApiContext(
+        interface_id='benchmark',
+        features=EchoFeatures(),
+        errors=None,
+        logging=NullLogging(),
+        get_route_evt=StaticEvent(),
+        get_status_code_evt=StaticEvent(500),
+        get_routers_evt=StaticEvent([router]),
+    )
+    context.compile_dispatch(errors={})
+
+    # Set the request pool if enabled.
+    if pooled:
+        context.request_pool = RequestContextPool()
+    return context
+
+
+# ** function: bench
+def bench(context: FlaskApiContext, requests: int) -> Dict[str, float]:
+    '''
+    Time and trace repeated runs of the feature.
+
+    :param context: The context.
+    :type context: FlaskApiContext
+    :param requests: The number of runs.
+    :type requests: int
+    :return: The time and peak memory per run.
+    :rtype: Dict[str, float]
+    '''
+
+    # Warm up, then time the runs.
+    headers = {'Content-Type': 'application/json'}
+    data = {'a': 1, 'b': 2}
+    for _ in range(100):
+        context.run('echo.run', headers, data)
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        context.run('echo.run', headers, data)
+        timings.append(time.perf_counter() - start)
+
+    # Trace the peak memory of each run.
+    tracemalloc.start()
+    peaks = []
+    for _ in range(min(requests, 2000)):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        context.run('echo.run', headers, data)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    # Summarize in microseconds and bytes.
+    return {
+        'median_us': round(statistics.median(timings) * 1e6, 2),
+        'mean_us': round(statistics.mean(timings) * 1e6, 2),
+        'peak_bytes_per_request': round(statistics.mean(peaks)),
+    }
+
+
+# ** function: main
+def main():
+    '''
+    Run the benchmark and print the results as JSON.
+    '''
+
+    # Parse the benchmark options.
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=50000)
+    args = parser.parse_args()
+
+    # Run both request modes against the same feature.
+    allocated = bench(build_context(pooled=False), args.requests)
+    pooled = bench(build_context(pooled=True), args.requests)
+    results = {
+        'options': vars(args),
+        'allocated': allocated,
+        'pooled': pooled,
+        'speedup': round(allocated['median_us'] / pooled['median_us'], 2),
+    }
+    print(json.dumps(results, indent=2))
+
+
+# *** exec
+
+if __name__ == '__main__':
+    main()
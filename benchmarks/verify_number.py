@@ -0,0 +1,117 @@
+'''Benchmark: numeric validation of the example calc events.
+
+Times CalcUtil.verify_number against the previous str() round trip check,
+for operands that arrive as JSON ints, floats and numeric strings, then
+times each scalar calc event end to end with the same operands.
+
+Run from the repository root:
+
+    python -m benchmarks.verify_number --number 200000 --repeat 5
+'''
+
+# *** imports
+
+# ** core
+import argparse
+import json
+import os
+import sys
+import timeit
+from typing import Any, Callable, Dict
+
+
+# *** constants
+
+# ** constant: operands
+OPERANDS = dict(
+    int=(1234, 56),
+    float=(1234.5, 0.25),
+    str=('1234.5', '56'),
+)
+
+
+# *** functions
+
+# ** function: legacy_verify_number
+def legacy_verify_number(value: str) -> int | float:
+    '''
+    The previous validation, which the events called as verify_number(str(value)).
+
+    :param value: The value to verify.
+    :type value: str
+    :return: The numeric value as an integer or float.
+    :rtype: int | float
+    '''
+
+    # Check the string form, then convert it back.
+    if not (isinstance(value, str) and (value.isdigit() or (value.replace('.', '', 1).isdigit() and value.count('.') < 2))):
+        raise ValueError(value)
+    if '.' in value:
+        return float(value)
+    return int(value)
+
+
+# ** function: ns_per_call
+def ns_per_call(run: Callable[[], Any], number: int, repeat: int) -> float:
+    '''
+    Time a function, keeping the best of several runs.
+
+    :param run: The function to time.
+    :type run: Callable[[], Any]
+    :param number: The number of calls per run.
+    :type number: int
+    :param repeat: The number of runs.
+    :type repeat: int
+    :return: The best time per call, in nanoseconds.
+    :rtype: float
+    '''
+
+    # Keep the best run.
+    return round(min(timeit.repeat(run, number=number, repeat=repeat)) / number * 1e9, 1)
+
+
+# ** function: main
+def main():
+    '''
+    Run the benchmark and print the results as JSON.
+    '''
+
+    # Parse the benchmark options.
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--app-dir', default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'example'))
+    parser.add_argument('--number', type=int, default=200000, help='calls per timed run')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # Import the example events and utility from the app directory.
+    sys.path.insert(0, args.app_dir)
+    from app.events import calc
+    from app.utils.calc import CalcUtil
+
+    # Time the validation of each operand type, before and after.
+    results: Dict[str, Any] = {'options': dict(number=args.number, repeat=args.repeat), 'verify_number': {}, 'events': {}}
+    for kind, (a, _) in OPERANDS.items():
+        legacy = ns_per_call(lambda: legacy_verify_number(str(a)), args.number, args.repeat)
+        current = ns_per_call(lambda: CalcUtil.verify_number(a), args.number, args.repeat)
+        results['verify_number'][kind] = dict(legacy_ns=legacy, ns=current, speedup=round(legacy / current, 2))
+
+    # Time each scalar event with each operand type.
+    events = dict(
+        add=calc.AddNumber(),
+        subtract=calc.SubtractNumber(),
+        multiply=calc.MultiplyNumber(),
+        divide=calc.DivideNumber(),
+        exponentiate=calc.ExponentiateNumber(),
+    )
+    for name, event in events.items():
+        results['events'][name] = {
+            kind: ns_per_call(lambda: event.execute(a=a, b=b), args.number, args.repeat)
+            for kind, (a, b) in OPERANDS.items()
+        }
+    print(json.dumps(results, indent=2))
+
+
+# *** exec
+
+if __name__ == '__main__':
+    main()
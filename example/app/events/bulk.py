@@ -0,0 +1,302 @@
+'''Calculator bulk arithmetic domain events.'''
+
+# *** imports
+
+# ** core
+import math
+import operator
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Tuple
+
+# ** infra
+import numpy as np
+from tiferet.events import DomainEvent
+
+# ** app
+from ..utils.bulk import BulkCalcUtil, FLOAT_EXACT_BOUND
+
+
+# *** events
+
+# ** event: bulk_calc_event
+class BulkCalcEvent(DomainEvent, ABC):
+    '''
+    A base domain event to perform an operation on arrays of operand pairs with NumPy.
+    '''
+
+    # * attribute: operation
+    operation: Callable[[int, int], int | float]
+
+    # * method: compute
+    @abstractmethod
+    def compute(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        '''
+        Compute the operation on the valid operand pairs, as floats.
+
+        :param a: The first operands.
+        :type a: np.ndarray
+        :param b: The second operands.
+        :type b: np.ndarray
+        :return: The results.
+        :rtype: np.ndarray
+        '''
+
+        raise NotImplementedError()
+
+    # * method: get_integral
+    def get_integral(self, b: np.ndarray) -> np.ndarray:
+        '''
+        Get the mask of int operand pairs whose scalar result is an int.
+
+        :param b: The second operands, as ints.
+        :type b: np.ndarray
+        :return: The mask.
+        :rtype: np.ndarray
+        '''
+
+        # Int operations return ints by default.
+        return np.ones(b.size, dtype=bool)
+
+    # * method: get_zero_division
+    def get_zero_division(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        '''
+        Get the mask of operand pairs that divide by zero.
+
+        :param a: The first operands.
+        :type a: np.ndarray
+        :param b: The second operands.
+        :type b: np.ndarray
+        :return: The mask.
+        :rtype: np.ndarray
+        '''
+
+        # Operations do not divide by default.
+        return np.zeros(b.size, dtype=bool)
+
+    # * method: compute_integers
+    def compute_integers(self, a: np.ndarray, b: np.ndarray, valid: np.ndarray, results: np.ndarray) -> Tuple[List[Any], np.ndarray]:
+        '''
+        Compute the results of int operand pairs exactly, as the scalar events do.
+
+        The float results are kept where the operands and the result are
+        exact as floats, converted to ints where the scalar result is an int;
+        the other pairs are computed with Python ints.
+
+        :param a: The first operands, as ints.
+        :type a: np.ndarray
+        :param b: The second operands, as ints.
+        :type b: np.ndarray
+        :param valid: The mask of valid operand pairs.
+        :type valid: np.ndarray
+        :param results: The float results.
+        :type results: np.ndarray
+        :return: The results, and the mask of finite results.
+        :rtype: Tuple[List[Any], np.ndarray]
+        '''
+
+        # Find the pairs that are exact as floats.
+        exact = valid & (np.abs(a.astype(np.float64)) < FLOAT_EXACT_BOUND) & (np.abs(b.astype(np.float64)) < FLOAT_EXACT_BOUND)
+        exact &= np.abs(results) < FLOAT_EXACT_BOUND
+
+        # Convert their results to ints where the scalar result is an int.
+        integral = exact & self.get_integral(b)
+        integers = np.where(integral, results, 0).astype(np.int64).tolist()
+        output = [integer if whole else result for integer, result, whole in zip(integers, results.tolist(), integral.tolist())]
+
+        # Compute the other valid pairs with Python ints, mapping division by zero to NaN and overflows to infinity.
+        finite = np.isfinite(results)
+        for index in np.flatnonzero(valid & ~exact).tolist():
+            try:
+                result = self.operation(int(a[index]), int(b[index]))
+            except ZeroDivisionError:
+                result = math.nan
+            except OverflowError:
+                result = math.inf
+            output[index] = result
+            finite[index] = isinstance(result, int) or math.isfinite(result)
+        return output, finite
+
+    # * method: execute
+    def execute(self, a: List[Any], b: List[Any] | Any, **kwargs) -> Dict[str, List[Any]]:
+        '''
+        Execute the operation on each operand pair, reporting errors per element.
+
+        :param a: The first operands.
+        :type a: List[Any]
+        :param b: The second operands, of the same length, or a single operand for every pair.
+        :type b: List[Any] | Any
+        :return: The results (None where an element failed) and the element errors.
+        :rtype: Dict[str, List[Any]]
+        '''
+
+        # Verify the operands are arrays of equal length.
+        self.verify(isinstance(a, list), 'INVALID_OPERANDS')
+        self.verify(not isinstance(b, list) or len(b) == len(a), 'INVALID_OPERANDS')
+
+        # Verify the numeric inputs in bulk.
+        a_verified, a_valid = BulkCalcUtil.verify_numbers(a)
+        b_verified, b_valid = BulkCalcUtil.verify_numbers(b, len(a))
+        valid = a_valid & b_valid
+
+        # Compute the valid pairs as floats, ignoring the floating point warnings of the failed elements.
+        with np.errstate(all='ignore'):
+            results = self.compute(
+                np.where(valid, a_verified, 0).astype(np.float64),
+                np.where(valid, b_verified, 1).astype(np.float64),
+            )
+
+        # Keep the results of int operands exact.
+        if a_verified.dtype.kind == 'i' and b_verified.dtype.kind == 'i':
+            output, finite = self.compute_integers(a_verified, b_verified, valid, results)
+        else:
+            output, finite = results.tolist(), np.isfinite(results)
+        failed = ~valid | ~finite
+        zero_division = self.get_zero_division(a_verified, b_verified)
+
+        # Report the failed elements: invalid inputs, division by zero and results out of range.
+        errors = []
+        for index in np.flatnonzero(failed).tolist():
+            if not a_valid[index]:
+                errors.append(dict(index=index, error_code='INVALID_INPUT', value=a[index]))
+            elif not b_valid[index]:
+                errors.append(dict(index=index, error_code='INVALID_INPUT', value=b[index] if isinstance(b, list) else b))
+            elif zero_division[index]:
+                errors.append(dict(index=index, error_code='DIVISION_BY_ZERO'))
+            else:
+                errors.append(dict(index=index, error_code='RESULT_OUT_OF_RANGE'))
+
+        # Return the results with None for the failed elements.
+        for error in errors:
+            output[error['index']] = None
+        return dict(results=output, errors=errors)
+
+
+# ** event: bulk_add_numbers
+class BulkAddNumbers(BulkCalcEvent):
+    '''
+    A domain event to perform addition on arrays of number pairs.
+    '''
+
+    # * attribute: operation
+    operation = staticmethod(operator.add)
+
+    # * method: compute
+    def compute(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        '''
+        Add the operand pairs.
+        '''
+
+        # Add the arrays.
+        return np.add(a, b)
+
+
+# ** event: bulk_subtract_numbers
+class BulkSubtractNumbers(BulkCalcEvent):
+    '''
+    A domain event to perform subtraction on arrays of number pairs.
+    '''
+
+    # * attribute: operation
+    operation = staticmethod(operator.sub)
+
+    # * method: compute
+    def compute(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        '''
+        Subtract the second operands from the first.
+        '''
+
+        # Subtract the arrays.
+        return np.subtract(a, b)
+
+
+# ** event: bulk_multiply_numbers
+class BulkMultiplyNumbers(BulkCalcEvent):
+    '''
+    A domain event to perform multiplication on arrays of number pairs.
+    '''
+
+    # * attribute: operation
+    operation = staticmethod(operator.mul)
+
+    # * method: compute
+    def compute(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        '''
+        Multiply the operand pairs.
+        '''
+
+        # Multiply the arrays.
+        return np.multiply(a, b)
+
+
+# ** event: bulk_divide_numbers
+class BulkDivideNumbers(BulkCalcEvent):
+    '''
+    A domain event to perform division on arrays of number pairs.
+    '''
+
+    # * attribute: operation
+    operation = staticmethod(operator.truediv)
+
+    # * method: compute
+    def compute(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        '''
+        Divide the first operands by the second, leaving NaN where the denominator is zero.
+        '''
+
+        # Divide the arrays where the denominator is non-zero.
+        return np.divide(a, b, out=np.full_like(a, np.nan), where=b != 0)
+
+    # * method: get_integral
+    def get_integral(self, b: np.ndarray) -> np.ndarray:
+        '''
+        Quotients are always floats.
+        '''
+
+        # Return no int results.
+        return np.zeros(b.size, dtype=bool)
+
+    # * method: get_zero_division
+    def get_zero_division(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        '''
+        Zero denominators divide by zero.
+        '''
+
+        # Return the zero denominators.
+        return b == 0
+
+
+# ** event: bulk_exponentiate_numbers
+class BulkExponentiateNumbers(BulkCalcEvent):
+    '''
+    A domain event to perform exponentiation on arrays of number pairs.
+    '''
+
+    # * attribute: operation
+    operation = staticmethod(operator.pow)
+
+    # * method: compute
+    def compute(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        '''
+        Raise the bases to the exponents.
+        '''
+
+        # Exponentiate the arrays.
+        return np.power(a, b)
+
+    # * method: get_integral
+    def get_integral(self, b: np.ndarray) -> np.ndarray:
+        '''
+        Int powers are ints for non-negative exponents only.
+        '''
+
+        # Return the non-negative exponents.
+        return b >= 0
+
+    # * method: get_zero_division
+    def get_zero_division(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        '''
+        Zero raised to a negative power divides by zero.
+        '''
+
+        # Return the zero bases with negative exponents.
+        return (a == 0) & (b < 0)
@@ -3,6 +3,7 @@
 # *** imports
 
 # ** core
+import operator
 from typing import Any
 
 # ** infra
@@ -34,11 +35,11 @@ class AddNumber(DomainEvent):
         '''
 
         # Verify numeric inputs.
-        a_verified = CalcUtil.verify_number(str(a))
-        b_verified = CalcUtil.verify_number(str(b))
+        a_verified = CalcUtil.verify_number(a)
+        b_verified = CalcUtil.verify_number(b)
 
-        # Add verified values.
-        result = a_verified + b_verified
+        # Add verified values, verifying the result is in range.
+        result = CalcUtil.calculate(operator.add, a_verified, b_verified)
 
         # Return the result.
         return result
@@ -64,11 +65,11 @@ class SubtractNumber(DomainEvent):
         '''
 
         # Verify numeric inputs.
-        a_verified = CalcUtil.verify_number(str(a))
-        b_verified = CalcUtil.verify_number(str(b))
+        a_verified = CalcUtil.verify_number(a)
+        b_verified = CalcUtil.verify_number(b)
 
-        # Subtract verified values.
-        result = a_verified - b_verified
+        # Subtract verified values, verifying the result is in range.
+        result = CalcUtil.calculate(operator.sub, a_verified, b_verified)
 
         # Return the result.
         return result
@@ -94,11 +95,11 @@ class MultiplyNumber(DomainEvent):
         '''
 
         # Verify numeric inputs.
-        a_verified = CalcUtil.verify_number(str(a))
-        b_verified = CalcUtil.verify_number(str(b))
+        a_verified = CalcUtil.verify_number(a)
+        b_verified = CalcUtil.verify_number(b)
 
-        # Multiply verified values.
-        result = a_verified * b_verified
+        # Multiply verified values, verifying the result is in range.
+        result = CalcUtil.calculate(operator.mul, a_verified, b_verified)
 
         # Return the result.
         return result
@@ -124,14 +125,14 @@ class DivideNumber(DomainEvent):
         '''
 
         # Verify numeric inputs.
-        a_verified = CalcUtil.verify_number(str(a))
-        b_verified = CalcUtil.verify_number(str(b))
+        a_verified = CalcUtil.verify_number(a)
+        b_verified = CalcUtil.verify_number(b)
 
         # Verify non-zero denominator.
         self.verify(b_verified != 0, 'DIVISION_BY_ZERO')
 
-        # Divide verified values.
-        result = a_verified / b_verified
+        # Divide verified values, verifying the result is in range.
+        result = CalcUtil.calculate(operator.truediv, a_verified, b_verified)
 
         # Return the result.
         return result
@@ -157,11 +158,11 @@ class ExponentiateNumber(DomainEvent):
         '''
 
         # Verify numeric inputs.
-        a_verified = CalcUtil.verify_number(str(a))
-        b_verified = CalcUtil.verify_number(str(b))
+        a_verified = CalcUtil.verify_number(a)
+        b_verified = CalcUtil.verify_number(b)
 
-        # Exponentiate verified values.
-        result = a_verified ** b_verified
+        # Exponentiate verified values, verifying the result is a finite real number (zero to a negative power divides by zero).
+        result = CalcUtil.calculate(operator.pow, a_verified, b_verified)
 
         # Return the result.
         return result
@@ -0,0 +1,79 @@
+'''Calculator request models.'''
+
+# *** imports
+
+# ** core
+from typing import Annotated, Any, List
+
+# ** infra
+from pydantic import Field, StrictFloat, StrictInt, StringConstraints
+from tiferet_openapi.domain.request import ApiRequestModel
+
+# ** app
+from ..utils.calc import NUMBER_PATTERN
+
+
+# *** constants
+
+# ** constant: number
+Number = Annotated[
+    StrictInt | Annotated[StrictFloat, Field(allow_inf_nan=False)] | Annotated[str, StringConstraints(pattern=f'^(?:{NUMBER_PATTERN.pattern})$')],
+    Field(description='A number, or a numeric string (e.g. "-2.5" or "1e3").'),
+]
+
+
+# *** models
+
+# ** model: calc_request
+class CalcRequest(ApiRequestModel):
+    '''
+    A request for an arithmetic operation on two numbers.
+    '''
+
+    # * attribute: a
+    a: Number
+
+    # * attribute: b
+    b: Number
+
+
+# ** model: sqrt_request
+class SqrtRequest(ApiRequestModel):
+    '''
+    A request for the square root of a number.
+    '''
+
+    # * attribute: a
+    a: Number
+
+
+# ** model: bulk_calc_request
+class BulkCalcRequest(ApiRequestModel):
+    '''
+    A request for an arithmetic operation on arrays of number pairs; elements are validated one by one.
+    '''
+
+    # * attribute: a
+    a: List[Any] = Field(
+        ...,
+        description='The first operands.',
+    )
+
+    # * attribute: b
+    b: List[Any] | Number = Field(
+        ...,
+        description='The second operands, of the same length as a, or one number for every pair.',
+    )
+
+
+# ** model: bulk_sqrt_request
+class BulkSqrtRequest(ApiRequestModel):
+    '''
+    A request for the square roots of an array of numbers; elements are validated one by one.
+    '''
+
+    # * attribute: a
+    a: List[Any] = Field(
+        ...,
+        description='The numbers.',
+    )
@@ -0,0 +1,76 @@
+'''Calculator bulk validation utility.'''
+
+# *** imports
+
+# ** core
+from typing import Any, List, Tuple
+
+# ** infra
+import numpy as np
+
+# ** app
+from .calc import CalcUtil
+
+
+# *** constants
+
+# ** constant: int64_bound
+INT64_BOUND = 2 ** 63
+
+# ** constant: float_exact_bound
+FLOAT_EXACT_BOUND = 2 ** 53
+
+
+# *** utils
+
+# ** util: bulk_calc_util
+class BulkCalcUtil:
+    '''
+    Utility for validating arrays of numeric inputs with NumPy.
+    '''
+
+    # * method: verify_numbers (static)
+    @staticmethod
+    def verify_numbers(values: List[Any] | Any, size: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        Verify an array of values in bulk, with the rules of CalcUtil.verify_number for each element.
+
+        The values are kept as 64-bit ints if every valid element is an int
+        that fits, so int operands stay exact as in the scalar events, and
+        are converted to floats otherwise.
+
+        :param values: The values to verify, or a single value to repeat.
+        :type values: List[Any] | Any
+        :param size: The number of elements to repeat a single value to.
+        :type size: int
+        :return: The values as ints (zero where invalid) or floats (NaN where invalid), and the mask of valid elements.
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        '''
+
+        # Repeat a single value to the array size.
+        if not isinstance(values, (list, tuple)):
+            values = [values] * (size or 1)
+
+        # Accept arrays of 64-bit ints or of finite numbers without conversion.
+        try:
+            array = np.asarray(values)
+        except (ValueError, OverflowError):
+            array = None
+        if array is not None and array.ndim == 1 and array.dtype.kind in 'iuf':
+            if array.dtype.kind == 'i' or (array.dtype.kind == 'u' and (not array.size or array.max() < INT64_BOUND)):
+                return array.astype(np.int64), np.ones(array.size, dtype=bool)
+            numbers = array.astype(np.float64)
+            return numbers, np.isfinite(numbers)
+
+        # Otherwise parse each element.
+        parsed = [CalcUtil.parse_number(value) for value in values]
+        valid = np.fromiter((number is not None for number in parsed), dtype=bool, count=len(parsed))
+
+        # Keep ints that fit in 64 bits, leaving zero where invalid.
+        if all(type(number) is int and -INT64_BOUND <= number < INT64_BOUND for number in parsed if number is not None):
+            numbers = np.fromiter((0 if number is None else number for number in parsed), dtype=np.int64, count=len(parsed))
+            return numbers, valid
+
+        # Convert the rest to floats, leaving NaN where invalid.
+        numbers = np.fromiter((np.nan if number is None else number for number in parsed), dtype=np.float64, count=len(parsed))
+        return numbers, valid
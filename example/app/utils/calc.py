@@ -2,10 +2,21 @@
 
 # *** imports
 
+# ** core
+import math
+import re
+from typing import Any, Callable
+
 # ** infra
 from tiferet.events import RaiseError
 
 
+# *** constants
+
+# ** constant: number_pattern
+NUMBER_PATTERN = re.compile(r'[-+]?(?:\d+(\.\d*)?|(\.)\d+)([eE][-+]?\d+)?')
+
+
 # *** utils
 
 # ** util: calc_util
@@ -14,32 +25,110 @@ class CalcUtil:
     Utility for validating numeric inputs.
     '''
 
+    # * method: parse_number (static)
+    @staticmethod
+    def parse_number(value: Any) -> int | float | None:
+        '''
+        Parse a value as a finite integer or float, or None if it is not a number.
+
+        Ints and floats are returned as they are. Digit strings, with at most
+        one decimal point, are converted directly; other strings are matched
+        in one pass as signed decimals with an optional exponent, and are
+        converted to an int if they have neither a decimal point nor an
+        exponent.
+
+        :param value: The value to parse.
+        :type value: Any
+        :return: The numeric value, or None if invalid.
+        :rtype: int | float | None
+        '''
+
+        # Return ints and finite floats without conversion (bools are not numbers).
+        value_type = type(value)
+        if value_type is int:
+            return value
+        if value_type is float:
+            return value if math.isfinite(value) else None
+
+        # Reject everything else but strings, converting plain digit and decimal strings directly.
+        if value_type is not str:
+            return None
+        try:
+            if value.isdecimal():
+                return int(value)
+            if value.replace('.', '', 1).isdecimal():
+                return float(value)
+
+            # Match signed and exponent strings against the number pattern.
+            match = NUMBER_PATTERN.fullmatch(value)
+            if match is None:
+                return None
+
+            # Convert to an int if there is no decimal point or exponent, otherwise to a finite float.
+            if match.lastindex is None:
+                return int(value)
+            number = float(value)
+        except ValueError:
+            return None
+        return number if math.isfinite(number) else None
+
     # * method: verify_number (static)
     @staticmethod
-    def verify_number(value: str) -> int | float:
+    def verify_number(value: Any) -> int | float:
         '''
-        Verify that the value can be converted to an integer or float.
+        Verify that the value is a number, or a string that can be converted to one.
 
         :param value: The value to verify.
-        :type value: str
+        :type value: Any
         :return: The numeric value as an integer or float.
         :rtype: int | float
         '''
 
-        # Check if the value is a valid number.
-        is_valid = isinstance(value, str) and (
-            value.isdigit()
-            or (value.replace('.', '', 1).isdigit() and value.count('.') < 2)
-        )
+        # Parse the value.
+        number = CalcUtil.parse_number(value)
 
         # Raise error if invalid.
-        if not is_valid:
+        if number is None:
             RaiseError.execute(
                 error_code='INVALID_INPUT',
                 value=value,
             )
 
-        # If valid, return the value as a float or int.
-        if '.' in value:
-            return float(value)
-        return int(value)
+        # If valid, return the number.
+        return number
+
+    # * method: calculate (static)
+    @staticmethod
+    def calculate(operation: Callable[[Any, Any], Any], a: int | float, b: int | float) -> int | float:
+        '''
+        Apply an operation to verified numbers, verifying the result is a finite real number.
+
+        Int results are exact and always in range. Float results overflowing
+        to infinity, ints too large to convert to floats and complex results
+        (negative bases with fractional exponents) raise RESULT_OUT_OF_RANGE,
+        and division by zero raises DIVISION_BY_ZERO.
+
+        :param operation: The operation, e.g. operator.add.
+        :type operation: Callable[[Any, Any], Any]
+        :param a: The first operand.
+        :type a: int | float
+        :param b: The second operand.
+        :type b: int | float
+        :return: The result.
+        :rtype: int | float
+        '''
+
+        # Apply the operation, raising division by zero and treating overflows as out of range.
+        try:
+            result = operation(a, b)
+        except ZeroDivisionError:
+            RaiseError.execute(error_code='DIVISION_BY_ZERO')
+        except OverflowError:
+            result = None
+
+        # Raise error if the result is not a finite int or float.
+        if not (type(result) is int or (type(result) is float and math.isfinite(result))):
+            RaiseError.execute(error_code='RESULT_OUT_OF_RANGE')
+
+        # If in range, return the result.
+        return result
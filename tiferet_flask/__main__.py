@@ -0,0 +1,87 @@
+'''Tiferet Flask prefork server command.
+
+Builds the app once and serves it with prefork workers sharing one socket.
+The workers run werkzeug's development server; put it behind a reverse
+proxy, or use gunicorn with preload, for untrusted traffic:
+
+    python -m tiferet_flask calc_flask_api --bind 0.0.0.0:8000 --max-requests 10000 --max-memory-mb 512
+'''
+
+# *** imports
+
+# ** core
+import argparse
+import logging
+import os
+import sys
+from typing import List
+
+# ** app
+from .blueprints import run
+from .contexts import FlaskAppOptions
+
+
+# *** functions
+
+# ** function: main
+def main(argv: List[str] = None):
+    '''
+    Parse the server options and serve the interface until SIGTERM or SIGINT.
+
+    :param argv: The command line arguments; sys.argv if None.
+    :type argv: List[str]
+    '''
+
+    # Parse the server options.
+    parser = argparse.ArgumentParser(prog='tiferet-flask', description='Serve a Tiferet Flask interface with prefork workers.')
+    parser.add_argument('interface_id', help='the interface ID to serve')
+    parser.add_argument('--bind', default='127.0.0.1:5000', help='host:port to listen on (default: %(default)s)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: the usable CPU count)')
+    parser.add_argument('--threaded', action='store_true', help='serve requests on threads within each worker')
+    parser.add_argument('--max-requests', type=int, default=0, help='recycle a worker after this many requests (default: never)')
+    parser.add_argument('--max-requests-jitter', type=int, default=0, help='add up to this many requests to each worker limit')
+    parser.add_argument('--max-memory-mb', type=float, help='recycle a worker once its resident memory exceeds this many MiB')
+    parser.add_argument('--graceful-timeout', type=float, default=30.0, help='seconds to finish in-flight requests on shutdown (default: %(default)s)')
+    parser.add_argument('--access-log', action='store_true', help='log each request')
+    parser.add_argument('--swagger', action='store_true', help='serve the Swagger UI')
+    parser.add_argument('--reload', action='store_true', help='reload the routes, features and errors in place when their config files change')
+    parser.add_argument('--no-cors', dest='cors', action='store_false', help='do not answer CORS preflight requests or add CORS headers')
+    parser.add_argument('--limits', action='store_true', help='enforce the rate limits and concurrency caps in openapi.yml across the workers')
+    parser.add_argument('--validate-requests', action='store_true', help='reject requests failing the route request models with a 422')
+    parser.add_argument('--app-dir', help='the app directory holding the app configuration (default: the current directory)')
+    args = parser.parse_args(argv)
+
+    # Load the app configuration relative to the app directory.
+    if args.app_dir:
+        os.chdir(args.app_dir)
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    logging.basicConfig(level=logging.INFO, format='[%(process)d] %(levelname)s %(message)s')
+
+    # Build the app once and serve it.
+    run(
+        args.interface_id,
+        swagger=args.swagger,
+        options=FlaskAppOptions(
+            cors=args.cors,
+            limits=args.limits,
+            validate_requests=args.validate_requests,
+            reload=args.reload,
+        ),
+        server_options=dict(
+            bind=args.bind,
+            workers=args.workers,
+            threaded=args.threaded,
+            max_requests=args.max_requests,
+            max_requests_jitter=args.max_requests_jitter,
+            max_memory_mb=args.max_memory_mb,
+            graceful_timeout=args.graceful_timeout,
+            access_log=args.access_log,
+        ),
+    )
+
+
+# *** exec
+
+if __name__ == '__main__':
+    main()
@@ -4,9 +4,23 @@
 
 # ** app
 from .flask import (
+    register_interface,
     get_routers,
+    get_openapi_config,
+    get_route_options,
+    load_openapi_snapshot,
+    compile_dispatch,
+    refresh_dispatch,
+    rebuild_url_map,
+    get_config_files,
+    reload_config,
+    watch_config,
     build_blueprint,
     build_flask_app,
     build_flask_app as FlaskApp,
+    get_startup_report,
     run,
+    preload,
 )
+from .view import build_view_func, build_async_view_func, build_batch_view_func, build_metrics_view_func, build_cors_preflight_func, build_cors_response_func, build_limit_admit_func, build_limit_release_func, build_route_tables_func
+from .asgi import build_asgi_app
@@ -0,0 +1,314 @@
+"""Flask API ASGI Blueprints"""
+
+# *** imports
+
+# ** core
+import json
+from functools import partial
+from typing import Any, Callable, Dict, Tuple
+from urllib.parse import parse_qsl
+
+# ** infra
+from flask import Flask
+from tiferet.assets.exceptions import TiferetAPIError
+from werkzeug.exceptions import BadRequest, HTTPException, RequestEntityTooLarge
+from werkzeug.routing import RequestRedirect
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:
+    WsgiToAsgi = None
+
+# ** app
+from ..contexts import RouteTables
+from .view import (
+    build_feature_call,
+    build_item_dumper,
+    finish_feature_response,
+    get_ingest_options,
+    get_max_body_size,
+    iter_stream_chunks,
+    prepare_feature_request,
+)
+
+
+# *** blueprints
+
+# ** blueprint: read_asgi_body
+async def read_asgi_body(receive: Callable, max_size: int | None = None) -> bytes | None:
+    '''
+    Read the full request body from an ASGI receive channel.
+
+    :param receive: The ASGI receive callable.
+    :type receive: Callable
+    :param max_size: The maximum body size in bytes; unlimited if None.
+    :type max_size: int | None
+    :return: The request body, or None once it exceeds max_size.
+    :rtype: bytes | None
+    '''
+
+    # Collect the body chunks until the client signals the end.
+    chunks = []
+    size = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunk = message.get('body', b'')
+        size += len(chunk)
+
+        # Stop reading once the body is over the limit.
+        if max_size is not None and size > max_size:
+            return None
+        chunks.append(chunk)
+        more_body = message.get('more_body', False)
+    return b''.join(chunks)
+
+
+# ** blueprint: parse_asgi_data
+def parse_asgi_data(
+        headers: Dict[str, str],
+        body: bytes | None,
+        query_string: bytes,
+        params: Tuple[str, ...] | None = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+    '''
+    Collect the feature data from the JSON body, query params and route params of an ASGI request.
+
+    :param headers: The request headers.
+    :type headers: Dict[str, str]
+    :param body: The request body, or None if it exceeded the route limit.
+    :type body: bytes | None
+    :param query_string: The raw query string.
+    :type query_string: bytes
+    :param params: The names of the params the feature needs; all params if None.
+    :type params: Tuple[str, ...] | None
+    :param kwargs: The route params.
+    :type kwargs: dict
+    :return: The feature request data.
+    :rtype: Dict[str, Any]
+    :raises RequestEntityTooLarge: If the body exceeded the route limit.
+    :raises BadRequest: If the JSON body cannot be parsed.
+    '''
+
+    # Reject bodies read past the route limit.
+    if body is None:
+        raise RequestEntityTooLarge()
+
+    # Parse the JSON body when declared, rejecting malformed JSON like request.get_json.
+    data = None
+    if body and 'json' in headers.get('Content-Type', ''):
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise BadRequest('Failed to decode JSON object.')
+    if not isinstance(data, dict):
+        data = {}
+
+    # Merge the query params, keeping the first value like request.args.
+    args = {}
+    for name, value in parse_qsl(query_string.decode('latin-1')):
+        args.setdefault(name, value)
+    data.update(args)
+
+    # Keep only the params the feature needs.
+    if params is not None:
+        data = {name: data[name] for name in params if name in data}
+
+    # Route params always apply.
+    data.update(kwargs)
+    return data
+
+
+# ** blueprint: build_asgi_app
+def build_asgi_app(flask_app: Flask) -> Callable:
+    '''
+    Build an ASGI application from a Flask app assembled by build_flask_app.
+
+    Feature routes compiled into the dispatch table run natively on the
+    server's event loop via FlaskApiContext.run_async. All other requests
+    (Swagger UI, redirects, 404/405) fall back to the WSGI Flask app when
+    asgiref is installed.
+
+    :param flask_app: A Flask app assembled by build_flask_app.
+    :type flask_app: Flask
+    :return: The ASGI application callable.
+    :rtype: Callable
+    '''
+
+    # Load the interface context, response cache, coalescing, metrics and profiler, and prepare the WSGI fallback.
+    state = flask_app.extensions['tiferet_flask']
+    interface_context = state['context']
+    response_cache = state.get('response_cache')
+    coalescer = state.get('coalescer')
+    metrics = state.get('metrics')
+    profiler = state.get('profiler')
+    wsgi_fallback = WsgiToAsgi(flask_app) if WsgiToAsgi else None
+    url_adapters = {}
+
+    # Define the serializer for the shared response pipeline, using the provider's byte serializer when available.
+    dump_bytes = getattr(flask_app.json, 'dump_bytes', None)
+    dump_item = build_item_dumper(flask_app.json)
+    def serialize(payload: Any, status_code: int, stream_format: str | None = None) -> Tuple[int, bytes, Any]:
+        if stream_format:
+            content_type = b'application/x-ndjson' if stream_format == 'ndjson' else b'application/json'
+            return status_code, content_type, iter_stream_chunks(payload, stream_format, dump_item)
+        body = dump_bytes(payload) if dump_bytes else flask_app.json.dumps(payload).encode('utf-8')
+        return status_code, b'application/json', body
+
+    # Define the response sender, streaming chunk iterators and sending no body for HEAD requests.
+    async def send_response(send: Callable, result: Tuple[int, bytes, Any], method: str, extra_headers: list = []):
+        status_code, content_type, body = result
+        headers = [(b'content-type', content_type)]
+        if isinstance(body, bytes):
+            headers.append((b'content-length', str(len(body)).encode('latin-1')))
+        await send({
+            'type': 'http.response.start',
+            'status': status_code,
+            'headers': [*headers, *extra_headers],
+        })
+        if method == 'HEAD' or isinstance(body, bytes):
+            return await send({'type': 'http.response.body', 'body': b'' if method == 'HEAD' else body})
+        for chunk in body:
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    # Define the ASGI application.
+    async def asgi_app(scope: Dict[str, Any], receive: Callable, send: Callable):
+
+        # Acknowledge lifespan events.
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+
+        # Read the published route tables once, so a reload never mixes old and new tables within the request.
+        tables = state['tables']
+        cors, limits = tables.cors, tables.limits
+
+        # Match the path against their url map, binding each map once as hot reloads swap it.
+        url_map = tables.url_map
+        url_adapter = url_adapters.get(url_map)
+        if url_adapter is None:
+            url_adapters.clear()
+            url_adapter = url_adapters[url_map] = url_map.bind('localhost')
+        try:
+            endpoint, route_params = url_adapter.match(scope['path'], method=scope['method'])
+        except (HTTPException, RequestRedirect):
+            endpoint, route_params = None, {}
+
+        # Answer CORS preflight requests from the compiled policies.
+        if scope['method'] == 'OPTIONS' and cors:
+            headers = {
+                name.decode('latin-1').title(): value.decode('latin-1')
+                for name, value in scope.get('headers', [])
+            }
+            origin = headers.get('Origin')
+            if origin and 'Access-Control-Request-Method' in headers:
+                preflight = cors.get_preflight_headers(endpoint, origin, headers.get('Access-Control-Request-Headers'))
+                if preflight is not None:
+                    await send({
+                        'type': 'http.response.start',
+                        'status': 204,
+                        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in preflight],
+                    })
+                    return await send({'type': 'http.response.body', 'body': b''})
+
+        # Fall back to the WSGI app for anything but compiled feature routes, including other OPTIONS requests.
+        dispatch = tables.dispatch or interface_context.dispatch
+        entry = dispatch.get_entry(endpoint) if dispatch and endpoint and scope['method'] != 'OPTIONS' else None
+        if entry is None:
+            if wsgi_fallback is None:
+                return await send_response(send, serialize({'error_code': 'NOT_FOUND', 'message': 'Not found.'}, 404), scope['method'])
+            return await wsgi_fallback(scope, receive, send)
+
+        # Parse the headers.
+        headers = {
+            name.decode('latin-1').title(): value.decode('latin-1')
+            for name, value in scope.get('headers', [])
+        }
+
+        # Hand routes ingesting streamed bodies to the WSGI app, which spools the body to disk and enforces the limits.
+        if get_ingest_options(entry) and wsgi_fallback:
+            return await wsgi_fallback(scope, receive, send)
+
+        # Compile the CORS headers of cross-origin responses, rejections included.
+        origin = headers.get('Origin')
+        cors_headers = [
+            (name.lower().encode('latin-1'), value.encode('latin-1'))
+            for name, value in cors.get_response_headers(endpoint, origin)
+        ] if cors and origin else []
+
+        # Reject requests over the router and route limits with the precompiled response.
+        entered, rejected = limits.admit(endpoint) if limits else ((), None)
+        if rejected:
+            await send({
+                'type': 'http.response.start',
+                'status': rejected.status_code,
+                'headers': [
+                    *[(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in rejected.headers],
+                    *cors_headers,
+                ],
+            })
+            return await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else rejected.body})
+
+        # Handle the admitted request, releasing its concurrency caps once the response is sent.
+        try:
+            await handle_feature(scope, receive, send, tables, endpoint, entry, route_params, headers, cors_headers)
+        finally:
+            if entered:
+                limits.release(entered)
+
+    # Define the feature request handler, running the shared request and response pipeline of the Flask views.
+    async def handle_feature(
+            scope: Dict[str, Any],
+            receive: Callable,
+            send: Callable,
+            tables: RouteTables,
+            endpoint: str,
+            entry: Any,
+            route_params: Dict[str, Any],
+            headers: Dict[str, str],
+            cors_headers: list,
+        ):
+
+        # Read the body within the route limit, unless its declared length is already over it.
+        max_body_size = get_max_body_size(entry)
+        content_length = int(headers['Content-Length']) if headers.get('Content-Length') else None
+        body = None
+        if not (max_body_size and content_length is not None and content_length > max_body_size):
+            body = await read_asgi_body(receive, max_body_size)
+
+        # Parse and validate the request data, sending rejections before the feature runs.
+        read_data = partial(parse_asgi_data, headers, body, scope.get('query_string', b''), entry.params, **route_params)
+        feature_id, data, started, rejected = prepare_feature_request(
+            entry, endpoint, content_length, read_data, metrics, tables.schemas,
+        )
+        if rejected:
+            return await send_response(send, serialize(*rejected), scope['method'], cors_headers)
+
+        # Await the feature on the event loop, coalesced and through the response cache if configured, profiling its commands on sampled requests.
+        run_feature = build_feature_call(
+            interface_context, entry, feature_id, data, response_cache, coalescer, is_async=True, headers=headers,
+        )
+        profile = profiler.start() if profiler else None
+        response = status_code = error = None
+        try:
+            response, status_code = await run_feature()
+        except TiferetAPIError as raised:
+            error = raised
+        finally:
+            timings = profiler.stop(profile) if profile else None
+
+        # Format and record the response, then send it with the CORS headers and command timings.
+        result = finish_feature_response(entry, feature_id, response, status_code, error, started, serialize, metrics)
+        extra_headers = list(cors_headers)
+        if timings:
+            extra_headers.append((b'server-timing', profiler.format_server_timing(timings).encode('latin-1')))
+        await send_response(send, result, scope['method'], extra_headers)
+
+    # Return the ASGI application.
+    return asgi_app
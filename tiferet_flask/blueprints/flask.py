@@ -3,22 +3,129 @@
 # *** imports
 
 # ** core
-from typing import Callable, List
+import gc
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+import weakref
+from contextlib import contextmanager
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, Iterator, List
 
 # ** infra
-from flask import Flask, Blueprint
-from flask_cors import CORS
+from flask import Flask, Blueprint, request
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.routing import Map
+from tiferet import Yaml
 from tiferet.di import ServiceProvider
-from tiferet_openapi import ApiRouter
+from tiferet.domain import AppInterface
+from tiferet_openapi import ApiRoute, ApiRouter
 from tiferet.blueprints.main import (
     resolve_interface,
     realize_interface,
     create_service_provider,
 )
 
+# ** app
+from ..contexts import (
+    LazyApiContext,
+    ResponseCacheContext,
+    CoalesceContext,
+    FlaskJsonProvider,
+    MetricsContext,
+    CommandProfiler,
+    CorsContext,
+    ConfigWatchContext,
+    PreforkServerContext,
+    RequestContextPool,
+    RateLimitContext,
+    RequestSchemaContext,
+    RouteTables,
+    SharedMemoryRateLimiter,
+    FlaskAppOptions,
+)
+from .view import (
+    build_view_func,
+    build_async_view_func,
+    build_batch_view_func,
+    build_metrics_view_func,
+    build_cors_preflight_func,
+    build_cors_response_func,
+    build_limit_admit_func,
+    build_limit_release_func,
+    build_route_tables_func,
+    format_body_too_large,
+)
+
+
+# *** constants
+
+# ** constant: snapshot_version
+SNAPSHOT_VERSION = 2
+
 
 # *** blueprints
 
+# ** blueprint: time_phase
+@contextmanager
+def time_phase(timings: Dict[str, float], phase: str) -> Iterator[None]:
+    '''
+    Record the wall time of a startup phase, in milliseconds.
+
+    :param timings: The startup timings to record into.
+    :type timings: Dict[str, float]
+    :param phase: The phase name.
+    :type phase: str
+    '''
+
+    # Time the wrapped block, recording even if it raises.
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = round((time.perf_counter() - start) * 1000, 3)
+
+
+# ** blueprint: register_interface
+def register_interface(app_interface: AppInterface, service_provider: ServiceProvider) -> ServiceProvider:
+    '''
+    Register the interface service types on the provider without resolving the app context.
+
+    Mirrors the registration half of realize_interface so single events
+    (e.g. get_routers_evt) can be resolved before the full context graph.
+
+    :param app_interface: The resolved app interface definition.
+    :type app_interface: AppInterface
+    :param service_provider: The service provider to register the services on.
+    :type service_provider: ServiceProvider
+    :return: The service provider.
+    :rtype: ServiceProvider
+    '''
+
+    # Register the interface dependencies and the provider factory.
+    dependencies = app_interface.get_service_type_mapping()
+    dependencies['create_service_provider'] = create_service_provider
+    service_provider.add_services(dependencies)
+    return service_provider
+
+
+# ** blueprint: get_interface_type
+def get_interface_type(app_interface: AppInterface) -> type:
+    '''
+    Get the context class of an app interface without realizing it, e.g. to check its capabilities in lazy mode.
+
+    :param app_interface: The resolved app interface definition.
+    :type app_interface: AppInterface
+    :return: The interface context class.
+    :rtype: type
+    '''
+
+    # Import the class the interface is realized as.
+    return getattr(import_module(app_interface.module_path), app_interface.class_name)
+
+
 # ** blueprint: get_routers
 def get_routers(service_provider: ServiceProvider) -> List[ApiRouter]:
     '''
@@ -35,6 +142,467 @@ def get_routers(service_provider: ServiceProvider) -> List[ApiRouter]:
     return get_routers_evt.execute()
 
 
+# ** blueprint: get_openapi_config
+def get_openapi_config(service_provider: ServiceProvider) -> Dict[str, Any]:
+    '''
+    Load the raw OpenAPI configuration node backing the openapi service.
+
+    :param service_provider: The service provider to resolve the openapi service from.
+    :type service_provider: ServiceProvider
+    :return: The configuration mapping under the service root key.
+    :rtype: Dict[str, Any]
+    '''
+
+    # Resolve the openapi service and load its root configuration node.
+    openapi_service = service_provider.get_service('openapi_service')
+    return Yaml(
+        openapi_service.openapi_yaml_file,
+        encoding=openapi_service.encoding,
+    ).load(
+        start_node=lambda data: data.get(openapi_service.root_key, {})
+    )
+
+
+# ** blueprint: get_route_options
+def get_route_options(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    '''
+    Collect the Flask route options declared alongside each route in the OpenAPI configuration.
+
+    A router's `cors` block applies to each of its routes, under the route's own `cors` block.
+    A false block disables CORS; a router's false block yields to a route's own block.
+    A router's `limits` block is kept on each of its routes as `router_limits`, since it is shared by them.
+
+    :param config: The raw OpenAPI configuration node.
+    :type config: Dict[str, Any]
+    :return: The non-ApiRoute keys of each route, keyed by endpoint.
+    :rtype: Dict[str, Dict[str, Any]]
+    '''
+
+    # Keep the route keys the ApiRoute domain object does not model.
+    options = {}
+    for router_name, router_data in config.get('routers', {}).items():
+        router_cors = (router_data or {}).get('cors')
+        router_limits = (router_data or {}).get('limits')
+        for route_id, route_data in (router_data or {}).get('routes', {}).items():
+            route_options = {
+                key: value
+                for key, value in (route_data or {}).items()
+                if key not in ApiRoute.model_fields
+            }
+
+            # Merge the router CORS options under the route ones, where false disables CORS.
+            route_cors = route_options.get('cors')
+            if router_cors is not None and route_cors is not False:
+                route_options['cors'] = {**router_cors, **(route_cors or {})} if router_cors is not False else route_cors or False
+
+            # Keep the router limits, shared by its routes.
+            if router_limits:
+                route_options['router_limits'] = router_limits
+            options[f'{router_name}.{route_id}'] = route_options
+    return options
+
+
+# ** blueprint: hash_openapi_file
+def hash_openapi_file(openapi_yaml_file: str) -> str:
+    '''
+    Hash the content of an OpenAPI YAML file.
+
+    :param openapi_yaml_file: The OpenAPI YAML file path.
+    :type openapi_yaml_file: str
+    :return: The SHA-256 hex digest of the file content.
+    :rtype: str
+    '''
+
+    # Hash the raw file bytes.
+    with open(openapi_yaml_file, 'rb') as yaml_file:
+        return hashlib.sha256(yaml_file.read()).hexdigest()
+
+
+# ** blueprint: compile_openapi_snapshot
+def compile_openapi_snapshot(service_provider: ServiceProvider) -> Dict[str, Any]:
+    '''
+    Parse the OpenAPI configuration into its routers, error map and route options.
+
+    :param service_provider: The service provider to resolve events and services from.
+    :type service_provider: ServiceProvider
+    :return: The snapshot data (routers, errors, options).
+    :rtype: Dict[str, Any]
+    '''
+
+    # Load the routers via the event and the rest from the raw configuration.
+    config = get_openapi_config(service_provider)
+    return dict(
+        routers=get_routers(service_provider),
+        errors=dict(config.get('errors', {})),
+        options=get_route_options(config),
+    )
+
+
+# ** blueprint: write_openapi_snapshot
+def write_openapi_snapshot(snapshot_path: str, digest: str, snapshot: Dict[str, Any]) -> bool:
+    '''
+    Atomically write a snapshot file, so concurrent workers never read a partial file.
+
+    :param snapshot_path: The snapshot file path.
+    :type snapshot_path: str
+    :param digest: The content hash of the source YAML.
+    :type digest: str
+    :param snapshot: The snapshot data (routers, errors, options).
+    :type snapshot: Dict[str, Any]
+    :return: True if the snapshot was written.
+    :rtype: bool
+    '''
+
+    # Pickle to a temporary file in the same directory, then swap it in.
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as snapshot_file:
+            pickle.dump(
+                dict(version=SNAPSHOT_VERSION, digest=digest, **snapshot),
+                snapshot_file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temp_path, snapshot_path)
+
+    # Skip caching on read-only or otherwise unwritable file systems.
+    except OSError:
+        return False
+    return True
+
+
+# ** blueprint: load_openapi_snapshot
+def load_openapi_snapshot(service_provider: ServiceProvider, snapshot_path: str = None) -> Dict[str, Any]:
+    '''
+    Load the compiled OpenAPI snapshot, rebuilding it when the YAML content changes.
+
+    The snapshot is a pickle keyed by the SHA-256 of the YAML file. Only
+    load snapshot files the application itself wrote.
+
+    :param service_provider: The service provider to resolve events and services from.
+    :type service_provider: ServiceProvider
+    :param snapshot_path: The snapshot file path; defaults to the YAML path with a .snapshot suffix.
+    :type snapshot_path: str
+    :return: The snapshot data (routers, errors, options).
+    :rtype: Dict[str, Any]
+    '''
+
+    # Hash the YAML backing the openapi service.
+    openapi_yaml_file = service_provider.get_service('openapi_service').openapi_yaml_file
+    snapshot_path = snapshot_path or f'{openapi_yaml_file}.snapshot'
+    digest = hash_openapi_file(openapi_yaml_file)
+
+    # Return the cached snapshot if it matches the YAML and format version.
+    try:
+        with open(snapshot_path, 'rb') as snapshot_file:
+            cached = pickle.load(snapshot_file)
+        if cached.get('version') == SNAPSHOT_VERSION and cached.get('digest') == digest:
+            return dict(
+                routers=cached['routers'],
+                errors=cached['errors'],
+                options=cached['options'],
+            )
+
+    # Treat missing, stale or unreadable snapshots as a cache miss.
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, KeyError, TypeError):
+        pass
+
+    # Re-parse the YAML and write a fresh snapshot.
+    snapshot = compile_openapi_snapshot(service_provider)
+    write_openapi_snapshot(snapshot_path, digest, snapshot)
+    return snapshot
+
+
+# ** blueprint: compile_dispatch
+def compile_dispatch(
+        service_provider: ServiceProvider,
+        interface_context: Any,
+        routers: List[ApiRouter] = None,
+        snapshot: Dict[str, Any] = None,
+    ) -> Any:
+    '''
+    Compile the interface context dispatch table from the routers and error map.
+
+    :param service_provider: The service provider to resolve events and services from.
+    :type service_provider: ServiceProvider
+    :param interface_context: The realized Flask API context.
+    :type interface_context: FlaskApiContext
+    :param routers: Preloaded routers; loaded via get_routers if None.
+    :type routers: List[ApiRouter]
+    :param snapshot: A loaded OpenAPI snapshot (routers, errors, options) to compile instead of the YAML.
+    :type snapshot: Dict[str, Any]
+    :return: The compiled dispatch table.
+    :rtype: DispatchContext
+    '''
+
+    # Compile the snapshot as-is when given.
+    if snapshot is not None:
+        return interface_context.compile_dispatch(**snapshot)
+
+    # Load the routers if none are given.
+    if routers is None:
+        routers = get_routers(service_provider)
+
+    # Load the error code to status code map and the route options.
+    config = get_openapi_config(service_provider)
+
+    # Compile and return the dispatch table.
+    return interface_context.compile_dispatch(
+        routers=routers,
+        errors=config.get('errors', {}),
+        options=get_route_options(config),
+    )
+
+
+# ** blueprint: refresh_dispatch
+def refresh_dispatch(flask_app: Flask) -> Any:
+    '''
+    Recompile the route tables of a built Flask app, e.g. after the YAML changes.
+
+    The dispatch table, CORS policies, limits, request schemas and URL map
+    are compiled aside, then published together as one RouteTables snapshot
+    with a single assignment.
+
+    :param flask_app: A Flask app assembled by build_flask_app.
+    :type flask_app: Flask
+    :return: The newly compiled dispatch table.
+    :rtype: DispatchContext
+    '''
+
+    # Reload the snapshot (rebuilt if the YAML changed) when enabled, or parse the YAML.
+    state = flask_app.extensions['tiferet_flask']
+    if state.get('snapshot'):
+        snapshot = load_openapi_snapshot(state['service_provider'], state.get('snapshot_path'))
+    else:
+        snapshot = compile_openapi_snapshot(state['service_provider'])
+
+    # Recompile the dispatch table from the service provider stored on the app.
+    context = state['context']
+    tables = state['tables']
+    routers, options = snapshot['routers'], snapshot['options']
+    dispatch = compile_dispatch(state['service_provider'], context, snapshot=snapshot)
+
+    # Compile the CORS policies, limits (keeping the backend state), request schemas and URL map of the new routes aside.
+    schemas = RequestSchemaContext(routers) if tables.schemas else None
+    new_tables = RouteTables(
+        routers=tuple(routers),
+        dispatch=dispatch,
+        cors=CorsContext(routers, options, **tables.cors.defaults) if tables.cors else None,
+        limits=RateLimitContext(routers, options, tables.limits.backend) if tables.limits else None,
+        schemas=schemas,
+        url_map=rebuild_url_map(flask_app, routers, [route.endpoint for router in tables.routers for route in router.routes]),
+    )
+
+    # Publish the tables with a single assignment, then match new requests against their URL map.
+    state['tables'] = new_tables
+    flask_app.url_map = new_tables.url_map
+
+    # Hand the new schemas to the context for its spec and drop responses cached under the old options.
+    if schemas and hasattr(context, 'request_schemas'):
+        context.request_schemas = schemas
+    if state.get('response_cache'):
+        state['response_cache'].clear()
+    return dispatch
+
+
+# ** blueprint: rebuild_url_map
+def rebuild_url_map(flask_app: Flask, routers: List[ApiRouter], replaced_endpoints: Iterable[str] = ()) -> Map:
+    '''
+    Compile a new URL map of a built Flask app for the given routers, aside from the current one.
+
+    The map is published with the route tables by refresh_dispatch, so
+    in-flight requests keep matching against the old map.
+
+    :param flask_app: A Flask app assembled by build_flask_app.
+    :type flask_app: Flask
+    :param routers: The routers to add the rules of.
+    :type routers: List[ApiRouter]
+    :param replaced_endpoints: The endpoints of the previous routers, whose rules are dropped.
+    :type replaced_endpoints: Iterable[str]
+    :return: The new URL map.
+    :rtype: Map
+    '''
+
+    # Create an empty map with the settings of the current one.
+    view_func = flask_app.extensions['tiferet_flask']['view_func']
+    url_map = flask_app.url_map
+    new_map = flask_app.url_map_class(
+        default_subdomain=url_map.default_subdomain,
+        strict_slashes=url_map.strict_slashes,
+        merge_slashes=url_map.merge_slashes,
+        redirect_defaults=url_map.redirect_defaults,
+        converters=url_map.converters,
+        sort_parameters=url_map.sort_parameters,
+        sort_key=url_map.sort_key,
+        host_matching=url_map.host_matching,
+    )
+
+    # Copy the rules outside the routers (e.g. static, Swagger UI, metrics, batch).
+    replaced_endpoints = set(replaced_endpoints)
+    for rule in url_map.iter_rules():
+        if rule.endpoint in replaced_endpoints:
+            continue
+        copied = rule.empty()
+        copied.provide_automatic_options = getattr(rule, 'provide_automatic_options', False)
+        new_map.add(copied)
+
+    # Add the router rules as Flask blueprints register them, pointing new endpoints at the app view.
+    for router in routers:
+        for route in router.routes:
+            path = '/'.join((router.prefix.rstrip('/'), route.path.lstrip('/'))) if router.prefix else route.path
+            rule = flask_app.url_rule_class(path, methods=set(route.methods) | {'OPTIONS'}, endpoint=route.endpoint)
+            rule.provide_automatic_options = 'OPTIONS' not in route.methods
+            new_map.add(rule)
+            flask_app.view_functions.setdefault(route.endpoint, view_func)
+
+    # Compile the matcher.
+    new_map.update()
+    return new_map
+
+
+# ** blueprint: get_config_files
+def get_config_files(service_provider: ServiceProvider) -> Dict[str, str]:
+    '''
+    Get the configuration files backing the openapi, feature and error services.
+
+    :param service_provider: The service provider to resolve the services from.
+    :type service_provider: ServiceProvider
+    :return: The file paths, keyed by openapi, features and errors, skipping services without a file.
+    :rtype: Dict[str, str]
+    '''
+
+    # Read the file path attribute of each service that resolves.
+    files = {}
+    for name, service_id, attribute in (
+            ('openapi', 'openapi_service', 'openapi_yaml_file'),
+            ('features', 'feature_service', 'config_file'),
+            ('errors', 'error_service', 'config_file'),
+        ):
+        try:
+            path = getattr(service_provider.get_service(service_id), attribute, None)
+        except Exception:
+            path = None
+        if isinstance(path, str):
+            files[name] = path
+    return files
+
+
+# ** blueprint: reload_config
+def reload_config(flask_app: Flask, changed: List[str]) -> None:
+    '''
+    Reload a built Flask app in place after its configuration files change.
+
+    Route changes recompile the route tables and Swagger spec; feature and
+    error changes drop the cached features and recompile the error
+    templates. The route tables are compiled aside and published as one
+    snapshot, so requests are never blocked and see either the old or the
+    new tables, never a mix.
+
+    :param flask_app: A Flask app assembled by build_flask_app.
+    :type flask_app: Flask
+    :param changed: The names of the changed files (openapi, features, errors).
+    :type changed: List[str]
+    '''
+
+    # Recompile the routes and swap in the new URL map and Swagger UI views.
+    state = flask_app.extensions['tiferet_flask']
+    context = state['context']
+    if 'openapi' in changed:
+        refresh_dispatch(flask_app)
+        if hasattr(context, 'clear_spec_variants'):
+            context.clear_spec_variants()
+        if state.get('swagger_options') is not None:
+            swap_swagger_views(flask_app)
+
+    # Drop the cached features of the dispatched endpoints, so they reload from the feature config.
+    if 'features' in changed or 'errors' in changed:
+        dispatch = getattr(context, 'dispatch', None)
+        feature_cache = getattr(getattr(context, 'features', None), 'cache', None)
+        if dispatch and feature_cache is not None:
+            for entry in dispatch.routes.values():
+                feature_cache.delete(entry.feature_id)
+        if getattr(context, 'error_templates', None) is not None:
+            context.compile_error_templates()
+        if state.get('response_cache'):
+            state['response_cache'].clear()
+    flask_app.logger.info('Reloaded %s', ', '.join(changed))
+
+
+# ** blueprint: swap_swagger_views
+def swap_swagger_views(flask_app: Flask) -> Dict[str, Callable]:
+    '''
+    Build the Swagger UI views from the interface context and swap them in for the registered ones.
+
+    :param flask_app: A Flask app assembled by build_flask_app with swagger enabled.
+    :type flask_app: Flask
+    :return: The new view functions, keyed by endpoint.
+    :rtype: Dict[str, Callable]
+    '''
+
+    # Build the swagger blueprint on a scratch app to collect its views.
+    state = flask_app.extensions['tiferet_flask']
+    swagger_app = Flask(__name__)
+    swagger_app.register_blueprint(state['context'].create_swagger_blueprint(**state['swagger_options']))
+    views = {
+        endpoint: view_func
+        for endpoint, view_func in swagger_app.view_functions.items()
+        if endpoint != 'static'
+    }
+
+    # Swap them in for the registered views.
+    flask_app.view_functions.update(views)
+    return views
+
+
+# ** blueprint: build_lazy_swagger_blueprint
+def build_lazy_swagger_blueprint(flask_app: Flask) -> Blueprint:
+    '''
+    Build a Swagger UI blueprint that defers generating the spec, and so realizing a lazy context, to its first request.
+
+    :param flask_app: A Flask app assembled by build_flask_app with swagger enabled.
+    :type flask_app: Flask
+    :return: A Flask Blueprint serving /docs and /docs/openapi.json.
+    :rtype: Blueprint
+    '''
+
+    # Swap the real views in on the first request, then serve it with them.
+    def swagger_view(**kwargs):
+        views = swap_swagger_views(flask_app)
+        return views[request.endpoint](**kwargs)
+
+    # Register the endpoints of the real swagger blueprint.
+    swagger_bp = Blueprint('swagger', __name__, url_prefix='/docs')
+    swagger_bp.add_url_rule('/openapi.json', 'openapi_json', swagger_view)
+    swagger_bp.add_url_rule('/', 'swagger_ui', swagger_view)
+    return swagger_bp
+
+
+# ** blueprint: watch_config
+def watch_config(flask_app: Flask, interval: float = 1.0, files: Dict[str, str] = None) -> ConfigWatchContext:
+    '''
+    Start polling the configuration files of a built Flask app and reload it in place when they change.
+
+    :param flask_app: A Flask app assembled by build_flask_app.
+    :type flask_app: Flask
+    :param interval: The seconds between polls.
+    :type interval: float
+    :param files: The files to watch, keyed by openapi, features or errors; those of the app services if None.
+    :type files: Dict[str, str]
+    :return: The started watcher.
+    :rtype: ConfigWatchContext
+    '''
+
+    # Watch the service configuration files, reloading the app on change.
+    state = flask_app.extensions['tiferet_flask']
+    watcher = ConfigWatchContext(
+        files if files is not None else get_config_files(state['service_provider']),
+        lambda changed: reload_config(flask_app, changed),
+        interval=interval,
+    )
+    state['watcher'] = watcher
+    return watcher.start()
+
+
 # ** blueprint: build_blueprint
 def build_blueprint(router: ApiRouter, view_func: Callable, **kwargs) -> Blueprint:
     '''
@@ -71,71 +639,379 @@ def build_blueprint(router: ApiRouter, view_func: Callable, **kwargs) -> Bluepri
 
 
 # ** blueprint: build_flask_app
-def build_flask_app(interface_id: str, view_func: Callable, swagger: bool = False, **parameters) -> Flask:
+def build_flask_app(
+        interface_id: str,
+        view_func: Callable = None,
+        swagger: bool = False,
+        options: FlaskAppOptions = None,
+        **parameters
+    ) -> Flask:
     '''
     Build a complete Flask application with CORS and blueprints.
 
     Resolves the interface via tiferet.blueprints.main, realizes it,
-    builds CORS-enabled Flask app, and registers routers as blueprints.
+    builds CORS-enabled Flask app, compiles the dispatch table, and
+    registers routers as blueprints. Each phase is timed into the
+    app's startup profile (see get_startup_report).
 
     :param interface_id: The interface ID to load.
     :type interface_id: str
-    :param view_func: The view function to handle requests.
+    :param view_func: The view function to handle requests; defaults to build_view_func.
     :type view_func: Callable
     :param swagger: Whether to register a Swagger UI blueprint.
     :type swagger: bool
+    :param options: The optional features to enable (CORS, limits, request validation, metrics, batch, reload, ...); all off if None.
+    :type options: FlaskAppOptions
     :param parameters: Additional keyword arguments passed to resolve_interface.
     :type parameters: dict
     :return: A configured Flask application instance.
     :rtype: Flask
     '''
 
+    # Default to no optional features.
+    options = options or FlaskAppOptions()
+
     # Resolve the interface definition.
-    app_interface, default_services = resolve_interface(interface_id, **parameters)
+    timings = {}
+    with time_phase(timings, 'resolve_interface'):
+        app_interface, default_services = resolve_interface(interface_id, **parameters)
 
     # Build a service provider seeded with default service dependencies.
-    service_provider = create_service_provider(
-        type_map={dep.service_id: dep.get_service_type() for dep in default_services},
-    )
+    with time_phase(timings, 'create_service_provider'):
+        service_provider = create_service_provider(
+            type_map={dep.service_id: dep.get_service_type() for dep in default_services},
+        )
+
+    # Create the metrics context if enabled.
+    metrics_options = dict(options.metrics_options or {})
+    metrics_context = MetricsContext(metrics_options.get('buckets')) if options.metrics else None
+
+    # Create the command profiler if enabled.
+    profiler = CommandProfiler(**(options.profile_options or {})) if options.profile else None
+
+    # Create the request context pool if enabled.
+    request_pool = RequestContextPool(**(options.pool_options or {})) if options.pool_requests else None
+
+    # In lazy mode, load the routers only and realize the context on first use.
+    if options.lazy:
+        with time_phase(timings, 'get_routers'):
+            register_interface(app_interface, service_provider)
+            openapi_snapshot = load_openapi_snapshot(service_provider, options.snapshot_path) if options.snapshot else None
+            routers = openapi_snapshot['routers'] if openapi_snapshot else get_routers(service_provider)
+
+        # Define the deferred realization, recording its timings on first use.
+        def load_interface_context():
+            with time_phase(timings, 'realize_interface'):
+                context = realize_interface(app_interface, interface_id, service_provider)
+            if options.fast_json and hasattr(context, 'raw_models'):
+                context.raw_models = True
+            if metrics_context and hasattr(context, 'metrics'):
+                context.metrics = metrics_context
+            if request_pool and hasattr(context, 'request_pool'):
+                context.request_pool = request_pool
+            if profiler and hasattr(context, 'features'):
+                profiler.install(context.features)
+            if schema_context and hasattr(context, 'request_schemas'):
+                context.request_schemas = schema_context
+            if hasattr(context, 'compile_dispatch'):
+                with time_phase(timings, 'compile_dispatch'):
+                    compile_dispatch(service_provider, context, routers=routers, snapshot=openapi_snapshot)
+                state = flask_app.extensions['tiferet_flask']
+                state['tables'] = state['tables']._replace(dispatch=context.dispatch)
+            if options.fast_errors and hasattr(context, 'compile_error_templates'):
+                with time_phase(timings, 'compile_error_templates'):
+                    context.compile_error_templates()
+            return context
+        interface_context = LazyApiContext(load_interface_context)
 
-    # Realize the app interface context.
-    interface_context = realize_interface(app_interface, interface_id)
+    # Otherwise realize the app interface context on the same service provider.
+    else:
+        with time_phase(timings, 'realize_interface'):
+            interface_context = realize_interface(app_interface, interface_id, service_provider)
+        if options.fast_json and hasattr(interface_context, 'raw_models'):
+            interface_context.raw_models = True
+        if metrics_context and hasattr(interface_context, 'metrics'):
+            interface_context.metrics = metrics_context
+        if request_pool and hasattr(interface_context, 'request_pool'):
+            interface_context.request_pool = request_pool
+        if profiler and hasattr(interface_context, 'features'):
+            profiler.install(interface_context.features)
 
-    # Create the Flask application with CORS.
+        # Load the routers and compile the dispatch table when supported.
+        with time_phase(timings, 'get_routers'):
+            openapi_snapshot = load_openapi_snapshot(service_provider, options.snapshot_path) if options.snapshot else None
+            routers = openapi_snapshot['routers'] if openapi_snapshot else get_routers(service_provider)
+        if hasattr(interface_context, 'compile_dispatch'):
+            with time_phase(timings, 'compile_dispatch'):
+                compile_dispatch(service_provider, interface_context, routers=routers, snapshot=openapi_snapshot)
+        if options.fast_errors and hasattr(interface_context, 'compile_error_templates'):
+            with time_phase(timings, 'compile_error_templates'):
+                interface_context.compile_error_templates()
+
+    # Compile the CORS policy of each route once.
+    cors_context = None
+    if options.cors:
+        with time_phase(timings, 'compile_cors'):
+            route_options = openapi_snapshot['options'] if openapi_snapshot else get_route_options(get_openapi_config(service_provider))
+            cors_context = CorsContext(routers, route_options, **(options.cors_options or {}))
+
+    # Compile the router and route limits once.
+    limit_context = None
+    if options.limits:
+        with time_phase(timings, 'compile_limits'):
+            route_options = openapi_snapshot['options'] if openapi_snapshot else get_route_options(get_openapi_config(service_provider))
+            limit_context = RateLimitContext(routers, route_options, options.limit_backend)
+
+    # Compile the request model of each route once, and hand the schemas to the context for its spec (on first use in lazy mode).
+    schema_context = None
+    if options.validate_requests:
+        with time_phase(timings, 'compile_schemas'):
+            schema_context = RequestSchemaContext(routers)
+        if not options.lazy and hasattr(interface_context, 'request_schemas'):
+            interface_context.request_schemas = schema_context
+
+    # Create the Flask application, pinning the route tables to each request, answering CORS preflight requests and rejecting requests over a limit before the view.
     flask_app = Flask(__name__)
-    CORS(flask_app)
+    flask_app.before_request(build_route_tables_func(flask_app))
+    if cors_context:
+        flask_app.before_request(build_cors_preflight_func(cors_context))
+        flask_app.after_request(build_cors_response_func(cors_context))
+    if limit_context:
+        flask_app.before_request(build_limit_admit_func(limit_context))
+        flask_app.teardown_request(build_limit_release_func(limit_context))
 
-    # Load and register routers as blueprints.
-    routers = get_routers(service_provider)
-    for router in routers:
-        blueprint = build_blueprint(router, view_func=view_func)
-        flask_app.register_blueprint(blueprint)
+    # Format bodies over the route size limit as JSON errors.
+    flask_app.register_error_handler(
+        RequestEntityTooLarge,
+        lambda error: format_body_too_large(request.max_content_length),
+    )
+
+    # Optionally install the fast JSON provider.
+    if options.fast_json:
+        flask_app.json = FlaskJsonProvider(flask_app)
+
+    # Expose the interface context, service provider, response cache, coalescing, metrics, profiler and route tables to views and extensions.
+    response_cache = ResponseCacheContext(options.cache_backend)
+    coalescer = CoalesceContext()
+    flask_app.extensions['tiferet_flask'] = dict(
+        context=interface_context,
+        service_provider=service_provider,
+        response_cache=response_cache,
+        coalescer=coalescer,
+        metrics=metrics_context,
+        profiler=profiler,
+        tables=RouteTables(
+            routers=tuple(routers),
+            dispatch=None if options.lazy else getattr(interface_context, 'dispatch', None),
+            cors=cors_context,
+            limits=limit_context,
+            schemas=schema_context,
+            url_map=flask_app.url_map,
+        ),
+        view_func=None,
+        swagger_options=None,
+        startup=timings,
+        snapshot=options.snapshot,
+        snapshot_path=options.snapshot_path,
+    )
+
+    # Default to the built-in (sync or async) view function.
+    if view_func is None:
+        build_view = build_async_view_func if options.async_mode else build_view_func
+        view_func = build_view(interface_context, response_cache, metrics_context, profiler, coalescer, schema_context)
+    flask_app.extensions['tiferet_flask']['view_func'] = view_func
+
+    # Register routers as blueprints.
+    with time_phase(timings, 'register_blueprints'):
+        for router in routers:
+            blueprint = build_blueprint(router, view_func=view_func)
+            flask_app.register_blueprint(blueprint)
+
+    # Optionally register the batch route, admitting each item against its route limits and shutting its thread pool down with the app.
+    if options.batch:
+        batch_options = dict(options.batch_options or {})
+        batch_path = batch_options.pop('path', '/batch')
+        batch_view_func = build_batch_view_func(
+            interface_context,
+            response_cache=response_cache,
+            schemas=schema_context,
+            limits=limit_context,
+            coalescer=coalescer,
+            metrics=metrics_context,
+            **batch_options,
+        )
+        flask_app.add_url_rule(
+            batch_path,
+            'batch',
+            methods=['POST'],
+            view_func=batch_view_func,
+        )
+        if batch_view_func.executor:
+            weakref.finalize(flask_app, batch_view_func.executor.shutdown, wait=False)
+
+    # Optionally register the metrics route.
+    metrics_path = metrics_options.get('path', '/metrics')
+    if metrics_context and metrics_path:
+        flask_app.add_url_rule(
+            metrics_path,
+            'metrics',
+            methods=['GET'],
+            view_func=build_metrics_view_func(metrics_context, coalescer),
+        )
+
+    # Optionally register the swagger blueprint, checking the context class in lazy mode and generating the spec on first use.
+    if swagger and hasattr(get_interface_type(app_interface) if options.lazy else interface_context, 'create_swagger_blueprint'):
+        flask_app.extensions['tiferet_flask']['swagger_options'] = dict(options.swagger_options or {})
+        with time_phase(timings, 'swagger'):
+            if options.lazy:
+                swagger_bp = build_lazy_swagger_blueprint(flask_app)
+            else:
+                swagger_bp = interface_context.create_swagger_blueprint(**(options.swagger_options or {}))
+            flask_app.register_blueprint(swagger_bp)
 
-    # Optionally register the swagger blueprint.
-    if swagger and hasattr(interface_context, 'create_swagger_blueprint'):
-        swagger_bp = interface_context.create_swagger_blueprint(**parameters)
-        flask_app.register_blueprint(swagger_bp)
+    # Optionally reload the app in place when its configuration files change.
+    if options.reload:
+        watch_config(flask_app, **(options.reload_options or {}))
+
+    # Log the startup profile.
+    flask_app.logger.debug('Startup profile for %s: %s', interface_id, format_startup_report(timings))
 
     # Return the assembled Flask application.
     return flask_app
 
 
+# ** blueprint: format_startup_report
+def format_startup_report(timings: Dict[str, float]) -> str:
+    '''
+    Format startup phase timings as a single readable line.
+
+    :param timings: The startup timings, in milliseconds.
+    :type timings: Dict[str, float]
+    :return: The formatted report.
+    :rtype: str
+    '''
+
+    # Join the phases in order and append the total.
+    phases = ', '.join(f'{phase}={ms:.1f}ms' for phase, ms in timings.items())
+    return f'{phases}, total={sum(timings.values()):.1f}ms'
+
+
+# ** blueprint: get_startup_report
+def get_startup_report(flask_app: Flask) -> Dict[str, float]:
+    '''
+    Get the startup phase timings of a Flask app assembled by build_flask_app.
+
+    In lazy mode, realize_interface and compile_dispatch appear once the
+    first request has realized the interface context.
+
+    :param flask_app: A Flask app assembled by build_flask_app.
+    :type flask_app: Flask
+    :return: The phase timings in milliseconds, plus their total.
+    :rtype: Dict[str, float]
+    '''
+
+    # Copy the recorded timings and add the total.
+    timings = dict(flask_app.extensions['tiferet_flask']['startup'])
+    timings['total'] = round(sum(timings.values()), 3)
+    return timings
+
+
 # ** blueprint: run
-def run(interface_id: str, view_func: Callable, **parameters) -> Flask:
+def run(interface_id: str, view_func: Callable = None, server_options: Dict[str, Any] = None, **parameters) -> Flask:
     '''
-    Build and return a ready-to-serve Flask application.
+    Build a Flask application and, given server options, serve it with prefork workers.
 
-    Convenience alias for build_flask_app.
+    Without server options this is a convenience alias for build_flask_app.
+    With them, the app is built once with preload (warmed and frozen), then
+    served by a PreforkServerContext on one shared listening socket until
+    SIGTERM or SIGINT, after which the app is returned. The workers run
+    werkzeug's development server, so this is not a production-grade server
+    on its own; put it behind a reverse proxy for untrusted traffic. With limits
+    enabled, they default to a SharedMemoryRateLimiter, so they hold across workers,
+    and the master gives back the in-flight counts of each worker it reaps.
+    With reload enabled, each worker restarts the config watcher.
 
     :param interface_id: The interface ID to load.
     :type interface_id: str
     :param view_func: The view function to handle requests.
     :type view_func: Callable
+    :param server_options: The PreforkServerContext options (bind, workers, threaded, max_requests, max_requests_jitter, max_memory_mb, graceful_timeout, backlog, access_log).
+    :type server_options: Dict[str, Any]
     :param parameters: Additional keyword arguments.
     :type parameters: dict
     :return: A configured Flask application instance.
     :rtype: Flask
     '''
 
-    # Build and return the Flask application.
-    return build_flask_app(interface_id, view_func, **parameters)
+    # Build and return the Flask application if it is not served here.
+    if server_options is None:
+        return build_flask_app(interface_id, view_func, **parameters)
+
+    # Build the app once in the master, sharing enabled limits with the forked workers, then serve it.
+    options = parameters.get('options') or FlaskAppOptions()
+    if options.limits and options.limit_backend is None:
+        options = parameters['options'] = options._replace(limit_backend=SharedMemoryRateLimiter())
+    flask_app = preload(interface_id, view_func, **parameters)
+    server_options = dict(server_options)
+    if hasattr(options.limit_backend, 'reap'):
+        server_options.setdefault('on_worker_exit', options.limit_backend.reap)
+
+    # Restart the config watcher in each worker, since its thread does not survive the fork.
+    watcher = flask_app.extensions['tiferet_flask'].get('watcher')
+    if watcher:
+        server_options.setdefault('on_worker_start', watcher.restart)
+    PreforkServerContext(flask_app, **server_options).serve()
+    return flask_app
+
+
+# ** blueprint: preload
+def preload(interface_id: str, view_func: Callable = None, freeze: bool = True, **parameters) -> Flask:
+    '''
+    Build a fully warmed Flask application in a prefork master (e.g. gunicorn --preload).
+
+    Realizes the interface eagerly, compiles the dispatch table and URL
+    matcher, generates and serializes the OpenAPI spec variants when the
+    context supports it, and moves the resulting heap into the permanent
+    generation with gc.freeze() so forked workers share its pages
+    copy-on-write.
+
+    :param interface_id: The interface ID to load.
+    :type interface_id: str
+    :param view_func: The view function to handle requests.
+    :type view_func: Callable
+    :param freeze: Whether to freeze the heap with gc.freeze() after warming.
+    :type freeze: bool
+    :param parameters: Additional keyword arguments passed to build_flask_app.
+    :type parameters: dict
+    :return: A warmed Flask application instance.
+    :rtype: Flask
+    '''
+
+    # Build the Flask application.
+    flask_app = build_flask_app(interface_id, view_func, **parameters)
+    state = flask_app.extensions['tiferet_flask']
+
+    # Warm the interface context, dispatch table and URL matcher.
+    with time_phase(state['startup'], 'preload'):
+        context = state['context']
+        if isinstance(context, LazyApiContext):
+            context = context.load()
+        if hasattr(context, 'compile_dispatch') and context.dispatch is None:
+            compile_dispatch(state['service_provider'], context)
+            state['tables'] = state['tables']._replace(dispatch=context.dispatch)
+        flask_app.url_map.update()
+
+        # Serialize the spec variants whether or not Swagger UI is enabled, and swap in the deferred Swagger UI views of lazy mode.
+        swagger_options = state['swagger_options'] or {}
+        if hasattr(context, 'get_spec_variants'):
+            context.get_spec_variants(**{name: swagger_options[name] for name in ('title', 'version', 'description', 'spec_path') if name in swagger_options})
+        if state['swagger_options'] is not None and isinstance(state['context'], LazyApiContext):
+            swap_swagger_views(flask_app)
+
+        # Collect garbage once, then freeze the surviving heap.
+        if freeze:
+            gc.collect()
+            gc.freeze()
+
+    # Return the warmed Flask application.
+    return flask_app
@@ -0,0 +1,352 @@
+# *** imports
+
+# ** core
+import asyncio
+import json
+
+# ** infra
+import pytest
+from unittest import mock
+from flask import Flask
+from pydantic import BaseModel
+from tiferet import TiferetError
+from tiferet.contexts.error import ErrorContext
+from tiferet.contexts.feature import FeatureContext
+from tiferet.contexts.logging import LoggingContext
+from tiferet.events import DomainEvent
+from tiferet_openapi import ApiRoute, ApiRouter
+
+# ** app
+from ...contexts import CorsContext, FlaskApiContext, MetricsContext, RateLimitContext, RequestSchemaContext, RouteTables
+from ..asgi import build_asgi_app
+from ..flask import build_blueprint
+from ..view import build_async_view_func
+
+
+# *** classes
+
+# ** class: add_request
+class AddRequest(BaseModel):
+    '''
+    A sample request model.
+    '''
+
+    a: int
+
+
+# *** fixtures
+
+# ** fixture: router
+@pytest.fixture
+def router() -> ApiRouter:
+    '''
+    Fixture to provide a calc router.
+    '''
+
+    return ApiRouter(
+        name='calc',
+        prefix='/calc',
+        routes=[
+            ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['GET', 'POST'], status_code=201),
+            ApiRoute(id='export', endpoint='calc.export', path='/export', methods=['GET'], status_code=200),
+        ],
+    )
+
+
+# ** fixture: flask_api_context
+@pytest.fixture
+def flask_api_context(router: ApiRouter) -> FlaskApiContext:
+    '''
+    Fixture to provide a FlaskApiContext with an async feature echoing its data.
+    '''
+
+    # Create an async feature execution that echoes the data or raises on request.
+    async def execute_feature_async(feature_id, request, **kwargs):
+        await asyncio.sleep(0)
+        if request.data.get('fail'):
+            raise TiferetError('DIVISION_BY_ZERO', 'Cannot divide by zero.')
+        if feature_id == 'calc.export':
+            request.set_result(iter([{'n': 0}, {'n': 1}]))
+            return
+        request.set_result(dict(request.data))
+
+    mock_features = mock.Mock(spec=FeatureContext)
+    mock_features.execute_feature_async = mock.AsyncMock(side_effect=execute_feature_async)
+
+    # Create an error context formatting the error code.
+    mock_errors = mock.Mock(spec=ErrorContext)
+    mock_errors.handle_error.return_value = {'error_code': 'DIVISION_BY_ZERO', 'name': 'Division By Zero', 'message': 'Cannot divide by zero.'}
+
+    # Create the context and compile its dispatch table.
+    context = FlaskApiContext(
+        interface_id='calc_api',
+        features=mock_features,
+        errors=mock_errors,
+        logging=mock.Mock(spec=LoggingContext),
+        get_route_evt=mock.Mock(spec=DomainEvent),
+        get_status_code_evt=mock.Mock(spec=DomainEvent),
+        get_routers_evt=mock.Mock(spec=DomainEvent),
+    )
+    context.compile_dispatch(
+        routers=[router],
+        errors={'DIVISION_BY_ZERO': 400},
+        options={'calc.export': {'stream': 'ndjson'}, 'calc.add': {'max_body_size': 16}},
+    )
+    return context
+
+
+# ** fixture: flask_app
+@pytest.fixture
+def flask_app(router: ApiRouter, flask_api_context: FlaskApiContext) -> Flask:
+    '''
+    Fixture to provide a Flask app serving the async view.
+    '''
+
+    # Build the Flask app as build_flask_app does in async mode.
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(build_blueprint(router, build_async_view_func(flask_api_context)))
+    flask_app.extensions['tiferet_flask'] = dict(
+        context=flask_api_context,
+        tables=RouteTables(routers=(router,), dispatch=flask_api_context.dispatch, cors=None, limits=None, schemas=None, url_map=flask_app.url_map),
+    )
+    return flask_app
+
+
+# ** fixture: call_asgi
+@pytest.fixture
+def call_asgi(flask_app: Flask):
+    '''
+    Fixture to provide a helper calling the ASGI app with a single HTTP request.
+    '''
+
+    # Define the request helper, building the ASGI app from the current app state and keeping the last response headers.
+    def call(method: str, path: str, body: bytes = b'', query_string: bytes = b'', headers: dict = None):
+        asgi_app = build_asgi_app(flask_app)
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            'type': 'http',
+            'http_version': '1.1',
+            'scheme': 'http',
+            'server': ('testserver', 80),
+            'root_path': '',
+            'method': method,
+            'path': path,
+            'query_string': query_string,
+            'headers': [(b'content-type', b'application/json')] + [
+                (name.lower().encode(), value.encode()) for name, value in (headers or {}).items()
+            ],
+        }
+        asyncio.run(asgi_app(scope, receive, send))
+        call.headers = {name.decode(): value.decode() for name, value in messages[0]['headers']}
+        return messages[0]['status'], b''.join(message.get('body', b'') for message in messages[1:])
+
+    return call
+
+
+# *** tests
+
+# ** test: async_view_func
+def test_async_view_func(flask_app: Flask):
+    '''
+    Test the async view awaits the feature through the Flask test client.
+    '''
+
+    # Post a request to the async view.
+    pytest.importorskip('asgiref')
+    response = flask_app.test_client().post('/calc/add', json={'a': 1})
+
+    # Assert the response and route status code.
+    assert response.status_code == 201
+    assert response.json == {'a': 1}
+
+
+# ** test: asgi_app_feature_route
+def test_asgi_app_feature_route(call_asgi):
+    '''
+    Test the ASGI app runs compiled feature routes natively.
+    '''
+
+    # Call the feature route with a JSON body and a query param.
+    status_code, body = call_asgi('POST', '/calc/add', body=b'{"a": 1}', query_string=b'b=2&b=3')
+
+    # Assert the response and route status code.
+    assert status_code == 201
+    assert json.loads(body) == {'a': 1, 'b': '2'}
+
+
+# ** test: asgi_app_error
+def test_asgi_app_error(call_asgi):
+    '''
+    Test the ASGI app formats feature errors with the mapped status code.
+    '''
+
+    # Call the feature route with a failing payload.
+    status_code, body = call_asgi('POST', '/calc/add', body=b'{"fail": true}')
+
+    # Assert the error response.
+    assert status_code == 400
+    assert json.loads(body)['error_code'] == 'DIVISION_BY_ZERO'
+
+
+# ** test: asgi_app_fallback
+def test_asgi_app_fallback(call_asgi):
+    '''
+    Test the ASGI app falls back to the WSGI app for unknown paths.
+    '''
+
+    # Call an unknown path.
+    pytest.importorskip('asgiref')
+    status_code, _ = call_asgi('GET', '/unknown')
+
+    # Assert the Flask 404 response.
+    assert status_code == 404
+
+
+# ** test: asgi_app_stream
+def test_asgi_app_stream(call_asgi):
+    '''
+    Test the ASGI app streams iterator results as NDJSON for streaming routes.
+    '''
+
+    # Call the streaming route.
+    status_code, body = call_asgi('GET', '/calc/export')
+
+    # Assert one JSON document per line.
+    assert status_code == 200
+    assert [json.loads(line) for line in body.splitlines()] == [{'n': 0}, {'n': 1}]
+
+
+# ** test: asgi_app_max_body_size
+def test_asgi_app_max_body_size(call_asgi):
+    '''
+    Test the ASGI app stops reading bodies over the route limit and answers 413.
+    '''
+
+    # Call the feature route with a body over the limit.
+    status_code, body = call_asgi('POST', '/calc/add', body=b'{"a": 1, "b": 2, "c": 3}')
+
+    # Assert the JSON 413 response.
+    assert status_code == 413
+    assert json.loads(body)['error_code'] == 'REQUEST_TOO_LARGE'
+
+
+# ** test: asgi_app_max_body_size_cors_metrics
+def test_asgi_app_max_body_size_cors_metrics(flask_app: Flask, router: ApiRouter, call_asgi):
+    '''
+    Test the ASGI app adds the CORS headers to 413 rejections and records them in the metrics.
+    '''
+
+    # Compile a policy allowing one origin and enable the metrics.
+    state = flask_app.extensions['tiferet_flask']
+    state['tables'] = state['tables']._replace(cors=CorsContext([router], origins=['https://a.example']))
+    state['metrics'] = MetricsContext()
+
+    # Call the feature route with a cross-origin body over the limit.
+    status_code, _ = call_asgi('POST', '/calc/add', body=b'{"a": 1, "b": 2, "c": 3}', headers={'Origin': 'https://a.example'})
+
+    # Assert the rejection carries the origin headers and is counted.
+    assert status_code == 413
+    assert call_asgi.headers['access-control-allow-origin'] == 'https://a.example'
+    _, responses = state['metrics'].collect()
+    assert responses == {('calc.add', 413): 1}
+
+
+# ** test: asgi_app_invalid_json
+def test_asgi_app_invalid_json(call_asgi):
+    '''
+    Test the ASGI app rejects malformed JSON bodies like the Flask views.
+    '''
+
+    # Call the feature route with a malformed body.
+    status_code, body = call_asgi('POST', '/calc/add', body=b'{"a":')
+
+    # Assert the JSON 400 response.
+    assert status_code == 400
+    assert json.loads(body)['error_code'] == 'INVALID_JSON'
+
+
+# ** test: asgi_app_head
+def test_asgi_app_head(call_asgi):
+    '''
+    Test the ASGI app sends no body for HEAD requests.
+    '''
+
+    # Call the feature route with a GET and a HEAD request.
+    _, get_body = call_asgi('GET', '/calc/add', query_string=b'a=1')
+    status_code, body = call_asgi('HEAD', '/calc/add', query_string=b'a=1')
+
+    # Assert the headers describe the omitted JSON body.
+    assert status_code == 201
+    assert body == b''
+    assert call_asgi.headers['content-length'] == str(len(get_body))
+
+
+# ** test: asgi_app_cors
+def test_asgi_app_cors(flask_app: Flask, router: ApiRouter, call_asgi):
+    '''
+    Test the ASGI app answers preflight requests without running the feature and adds CORS headers to responses.
+    '''
+
+    # Compile a policy allowing one origin.
+    state = flask_app.extensions['tiferet_flask']
+    state['tables'] = state['tables']._replace(cors=CorsContext([router], origins=['https://a.example'], max_age=600))
+
+    # Send a preflight request.
+    status_code, _ = call_asgi('OPTIONS', '/calc/add', headers={'Origin': 'https://a.example', 'Access-Control-Request-Method': 'POST'})
+    assert status_code == 204
+    assert call_asgi.headers['access-control-allow-origin'] == 'https://a.example'
+    assert call_asgi.headers['access-control-allow-methods'] == 'GET, POST, OPTIONS, HEAD'
+    assert call_asgi.headers['access-control-max-age'] == '600'
+
+    # Assert the feature response carries the origin headers.
+    status_code, _ = call_asgi('POST', '/calc/add', body=b'{"a": 1}', headers={'Origin': 'https://a.example'})
+    assert status_code == 201
+    assert call_asgi.headers['access-control-allow-origin'] == 'https://a.example'
+    assert call_asgi.headers['vary'] == 'Origin'
+
+
+# ** test: asgi_app_limits
+def test_asgi_app_limits(flask_app: Flask, router: ApiRouter, call_asgi):
+    '''
+    Test the ASGI app rejects requests over the route rate limit before running the feature.
+    '''
+
+    # Limit the route to one request per minute.
+    state = flask_app.extensions['tiferet_flask']
+    state['tables'] = state['tables']._replace(limits=RateLimitContext([router], options={'calc.add': {'limits': {'rate': 0.0167, 'burst': 1}}}))
+
+    # Assert the first request runs and the second is rejected.
+    assert call_asgi('POST', '/calc/add', body=b'{"a": 1}')[0] == 201
+    status_code, body = call_asgi('POST', '/calc/add', body=b'{"a": 1}')
+    assert status_code == 429
+    assert json.loads(body)['error_code'] == 'RATE_LIMITED'
+    assert call_asgi.headers['retry-after'] == '60'
+
+
+# ** test: asgi_app_request_schema
+def test_asgi_app_request_schema(flask_app: Flask, router: ApiRouter, call_asgi):
+    '''
+    Test the ASGI app rejects data failing the route request model before awaiting the feature.
+    '''
+
+    # Compile a request model for the add route.
+    state = flask_app.extensions['tiferet_flask']
+    state['tables'] = state['tables']._replace(schemas=RequestSchemaContext([ApiRouter(name='calc', routes=[
+        ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['POST'], request_model=f'{__name__}.AddRequest'),
+    ])]))
+
+    # Assert invalid data is rejected with a 422 and valid data is coerced.
+    status_code, body = call_asgi('POST', '/calc/add', body=b'{"a": "x"}')
+    assert status_code == 422
+    assert json.loads(body)['error_code'] == 'INVALID_REQUEST'
+    assert not flask_app.extensions['tiferet_flask']['context'].features.execute_feature_async.called
+    status_code, body = call_asgi('POST', '/calc/add', body=b'{"a": "1"}')
+    assert status_code == 201
+    assert json.loads(body) == {'a': 1}
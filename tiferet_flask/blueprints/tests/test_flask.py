@@ -1,15 +1,35 @@
 # *** imports
 
+# ** core
+import gc
+import os
+import sys
+
 # ** infra
 import pytest
 from unittest import mock
 from flask import Blueprint
 from tiferet.events import DomainEvent
 from tiferet.di import ServiceProvider
-from tiferet_openapi import ApiRoute, ApiRouter
+from tiferet_openapi import ApiRoute, ApiRouter, OpenApiYamlRepository
 
 # ** app
-from ..flask import get_routers, build_blueprint
+from ...contexts import DispatchContext, FlaskApiContext, FlaskAppOptions, FlaskJsonProvider, LazyApiContext
+from ..flask import (
+    get_routers,
+    get_openapi_config,
+    get_route_options,
+    load_openapi_snapshot,
+    compile_dispatch,
+    refresh_dispatch,
+    rebuild_url_map,
+    build_blueprint,
+    build_flask_app,
+    get_startup_report,
+    preload,
+    run,
+    reload_config,
+)
 
 
 # *** fixtures
@@ -90,6 +110,83 @@ def mock_service_provider(sample_router: ApiRouter) -> mock.Mock:
     return provider
 
 
+# ** fixture: openapi_yaml_file
+@pytest.fixture
+def openapi_yaml_file(tmp_path) -> str:
+    '''
+    Fixture to provide a sample openapi.yml file.
+    '''
+
+    # Write the sample configuration.
+    path = tmp_path / 'openapi.yml'
+    path.write_text(
+        'openapi:\n'
+        '  routers:\n'
+        '    calc:\n'
+        '      prefix: /calc\n'
+        '      routes:\n'
+        '        add:\n'
+        '          path: /add\n'
+        '          methods: [POST]\n'
+        '          status_code: 200\n'
+        '  errors:\n'
+        '    DIVISION_BY_ZERO: 400\n'
+        '    INVALID_INPUT: 422\n'
+    )
+    return str(path)
+
+
+# ** fixture: openapi_service_provider
+@pytest.fixture
+def openapi_service_provider(sample_router: ApiRouter, openapi_yaml_file: str) -> mock.Mock:
+    '''
+    Fixture to provide a mock ServiceProvider with get_routers_evt and a YAML openapi_service.
+    '''
+
+    # Create a mock get_routers event.
+    mock_get_routers_evt = mock.Mock(spec=DomainEvent)
+    mock_get_routers_evt.execute = mock.Mock(return_value=[sample_router])
+
+    # Create the YAML-backed openapi service.
+    openapi_service = OpenApiYamlRepository(openapi_yaml_file)
+
+    # Create the mock service provider.
+    services = dict(get_routers_evt=mock_get_routers_evt, openapi_service=openapi_service)
+    provider = mock.Mock(spec=ServiceProvider)
+    provider.get_service = mock.Mock(side_effect=services.get)
+
+    return provider
+
+
+# ** fixture: mock_interface_context
+@pytest.fixture
+def mock_interface_context() -> mock.Mock:
+    '''
+    Fixture to provide a mock Flask API context.
+    '''
+
+    return mock.Mock(spec=FlaskApiContext)
+
+
+# ** fixture: patched_main
+@pytest.fixture
+def patched_main(openapi_service_provider: mock.Mock, mock_interface_context: mock.Mock):
+    '''
+    Fixture to patch the tiferet main blueprints used by build_flask_app.
+    '''
+
+    # Create an app interface without extra service types.
+    app_interface = mock.Mock(module_path='tiferet_flask.contexts', class_name='FlaskApiContext')
+    app_interface.get_service_type_mapping.return_value = {}
+
+    # Patch interface resolution, provider creation and realization.
+    module = 'tiferet_flask.blueprints.flask'
+    with mock.patch(f'{module}.resolve_interface', return_value=(app_interface, [])) as resolve, \
+            mock.patch(f'{module}.create_service_provider', return_value=openapi_service_provider), \
+            mock.patch(f'{module}.realize_interface', return_value=mock_interface_context) as realize:
+        yield dict(resolve_interface=resolve, realize_interface=realize)
+
+
 # *** tests
 
 # ** test: build_blueprint_single_route
@@ -165,3 +262,698 @@ def test_get_routers(mock_service_provider: mock.Mock, sample_router: ApiRouter)
     # Assert the result contains the expected router.
     assert len(routers) == 1
     assert routers[0] is sample_router
+
+
+# ** test: get_openapi_config
+def test_get_openapi_config(openapi_service_provider: mock.Mock):
+    '''
+    Test get_openapi_config loads the raw root node of the openapi service file.
+    '''
+
+    # Load the configuration.
+    config = get_openapi_config(openapi_service_provider)
+
+    # Assert the routers and errors are present.
+    assert 'calc' in config['routers']
+    assert config['errors'] == {'DIVISION_BY_ZERO': 400, 'INVALID_INPUT': 422}
+
+
+# ** test: get_route_options
+def test_get_route_options():
+    '''
+    Test get_route_options keeps only the keys ApiRoute does not model.
+    '''
+
+    # Collect the route options from a raw configuration.
+    options = get_route_options({
+        'routers': {
+            'calc': {
+                'routes': {
+                    'add': {'path': '/add', 'methods': ['POST'], 'params': ['a', 'b']},
+                    'sqrt': {'path': '/sqrt', 'methods': ['POST']},
+                },
+            },
+        },
+    })
+
+    # Assert the options are keyed by endpoint.
+    assert options == {'calc.add': {'params': ['a', 'b']}, 'calc.sqrt': {}}
+
+
+# ** test: get_route_options_cors
+def test_get_route_options_cors():
+    '''
+    Test get_route_options merges the router CORS options under the route ones.
+    '''
+
+    # Collect the route options of routers with CORS blocks.
+    options = get_route_options({
+        'routers': {
+            'calc': {
+                'cors': {'origins': ['https://a.example'], 'max_age': 600},
+                'routes': {
+                    'add': {'path': '/add', 'cors': {'max_age': 60}},
+                    'sqrt': {'path': '/sqrt', 'cors': False},
+                },
+            },
+            'admin': {
+                'cors': False,
+                'routes': {'stats': {'path': '/stats'}},
+            },
+        },
+    })
+
+    # Assert the merged and disabled CORS options.
+    assert options['calc.add']['cors'] == {'origins': ['https://a.example'], 'max_age': 60}
+    assert options['calc.sqrt']['cors'] is False
+    assert options['admin.stats']['cors'] is False
+
+
+# ** test: get_route_options_limits
+def test_get_route_options_limits():
+    '''
+    Test get_route_options keeps the router limits on each route, beside the route limits.
+    '''
+
+    # Collect the route options of a router with a limits block.
+    options = get_route_options({
+        'routers': {
+            'calc': {
+                'limits': {'rate': 100, 'concurrency': 8},
+                'routes': {
+                    'add': {'path': '/add', 'limits': {'rate': 10}},
+                    'sqrt': {'path': '/sqrt'},
+                },
+            },
+        },
+    })
+
+    # Assert the router and route limits.
+    assert options['calc.add'] == {'router_limits': {'rate': 100, 'concurrency': 8}, 'limits': {'rate': 10}}
+    assert options['calc.sqrt'] == {'router_limits': {'rate': 100, 'concurrency': 8}}
+
+
+# ** test: load_openapi_snapshot
+def test_load_openapi_snapshot(openapi_service_provider: mock.Mock, openapi_yaml_file: str):
+    '''
+    Test the snapshot is written once, reused, and rebuilt when the YAML changes.
+    '''
+
+    # Load the snapshot twice.
+    get_routers_evt = openapi_service_provider.get_service('get_routers_evt')
+    first = load_openapi_snapshot(openapi_service_provider)
+    second = load_openapi_snapshot(openapi_service_provider)
+
+    # Assert the YAML was parsed once and the snapshot file was reused.
+    assert get_routers_evt.execute.call_count == 1
+    assert second['routers'][0].routes[0].endpoint == 'calc.add'
+    assert second['errors'] == first['errors'] == {'DIVISION_BY_ZERO': 400, 'INVALID_INPUT': 422}
+    assert second['options'] == {'calc.add': {}}
+
+    # Change the YAML and assert the snapshot is rebuilt.
+    with open(openapi_yaml_file, 'a') as yaml_file:
+        yaml_file.write('    NOT_FOUND: 404\n')
+    third = load_openapi_snapshot(openapi_service_provider)
+    assert get_routers_evt.execute.call_count == 2
+    assert third['errors']['NOT_FOUND'] == 404
+
+
+# ** test: load_openapi_snapshot_corrupt
+def test_load_openapi_snapshot_corrupt(openapi_service_provider: mock.Mock, tmp_path):
+    '''
+    Test a corrupt snapshot file is treated as a cache miss and overwritten.
+    '''
+
+    # Write a corrupt snapshot at a custom path.
+    snapshot_path = tmp_path / 'routers.snapshot'
+    snapshot_path.write_bytes(b'not a pickle')
+
+    # Load the snapshot and assert it was rebuilt.
+    snapshot = load_openapi_snapshot(openapi_service_provider, str(snapshot_path))
+    assert snapshot['routers'][0].name == 'calc'
+    assert load_openapi_snapshot(openapi_service_provider, str(snapshot_path))['errors'] == snapshot['errors']
+    assert openapi_service_provider.get_service('get_routers_evt').execute.call_count == 1
+
+
+# ** test: compile_dispatch
+def test_compile_dispatch(openapi_service_provider: mock.Mock, mock_interface_context: mock.Mock, sample_router: ApiRouter):
+    '''
+    Test compile_dispatch compiles the context table from routers and errors.
+    '''
+
+    # Compile the dispatch table.
+    compile_dispatch(openapi_service_provider, mock_interface_context)
+
+    # Assert the context compiled with the loaded routers and error map.
+    mock_interface_context.compile_dispatch.assert_called_once_with(
+        routers=[sample_router],
+        errors={'DIVISION_BY_ZERO': 400, 'INVALID_INPUT': 422},
+        options={'calc.add': {}},
+    )
+
+
+# ** test: build_flask_app
+def test_build_flask_app(patched_main: dict, openapi_service_provider: mock.Mock, mock_interface_context: mock.Mock):
+    '''
+    Test build_flask_app realizes the interface, compiles dispatch and registers routes.
+    '''
+
+    # Build the Flask app.
+    flask_app = build_flask_app('calc_api', lambda **kwargs: '')
+
+    # Assert the interface was realized on the shared service provider.
+    args = patched_main['realize_interface'].call_args.args
+    assert args[2] is openapi_service_provider
+
+    # Assert the dispatch table was compiled and the state is exposed.
+    mock_interface_context.compile_dispatch.assert_called_once()
+    state = flask_app.extensions['tiferet_flask']
+    assert state['context'] is mock_interface_context
+    assert state['service_provider'] is openapi_service_provider
+
+    # Assert the route is registered.
+    assert 'calc.add' in flask_app.view_functions
+
+    # Assert CORS is on, and limits and request validation are off, by default.
+    tables = state['tables']
+    assert tables.cors is not None
+    assert (tables.limits, tables.schemas) == (None, None)
+
+
+# ** test: build_flask_app_default_view
+def test_build_flask_app_default_view(patched_main: dict):
+    '''
+    Test build_flask_app registers the built-in view when none is given.
+    '''
+
+    # Build the Flask app without a view function.
+    flask_app = build_flask_app('calc_api')
+
+    # Assert the built-in view is registered.
+    assert flask_app.view_functions['calc.add'].__name__ == 'view_func'
+
+
+# ** test: build_flask_app_batch
+def test_build_flask_app_batch(patched_main: dict):
+    '''
+    Test build_flask_app registers the batch route at the configured path.
+    '''
+
+    # Build the Flask app with a custom batch path.
+    flask_app = build_flask_app('calc_api', options=FlaskAppOptions(batch=True, batch_options=dict(path='/calc/batch', max_workers=2)))
+
+    # Assert the batch route is registered for POST only.
+    rule = next(rule for rule in flask_app.url_map.iter_rules() if rule.endpoint == 'batch')
+    assert rule.rule == '/calc/batch'
+    assert 'POST' in rule.methods and 'GET' not in rule.methods
+
+    # Assert the batch thread pool is shut down with the app.
+    executor = flask_app.view_functions['batch'].executor
+    del flask_app
+    gc.collect()
+    assert executor._shutdown
+
+
+# ** test: build_flask_app_startup_report
+def test_build_flask_app_startup_report(patched_main: dict):
+    '''
+    Test build_flask_app records a timing for each startup phase.
+    '''
+
+    # Build the Flask app with every compiled feature and read its startup report.
+    report = get_startup_report(build_flask_app('calc_api', options=FlaskAppOptions(
+        fast_errors=True,
+        limits=True,
+        validate_requests=True,
+    )))
+
+    # Assert each phase and the total are reported in order.
+    assert list(report) == [
+        'resolve_interface',
+        'create_service_provider',
+        'realize_interface',
+        'get_routers',
+        'compile_dispatch',
+        'compile_error_templates',
+        'compile_cors',
+        'compile_limits',
+        'compile_schemas',
+        'register_blueprints',
+        'total',
+    ]
+    assert all(ms >= 0 for ms in report.values())
+
+
+# ** test: build_flask_app_fast_errors_default
+def test_build_flask_app_fast_errors_default(patched_main: dict):
+    '''
+    Test build_flask_app leaves error responses raising unless fast errors are enabled.
+    '''
+
+    # Build the Flask app with the defaults.
+    flask_app = build_flask_app('calc_api')
+
+    # Assert no error templates are compiled.
+    assert 'compile_error_templates' not in get_startup_report(flask_app)
+
+
+# ** test: build_flask_app_lazy
+def test_build_flask_app_lazy(patched_main: dict, openapi_service_provider: mock.Mock, mock_interface_context: mock.Mock):
+    '''
+    Test lazy mode registers routes up front and realizes the context on first use.
+    '''
+
+    # Build the Flask app in lazy mode.
+    flask_app = build_flask_app('calc_api', options=FlaskAppOptions(lazy=True))
+
+    # Assert the routes are registered without realizing the context.
+    assert 'calc.add' in flask_app.view_functions
+    context = flask_app.extensions['tiferet_flask']['context']
+    assert isinstance(context, LazyApiContext)
+    assert not context.loaded
+    patched_main['realize_interface'].assert_not_called()
+    openapi_service_provider.add_services.assert_called_once()
+
+    # Access the context and assert it was realized and compiled once.
+    assert context.run is mock_interface_context.run
+    assert context.dispatch is mock_interface_context.dispatch
+    patched_main['realize_interface'].assert_called_once()
+    mock_interface_context.compile_dispatch.assert_called_once()
+    assert 'realize_interface' in get_startup_report(flask_app)
+
+
+# ** test: build_flask_app_lazy_swagger
+def test_build_flask_app_lazy_swagger(patched_main: dict, mock_interface_context: mock.Mock):
+    '''
+    Test lazy mode registers Swagger UI without realizing the context, generating the spec on the first docs request.
+    '''
+
+    # Give the context a swagger blueprint serving a spec.
+    swagger_bp = Blueprint('swagger', __name__, url_prefix='/docs')
+    swagger_bp.add_url_rule('/openapi.json', 'openapi_json', lambda: 'spec')
+    swagger_bp.add_url_rule('/', 'swagger_ui', lambda: 'ui')
+    mock_interface_context.create_swagger_blueprint.return_value = swagger_bp
+
+    # Build the Flask app in lazy mode with Swagger UI.
+    flask_app = build_flask_app('calc_api', swagger=True, options=FlaskAppOptions(lazy=True, swagger_options=dict(title='Calc')))
+
+    # Assert the docs routes are registered without realizing the context.
+    context = flask_app.extensions['tiferet_flask']['context']
+    assert 'swagger.openapi_json' in flask_app.view_functions
+    assert not context.loaded
+    patched_main['realize_interface'].assert_not_called()
+
+    # Assert the first docs request realizes the context and swaps in its views.
+    client = flask_app.test_client()
+    assert client.get('/docs/openapi.json').get_data(as_text=True) == 'spec'
+    assert context.loaded
+    assert client.get('/docs/').get_data(as_text=True) == 'ui'
+    mock_interface_context.create_swagger_blueprint.assert_called_once_with(title='Calc')
+
+
+# ** test: build_flask_app_snapshot
+def test_build_flask_app_snapshot(patched_main: dict, openapi_yaml_file: str, mock_interface_context: mock.Mock):
+    '''
+    Test build_flask_app compiles the dispatch table from the snapshot.
+    '''
+
+    # Build the Flask app from a snapshot.
+    flask_app = build_flask_app('calc_api', options=FlaskAppOptions(snapshot=True))
+
+    # Assert the snapshot was written next to the YAML and compiled.
+    assert os.path.exists(f'{openapi_yaml_file}.snapshot')
+    kwargs = mock_interface_context.compile_dispatch.call_args.kwargs
+    assert kwargs['errors'] == {'DIVISION_BY_ZERO': 400, 'INVALID_INPUT': 422}
+    assert 'calc.add' in flask_app.view_functions
+
+
+# ** test: build_flask_app_fast_json
+def test_build_flask_app_fast_json(patched_main: dict, mock_interface_context: mock.Mock):
+    '''
+    Test fast_json installs the JSON provider and keeps results as models.
+    '''
+
+    # Build the Flask app with the fast JSON provider.
+    flask_app = build_flask_app('calc_api', options=FlaskAppOptions(fast_json=True))
+
+    # Assert the provider is installed and raw models are enabled.
+    assert isinstance(flask_app.json, FlaskJsonProvider)
+    assert mock_interface_context.raw_models is True
+
+
+# ** test: build_flask_app_metrics
+def test_build_flask_app_metrics(patched_main: dict, mock_interface_context: mock.Mock):
+    '''
+    Test metrics attaches a metrics context to the interface context and registers the metrics route.
+    '''
+
+    # Build the Flask app with metrics on a custom path.
+    flask_app = build_flask_app('calc_api', options=FlaskAppOptions(metrics=True, metrics_options={'path': '/_metrics'}))
+
+    # Assert the metrics context is shared and served.
+    metrics = flask_app.extensions['tiferet_flask']['metrics']
+    assert mock_interface_context.metrics is metrics
+    response = flask_app.test_client().get('/_metrics')
+    assert response.status_code == 200
+    assert b'# TYPE tiferet_flask_phase_seconds histogram' in response.data
+
+
+# ** test: build_flask_app_profile
+def test_build_flask_app_profile(patched_main: dict, mock_interface_context: mock.Mock):
+    '''
+    Test profile installs a sampled command profiler on the feature context.
+    '''
+
+    # Build the Flask app profiling 1% of requests.
+    mock_interface_context.features = mock.Mock()
+    flask_app = build_flask_app('calc_api', options=FlaskAppOptions(profile=True, profile_options={'sample_rate': 0.01}))
+
+    # Assert the profiler is shared and installed.
+    profiler = flask_app.extensions['tiferet_flask']['profiler']
+    assert profiler.sample_rate == 0.01
+    assert mock_interface_context.features._command_profiler is profiler
+
+
+# ** test: build_flask_app_cors
+def test_build_flask_app_cors(patched_main: dict, openapi_yaml_file: str):
+    '''
+    Test build_flask_app answers preflight requests from the compiled policies without entering the view.
+    '''
+
+    # Restrict the router to one origin in the YAML.
+    with open(openapi_yaml_file, 'w') as yaml_file:
+        yaml_file.write(
+            'openapi:\n'
+            '  routers:\n'
+            '    calc:\n'
+            '      prefix: /calc\n'
+            '      cors:\n'
+            '        origins: [https://a.example]\n'
+            '        max_age: 600\n'
+            '      routes:\n'
+            '        add:\n'
+            '          path: /add\n'
+            '          methods: [POST]\n'
+        )
+    calls = []
+    client = build_flask_app('calc_api', lambda **kwargs: calls.append(kwargs) or 'ok').test_client()
+
+    # Send a preflight from the allowed origin.
+    response = client.options('/calc/add', headers={'Origin': 'https://a.example', 'Access-Control-Request-Method': 'POST'})
+    assert response.status_code == 204
+    assert response.headers['Access-Control-Allow-Origin'] == 'https://a.example'
+    assert response.headers['Access-Control-Allow-Methods'] == 'POST, OPTIONS'
+    assert response.headers['Access-Control-Max-Age'] == '600'
+    assert calls == []
+
+    # Assert other origins get no CORS headers, and actual responses carry them.
+    response = client.options('/calc/add', headers={'Origin': 'https://b.example', 'Access-Control-Request-Method': 'POST'})
+    assert 'Access-Control-Allow-Origin' not in response.headers
+    response = client.post('/calc/add', headers={'Origin': 'https://a.example'})
+    assert response.headers['Access-Control-Allow-Origin'] == 'https://a.example'
+    assert response.headers['Vary'] == 'Origin'
+
+
+# ** test: build_flask_app_limits
+def test_build_flask_app_limits(patched_main: dict, openapi_yaml_file: str):
+    '''
+    Test build_flask_app rejects requests over the route rate limit and concurrency cap before entering the view.
+    '''
+
+    # Limit the route to two requests at a rate of one per minute, one in flight at a time.
+    with open(openapi_yaml_file, 'w') as yaml_file:
+        yaml_file.write(
+            'openapi:\n'
+            '  routers:\n'
+            '    calc:\n'
+            '      prefix: /calc\n'
+            '      routes:\n'
+            '        add:\n'
+            '          path: /add\n'
+            '          methods: [POST]\n'
+            '          limits:\n'
+            '            rate: 0.0167\n'
+            '            burst: 2\n'
+            '            concurrency: 1\n'
+        )
+
+    # Send a nested request from the view while the first is in flight.
+    nested = []
+    def view_func(**kwargs):
+        if not nested:
+            nested.append(client.post('/calc/add'))
+        return 'ok'
+    client = build_flask_app('calc_api', view_func, options=FlaskAppOptions(limits=True)).test_client()
+
+    # Assert the nested request was shed, then the rate limit applies.
+    assert client.post('/calc/add').status_code == 200
+    assert nested[0].status_code == 503
+    assert nested[0].json['error_code'] == 'SERVICE_OVERLOADED'
+    assert client.post('/calc/add').status_code == 200
+    response = client.post('/calc/add')
+    assert response.status_code == 429
+    assert response.json['error_code'] == 'RATE_LIMITED'
+    assert response.headers['Retry-After'] == '60'
+
+
+# ** test: build_flask_app_request_schemas
+def test_build_flask_app_request_schemas(patched_main: dict, sample_route: ApiRoute, mock_interface_context: mock.Mock):
+    '''
+    Test build_flask_app compiles the route request models once and hands them to the context for its spec.
+    '''
+
+    # Declare a request model for the route.
+    sample_route.request_model = 'tiferet_openapi.ApiRoute'
+
+    # Build the app and assert the compiled schemas are shared by the app state and the context.
+    flask_app = build_flask_app('calc_api', lambda **kwargs: '', options=FlaskAppOptions(validate_requests=True))
+    schemas = flask_app.extensions['tiferet_flask']['tables'].schemas
+    assert schemas.get_schema('calc.add').name == 'ApiRoute'
+    assert mock_interface_context.request_schemas is schemas
+
+    # Assert apps built without validation compile no schemas.
+    assert build_flask_app('calc_api', lambda **kwargs: '').extensions['tiferet_flask']['tables'].schemas is None
+
+
+# ** test: refresh_dispatch
+def test_refresh_dispatch(patched_main: dict, mock_interface_context: mock.Mock):
+    '''
+    Test refresh_dispatch recompiles the table of a built app.
+    '''
+
+    # Build the app and refresh its dispatch table.
+    flask_app = build_flask_app('calc_api', lambda **kwargs: '')
+    refresh_dispatch(flask_app)
+
+    # Assert the table was compiled twice.
+    assert mock_interface_context.compile_dispatch.call_count == 2
+
+
+# ** test: build_flask_app_reload
+def test_build_flask_app_reload(patched_main: dict, openapi_service_provider: mock.Mock, openapi_yaml_file: str, mock_interface_context: mock.Mock):
+    '''
+    Test a changed openapi.yml is reloaded in place, swapping in the new routes.
+    '''
+
+    # Load the routers from the YAML and build the app with a watcher polling rarely.
+    openapi_service = openapi_service_provider.get_service('openapi_service')
+    openapi_service_provider.get_service('get_routers_evt').execute.side_effect = openapi_service.get_routers
+    flask_app = build_flask_app('calc_api', lambda **kwargs: 'ok', options=FlaskAppOptions(reload=True, reload_options=dict(interval=60)))
+    watcher = flask_app.extensions['tiferet_flask']['watcher']
+    client = flask_app.test_client()
+    url_map = flask_app.url_map
+    old_tables = flask_app.extensions['tiferet_flask']['tables']
+    assert client.post('/calc/subtract').status_code == 404
+
+    # Replace the add route with a subtract route.
+    try:
+        with open(openapi_yaml_file, 'w') as yaml_file:
+            yaml_file.write(
+                'openapi:\n'
+                '  routers:\n'
+                '    calc:\n'
+                '      prefix: /calc\n'
+                '      routes:\n'
+                '        subtract:\n'
+                '          path: /subtract\n'
+                '          methods: [POST]\n'
+                '          status_code: 200\n'
+            )
+        assert watcher.check() == ['openapi']
+    finally:
+        watcher.stop()
+
+    # Assert the new tables were published as one snapshot, leaving the old one intact, and the dispatch table recompiled.
+    tables = flask_app.extensions['tiferet_flask']['tables']
+    assert flask_app.url_map is tables.url_map is not url_map
+    assert [route.id for route in tables.routers[0].routes] == ['subtract']
+    assert [route.id for route in old_tables.routers[0].routes] == ['add']
+    assert client.post('/calc/subtract').status_code == 200
+    assert client.post('/calc/add').status_code == 404
+    assert mock_interface_context.compile_dispatch.call_args.kwargs['routers'][0].routes[0].id == 'subtract'
+
+
+# ** test: build_flask_app_route_tables_rematch
+def test_build_flask_app_route_tables_rematch(patched_main: dict):
+    '''
+    Test a request matched against a URL map replaced by a reload is matched again against the map of its pinned tables.
+    '''
+
+    # Build the app and publish tables for a subtract route without pointing Flask at their map.
+    flask_app = build_flask_app('calc_api', lambda **kwargs: 'ok')
+    state = flask_app.extensions['tiferet_flask']
+    routers = [ApiRouter(name='calc', prefix='/calc', routes=[
+        ApiRoute(id='subtract', endpoint='calc.subtract', path='/subtract', methods=['POST'], status_code=200),
+    ])]
+    url_map = rebuild_url_map(flask_app, routers, ['calc.add'])
+    state['tables'] = state['tables']._replace(routers=tuple(routers), url_map=url_map)
+
+    # Assert requests are routed by the pinned tables.
+    client = flask_app.test_client()
+    assert client.post('/calc/subtract').status_code == 200
+    assert client.post('/calc/add').status_code == 404
+
+
+# ** test: reload_config_features
+def test_reload_config_features(patched_main: dict, mock_interface_context: mock.Mock):
+    '''
+    Test feature config changes drop the cached features of the dispatched endpoints.
+    '''
+
+    # Build the app over a compiled dispatch table and a feature cache.
+    mock_interface_context.dispatch = DispatchContext([ApiRouter(name='calc', prefix='/calc', routes=[
+        ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['POST'], status_code=200),
+    ])])
+    mock_interface_context.features = mock.Mock()
+    mock_interface_context.error_templates = None
+    flask_app = build_flask_app('calc_api', lambda **kwargs: 'ok')
+
+    # Reload the feature config.
+    reload_config(flask_app, ['features'])
+
+    # Assert the cached feature was dropped.
+    mock_interface_context.features.cache.delete.assert_called_once_with('calc.add')
+
+
+# ** test: preload_prefork
+@pytest.mark.skipif(not hasattr(os, 'fork') or sys.platform == 'darwin', reason='requires fork')
+def test_preload_prefork(patched_main: dict, mock_interface_context: mock.Mock):
+    '''
+    Test preload warms and freezes the app in the master, and forked workers serve it.
+    '''
+
+    # Preload the app in the "master" process, lazily built to check it is realized.
+    flask_app = preload('calc_api', lambda **kwargs: 'ok', options=FlaskAppOptions(lazy=True))
+    try:
+        assert gc.get_freeze_count() > 0
+        assert flask_app.extensions['tiferet_flask']['context'].loaded
+        assert 'preload' in get_startup_report(flask_app)
+        mock_interface_context.get_spec_variants.assert_called_once_with()
+
+        # Fork workers that serve a request from the shared app.
+        workers = []
+        for _ in range(2):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                status = 1
+                try:
+                    response = flask_app.test_client().post('/calc/add')
+                    os.write(write_fd, f'{response.status_code} {gc.get_freeze_count() > 0}'.encode())
+                    status = 0
+                finally:
+                    os._exit(status)
+            os.close(write_fd)
+            workers.append((pid, read_fd))
+
+        # Assert each worker served the request from the frozen heap.
+        for pid, read_fd in workers:
+            with os.fdopen(read_fd) as pipe:
+                assert pipe.read() == '200 True'
+            assert os.waitpid(pid, 0)[1] == 0
+
+    # Restore the garbage collector for the rest of the suite.
+    finally:
+        gc.unfreeze()
+
+
+# ** test: preload_swagger
+def test_preload_swagger(patched_main: dict, mock_interface_context: mock.Mock):
+    '''
+    Test preload serializes the spec with the Swagger UI settings and swaps in the deferred lazy views before forking.
+    '''
+
+    # Give the context a swagger blueprint.
+    swagger_bp = Blueprint('swagger', __name__, url_prefix='/docs')
+    swagger_bp.add_url_rule('/openapi.json', 'openapi_json', lambda: 'spec')
+    mock_interface_context.create_swagger_blueprint.return_value = swagger_bp
+
+    # Preload a lazy app with Swagger UI.
+    flask_app = preload('calc_api', freeze=False, swagger=True, options=FlaskAppOptions(lazy=True, swagger_options=dict(title='Calc', cache_max_age=60)))
+
+    # Assert the spec was serialized with the spec settings and the real views were swapped in.
+    mock_interface_context.get_spec_variants.assert_called_once_with(title='Calc')
+    mock_interface_context.create_swagger_blueprint.assert_called_once_with(title='Calc', cache_max_age=60)
+
+    # Assert the docs are served without building the views again.
+    assert flask_app.test_client().get('/docs/openapi.json').get_data(as_text=True) == 'spec'
+    mock_interface_context.create_swagger_blueprint.assert_called_once()
+
+
+# ** test: run_server
+def test_run_server(patched_main: dict):
+    '''
+    Test run returns the app without server options, and preloads it and serves it with them.
+    '''
+
+    # Run without and with server options, patching out the server.
+    with mock.patch('tiferet_flask.blueprints.flask.PreforkServerContext') as server_type, \
+            mock.patch('tiferet_flask.blueprints.flask.gc.freeze'):
+        assert 'preload' not in get_startup_report(run('calc_api', lambda **kwargs: 'ok'))
+        server_type.assert_not_called()
+        flask_app = run('calc_api', lambda **kwargs: 'ok', server_options=dict(bind='127.0.0.1:0', workers=2), options=FlaskAppOptions(limits=True))
+
+    # Assert the app was preloaded and served with the options, reaping the shared limits of exited workers.
+    assert 'preload' in get_startup_report(flask_app)
+    limit_backend = flask_app.extensions['tiferet_flask']['tables'].limits.backend
+    server_type.assert_called_once_with(flask_app, bind='127.0.0.1:0', workers=2, on_worker_exit=limit_backend.reap)
+    server_type.return_value.serve.assert_called_once()
+
+
+# ** test: run_server_limit_backend
+def test_run_server_limit_backend(patched_main: dict):
+    '''
+    Test run serves with a given limit backend without allocating the shared one.
+    '''
+
+    # Run with a limit backend, patching out the server and the shared backend.
+    limit_backend = mock.Mock(spec=['consume', 'refund', 'enter', 'exit', 'clear'])
+    with mock.patch('tiferet_flask.blueprints.flask.PreforkServerContext') as server_type, \
+            mock.patch('tiferet_flask.blueprints.flask.SharedMemoryRateLimiter') as shared_type, \
+            mock.patch('tiferet_flask.blueprints.flask.gc.freeze'):
+        flask_app = run('calc_api', lambda **kwargs: 'ok', server_options=dict(workers=2), options=FlaskAppOptions(limits=True, limit_backend=limit_backend))
+
+    # Assert the given backend is used and the shared one is never created.
+    shared_type.assert_not_called()
+    assert flask_app.extensions['tiferet_flask']['tables'].limits.backend is limit_backend
+    server_type.assert_called_once_with(flask_app, workers=2)
+
+
+# ** test: run_server_reload
+def test_run_server_reload(patched_main: dict):
+    '''
+    Test run restarts the config watcher in each worker when reload is enabled.
+    '''
+
+    # Run with reload, patching out the server.
+    with mock.patch('tiferet_flask.blueprints.flask.PreforkServerContext') as server_type, \
+            mock.patch('tiferet_flask.blueprints.flask.gc.freeze'):
+        flask_app = run('calc_api', lambda **kwargs: 'ok', server_options=dict(workers=2), options=FlaskAppOptions(reload=True, reload_options=dict(interval=60)))
+
+    # Assert each worker restarts the watcher.
+    watcher = flask_app.extensions['tiferet_flask']['watcher']
+    try:
+        assert server_type.call_args.kwargs['on_worker_start'] == watcher.restart
+    finally:
+        watcher.stop()
@@ -0,0 +1,584 @@
+# *** imports
+
+# ** core
+import io
+from collections.abc import Iterator
+
+# ** infra
+import pytest
+from unittest import mock
+from flask import Flask
+from pydantic import BaseModel
+from tiferet import TiferetError
+from tiferet.contexts.error import ErrorContext
+from tiferet.contexts.feature import FeatureContext
+from tiferet.contexts.logging import LoggingContext
+from tiferet.domain import Error, ErrorMessage
+from tiferet.events import DomainEvent
+from tiferet_openapi import ApiRoute, ApiRouter
+
+# ** app
+from ...contexts import CoalesceContext, CommandProfiler, FlaskApiContext, LazyHeaders, MetricsContext, RateLimitContext, RequestSchemaContext, ResponseCacheContext
+from ..flask import build_blueprint
+from ..view import build_view_func, build_batch_view_func, build_metrics_view_func
+
+
+# *** classes
+
+# ** class: row
+class Row(BaseModel):
+    '''
+    A sample streamed model.
+    '''
+
+    n: int
+
+
+# ** class: add_request
+class AddRequest(BaseModel):
+    '''
+    A sample request model.
+    '''
+
+    a: int
+    b: int = 0
+
+
+# *** fixtures
+
+# ** fixture: router
+@pytest.fixture
+def router() -> ApiRouter:
+    '''
+    Fixture to provide a calc router.
+    '''
+
+    return ApiRouter(
+        name='calc',
+        prefix='/calc',
+        routes=[
+            ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['GET', 'POST'], status_code=200),
+            ApiRoute(id='item', endpoint='calc.item', path='/item/<item_id>', methods=['GET'], status_code=200),
+            ApiRoute(id='export', endpoint='calc.export', path='/export', methods=['GET'], status_code=206),
+            ApiRoute(id='ingest', endpoint='calc.ingest', path='/ingest', methods=['POST'], status_code=200),
+            ApiRoute(id='upload', endpoint='calc.upload', path='/upload', methods=['POST'], status_code=200),
+        ],
+    )
+
+
+# ** fixture: feature_calls
+@pytest.fixture
+def feature_calls() -> list:
+    '''
+    Fixture to collect the requests passed to the feature context.
+    '''
+
+    return []
+
+
+# ** fixture: flask_api_context
+@pytest.fixture
+def flask_api_context(router: ApiRouter, feature_calls: list) -> FlaskApiContext:
+    '''
+    Fixture to provide a FlaskApiContext echoing the request data as the result.
+    '''
+
+    # Create a feature context that echoes the data or raises on request.
+    def execute_feature(feature_id, request, **kwargs):
+        feature_calls.append(request)
+        if request.data.get('fail'):
+            raise TiferetError('DIVISION_BY_ZERO', 'Cannot divide by zero.')
+        if feature_id in ('calc.ingest', 'calc.upload'):
+            rows = request.data['rows']
+            request.set_result(dict(lazy=isinstance(rows, Iterator), rows=list(rows), source=request.data.get('source')))
+            return
+        if feature_id == 'calc.export':
+            count = int(request.data.get('count', 3))
+            request.set_result(Row(n=n) for n in range(count))
+            return
+        request.set_result(dict(request.data))
+
+    mock_features = mock.Mock(spec=FeatureContext)
+    mock_features.execute_feature = mock.Mock(side_effect=execute_feature)
+
+    # Create an error context formatting the error code.
+    mock_errors = mock.Mock(spec=ErrorContext)
+    mock_errors.handle_error.return_value = {'error_code': 'DIVISION_BY_ZERO', 'name': 'Division By Zero', 'message': 'Cannot divide by zero.'}
+
+    # Create the context with event mocks and compile its dispatch table.
+    context = FlaskApiContext(
+        interface_id='calc_api',
+        features=mock_features,
+        errors=mock_errors,
+        logging=mock.Mock(spec=LoggingContext),
+        get_route_evt=mock.Mock(spec=DomainEvent),
+        get_status_code_evt=mock.Mock(spec=DomainEvent),
+        get_routers_evt=mock.Mock(spec=DomainEvent),
+    )
+    context.compile_dispatch(
+        routers=[router],
+        errors={'DIVISION_BY_ZERO': 400},
+        options={
+            'calc.add': {'params': ['a', 'b', 'fail']},
+            'calc.item': {'cache': {'ttl': 60}},
+            'calc.export': {'stream': True},
+            'calc.ingest': {'ingest': 'ndjson', 'max_body_size': 64},
+            'calc.upload': {'ingest': {'format': 'csv', 'param': 'rows'}},
+        },
+    )
+    return context
+
+
+# ** fixture: client
+@pytest.fixture
+def client(router: ApiRouter, flask_api_context: FlaskApiContext):
+    '''
+    Fixture to provide a Flask test client serving the built-in view.
+    '''
+
+    # Build the Flask app with the built-in view.
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(build_blueprint(router, build_view_func(flask_api_context)))
+    return flask_app.test_client()
+
+
+# *** tests
+
+# ** test: view_func_json_and_args
+def test_view_func_json_and_args(client, feature_calls: list):
+    '''
+    Test the view merges JSON and query params and keeps only the declared params.
+    '''
+
+    # Post JSON with a query param and an undeclared key.
+    response = client.post('/calc/add?b=2', json={'a': 1, 'c': 3})
+
+    # Assert the response carries only the declared params.
+    assert response.status_code == 200
+    assert response.json == {'a': 1, 'b': '2'}
+
+    # Assert the feature received lazily loaded headers with the feature id written through.
+    headers = feature_calls[0].headers
+    assert isinstance(headers, LazyHeaders)
+    assert headers['feature_id'] == 'calc.add'
+    assert not headers.loaded
+
+
+# ** test: view_func_invalid_json
+def test_view_func_invalid_json(client, feature_calls: list):
+    '''
+    Test a malformed JSON body is rejected with a JSON 400 before the feature runs.
+    '''
+
+    # Post a body that is not valid JSON.
+    response = client.post('/calc/add', data=b'{"a": 1', content_type='application/json')
+
+    # Assert the JSON 400 response and that the feature never ran.
+    assert response.status_code == 400
+    assert response.json['error_code'] == 'INVALID_JSON'
+    assert not feature_calls
+
+
+# ** test: view_func_route_params
+def test_view_func_route_params(client):
+    '''
+    Test the view passes all data through for routes without declared params.
+    '''
+
+    # Get a route with a path param and a query param.
+    response = client.get('/calc/item/42?verbose=1')
+
+    # Assert all params are passed through.
+    assert response.json == {'item_id': '42', 'verbose': '1'}
+
+
+# ** test: view_func_response_cache
+def test_view_func_response_cache(router: ApiRouter, flask_api_context: FlaskApiContext, feature_calls: list):
+    '''
+    Test the view serves routes with a cache block from the response cache.
+    '''
+
+    # Build the Flask app with a response cache.
+    response_cache = ResponseCacheContext()
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(build_blueprint(router, build_view_func(flask_api_context, response_cache)))
+    client = flask_app.test_client()
+
+    # Request the cached route twice and a different item once.
+    assert client.get('/calc/item/42').json == {'item_id': '42'}
+    assert client.get('/calc/item/42').json == {'item_id': '42'}
+    assert client.get('/calc/item/7').json == {'item_id': '7'}
+
+    # Assert the repeated request was served from the cache.
+    assert len(feature_calls) == 2
+    assert response_cache.get_stats() == {'calc.item': {'hits': 1, 'misses': 2}}
+
+
+# ** test: view_func_coalesce
+def test_view_func_coalesce(router: ApiRouter, flask_api_context: FlaskApiContext):
+    '''
+    Test the view runs routes with a coalesce block through the coalescing context and the metrics view renders its counters.
+    '''
+
+    # Coalesce the add route and build the Flask app with a metrics route.
+    flask_api_context.compile_dispatch(routers=[router], errors={}, options={'calc.add': {'coalesce': True}})
+    coalescer = CoalesceContext()
+    metrics = MetricsContext()
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(build_blueprint(router, build_view_func(flask_api_context, metrics=metrics, coalescer=coalescer)))
+    flask_app.add_url_rule('/metrics', 'metrics', view_func=build_metrics_view_func(metrics, coalescer))
+    client = flask_app.test_client()
+
+    # Send a request and assert it ran through the coalescing context.
+    assert client.post('/calc/add', json={'a': 1, 'b': 2}).json == {'a': 1, 'b': 2}
+    assert coalescer.get_stats() == {'calc.add': {'executed': 1, 'coalesced': 0}}
+    assert b'tiferet_flask_coalesced_requests_total{endpoint="calc.add",outcome="executed"} 1' in client.get('/metrics').data
+
+
+# ** test: view_func_request_schema
+def test_view_func_request_schema(router: ApiRouter, flask_api_context: FlaskApiContext, feature_calls: list):
+    '''
+    Test the view and batch view validate data against the route request model before running the feature.
+    '''
+
+    # Compile a request model for the add route and build the Flask app with a batch route.
+    schemas = RequestSchemaContext([ApiRouter(name='calc', routes=[
+        ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['POST'], request_model=f'{__name__}.AddRequest'),
+    ])])
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(build_blueprint(router, build_view_func(flask_api_context, schemas=schemas)))
+    flask_app.add_url_rule('/batch', 'batch', methods=['POST'], view_func=build_batch_view_func(flask_api_context, schemas=schemas))
+    client = flask_app.test_client()
+
+    # Assert invalid data is rejected with a 422 without running the feature.
+    response = client.post('/calc/add', json={'b': 'x'})
+    assert response.status_code == 422
+    assert response.json['error_code'] == 'INVALID_REQUEST'
+    assert [error['loc'] for error in response.json['errors']] == [['a'], ['b']]
+    assert not feature_calls
+
+    # Assert valid data reaches the feature coerced, with the defaults filled in.
+    assert client.get('/calc/add?a=1').json == {'a': 1, 'b': 0}
+
+    # Assert batch items are validated per item.
+    results = client.post('/batch', json=[
+        {'endpoint': 'calc.add', 'data': {'a': '2'}},
+        {'endpoint': 'calc.add', 'data': {}},
+    ]).json
+    assert results[0] == {'status_code': 200, 'data': {'a': 2, 'b': 0}}
+    assert results[1]['status_code'] == 422
+    assert results[1]['error']['error_code'] == 'INVALID_REQUEST'
+    assert len(feature_calls) == 2
+
+
+# ** test: view_func_metrics
+def test_view_func_metrics(router: ApiRouter, flask_api_context: FlaskApiContext):
+    '''
+    Test the view and context record each request phase and the metrics view renders them.
+    '''
+
+    # Build the Flask app with metrics on the view, the context and a metrics route.
+    metrics = MetricsContext()
+    flask_api_context.metrics = metrics
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(build_blueprint(router, build_view_func(flask_api_context, metrics=metrics)))
+    flask_app.add_url_rule('/metrics', 'metrics', view_func=build_metrics_view_func(metrics))
+    client = flask_app.test_client()
+
+    # Send a successful and a failing request.
+    client.post('/calc/add', json={'a': 1, 'b': 2})
+    client.post('/calc/add', json={'a': 1, 'fail': True})
+
+    # Assert every phase was recorded, with the failing request skipping serialization.
+    histograms, responses = metrics.collect()
+    assert {phase: series[-1] for (_, phase), series in histograms.items()} == {
+        'parse_data': 2,
+        'parse_request': 2,
+        'execute_feature': 2,
+        'handle_response': 1,
+        'serialize': 1,
+        'total': 2,
+    }
+    assert responses == {('calc.add', 200): 1, ('calc.add', 400): 1}
+
+    # Assert the metrics route serves the Prometheus text format.
+    response = client.get('/metrics')
+    assert response.mimetype == 'text/plain'
+    assert b'tiferet_flask_responses_total{endpoint="calc.add",status="200"} 1' in response.data
+
+
+# ** test: view_func_server_timing
+def test_view_func_server_timing(router: ApiRouter, flask_api_context: FlaskApiContext):
+    '''
+    Test the view attaches the command timings of profiled requests as a Server-Timing header.
+    '''
+
+    # Run a command through the feature context's handler.
+    class AddNumber(object):
+        def execute(self, a, b, **kwargs):
+            return a + b
+    features = flask_api_context.features
+    features.handle_command = mock.Mock()
+    execute_feature = features.execute_feature.side_effect
+    def execute_command(feature_id, request, **kwargs):
+        features.handle_command(AddNumber(), request)
+        execute_feature(feature_id, request, **kwargs)
+    features.execute_feature.side_effect = execute_command
+
+    # Build the Flask app with a profiler sampling every request.
+    profiler = CommandProfiler()
+    profiler.install(features)
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(build_blueprint(router, build_view_func(flask_api_context, profiler=profiler)))
+    client = flask_app.test_client()
+
+    # Assert successful and failing responses carry the header.
+    assert client.post('/calc/add', json={'a': 1, 'b': 2}).headers['Server-Timing'].startswith('AddNumber;dur=')
+    response = client.post('/calc/add', json={'a': 1, 'fail': True})
+    assert response.status_code == 400
+    assert 'desc="step 0 cpu ' in response.headers['Server-Timing']
+
+    # Assert unsampled requests carry no header.
+    profiler.sample_rate = 0.0
+    assert 'Server-Timing' not in client.post('/calc/add', json={'a': 1, 'b': 2}).headers
+
+
+# ** test: view_func_error
+def test_view_func_error(client):
+    '''
+    Test the view formats errors with the mapped status code.
+    '''
+
+    # Post a failing request.
+    response = client.post('/calc/add', json={'a': 1, 'fail': True})
+
+    # Assert the error payload and status code.
+    assert response.status_code == 400
+    assert response.json['error_code'] == 'DIVISION_BY_ZERO'
+    assert response.json['message'] == 'Cannot divide by zero.'
+
+
+# ** test: view_func_error_templates
+def test_view_func_error_templates(router: ApiRouter, flask_api_context: FlaskApiContext):
+    '''
+    Test the view and batch items return precompiled error responses matching the raised ones.
+    '''
+
+    # Compile the error templates.
+    flask_api_context.errors.get_error_handler = mock.Mock(return_value=Error(
+        id='DIVISION_BY_ZERO',
+        name='Division By Zero',
+        message=[ErrorMessage(lang='en_US', text='Cannot divide by zero.')],
+    ))
+    flask_api_context.compile_error_templates()
+
+    # Build the Flask app with the built-in and batch views and a response cache.
+    response_cache = ResponseCacheContext()
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(build_blueprint(router, build_view_func(flask_api_context, response_cache)))
+    flask_app.add_url_rule('/batch', 'batch', methods=['POST'], view_func=build_batch_view_func(flask_api_context))
+    client = flask_app.test_client()
+
+    # Assert the error response without the error context formatting it.
+    response = client.post('/calc/add', json={'a': 1, 'fail': True})
+    assert response.status_code == 400
+    assert response.json == {'error_code': 'DIVISION_BY_ZERO', 'name': 'Division By Zero', 'message': 'Cannot divide by zero.'}
+    flask_api_context.errors.handle_error.assert_not_called()
+
+    # Assert batch items report the error as an error.
+    results = client.post('/batch', json=[{'endpoint': 'calc.add', 'data': {'a': 1, 'fail': True}}]).json
+    assert results == [{'status_code': 400, 'error': response.json}]
+
+    # Assert error responses are never cached.
+    flask_api_context.features.execute_feature.side_effect = TiferetError('DIVISION_BY_ZERO', 'Cannot divide by zero.')
+    assert client.get('/calc/item/1').status_code == 400
+    assert client.get('/calc/item/1').status_code == 400
+    assert response_cache.get_stats() == {'calc.item': {'hits': 0, 'misses': 2}}
+
+
+# ** test: batch_view_func
+@pytest.mark.parametrize('max_workers', [None, 4])
+def test_batch_view_func(flask_api_context: FlaskApiContext, max_workers: int):
+    '''
+    Test the batch view runs items in order with per-item status codes.
+    '''
+
+    # Build a Flask app with only the batch route.
+    flask_app = Flask(__name__)
+    flask_app.add_url_rule(
+        '/batch', 'batch', methods=['POST'],
+        view_func=build_batch_view_func(flask_api_context, max_workers=max_workers),
+    )
+    client = flask_app.test_client()
+
+    # Post a batch with a success, an error, an unknown endpoint and a malformed item.
+    response = client.post('/batch', json=[
+        {'endpoint': 'calc.add', 'data': {'a': 1, 'b': 2, 'c': 3}},
+        {'endpoint': 'calc.add', 'data': {'a': 1, 'fail': True}},
+        {'endpoint': 'calc.missing', 'data': {}},
+        'invalid',
+    ] + [{'endpoint': 'calc.add', 'data': {'a': i}} for i in range(10)])
+
+    # Assert the ordered results.
+    assert response.status_code == 200
+    results = response.json
+    assert results[0] == {'status_code': 200, 'data': {'a': 1, 'b': 2}}
+    assert results[1]['status_code'] == 400
+    assert results[1]['error']['error_code'] == 'DIVISION_BY_ZERO'
+    assert results[2]['status_code'] == 404
+    assert results[2]['error']['error_code'] == 'BATCH_ENDPOINT_NOT_FOUND'
+    assert results[3]['status_code'] == 400
+    assert [result['data']['a'] for result in results[4:]] == list(range(10))
+
+
+# ** test: batch_view_func_invalid_request
+def test_batch_view_func_invalid_request(flask_api_context: FlaskApiContext):
+    '''
+    Test the batch view rejects malformed, non-array and oversized batch bodies.
+    '''
+
+    # Build a Flask app with a small batch limit.
+    flask_app = Flask(__name__)
+    flask_app.add_url_rule(
+        '/batch', 'batch', methods=['POST'],
+        view_func=build_batch_view_func(flask_api_context, max_items=2),
+    )
+    client = flask_app.test_client()
+
+    # Assert both requests are rejected.
+    assert client.post('/batch', json={'endpoint': 'calc.add'}).status_code == 400
+    response = client.post('/batch', json=[{'endpoint': 'calc.add', 'data': {}}] * 3)
+    assert response.status_code == 400
+    assert response.json['error_code'] == 'INVALID_BATCH_REQUEST'
+
+    # Assert a malformed body is reported as invalid JSON.
+    response = client.post('/batch', data=b'[{"endpoint": ', content_type='application/json')
+    assert response.status_code == 400
+    assert response.json['error_code'] == 'INVALID_JSON'
+
+
+# ** test: batch_view_func_limits
+def test_batch_view_func_limits(flask_api_context: FlaskApiContext, router: ApiRouter):
+    '''
+    Test batch items are admitted against the limits of their endpoint and recorded in the metrics.
+    '''
+
+    # Build a Flask app with a batch route, limiting the add route to two requests and one in flight.
+    limits = RateLimitContext([router], options={'calc.add': {'limits': {'rate': 0.001, 'burst': 2, 'concurrency': 1}}})
+    metrics = MetricsContext()
+    flask_app = Flask(__name__)
+    flask_app.add_url_rule(
+        '/batch', 'batch', methods=['POST'],
+        view_func=build_batch_view_func(flask_api_context, limits=limits, metrics=metrics),
+    )
+
+    # Post three add items.
+    results = flask_app.test_client().post('/batch', json=[{'endpoint': 'calc.add', 'data': {'a': i}} for i in range(3)]).json
+
+    # Assert the third item was rate limited, and each item released the cap it entered.
+    assert [result['status_code'] for result in results] == [200, 200, 429]
+    assert results[2]['error']['error_code'] == 'RATE_LIMITED'
+    assert limits.backend.enter('route:calc.add', 1)
+
+    # Assert each item response was recorded.
+    _, responses = metrics.collect()
+    assert responses == {('calc.add', 200): 2}
+
+
+# ** test: view_func_stream
+@pytest.mark.parametrize('count', [0, 1, 3])
+def test_view_func_stream(client, count: int):
+    '''
+    Test streaming routes send generator results as a chunked JSON array with the route status code.
+    '''
+
+    # Request the streaming route.
+    response = client.get(f'/calc/export?count={count}')
+
+    # Assert the streamed array and the route status code.
+    assert response.status_code == 206
+    assert 'Content-Length' not in response.headers
+    assert response.mimetype == 'application/json'
+    assert response.json == [{'n': n} for n in range(count)]
+
+
+# ** test: view_func_generator_without_stream
+def test_view_func_generator_without_stream(router: ApiRouter, flask_api_context: FlaskApiContext):
+    '''
+    Test generator results on routes without a stream option are returned as a JSON list.
+    '''
+
+    # Recompile the dispatch table without the stream option.
+    flask_api_context.compile_dispatch(routers=[router], errors={})
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(build_blueprint(router, build_view_func(flask_api_context)))
+
+    # Assert the generator was materialized into a plain JSON response.
+    response = flask_app.test_client().get('/calc/export?count=2')
+    assert 'Content-Length' in response.headers
+    assert response.json == [{'n': 0}, {'n': 1}]
+
+
+# ** test: view_func_ingest_ndjson
+def test_view_func_ingest_ndjson(client):
+    '''
+    Test ingest routes pass NDJSON bodies to the feature as a lazy iterator.
+    '''
+
+    # Post an NDJSON body with a blank line and a query param.
+    response = client.post(
+        '/calc/ingest?source=upload',
+        data=b'{"a": 1}\n\n{"a": 2}\n',
+        content_type='application/x-ndjson',
+    )
+
+    # Assert the feature consumed the lazily parsed documents.
+    assert response.status_code == 200
+    assert response.json == {'lazy': True, 'rows': [{'a': 1}, {'a': 2}], 'source': 'upload'}
+
+
+# ** test: view_func_ingest_csv
+def test_view_func_ingest_csv(client):
+    '''
+    Test ingest routes pass CSV bodies to the feature as lazy dict rows.
+    '''
+
+    # Post a CSV body.
+    response = client.post('/calc/upload', data=b'a,b\n1,2\n3,4\n', content_type='text/csv')
+
+    # Assert the feature consumed the rows.
+    assert response.json['rows'] == [{'a': '1', 'b': '2'}, {'a': '3', 'b': '4'}]
+
+
+# ** test: view_func_max_body_size
+def test_view_func_max_body_size(client, feature_calls: list):
+    '''
+    Test bodies over the route limit are rejected with 413 before the feature runs.
+    '''
+
+    # Post a body over the limit with a declared length.
+    response = client.post('/calc/ingest', data=b'{"a": 1}\n' * 10, content_type='application/x-ndjson')
+
+    # Assert the JSON 413 response and that the feature never ran.
+    assert response.status_code == 413
+    assert response.json['error_code'] == 'REQUEST_TOO_LARGE'
+    assert response.json['max_body_size'] == 64
+    assert not feature_calls
+
+
+# ** test: view_func_max_body_size_chunked
+def test_view_func_max_body_size_chunked(client):
+    '''
+    Test chunked bodies are capped at the route limit while streaming.
+    '''
+
+    # Post a chunked body over the limit without a declared length.
+    response = client.post(
+        '/calc/ingest',
+        input_stream=io.BytesIO(b'{"a": 1}\n' * 10),
+        headers={'Transfer-Encoding': 'chunked', 'Content-Type': 'application/x-ndjson'},
+        environ_overrides={'wsgi.input_terminated': True},
+    )
+
+    # Assert reading past the limit was rejected.
+    assert response.status_code == 413
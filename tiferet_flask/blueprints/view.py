@@ -0,0 +1,1195 @@
+"""Flask API View Blueprints"""
+
+# *** imports
+
+# ** core
+import csv
+import io
+import json
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+# ** infra
+from flask import Flask, Response, current_app, request, jsonify, make_response, stream_with_context
+from flask.globals import request_ctx
+from pydantic import BaseModel
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+from tiferet.assets.exceptions import TiferetAPIError
+
+# ** app
+from ..contexts import CoalesceContext, CommandProfiler, CorsContext, DispatchContext, ErrorResponse, LazyHeaders, MetricsContext, RateLimitContext, RequestSchemaContext, ResponseCacheContext, RouteTables
+
+
+# *** blueprints
+
+# ** blueprint: get_ingest_options
+def get_ingest_options(entry: Any) -> Dict[str, Any] | None:
+    '''
+    Get the streaming body ingestion options configured for a route in openapi.yml.
+
+    :param entry: The dispatch entry of the route.
+    :type entry: DispatchEntry
+    :return: The ingestion options (format, param, encoding), or None if the route parses the body as JSON.
+    :rtype: Dict[str, Any] | None
+    '''
+
+    # Read the ingest option, accepting the format alone as shorthand.
+    ingest = entry.options.get('ingest') if entry else None
+    if not ingest:
+        return None
+    if isinstance(ingest, str):
+        ingest = dict(format=ingest)
+
+    # Fill in the defaults.
+    return dict(
+        format=str(ingest.get('format', 'ndjson')).lower(),
+        param=ingest.get('param', 'rows'),
+        encoding=ingest.get('encoding', 'utf-8'),
+    )
+
+
+# ** blueprint: iter_request_body
+def iter_request_body(stream: Any, body_format: str, encoding: str = 'utf-8') -> Iterator[Any]:
+    '''
+    Lazily parse a request body stream as NDJSON documents or CSV rows.
+
+    :param stream: The binary request body stream.
+    :type stream: Any
+    :param body_format: The body format (ndjson or csv).
+    :type body_format: str
+    :param encoding: The body text encoding.
+    :type encoding: str
+    :return: An iterator over the parsed documents or rows (as dicts).
+    :rtype: Iterator[Any]
+    '''
+
+    # Read CSV rows as dicts keyed by the header row.
+    if body_format == 'csv':
+        yield from csv.DictReader(io.TextIOWrapper(stream, encoding=encoding, newline=''))
+        return
+
+    # Read one JSON document per non-blank line.
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+# ** blueprint: get_max_body_size
+def get_max_body_size(entry: Any) -> int | None:
+    '''
+    Get the body size limit configured for a route in openapi.yml.
+
+    :param entry: The dispatch entry of the route.
+    :type entry: DispatchEntry
+    :return: The limit in bytes, or None if the route has none.
+    :rtype: int | None
+    '''
+
+    # Read the max_body_size option.
+    return (entry.options.get('max_body_size') if entry else None) or None
+
+
+# ** blueprint: build_body_too_large_payload
+def build_body_too_large_payload(max_body_size: int | None = None) -> Dict[str, Any]:
+    '''
+    Build the JSON error payload for bodies over the size limit.
+
+    :param max_body_size: The body size limit, in bytes.
+    :type max_body_size: int | None
+    :return: The error payload.
+    :rtype: Dict[str, Any]
+    '''
+
+    # Return the error fields.
+    return dict(
+        error_code='REQUEST_TOO_LARGE',
+        name='Request Too Large',
+        message='The request body exceeds the maximum size for this route.',
+        max_body_size=max_body_size,
+    )
+
+
+# ** blueprint: format_body_too_large
+def format_body_too_large(max_body_size: int | None = None) -> Tuple[Any, int]:
+    '''
+    Format the 413 JSON error response for bodies over the size limit.
+
+    :param max_body_size: The body size limit, in bytes.
+    :type max_body_size: int | None
+    :return: The JSON error response and status code.
+    :rtype: Tuple[Any, int]
+    '''
+
+    # Return the error payload with status 413.
+    return jsonify(build_body_too_large_payload(max_body_size)), 413
+
+
+# ** blueprint: build_invalid_json_payload
+def build_invalid_json_payload() -> Dict[str, Any]:
+    '''
+    Build the JSON error payload for request bodies that are not valid JSON.
+
+    :return: The error payload.
+    :rtype: Dict[str, Any]
+    '''
+
+    # Return the error fields.
+    return dict(
+        error_code='INVALID_JSON',
+        name='Invalid JSON',
+        message='The request body is not valid JSON.',
+    )
+
+
+# ** blueprint: format_invalid_json
+def format_invalid_json() -> Tuple[Any, int]:
+    '''
+    Format the 400 JSON error response for request bodies that are not valid JSON.
+
+    :return: The JSON error response and status code.
+    :rtype: Tuple[Any, int]
+    '''
+
+    # Return the error payload with status 400.
+    return jsonify(build_invalid_json_payload()), 400
+
+
+# ** blueprint: build_invalid_request_payload
+def build_invalid_request_payload(errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    '''
+    Build the JSON error payload for request data failing the route request model.
+
+    :param errors: The validation errors (type, loc, msg).
+    :type errors: List[Dict[str, Any]]
+    :return: The error payload.
+    :rtype: Dict[str, Any]
+    '''
+
+    # Return the error fields.
+    return dict(
+        error_code='INVALID_REQUEST',
+        name='Invalid Request',
+        message='The request data does not match the request model of this route.',
+        errors=errors,
+    )
+
+
+# ** blueprint: parse_view_data
+def parse_view_data(params: Tuple[str, ...] | None = None, ingest: Dict[str, Any] | None = None, **kwargs) -> Dict[str, Any]:
+    '''
+    Collect the feature data from the JSON payload, query params and route params.
+
+    :param params: The names of the params the feature needs; all params if None.
+    :type params: Tuple[str, ...] | None
+    :param ingest: Streaming ingestion options; the body is passed as a lazy iterator instead of parsed as JSON.
+    :type ingest: Dict[str, Any] | None
+    :param kwargs: The route params.
+    :type kwargs: dict
+    :return: The feature request data.
+    :rtype: Dict[str, Any]
+    :raises BadRequest: If the JSON body cannot be parsed.
+    '''
+
+    # Parse the JSON payload once (Flask caches the parsed body), unless it is ingested as a stream.
+    data = request.get_json() if request.is_json and not ingest else None
+    if not isinstance(data, dict):
+        data = {}
+
+    # Merge the query params only when present.
+    if request.args:
+        data.update(request.args.to_dict())
+
+    # Keep only the params the feature needs.
+    if params is not None:
+        data = {name: data[name] for name in params if name in data}
+
+    # Expose the body as a lazy iterator over the request stream.
+    if ingest:
+        data[ingest['param']] = iter_request_body(request.stream, ingest['format'], ingest['encoding'])
+
+    # Route params always apply.
+    data.update(kwargs)
+    return data
+
+
+# ** blueprint: build_error_payload
+def build_error_payload(error: TiferetAPIError) -> Dict[str, Any]:
+    '''
+    Build the JSON error payload for a TiferetAPIError raised by the interface context.
+
+    :param error: The API error.
+    :type error: TiferetAPIError
+    :return: The error payload.
+    :rtype: Dict[str, Any]
+    '''
+
+    # Return the formatted error fields.
+    return dict(
+        error_code=error.error_code,
+        name=error.name,
+        message=error.message,
+        **error.kwargs,
+    )
+
+
+# ** blueprint: get_stream_format
+def get_stream_format(entry: Any) -> str | None:
+    '''
+    Get the streaming format configured for a route in openapi.yml.
+
+    :param entry: The dispatch entry of the route.
+    :type entry: DispatchEntry
+    :return: The stream format (json or ndjson), or None if the route does not stream.
+    :rtype: str | None
+    '''
+
+    # Read the stream option, treating true as a JSON array.
+    stream = entry.options.get('stream') if entry else None
+    if not stream:
+        return None
+    return 'json' if stream is True else str(stream).lower()
+
+
+# ** blueprint: is_streamable
+def is_streamable(response: Any) -> bool:
+    '''
+    Check whether a feature response is a list or iterator that can be streamed.
+
+    :param response: The feature response.
+    :type response: Any
+    :return: True if the response can be streamed item by item.
+    :rtype: bool
+    '''
+
+    # Stream lists, tuples, generators and other iterators.
+    return isinstance(response, (list, tuple, Iterator))
+
+
+# ** blueprint: materialize_response
+def materialize_response(response: Any) -> Any:
+    '''
+    Collect an iterator response into a list, dumping models like OpenApiRequestContext does for lists.
+
+    :param response: The feature response.
+    :type response: Any
+    :return: The list of items, or the response unchanged if it is not an iterator.
+    :rtype: Any
+    '''
+
+    # Leave non-iterator responses unchanged.
+    if not isinstance(response, Iterator):
+        return response
+
+    # Collect the items, converting models to dicts.
+    return [item.model_dump() if isinstance(item, BaseModel) else item for item in response]
+
+
+# ** blueprint: build_item_dumper
+def build_item_dumper(json_provider: Any) -> Callable[[Any], bytes]:
+    '''
+    Build a function serializing a single streamed item to JSON bytes.
+
+    :param json_provider: The Flask JSON provider.
+    :type json_provider: JSONProvider
+    :return: The item serializer.
+    :rtype: Callable[[Any], bytes]
+    '''
+
+    # Prefer the provider's byte serializer when available.
+    dump_bytes = getattr(json_provider, 'dump_bytes', None)
+
+    # Define the item serializer, dumping models directly.
+    def dump_item(item: Any) -> bytes:
+        if isinstance(item, BaseModel):
+            return item.model_dump_json().encode('utf-8')
+        if dump_bytes:
+            return dump_bytes(item)
+        return json_provider.dumps(item).encode('utf-8')
+
+    # Return the item serializer.
+    return dump_item
+
+
+# ** blueprint: iter_stream_chunks
+def iter_stream_chunks(items: Iterable[Any], stream_format: str, dump_item: Callable[[Any], bytes]) -> Iterator[bytes]:
+    '''
+    Encode items one at a time as a JSON array or as newline-delimited JSON.
+
+    :param items: The items to stream.
+    :type items: Iterable[Any]
+    :param stream_format: The stream format (json or ndjson).
+    :type stream_format: str
+    :param dump_item: The item serializer.
+    :type dump_item: Callable[[Any], bytes]
+    :return: An iterator over the encoded chunks.
+    :rtype: Iterator[bytes]
+    '''
+
+    # Write one JSON document per line.
+    if stream_format == 'ndjson':
+        for item in items:
+            yield dump_item(item) + b'\n'
+        return
+
+    # Write a JSON array, separating items with commas.
+    separator = b'['
+    for item in items:
+        yield separator + dump_item(item)
+        separator = b','
+    yield b']' if separator == b',' else b'[]'
+
+
+# ** blueprint: build_stream_response
+def build_stream_response(items: Iterable[Any], status_code: int, stream_format: str) -> Response:
+    '''
+    Build a chunked Flask response streaming the items.
+
+    :param items: The items to stream.
+    :type items: Iterable[Any]
+    :param status_code: The route status code.
+    :type status_code: int
+    :param stream_format: The stream format (json or ndjson).
+    :type stream_format: str
+    :return: The streaming response.
+    :rtype: Response
+    '''
+
+    # Stream the encoded chunks within the request context.
+    chunks = iter_stream_chunks(items, stream_format, build_item_dumper(current_app.json))
+    return Response(
+        stream_with_context(chunks),
+        status=status_code,
+        mimetype='application/x-ndjson' if stream_format == 'ndjson' else 'application/json',
+    )
+
+
+# ** blueprint: format_result
+def format_result(payload: Any, status_code: int, stream_format: str | None = None) -> Tuple[Any, int] | Response:
+    '''
+    Format a response payload as a Flask JSON response, or stream its items.
+
+    :param payload: The response payload, or the items to stream.
+    :type payload: Any
+    :param status_code: The status code.
+    :type status_code: int
+    :param stream_format: The stream format (json or ndjson), or None to send the payload as one JSON document.
+    :type stream_format: str | None
+    :return: The JSON or streaming response.
+    :rtype: Tuple[Any, int] | Response
+    '''
+
+    # Stream the items in the stream format.
+    if stream_format:
+        return build_stream_response(payload, status_code, stream_format)
+
+    # Return the payload as JSON.
+    return jsonify(payload), status_code
+
+
+# ** blueprint: add_server_timing
+def add_server_timing(result: Tuple[Any, int] | Response, server_timing: str) -> Response:
+    '''
+    Attach a Server-Timing header to a view result.
+
+    :param result: The view result, as a response or a (body, status code) tuple.
+    :type result: Tuple[Any, int] | Response
+    :param server_timing: The Server-Timing header value.
+    :type server_timing: str
+    :return: The response with the header.
+    :rtype: Response
+    '''
+
+    # Convert the result to a response and set the header.
+    response = make_response(result)
+    response.headers['Server-Timing'] = server_timing
+    return response
+
+
+# ** blueprint: prepare_feature_request
+def prepare_feature_request(
+        entry: Any,
+        endpoint: str,
+        content_length: int | None,
+        read_data: Callable,
+        metrics: MetricsContext = None,
+        schemas: RequestSchemaContext = None,
+    ) -> Tuple[str, Dict[str, Any] | None, float | None, Tuple[Dict[str, Any], int] | None]:
+    '''
+    Prepare the feature request of a route independently of the server
+    interface: enforce its body size limit, and read and validate the request data.
+
+    :param entry: The dispatch entry of the route.
+    :type entry: DispatchEntry
+    :param endpoint: The route endpoint.
+    :type endpoint: str
+    :param content_length: The declared request content length, if any.
+    :type content_length: int | None
+    :param read_data: Reads the request data, raising BadRequest on malformed JSON and RequestEntityTooLarge on bodies over the limit.
+    :type read_data: Callable
+    :param metrics: The metrics context recording phase latencies, if enabled.
+    :type metrics: MetricsContext
+    :param schemas: The compiled request schemas validating the data of routes with a request model.
+    :type schemas: RequestSchemaContext
+    :return: The feature ID, request data, request start time, and the rejection payload and status code or None.
+    :rtype: Tuple[str, Dict[str, Any] | None, float | None, Tuple[Dict[str, Any], int] | None]
+    '''
+
+    # Start the request clock if metrics are enabled.
+    started = time.perf_counter() if metrics else None
+    feature_id = entry.feature_id if entry else endpoint
+
+    # Reject declared lengths over the route body size limit without reading the body.
+    max_body_size = get_max_body_size(entry)
+    rejected = None
+    data = None
+    if max_body_size and content_length is not None and content_length > max_body_size:
+        rejected = build_body_too_large_payload(max_body_size), 413
+
+    # Read the request data, rejecting malformed JSON and bodies streamed past the limit.
+    else:
+        try:
+            data = read_data()
+        except RequestEntityTooLarge:
+            if not max_body_size:
+                raise
+            rejected = build_body_too_large_payload(max_body_size), 413
+        except BadRequest:
+            rejected = build_invalid_json_payload(), 400
+        if metrics:
+            metrics.record(feature_id, 'parse_data', started)
+
+        # Reject data failing the route request model before running the feature.
+        if schemas and not rejected:
+            data, errors = schemas.validate(endpoint, data)
+            if errors:
+                rejected = build_invalid_request_payload(errors), 422
+
+    # Record rejected requests as responses.
+    if rejected and metrics:
+        metrics.record_response(feature_id, rejected[1], started)
+    return feature_id, data, started, rejected
+
+
+# ** blueprint: prepare_view_request
+def prepare_view_request(
+        interface_context: Any,
+        kwargs: Dict[str, Any],
+        metrics: MetricsContext = None,
+        schemas: RequestSchemaContext = None,
+    ) -> Tuple[Any, str, Dict[str, Any] | None, float | None, Tuple[Any, int] | None]:
+    '''
+    Prepare the feature request of a view: look up the route, enforce its body
+    size limit, and parse and validate the request data.
+
+    :param interface_context: The realized Flask API context.
+    :type interface_context: FlaskApiContext
+    :param kwargs: The route params.
+    :type kwargs: Dict[str, Any]
+    :param metrics: The metrics context recording phase latencies, if enabled.
+    :type metrics: MetricsContext
+    :param schemas: The compiled request schemas validating the data of routes with a request model.
+    :type schemas: RequestSchemaContext
+    :return: The dispatch entry, feature ID, request data, request start time, and the rejection response or None.
+    :rtype: Tuple[Any, str, Dict[str, Any] | None, float | None, Tuple[Any, int] | None]
+    '''
+
+    # Look up the precompiled dispatch entry for the endpoint in the route tables pinned to the request.
+    endpoint = request.endpoint
+    tables = get_route_tables()
+    if tables:
+        schemas = tables.schemas
+    dispatch = tables.dispatch if tables and tables.dispatch else interface_context.dispatch
+    entry = dispatch.get_entry(endpoint) if dispatch else None
+
+    # Cap the body stream for chunked uploads to routes with a body size limit.
+    max_body_size = get_max_body_size(entry)
+    if max_body_size:
+        request.max_content_length = max_body_size
+
+    # Parse and validate the request data, limited to the params the feature needs.
+    read_data = partial(parse_view_data, entry.params if entry else None, get_ingest_options(entry), **kwargs)
+    feature_id, data, started, rejected = prepare_feature_request(
+        entry, endpoint, request.content_length, read_data, metrics, schemas,
+    )
+
+    # Format rejections as JSON error responses.
+    if rejected:
+        rejected = jsonify(rejected[0]), rejected[1]
+    return entry, feature_id, data, started, rejected
+
+
+# ** blueprint: build_feature_call
+def build_feature_call(
+        interface_context: Any,
+        entry: Any,
+        feature_id: str,
+        data: Dict[str, Any],
+        response_cache: ResponseCacheContext = None,
+        coalescer: CoalesceContext = None,
+        is_async: bool = False,
+        headers: Any = None,
+    ) -> Callable:
+    '''
+    Build the call running the feature with lazily loaded headers, coalesced and through the response cache if configured.
+
+    :param interface_context: The realized Flask API context.
+    :type interface_context: FlaskApiContext
+    :param entry: The dispatch entry of the route.
+    :type entry: DispatchEntry
+    :param feature_id: The feature ID.
+    :type feature_id: str
+    :param data: The request data.
+    :type data: Dict[str, Any]
+    :param response_cache: The response cache for routes with a cache block.
+    :type response_cache: ResponseCacheContext
+    :param coalescer: The coalescing context for routes with a coalesce block.
+    :type coalescer: CoalesceContext
+    :param is_async: Whether to build an awaitable call through the async context methods.
+    :type is_async: bool
+    :param headers: The request headers; the Flask request headers, loaded lazily, if None.
+    :type headers: Any
+    :return: The call, returning (or, if async, awaiting) the response and status code.
+    :rtype: Callable
+    '''
+
+    # Run the feature with the request headers.
+    run_feature = partial(
+        interface_context.run_async if is_async else interface_context.run,
+        feature_id=feature_id,
+        headers=headers if headers is not None else LazyHeaders(request.headers),
+        data=data,
+    )
+
+    # Share identical concurrent runs, then serve cached responses, for configured routes.
+    if coalescer and entry:
+        run_feature = partial(coalescer.run_async if is_async else coalescer.run, entry, data, run_feature)
+    if response_cache and entry:
+        run_feature = partial(response_cache.run_async if is_async else response_cache.run, entry, data, run_feature)
+    return run_feature
+
+
+# ** blueprint: finish_feature_response
+def finish_feature_response(
+        entry: Any,
+        feature_id: str,
+        response: Any,
+        status_code: int | None,
+        error: TiferetAPIError | None,
+        started: float | None,
+        serialize: Callable,
+        metrics: MetricsContext = None,
+    ) -> Any:
+    '''
+    Serialize the feature response or error of a route independently of the
+    server interface, and record it.
+
+    :param entry: The dispatch entry of the route.
+    :type entry: DispatchEntry
+    :param feature_id: The feature ID.
+    :type feature_id: str
+    :param response: The feature response.
+    :type response: Any
+    :param status_code: The feature status code.
+    :type status_code: int | None
+    :param error: The API error raised by the feature, if any.
+    :type error: TiferetAPIError | None
+    :param started: The request start time, from time.perf_counter(), if metrics are enabled.
+    :type started: float | None
+    :param serialize: Serializes a (payload, status code, stream format or None) result for the server interface.
+    :type serialize: Callable
+    :param metrics: The metrics context recording phase latencies, if enabled.
+    :type metrics: MetricsContext
+    :return: The serialized result.
+    :rtype: Any
+    '''
+
+    # Serialize the error payload with its mapped status code.
+    if error is not None:
+        status_code = getattr(error, 'status_code', 500)
+        result = serialize(build_error_payload(error), status_code, None)
+
+    # Otherwise serialize the response, streamed for streaming routes and materialized for the rest.
+    else:
+        serialized = time.perf_counter() if metrics else None
+        stream_format = get_stream_format(entry)
+        if not (stream_format and is_streamable(response)):
+            stream_format = None
+            response = materialize_response(response)
+        result = serialize(response, status_code, stream_format)
+        if metrics:
+            metrics.record(feature_id, 'serialize', serialized)
+
+    # Record the response.
+    if metrics:
+        metrics.record_response(feature_id, status_code, started)
+    return result
+
+
+# ** blueprint: finish_view_response
+def finish_view_response(
+        entry: Any,
+        feature_id: str,
+        response: Any,
+        status_code: int | None,
+        error: TiferetAPIError | None,
+        started: float | None,
+        metrics: MetricsContext = None,
+        profiler: CommandProfiler = None,
+        timings: Any = None,
+    ) -> Tuple[Any, int] | Response:
+    '''
+    Format the feature response or error of a view, record it and attach the command timings.
+
+    :param entry: The dispatch entry of the route.
+    :type entry: DispatchEntry
+    :param feature_id: The feature ID.
+    :type feature_id: str
+    :param response: The feature response.
+    :type response: Any
+    :param status_code: The feature status code.
+    :type status_code: int | None
+    :param error: The API error raised by the feature, if any.
+    :type error: TiferetAPIError | None
+    :param started: The request start time, from time.perf_counter(), if metrics are enabled.
+    :type started: float | None
+    :param metrics: The metrics context recording phase latencies, if enabled.
+    :type metrics: MetricsContext
+    :param profiler: The command profiler, if enabled.
+    :type profiler: CommandProfiler
+    :param timings: The command timings of a sampled request.
+    :type timings: Any
+    :return: The view result.
+    :rtype: Tuple[Any, int] | Response
+    '''
+
+    # Format and record the response as JSON, or streamed for streaming routes.
+    result = finish_feature_response(entry, feature_id, response, status_code, error, started, format_result, metrics)
+
+    # Attach the command timings.
+    if timings:
+        result = add_server_timing(result, profiler.format_server_timing(timings))
+    return result
+
+
+# ** blueprint: build_view_func
+def build_view_func(
+        interface_context: Any,
+        response_cache: ResponseCacheContext = None,
+        metrics: MetricsContext = None,
+        profiler: CommandProfiler = None,
+        coalescer: CoalesceContext = None,
+        schemas: RequestSchemaContext = None,
+    ) -> Callable:
+    '''
+    Build the default view function executing the feature for the request endpoint.
+
+    :param interface_context: The realized Flask API context.
+    :type interface_context: FlaskApiContext
+    :param response_cache: The response cache for routes with a cache block.
+    :type response_cache: ResponseCacheContext
+    :param metrics: The metrics context recording phase latencies, if enabled.
+    :type metrics: MetricsContext
+    :param profiler: The command profiler timing the commands of sampled requests, if enabled.
+    :type profiler: CommandProfiler
+    :param coalescer: The coalescing context for routes with a coalesce block.
+    :type coalescer: CoalesceContext
+    :param schemas: The compiled request schemas validating the data of routes with a request model.
+    :type schemas: RequestSchemaContext
+    :return: The view function.
+    :rtype: Callable
+    '''
+
+    # Define the view function.
+    def view_func(**kwargs):
+
+        # Prepare the request, returning rejections before the feature runs.
+        entry, feature_id, data, started, rejected = prepare_view_request(interface_context, kwargs, metrics, schemas)
+        if rejected:
+            return rejected
+
+        # Execute the feature, profiling its commands on sampled requests.
+        run_feature = build_feature_call(interface_context, entry, feature_id, data, response_cache, coalescer)
+        profile = profiler.start() if profiler else None
+        response = status_code = error = None
+        try:
+            response, status_code = run_feature()
+        except TiferetAPIError as raised:
+            error = raised
+        finally:
+            timings = profiler.stop(profile) if profile else None
+
+        # Format and record the response.
+        return finish_view_response(entry, feature_id, response, status_code, error, started, metrics, profiler, timings)
+
+    # Return the view function.
+    return view_func
+
+
+# ** blueprint: build_async_view_func
+def build_async_view_func(
+        interface_context: Any,
+        response_cache: ResponseCacheContext = None,
+        metrics: MetricsContext = None,
+        profiler: CommandProfiler = None,
+        coalescer: CoalesceContext = None,
+        schemas: RequestSchemaContext = None,
+    ) -> Callable:
+    '''
+    Build an async view function awaiting the feature for the request endpoint.
+
+    Requires Flask async support (pip install tiferet-flask[async]).
+
+    :param interface_context: The realized Flask API context.
+    :type interface_context: FlaskApiContext
+    :param response_cache: The response cache for routes with a cache block.
+    :type response_cache: ResponseCacheContext
+    :param metrics: The metrics context recording phase latencies, if enabled.
+    :type metrics: MetricsContext
+    :param profiler: The command profiler timing the commands of sampled requests, if enabled.
+    :type profiler: CommandProfiler
+    :param coalescer: The coalescing context for routes with a coalesce block.
+    :type coalescer: CoalesceContext
+    :param schemas: The compiled request schemas validating the data of routes with a request model.
+    :type schemas: RequestSchemaContext
+    :return: The async view function.
+    :rtype: Callable
+    '''
+
+    # Define the async view function.
+    async def view_func(**kwargs):
+
+        # Prepare the request, returning rejections before the feature runs.
+        entry, feature_id, data, started, rejected = prepare_view_request(interface_context, kwargs, metrics, schemas)
+        if rejected:
+            return rejected
+
+        # Await the feature, profiling its commands on sampled requests.
+        run_feature = build_feature_call(interface_context, entry, feature_id, data, response_cache, coalescer, is_async=True)
+        profile = profiler.start() if profiler else None
+        response = status_code = error = None
+        try:
+            response, status_code = await run_feature()
+        except TiferetAPIError as raised:
+            error = raised
+        finally:
+            timings = profiler.stop(profile) if profile else None
+
+        # Format and record the response.
+        return finish_view_response(entry, feature_id, response, status_code, error, started, metrics, profiler, timings)
+
+    # Return the async view function.
+    return view_func
+
+
+# ** blueprint: run_batch_item
+def run_batch_item(
+        interface_context: Any,
+        item: Any,
+        headers: Any,
+        response_cache: ResponseCacheContext = None,
+        schemas: RequestSchemaContext = None,
+        limits: RateLimitContext = None,
+        coalescer: CoalesceContext = None,
+        metrics: MetricsContext = None,
+        dispatch: DispatchContext = None,
+    ) -> Dict[str, Any]:
+    '''
+    Run a single {endpoint, data} batch item through the interface context.
+
+    :param interface_context: The realized Flask API context.
+    :type interface_context: FlaskApiContext
+    :param item: The batch item.
+    :type item: Any
+    :param headers: The source request headers.
+    :type headers: Any
+    :param response_cache: The response cache for routes with a cache block.
+    :type response_cache: ResponseCacheContext
+    :param schemas: The compiled request schemas validating the data of routes with a request model.
+    :type schemas: RequestSchemaContext
+    :param limits: The rate limit context admitting the item against the limits of its endpoint.
+    :type limits: RateLimitContext
+    :param coalescer: The coalescing context for routes with a coalesce block.
+    :type coalescer: CoalesceContext
+    :param metrics: The metrics context recording the item latency, if enabled.
+    :type metrics: MetricsContext
+    :param dispatch: The dispatch table to look the item endpoint up in; that of the interface context if None.
+    :type dispatch: DispatchContext
+    :return: The item result with its status code.
+    :rtype: Dict[str, Any]
+    '''
+
+    # Reject malformed items.
+    if not isinstance(item, dict) or not isinstance(item.get('data', {}), dict):
+        return dict(status_code=400, error=dict(
+            error_code='INVALID_BATCH_ITEM',
+            name='Invalid Batch Item',
+            message='Batch items must be objects with an endpoint and a data object.',
+        ))
+
+    # Look up the dispatch entry for the item endpoint.
+    endpoint = item.get('endpoint')
+    if dispatch is None:
+        dispatch = interface_context.dispatch
+    entry = dispatch.get_entry(endpoint) if dispatch else None
+    if entry is None:
+        return dict(status_code=404, error=dict(
+            error_code='BATCH_ENDPOINT_NOT_FOUND',
+            name='Batch Endpoint Not Found',
+            message=f'No route is registered for endpoint: {endpoint}.',
+            endpoint=endpoint,
+        ))
+
+    # Admit the item against the limits of its endpoint, like a request to the route.
+    entered = ()
+    if limits:
+        entered, rejected = limits.admit(endpoint)
+        if rejected:
+            return dict(status_code=rejected.status_code, error=json.loads(rejected.body))
+
+    # Run the item, releasing the caps it entered.
+    started = time.perf_counter() if metrics else None
+    try:
+        result = run_batch_feature(interface_context, entry, item, headers, response_cache, schemas, coalescer)
+    finally:
+        if entered:
+            limits.release(entered)
+
+    # Record the item response.
+    if metrics:
+        metrics.record_response(entry.feature_id, result['status_code'], started)
+    return result
+
+
+# ** blueprint: run_batch_feature
+def run_batch_feature(
+        interface_context: Any,
+        entry: Any,
+        item: Dict[str, Any],
+        headers: Any,
+        response_cache: ResponseCacheContext = None,
+        schemas: RequestSchemaContext = None,
+        coalescer: CoalesceContext = None,
+    ) -> Dict[str, Any]:
+    '''
+    Validate the data of an admitted batch item and run its feature.
+
+    :param interface_context: The realized Flask API context.
+    :type interface_context: FlaskApiContext
+    :param entry: The dispatch entry of the item endpoint.
+    :type entry: DispatchEntry
+    :param item: The batch item.
+    :type item: Dict[str, Any]
+    :param headers: The source request headers.
+    :type headers: Any
+    :param response_cache: The response cache for routes with a cache block.
+    :type response_cache: ResponseCacheContext
+    :param schemas: The compiled request schemas validating the data of routes with a request model.
+    :type schemas: RequestSchemaContext
+    :param coalescer: The coalescing context for routes with a coalesce block.
+    :type coalescer: CoalesceContext
+    :return: The item result with its status code.
+    :rtype: Dict[str, Any]
+    '''
+
+    # Limit the data to the params the feature needs.
+    data = dict(item.get('data', {}))
+    if entry.params is not None:
+        data = {name: data[name] for name in entry.params if name in data}
+
+    # Reject data failing the route request model.
+    if schemas:
+        data, errors = schemas.validate(entry.route.endpoint, data)
+        if errors:
+            return dict(status_code=422, error=build_invalid_request_payload(errors))
+
+    # Execute the feature (coalesced and through the response cache if configured) and return its result or error.
+    try:
+        run_feature = partial(
+            interface_context.run,
+            feature_id=entry.feature_id,
+            headers=LazyHeaders(headers),
+            data=data,
+        )
+        if coalescer:
+            run_feature = partial(coalescer.run, entry, data, run_feature)
+        if response_cache:
+            response, status_code = response_cache.run(entry, data, run_feature)
+        else:
+            response, status_code = run_feature()
+    except TiferetAPIError as error:
+        return dict(status_code=getattr(error, 'status_code', 500), error=build_error_payload(error))
+
+    # Return error responses from precompiled error templates as errors.
+    if isinstance(response, ErrorResponse):
+        return dict(status_code=status_code, error=dict(response))
+
+    # Materialize iterator results, since batch results are returned as one JSON document.
+    return dict(status_code=status_code, data=materialize_response(response))
+
+
+# ** blueprint: build_batch_view_func
+def build_batch_view_func(
+        interface_context: Any,
+        max_workers: int = None,
+        max_items: int = 1000,
+        response_cache: ResponseCacheContext = None,
+        schemas: RequestSchemaContext = None,
+        limits: RateLimitContext = None,
+        coalescer: CoalesceContext = None,
+        metrics: MetricsContext = None,
+    ) -> Callable:
+    '''
+    Build a view running an array of {endpoint, data} items in one round trip.
+
+    Each item is admitted against the limits of its endpoint, so a batch
+    cannot get past the rate limits and concurrency caps of its routes. The
+    thread pool for concurrent items is exposed as the view's executor
+    attribute, so its owner can shut it down with the app.
+
+    :param interface_context: The realized Flask API context.
+    :type interface_context: FlaskApiContext
+    :param max_workers: Thread pool size for running items concurrently; items run in order if None or 1.
+    :type max_workers: int
+    :param max_items: The maximum number of items per batch.
+    :type max_items: int
+    :param response_cache: The response cache for routes with a cache block.
+    :type response_cache: ResponseCacheContext
+    :param schemas: The compiled request schemas validating the data of routes with a request model.
+    :type schemas: RequestSchemaContext
+    :param limits: The rate limit context admitting each item against the limits of its endpoint.
+    :type limits: RateLimitContext
+    :param coalescer: The coalescing context for routes with a coalesce block.
+    :type coalescer: CoalesceContext
+    :param metrics: The metrics context recording the item latencies, if enabled.
+    :type metrics: MetricsContext
+    :return: The batch view function.
+    :rtype: Callable
+    '''
+
+    # Create the shared thread pool for concurrent items.
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tiferet-batch') if max_workers and max_workers > 1 else None
+    run_item = partial(
+        run_batch_item,
+        response_cache=response_cache,
+        schemas=schemas,
+        limits=limits,
+        coalescer=coalescer,
+        metrics=metrics,
+    )
+
+    # Define the batch view function.
+    def batch_view_func():
+
+        # Parse the batch payload, rejecting malformed JSON.
+        try:
+            items = request.get_json() if request.is_json else None
+        except BadRequest:
+            return format_invalid_json()
+
+        # Validate the batch payload.
+        if not isinstance(items, list) or len(items) > max_items:
+            return jsonify(dict(
+                error_code='INVALID_BATCH_REQUEST',
+                name='Invalid Batch Request',
+                message=f'The batch body must be a JSON array of at most {max_items} items.',
+            )), 400
+
+        # Run the items against the route tables pinned to the request, in order or concurrently on the pool.
+        headers = request.headers
+        tables = get_route_tables()
+        pinned = dict(dispatch=tables.dispatch, schemas=tables.schemas, limits=tables.limits) if tables else {}
+        if executor:
+            results: List[Dict[str, Any]] = list(executor.map(
+                lambda item: run_item(interface_context, item, headers, **pinned),
+                items,
+            ))
+        else:
+            results = [run_item(interface_context, item, headers, **pinned) for item in items]
+
+        # Return the ordered results.
+        return jsonify(results), 200
+
+    # Return the batch view function with its thread pool.
+    batch_view_func.executor = executor
+    return batch_view_func
+
+
+# ** blueprint: build_metrics_view_func
+def build_metrics_view_func(metrics: MetricsContext, coalescer: CoalesceContext = None) -> Callable:
+    '''
+    Build the view function exposing the recorded metrics in the Prometheus text format.
+
+    :param metrics: The metrics context.
+    :type metrics: MetricsContext
+    :param coalescer: The coalescing context whose counters to expose, if any.
+    :type coalescer: CoalesceContext
+    :return: The metrics view function.
+    :rtype: Callable
+    '''
+
+    # Define the metrics view function, adding the coalescing counters.
+    def metrics_view_func():
+        text = metrics.render_prometheus()
+        if coalescer:
+            text += coalescer.render_prometheus()
+        return Response(text, mimetype='text/plain; version=0.0.4')
+
+    # Return the metrics view function.
+    return metrics_view_func
+
+
+# ** blueprint: get_route_tables
+def get_route_tables() -> RouteTables | None:
+    '''
+    Get the route tables pinned to the current request.
+
+    :return: The route tables, or None outside apps assembled by build_flask_app.
+    :rtype: RouteTables | None
+    '''
+
+    # Read the tables from the request environment.
+    return request.environ.get('tiferet_flask.tables')
+
+
+# ** blueprint: build_route_tables_func
+def build_route_tables_func(flask_app: Flask) -> Callable:
+    '''
+    Build the before-request hook pinning the published route tables to each request.
+
+    A request matched against a URL map that a reload replaced in the
+    meantime is matched again against the map of the pinned tables.
+
+    :param flask_app: A Flask app assembled by build_flask_app.
+    :type flask_app: Flask
+    :return: The before-request hook.
+    :rtype: Callable
+    '''
+
+    # Define the hook, reading the published tables once per request.
+    def route_tables_func():
+        tables = flask_app.extensions['tiferet_flask']['tables']
+        url_map = tables.url_map
+        if request_ctx.url_adapter is not None and request_ctx.url_adapter.map is not url_map:
+            request_ctx.url_adapter = url_map.bind_to_environ(
+                request.environ,
+                server_name=None if url_map.host_matching else flask_app.config['SERVER_NAME'],
+                subdomain=None if url_map.host_matching or flask_app.subdomain_matching else url_map.default_subdomain or '',
+            )
+            request.routing_exception = None
+            request_ctx.match_request()
+        request.environ['tiferet_flask.tables'] = tables
+        return None
+
+    # Return the hook.
+    return route_tables_func
+
+
+# ** blueprint: build_cors_preflight_func
+def build_cors_preflight_func(cors: CorsContext) -> Callable:
+    '''
+    Build the before-request hook answering CORS preflight requests from the precompiled policies.
+
+    :param cors: The CORS context.
+    :type cors: CorsContext
+    :return: The before-request hook, returning the preflight response or None for other requests.
+    :rtype: Callable
+    '''
+
+    # Define the hook, answering preflight requests without entering the view.
+    def cors_preflight_func():
+        if request.method != 'OPTIONS' or 'Access-Control-Request-Method' not in request.headers:
+            return None
+        origin = request.headers.get('Origin')
+        tables = get_route_tables()
+        cors_context = tables.cors if tables else cors
+        headers = cors_context.get_preflight_headers(request.endpoint, origin, request.headers.get('Access-Control-Request-Headers')) if origin else None
+        if headers is None:
+            return None
+        return Response(status=204, headers=headers)
+
+    # Return the hook.
+    return cors_preflight_func
+
+
+# ** blueprint: build_cors_response_func
+def build_cors_response_func(cors: CorsContext) -> Callable:
+    '''
+    Build the after-request hook adding the precompiled CORS headers to cross-origin responses.
+
+    :param cors: The CORS context.
+    :type cors: CorsContext
+    :return: The after-request hook.
+    :rtype: Callable
+    '''
+
+    # Define the hook, skipping same-origin requests and answered preflights.
+    def cors_response_func(response: Response) -> Response:
+        origin = request.headers.get('Origin')
+        if not origin or 'Access-Control-Allow-Methods' in response.headers:
+            return response
+        tables = get_route_tables()
+        cors_context = tables.cors if tables else cors
+        for name, value in cors_context.get_response_headers(request.endpoint, origin):
+            if name == 'Vary':
+                response.vary.add(value)
+            else:
+                response.headers[name] = value
+        return response
+
+    # Return the hook.
+    return cors_response_func
+
+
+# ** blueprint: build_limit_admit_func
+def build_limit_admit_func(limits: RateLimitContext) -> Callable:
+    '''
+    Build the before-request hook admitting requests against the router and route limits.
+
+    :param limits: The rate limit context.
+    :type limits: RateLimitContext
+    :return: The before-request hook, returning the precompiled 429 or 503 response or None for admitted requests.
+    :rtype: Callable
+    '''
+
+    # Define the hook, rejecting requests over a limit without entering the view.
+    def limit_admit_func():
+        if request.method == 'OPTIONS':
+            return None
+        tables = get_route_tables()
+        limit_context = tables.limits if tables else limits
+        entered, rejected = limit_context.admit(request.endpoint)
+        if rejected:
+            return Response(rejected.body, status=rejected.status_code, headers=rejected.headers)
+        if entered:
+            request.environ['tiferet_flask.limits'] = entered
+        return None
+
+    # Return the hook.
+    return limit_admit_func
+
+
+# ** blueprint: build_limit_release_func
+def build_limit_release_func(limits: RateLimitContext) -> Callable:
+    '''
+    Build the teardown hook releasing the concurrency caps entered by an admitted request.
+
+    :param limits: The rate limit context.
+    :type limits: RateLimitContext
+    :return: The teardown hook.
+    :rtype: Callable
+    '''
+
+    # Define the hook, run once the response (including a streamed one) is finished.
+    def limit_release_func(error: BaseException = None):
+        entered = request.environ.pop('tiferet_flask.limits', None)
+        if entered:
+            tables = get_route_tables()
+            limit_context = tables.limits if tables else limits
+            limit_context.release(entered)
+
+    # Return the hook.
+    return limit_release_func
+
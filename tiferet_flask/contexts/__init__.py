@@ -3,5 +3,20 @@
 # *** exports
 
 # ** app
-from .request import FlaskRequestContext
+from .request import FlaskRequestContext, LazyHeaders, PooledRequestContext, RequestContextPool
+from .dispatch import DispatchContext, DispatchEntry
 from .flask import FlaskApiContext
+from .lazy import LazyApiContext
+from .cache import ResponseCacheContext, MemoryResponseCache
+from .json import FlaskJsonProvider
+from .metrics import MetricsContext
+from .profile import CommandProfiler
+from .error import ErrorResponse, ErrorTemplate, ErrorTemplateContext
+from .server import PreforkServerContext
+from .cors import CorsContext, CorsPolicy
+from .reload import ConfigWatchContext
+from .coalesce import CoalesceContext, InFlightCall
+from .limit import LimitPolicy, LimitResponse, MemoryRateLimiter, RateLimitContext, SharedMemoryRateLimiter
+from .schema import RequestSchema, RequestSchemaContext
+from .tables import RouteTables
+from .options import FlaskAppOptions
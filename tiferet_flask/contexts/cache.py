@@ -0,0 +1,304 @@
+'''Flask response cache context.'''
+
+# *** imports
+
+# ** core
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+# ** app
+from ..interfaces import ResponseCacheService
+from .dispatch import DispatchEntry
+from .error import ErrorResponse
+
+
+# *** classes
+
+# ** class: memory_response_cache
+class MemoryResponseCache(ResponseCacheService):
+    '''
+    An in-process LRU response cache with per-entry TTL.
+    '''
+
+    # * attribute: max_entries
+    max_entries: int
+
+    # * attribute: entries
+    entries: OrderedDict
+
+    # * attribute: lock
+    lock: threading.Lock
+
+    # * init
+    def __init__(self, max_entries: int = 1024):
+        '''
+        Initialize the in-process cache.
+
+        :param max_entries: The maximum number of entries before the least recently used is evicted.
+        :type max_entries: int
+        '''
+
+        # Create the ordered entry map and its lock.
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    # * method: get
+    def get(self, key: str) -> Any | None:
+        '''
+        Get a cached value, marking it as recently used.
+
+        :param key: The cache key.
+        :type key: str
+        :return: The cached value, or None on a miss or after it expires.
+        :rtype: Any | None
+        '''
+
+        # Look up the entry and drop it if expired.
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+
+            # Mark the entry as recently used and return its value.
+            self.entries.move_to_end(key)
+            return value
+
+    # * method: set
+    def set(self, key: str, value: Any, ttl: float | None = None):
+        '''
+        Store a value, evicting the least recently used entries over the limit.
+
+        :param key: The cache key.
+        :type key: str
+        :param value: The value to cache.
+        :type value: Any
+        :param ttl: The time to live in seconds; no expiry if None.
+        :type ttl: float | None
+        '''
+
+        # Store the entry as most recently used.
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+
+            # Evict the least recently used entries.
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    # * method: clear
+    def clear(self):
+        '''
+        Remove all cached values.
+        '''
+
+        # Clear the entries.
+        with self.lock:
+            self.entries.clear()
+
+
+# *** contexts
+
+# ** context: response_cache_context
+class ResponseCacheContext(object):
+    '''
+    A context caching feature responses for routes with a cache block in openapi.yml.
+    '''
+
+    # * attribute: backend_factory
+    backend_factory: Callable[[str, Dict[str, Any]], ResponseCacheService]
+
+    # * attribute: backends
+    backends: Dict[str, ResponseCacheService]
+
+    # * attribute: stats
+    stats: Dict[str, Dict[str, int]]
+
+    # * attribute: lock
+    lock: threading.Lock
+
+    # * init
+    def __init__(self, backend_factory: Callable[[str, Dict[str, Any]], ResponseCacheService] = None):
+        '''
+        Initialize the response cache context.
+
+        :param backend_factory: Creates the backend for an endpoint from its cache options; in-process LRU if None.
+        :type backend_factory: Callable[[str, Dict[str, Any]], ResponseCacheService]
+        '''
+
+        # Default to one in-process LRU cache per route.
+        self.backend_factory = backend_factory or (
+            lambda endpoint, options: MemoryResponseCache(options.get('max_entries', 1024))
+        )
+        self.backends = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    # * method: get_backend
+    def get_backend(self, endpoint: str, options: Dict[str, Any]) -> ResponseCacheService:
+        '''
+        Get or create the cache backend for an endpoint.
+
+        :param endpoint: The Flask endpoint.
+        :type endpoint: str
+        :param options: The route cache options.
+        :type options: Dict[str, Any]
+        :return: The endpoint cache backend.
+        :rtype: ResponseCacheService
+        '''
+
+        # Create the backend and its counters on first use.
+        backend = self.backends.get(endpoint)
+        if backend is None:
+            with self.lock:
+                backend = self.backends.get(endpoint)
+                if backend is None:
+                    backend = self.backend_factory(endpoint, options)
+                    self.stats[endpoint] = dict(hits=0, misses=0)
+                    self.backends[endpoint] = backend
+        return backend
+
+    # * method: build_key
+    def build_key(self, entry: DispatchEntry, data: Dict[str, Any]) -> str | None:
+        '''
+        Build the cache key for a request, or None if the route is not cached.
+
+        :param entry: The dispatch entry of the route.
+        :type entry: DispatchEntry
+        :param data: The feature request data.
+        :type data: Dict[str, Any]
+        :return: The cache key.
+        :rtype: str | None
+        '''
+
+        # Skip routes without a cache block.
+        options = entry.options.get('cache')
+        if not options:
+            return None
+
+        # Key on the configured fields, the declared params or all data keys.
+        fields = options.get('key') or entry.params or sorted(data)
+        values = [data.get(field) for field in fields]
+        return f'{entry.feature_id}:{json.dumps(values, sort_keys=True, separators=(",", ":"), default=str)}'
+
+    # * method: count
+    def count(self, endpoint: str, counter: str):
+        '''
+        Increment a hit or miss counter.
+
+        :param endpoint: The Flask endpoint.
+        :type endpoint: str
+        :param counter: The counter name (hits or misses).
+        :type counter: str
+        '''
+
+        # Increment the counter under the lock, recreating counters dropped by a concurrent clear.
+        with self.lock:
+            self.stats.setdefault(endpoint, dict(hits=0, misses=0))[counter] += 1
+
+    # * method: run
+    def run(self, entry: DispatchEntry, data: Dict[str, Any], run_feature: Callable[[], Tuple[Any, int]]) -> Tuple[Any, int]:
+        '''
+        Return the cached response for a request, or run the feature and cache its response.
+
+        Errors raised or returned by the feature and streamed (iterator) responses are never cached.
+
+        :param entry: The dispatch entry of the route.
+        :type entry: DispatchEntry
+        :param data: The feature request data.
+        :type data: Dict[str, Any]
+        :param run_feature: Runs the feature, returning the response and status code.
+        :type run_feature: Callable[[], Tuple[Any, int]]
+        :return: The response and status code.
+        :rtype: Tuple[Any, int]
+        '''
+
+        # Run uncached routes directly.
+        key = self.build_key(entry, data)
+        if key is None:
+            return run_feature()
+
+        # Return a cached response on a hit.
+        options = entry.options['cache']
+        backend = self.get_backend(entry.route.endpoint, options)
+        cached = backend.get(key)
+        if cached is not None:
+            self.count(entry.route.endpoint, 'hits')
+            return cached
+
+        # Run the feature and cache its response on a miss.
+        self.count(entry.route.endpoint, 'misses')
+        result = run_feature()
+        if not isinstance(result[0], (Iterator, ErrorResponse)):
+            backend.set(key, result, options.get('ttl'))
+        return result
+
+    # * method: run_async
+    async def run_async(self, entry: DispatchEntry, data: Dict[str, Any], run_feature: Callable[[], Awaitable[Tuple[Any, int]]]) -> Tuple[Any, int]:
+        '''
+        Return the cached response for a request, or await the feature and cache its response.
+
+        :param entry: The dispatch entry of the route.
+        :type entry: DispatchEntry
+        :param data: The feature request data.
+        :type data: Dict[str, Any]
+        :param run_feature: Awaits the feature, returning the response and status code.
+        :type run_feature: Callable[[], Awaitable[Tuple[Any, int]]]
+        :return: The response and status code.
+        :rtype: Tuple[Any, int]
+        '''
+
+        # Await uncached routes directly.
+        key = self.build_key(entry, data)
+        if key is None:
+            return await run_feature()
+
+        # Return a cached response on a hit.
+        options = entry.options['cache']
+        backend = self.get_backend(entry.route.endpoint, options)
+        cached = backend.get(key)
+        if cached is not None:
+            self.count(entry.route.endpoint, 'hits')
+            return cached
+
+        # Await the feature and cache its response on a miss.
+        self.count(entry.route.endpoint, 'misses')
+        result = await run_feature()
+        if not isinstance(result[0], (Iterator, ErrorResponse)):
+            backend.set(key, result, options.get('ttl'))
+        return result
+
+    # * method: get_stats
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        '''
+        Get the hit and miss counters per endpoint.
+
+        :return: A copy of the counters, keyed by endpoint.
+        :rtype: Dict[str, Dict[str, int]]
+        '''
+
+        # Copy the counters under the lock.
+        with self.lock:
+            return {endpoint: dict(counters) for endpoint, counters in self.stats.items()}
+
+    # * method: clear
+    def clear(self):
+        '''
+        Drop all backends and counters, e.g. after the route options change.
+        '''
+
+        # Clear and forget each backend.
+        with self.lock:
+            for backend in self.backends.values():
+                backend.clear()
+            self.backends = {}
+            self.stats = {}
@@ -0,0 +1,344 @@
+'''Flask request coalescing context.'''
+
+# *** imports
+
+# ** core
+import asyncio
+import json
+import threading
+from collections.abc import Iterator
+from concurrent.futures import CancelledError, Future, wait
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+# ** app
+from .dispatch import DispatchEntry
+
+
+# *** classes
+
+# ** class: in_flight_call
+class InFlightCall(object):
+    '''
+    A feature execution shared by the concurrent requests with the same key.
+
+    Its outcome is a thread-safe future, so requests waiting on other
+    threads and on other event loops (e.g. Flask async views, each run on
+    its own loop) share the same call.
+    '''
+
+    # * attribute: future
+    future: Future
+
+    # * init
+    def __init__(self):
+        '''
+        Initialize the call, pending until the first request finishes it.
+        '''
+
+        # Create the outcome future.
+        self.future = Future()
+
+
+# *** contexts
+
+# ** context: coalesce_context
+class CoalesceContext(object):
+    '''
+    A context coalescing identical concurrent requests for routes with a
+    coalesce block in openapi.yml: the first request runs the feature and
+    the requests arriving while it runs wait for and share its response.
+
+    Requests are identical when they have the same feature and normalized
+    data; headers are not compared, so only coalesce routes whose responses
+    do not depend on them.
+    '''
+
+    # * attribute: calls
+    calls: Dict[str, InFlightCall]
+
+    # * attribute: stats
+    stats: Dict[str, Dict[str, int]]
+
+    # * attribute: lock
+    lock: threading.Lock
+
+    # * init
+    def __init__(self):
+        '''
+        Initialize the coalescing context.
+        '''
+
+        # Create the in-flight call map, the counters and their lock.
+        self.calls = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    # * method: get_options
+    @staticmethod
+    def get_options(entry: DispatchEntry) -> Dict[str, Any] | None:
+        '''
+        Get the coalesce options configured for a route.
+
+        :param entry: The dispatch entry of the route.
+        :type entry: DispatchEntry
+        :return: The coalesce options (key, timeout), or None if the route does not coalesce.
+        :rtype: Dict[str, Any] | None
+        '''
+
+        # Read the coalesce option, accepting true as shorthand.
+        options = entry.options.get('coalesce')
+        if not options:
+            return None
+        return options if isinstance(options, dict) else {}
+
+    # * method: build_key
+    def build_key(self, entry: DispatchEntry, data: Dict[str, Any]) -> str | None:
+        '''
+        Build the coalescing key for a request, or None if the route does not coalesce.
+
+        :param entry: The dispatch entry of the route.
+        :type entry: DispatchEntry
+        :param data: The feature request data.
+        :type data: Dict[str, Any]
+        :return: The coalescing key.
+        :rtype: str | None
+        '''
+
+        # Skip routes without a coalesce block.
+        options = self.get_options(entry)
+        if options is None:
+            return None
+
+        # Key on the configured fields, the declared params or all data keys.
+        fields = options.get('key') or entry.params or sorted(data)
+        values = [data.get(field) for field in fields]
+        return f'{entry.feature_id}:{json.dumps(values, sort_keys=True, separators=(",", ":"), default=str)}'
+
+    # * method: count
+    def count(self, endpoint: str, counter: str):
+        '''
+        Increment an executed or coalesced counter.
+
+        :param endpoint: The Flask endpoint.
+        :type endpoint: str
+        :param counter: The counter name (executed or coalesced).
+        :type counter: str
+        '''
+
+        # Increment the counter under the lock.
+        with self.lock:
+            counters = self.stats.setdefault(endpoint, dict(executed=0, coalesced=0))
+            counters[counter] += 1
+
+    # * method: join
+    def join(self, key: str) -> Tuple[InFlightCall, bool]:
+        '''
+        Join the call in flight for a key, or start one.
+
+        :param key: The coalescing key.
+        :type key: str
+        :return: The call, and whether this request leads it.
+        :rtype: Tuple[InFlightCall, bool]
+        '''
+
+        # Look up or register the call under the lock.
+        with self.lock:
+            call = self.calls.get(key)
+            if call is not None:
+                return call, False
+            call = self.calls[key] = InFlightCall()
+            return call, True
+
+    # * method: finish
+    def finish(self, key: str, call: InFlightCall, result: Tuple[Any, int] = None, error: BaseException = None):
+        '''
+        Unregister a led call, then resolve it for the waiting requests.
+
+        :param key: The coalescing key.
+        :type key: str
+        :param call: The led call.
+        :type call: InFlightCall
+        :param result: The response and status code, if the feature returned.
+        :type result: Tuple[Any, int]
+        :param error: The error raised by the feature; a cancelled run cancels the call.
+        :type error: BaseException
+        '''
+
+        # Unregister the call, so later requests run the feature again.
+        with self.lock:
+            del self.calls[key]
+
+        # Resolve the future.
+        if isinstance(error, (asyncio.CancelledError, CancelledError)):
+            call.future.cancel()
+        elif error is not None:
+            call.future.set_exception(error)
+        else:
+            call.future.set_result(result)
+
+    # * method: share
+    def share(self, endpoint: str, future: Future) -> Tuple[Any, int] | None:
+        '''
+        Share the outcome of a call with a waiting request.
+
+        Each waiter raises its own copy of a shared error. Streamed
+        (iterator) responses can be read once, so they are not shared.
+
+        :param endpoint: The Flask endpoint.
+        :type endpoint: str
+        :param future: The call outcome.
+        :type future: Future
+        :return: The shared response and status code, or None if the request must run the feature itself.
+        :rtype: Tuple[Any, int] | None
+        '''
+
+        # Run the feature if the call timed out or was cancelled.
+        if not future.done() or future.cancelled():
+            self.count(endpoint, 'executed')
+            return None
+
+        # Raise a copy of the shared error.
+        error = future.exception()
+        if error is not None:
+            self.count(endpoint, 'coalesced')
+            raise self.copy_error(error)
+
+        # Share the response, unless it streams.
+        result = future.result()
+        if isinstance(result[0], Iterator):
+            self.count(endpoint, 'executed')
+            return None
+        self.count(endpoint, 'coalesced')
+        return result
+
+    # * method: copy_error
+    @staticmethod
+    def copy_error(error: BaseException) -> BaseException:
+        '''
+        Copy an error without calling its initializer, so each waiting request raises its own instance.
+
+        :param error: The shared error.
+        :type error: BaseException
+        :return: The copy, or the error itself if it cannot be copied.
+        :rtype: BaseException
+        '''
+
+        # Copy the args and attributes into a new instance.
+        try:
+            copied = type(error).__new__(type(error), *error.args)
+            copied.__dict__.update(getattr(error, '__dict__', {}))
+        except Exception:
+            return error
+        return copied
+
+    # * method: run
+    def run(self, entry: DispatchEntry, data: Dict[str, Any], run_feature: Callable[[], Tuple[Any, int]]) -> Tuple[Any, int]:
+        '''
+        Run the feature, or wait for the identical request already running it and share its response.
+
+        Errors are shared like responses. Streamed (iterator) responses can be
+        read once, so the waiting requests run the feature themselves.
+
+        :param entry: The dispatch entry of the route.
+        :type entry: DispatchEntry
+        :param data: The feature request data.
+        :type data: Dict[str, Any]
+        :param run_feature: Runs the feature, returning the response and status code.
+        :type run_feature: Callable[[], Tuple[Any, int]]
+        :return: The response and status code.
+        :rtype: Tuple[Any, int]
+        '''
+
+        # Run routes that do not coalesce directly.
+        key = self.build_key(entry, data)
+        if key is None:
+            return run_feature()
+
+        # Wait for the call in flight and share its outcome, running the feature if it times out, is cancelled or streams.
+        endpoint = entry.route.endpoint
+        call, leader = self.join(key)
+        if not leader:
+            wait((call.future,), timeout=self.get_options(entry).get('timeout'))
+            result = self.share(endpoint, call.future)
+            return result if result is not None else run_feature()
+
+        # Run the feature, then release the waiting requests.
+        self.count(endpoint, 'executed')
+        try:
+            result = run_feature()
+        except BaseException as error:
+            self.finish(key, call, error=error)
+            raise
+        self.finish(key, call, result=result)
+        return result
+
+    # * method: run_async
+    async def run_async(self, entry: DispatchEntry, data: Dict[str, Any], run_feature: Callable[[], Awaitable[Tuple[Any, int]]]) -> Tuple[Any, int]:
+        '''
+        Await the feature, or the identical request already running it on any thread or event loop, and share its response.
+
+        :param entry: The dispatch entry of the route.
+        :type entry: DispatchEntry
+        :param data: The feature request data.
+        :type data: Dict[str, Any]
+        :param run_feature: Awaits the feature, returning the response and status code.
+        :type run_feature: Callable[[], Awaitable[Tuple[Any, int]]]
+        :return: The response and status code.
+        :rtype: Tuple[Any, int]
+        '''
+
+        # Await routes that do not coalesce directly.
+        key = self.build_key(entry, data)
+        if key is None:
+            return await run_feature()
+
+        # Await the call in flight through a wrapper on this loop and share its outcome, awaiting the feature if it times out, is cancelled or streams.
+        endpoint = entry.route.endpoint
+        call, leader = self.join(key)
+        if not leader:
+            if not call.future.done():
+                await asyncio.wait({asyncio.wrap_future(call.future)}, timeout=self.get_options(entry).get('timeout'))
+            result = self.share(endpoint, call.future)
+            return result if result is not None else await run_feature()
+
+        # Await the feature, then release the waiting requests.
+        self.count(endpoint, 'executed')
+        try:
+            result = await run_feature()
+        except BaseException as error:
+            self.finish(key, call, error=error)
+            raise
+        self.finish(key, call, result=result)
+        return result
+
+    # * method: get_stats
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        '''
+        Get the executed and coalesced counters per endpoint.
+
+        :return: A copy of the counters, keyed by endpoint.
+        :rtype: Dict[str, Dict[str, int]]
+        '''
+
+        # Copy the counters under the lock.
+        with self.lock:
+            return {endpoint: dict(counters) for endpoint, counters in self.stats.items()}
+
+    # * method: render_prometheus
+    def render_prometheus(self) -> str:
+        '''
+        Render the counters in the Prometheus text exposition format.
+
+        :return: The metrics text.
+        :rtype: str
+        '''
+
+        # Write the executed and coalesced counters.
+        lines = [
+            '# HELP tiferet_flask_coalesced_requests_total Requests per endpoint that ran the feature or shared a response in flight.',
+            '# TYPE tiferet_flask_coalesced_requests_total counter',
+        ]
+        for endpoint, counters in sorted(self.get_stats().items()):
+            for outcome, count in counters.items():
+                lines.append(f'tiferet_flask_coalesced_requests_total{{endpoint="{endpoint}",outcome="{outcome}"}} {count}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,288 @@
+'''Flask CORS context.'''
+
+# *** imports
+
+# ** core
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, NamedTuple, Sequence, Tuple
+
+# ** infra
+from tiferet_openapi import ApiRouter
+
+
+# *** constants
+
+# ** constant: default_methods
+DEFAULT_METHODS = ('GET', 'HEAD', 'POST', 'OPTIONS', 'PUT', 'PATCH', 'DELETE')
+
+# ** constant: default_max_age
+DEFAULT_MAX_AGE = 7200
+
+
+# *** classes
+
+# ** class: cors_policy
+class CorsPolicy(NamedTuple):
+    '''
+    A precompiled CORS policy with its preflight and response headers.
+    '''
+
+    # * attribute: origins
+    origins: FrozenSet[str] | None
+
+    # * attribute: credentials
+    credentials: bool
+
+    # * attribute: preflight_headers
+    preflight_headers: Tuple[Tuple[str, str], ...]
+
+    # * attribute: response_headers
+    response_headers: Tuple[Tuple[str, str], ...]
+
+    # * attribute: echo_request_headers
+    echo_request_headers: bool
+
+
+# *** contexts
+
+# ** context: cors_context
+class CorsContext(object):
+    '''
+    A context compiling the CORS policy of each route once, so preflight
+    requests are answered from precomputed headers without entering the view.
+
+    Policies come from the `cors` blocks of the routers and routes in
+    openapi.yml, over the app defaults. A `cors: false` block disables CORS
+    for a router or route.
+    '''
+
+    # * attribute: defaults
+    defaults: Dict[str, Any]
+
+    # * attribute: default_policy
+    default_policy: CorsPolicy | None
+
+    # * attribute: policies
+    policies: Mapping[str, CorsPolicy | None]
+
+    # * init
+    def __init__(self,
+            routers: List[ApiRouter] = (),
+            options: Dict[str, Dict[str, Any]] = None,
+            **defaults,
+        ):
+        '''
+        Initialize the context, compiling the policies of the given routes.
+
+        :param routers: The ApiRouter domain objects to compile policies for.
+        :type routers: List[ApiRouter]
+        :param options: The Flask route options from openapi.yml, keyed by endpoint.
+        :type options: Dict[str, Dict[str, Any]]
+        :param defaults: The app-wide CORS options (origins, methods, headers, expose_headers, max_age, credentials), also applied to endpoints outside the routers.
+        :type defaults: dict
+        '''
+
+        # Compile the default policy, then the route policies.
+        self.defaults = defaults
+        self.default_policy = self.compile_policy(**defaults)
+        self.policies = MappingProxyType({})
+        self.compile(routers, options)
+
+    # * method: compile
+    def compile(self, routers: List[ApiRouter], options: Dict[str, Dict[str, Any]] = None) -> Mapping[str, CorsPolicy | None]:
+        '''
+        Compile the route policies, replacing the previous ones in a single assignment.
+
+        :param routers: The ApiRouter domain objects to compile policies for.
+        :type routers: List[ApiRouter]
+        :param options: The Flask route options from openapi.yml, keyed by endpoint.
+        :type options: Dict[str, Dict[str, Any]]
+        :return: The compiled policies, keyed by endpoint.
+        :rtype: Mapping[str, CorsPolicy | None]
+        '''
+
+        # Compile each route policy over the defaults, allowing the route methods.
+        options = options or {}
+        policies = {}
+        for router in routers:
+            for route in router.routes:
+                cors = options.get(route.endpoint, {}).get('cors', {})
+                if cors is False:
+                    policies[route.endpoint] = None
+                    continue
+                methods = list(route.methods) + ['OPTIONS']
+                if 'GET' in methods:
+                    methods.append('HEAD')
+                policies[route.endpoint] = self.compile_policy(**{**self.defaults, 'methods': methods, **(cors or {})})
+
+        # Swap in the compiled policies.
+        self.policies = MappingProxyType(policies)
+        return self.policies
+
+    # * method: compile_policy
+    @staticmethod
+    def compile_policy(
+            origins: str | Sequence[str] = '*',
+            methods: Sequence[str] = DEFAULT_METHODS,
+            headers: str | Sequence[str] = '*',
+            expose_headers: Sequence[str] = (),
+            max_age: int | None = DEFAULT_MAX_AGE,
+            credentials: bool = False,
+            enabled: bool = True,
+        ) -> CorsPolicy | None:
+        '''
+        Compile a CORS policy.
+
+        :param origins: The allowed origins, or '*' for any origin.
+        :type origins: str | Sequence[str]
+        :param methods: The allowed methods.
+        :type methods: Sequence[str]
+        :param headers: The allowed request headers, or '*' for any header.
+        :type headers: str | Sequence[str]
+        :param expose_headers: The response headers exposed to the browser.
+        :type expose_headers: Sequence[str]
+        :param max_age: The seconds browsers may cache the preflight response; not sent if None.
+        :type max_age: int | None
+        :param credentials: Whether to allow credentialed requests.
+        :type credentials: bool
+        :param enabled: Whether CORS is enabled.
+        :type enabled: bool
+        :return: The compiled policy, or None if CORS is disabled.
+        :rtype: CorsPolicy | None
+        '''
+
+        # Skip disabled policies.
+        if not enabled:
+            return None
+
+        # Normalize the origins and headers, where '*' allows any.
+        if isinstance(origins, str):
+            origins = [origins]
+        if isinstance(headers, str):
+            headers = [headers]
+        any_origin = '*' in origins
+        any_header = '*' in headers
+
+        # Compile the headers shared by the preflight and actual responses.
+        shared = []
+        if credentials:
+            shared.append(('Access-Control-Allow-Credentials', 'true'))
+        if any_origin and not credentials:
+            shared.append(('Access-Control-Allow-Origin', '*'))
+
+        # Compile the preflight headers; wildcard headers are not honored on credentialed requests.
+        preflight = list(shared)
+        preflight.append(('Access-Control-Allow-Methods', ', '.join(dict.fromkeys(method.upper() for method in methods))))
+        if not (any_header and credentials):
+            preflight.append(('Access-Control-Allow-Headers', ', '.join(headers)))
+        if max_age is not None:
+            preflight.append(('Access-Control-Max-Age', str(int(max_age))))
+
+        # Compile the actual response headers.
+        response = list(shared)
+        if expose_headers:
+            response.append(('Access-Control-Expose-Headers', ', '.join(expose_headers)))
+
+        # Return the policy.
+        return CorsPolicy(
+            origins=None if any_origin else frozenset(origins),
+            credentials=credentials,
+            preflight_headers=tuple(preflight),
+            response_headers=tuple(response),
+            echo_request_headers=any_header and credentials,
+        )
+
+    # * method: get_policy
+    def get_policy(self, endpoint: str | None) -> CorsPolicy | None:
+        '''
+        Get the CORS policy of an endpoint.
+
+        :param endpoint: The Flask endpoint, or None for unmatched requests.
+        :type endpoint: str | None
+        :return: The route policy, the default policy for endpoints outside the routers, or None if CORS is disabled.
+        :rtype: CorsPolicy | None
+        '''
+
+        # Return the route policy, falling back to the default.
+        try:
+            return self.policies[endpoint]
+        except KeyError:
+            return self.default_policy
+
+    # * method: get_origin_headers
+    @staticmethod
+    def get_origin_headers(policy: CorsPolicy, origin: str) -> List[Tuple[str, str]] | None:
+        '''
+        Get the headers allowing a request origin.
+
+        :param policy: The CORS policy.
+        :type policy: CorsPolicy
+        :param origin: The Origin request header.
+        :type origin: str
+        :return: The origin headers (none for any origin without credentials), or None if the origin is not allowed.
+        :rtype: List[Tuple[str, str]] | None
+        '''
+
+        # Allow any origin with the precompiled wildcard, unless credentials require echoing it.
+        if policy.origins is None:
+            if not policy.credentials:
+                return []
+            return [('Access-Control-Allow-Origin', origin), ('Vary', 'Origin')]
+
+        # Echo allowed origins only.
+        if origin in policy.origins:
+            return [('Access-Control-Allow-Origin', origin), ('Vary', 'Origin')]
+        return None
+
+    # * method: get_preflight_headers
+    def get_preflight_headers(self, endpoint: str | None, origin: str, request_headers: str = None) -> List[Tuple[str, str]] | None:
+        '''
+        Get the headers of a preflight response.
+
+        :param endpoint: The Flask endpoint, or None for unmatched requests.
+        :type endpoint: str | None
+        :param origin: The Origin request header.
+        :type origin: str
+        :param request_headers: The Access-Control-Request-Headers request header.
+        :type request_headers: str
+        :return: The preflight headers (empty if the origin is not allowed), or None if CORS is disabled for the endpoint.
+        :rtype: List[Tuple[str, str]] | None
+        '''
+
+        # Skip endpoints without CORS.
+        policy = self.get_policy(endpoint)
+        if policy is None:
+            return None
+
+        # Answer disallowed origins without CORS headers, so the browser blocks the request.
+        origin_headers = self.get_origin_headers(policy, origin)
+        if origin_headers is None:
+            return []
+
+        # Add the precompiled headers, echoing the requested headers if any are allowed with credentials.
+        headers = origin_headers + list(policy.preflight_headers)
+        if policy.echo_request_headers and request_headers:
+            headers.append(('Access-Control-Allow-Headers', request_headers))
+        return headers
+
+    # * method: get_response_headers
+    def get_response_headers(self, endpoint: str | None, origin: str) -> List[Tuple[str, str]]:
+        '''
+        Get the CORS headers of an actual (non-preflight) response.
+
+        :param endpoint: The Flask endpoint, or None for unmatched requests.
+        :type endpoint: str | None
+        :param origin: The Origin request header.
+        :type origin: str
+        :return: The CORS headers, empty if CORS is disabled or the origin is not allowed.
+        :rtype: List[Tuple[str, str]]
+        '''
+
+        # Add the origin headers and the precompiled response headers.
+        policy = self.get_policy(endpoint)
+        if policy is None:
+            return []
+        origin_headers = self.get_origin_headers(policy, origin)
+        if origin_headers is None:
+            return []
+        return origin_headers + list(policy.response_headers)
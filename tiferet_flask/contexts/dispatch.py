@@ -0,0 +1,133 @@
+'''Flask dispatch context.'''
+
+# *** imports
+
+# ** core
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Tuple
+
+# ** infra
+from tiferet_openapi import ApiRoute, ApiRouter
+
+
+# *** classes
+
+# ** class: dispatch_entry
+class DispatchEntry(NamedTuple):
+    '''
+    A precompiled, immutable dispatch record for a single Flask endpoint.
+    '''
+
+    # * attribute: route
+    route: ApiRoute
+
+    # * attribute: status_code
+    status_code: int
+
+    # * attribute: feature_id
+    feature_id: str
+
+    # * attribute: options
+    options: Mapping[str, Any]
+
+    # * attribute: params
+    params: Tuple[str, ...] | None
+
+
+# *** contexts
+
+# ** context: dispatch_context
+class DispatchContext(object):
+    '''
+    An immutable dispatch table mapping Flask endpoints to their routes and
+    error codes to their HTTP status codes.
+    '''
+
+    # * attribute: routes
+    routes: Mapping[str, DispatchEntry]
+
+    # * attribute: errors
+    errors: Mapping[str, int]
+
+    # * init
+    def __init__(self,
+            routers: List[ApiRouter],
+            errors: Dict[str, int] = None,
+            options: Dict[str, Dict[str, Any]] = None,
+        ):
+        '''
+        Compile the dispatch table from the configured routers and error map.
+
+        :param routers: The ApiRouter domain objects to compile.
+        :type routers: List[ApiRouter]
+        :param errors: The error code to HTTP status code map.
+        :type errors: Dict[str, int]
+        :param options: The Flask route options from openapi.yml, keyed by endpoint.
+        :type options: Dict[str, Dict[str, Any]]
+        '''
+
+        # Compile one dispatch entry per route, keyed by the Flask endpoint.
+        options = options or {}
+        routes = {}
+        for router in routers:
+            for route in router.routes:
+                route_options = dict(options.get(route.endpoint, {}))
+                params = route_options.get('params')
+                routes[route.endpoint] = DispatchEntry(
+                    route=route,
+                    status_code=route.status_code,
+                    feature_id=route.endpoint,
+                    options=MappingProxyType(route_options),
+                    params=tuple(params) if params is not None else None,
+                )
+
+        # Freeze the compiled maps as read-only views.
+        self.routes = MappingProxyType(routes)
+        self.errors = MappingProxyType(dict(errors or {}))
+
+    # * method: get_entry
+    def get_entry(self, endpoint: str) -> DispatchEntry | None:
+        '''
+        Get the dispatch entry for a Flask endpoint.
+
+        :param endpoint: The Flask endpoint (router_name.route_id).
+        :type endpoint: str
+        :return: The dispatch entry, or None if the endpoint is not compiled.
+        :rtype: DispatchEntry | None
+        '''
+
+        # Return the compiled entry.
+        return self.routes.get(endpoint)
+
+    # * method: get_route
+    def get_route(self, endpoint: str, **kwargs) -> ApiRoute | None:
+        '''
+        Get the route for a Flask endpoint (GetRoute handler replacement).
+
+        :param endpoint: The Flask endpoint (router_name.route_id).
+        :type endpoint: str
+        :param kwargs: Additional keyword arguments.
+        :type kwargs: dict
+        :return: The compiled route, or None if the endpoint is not compiled.
+        :rtype: ApiRoute | None
+        '''
+
+        # Return the route from the compiled entry.
+        entry = self.routes.get(endpoint)
+        return entry.route if entry else None
+
+    # * method: get_status_code
+    def get_status_code(self, error_code: str, **kwargs) -> int:
+        '''
+        Get the HTTP status code for an error code (GetStatusCode handler replacement).
+
+        :param error_code: The error code to look up.
+        :type error_code: str
+        :param kwargs: Additional keyword arguments.
+        :type kwargs: dict
+        :return: The mapped status code, defaulting to 500.
+        :rtype: int
+        '''
+
+        # Return the mapped status code, defaulting to 500.
+        return self.errors.get(error_code, 500)
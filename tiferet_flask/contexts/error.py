@@ -0,0 +1,149 @@
+'''Flask error template context.'''
+
+# *** imports
+
+# ** core
+from typing import Any, Callable, Dict, Iterable, Mapping, NamedTuple, Tuple
+
+# ** infra
+from tiferet import TiferetError
+
+
+# *** classes
+
+# ** class: error_response
+class ErrorResponse(dict):
+    '''
+    An error payload returned by the interface context in place of a raised TiferetAPIError.
+    '''
+
+    pass
+
+
+# ** class: error_template
+class ErrorTemplate(NamedTuple):
+    '''
+    A precompiled error definition with its message texts and HTTP status code.
+    '''
+
+    # * attribute: error_code
+    error_code: str
+
+    # * attribute: name
+    name: str
+
+    # * attribute: messages
+    messages: Mapping[str, str]
+
+    # * attribute: status_code
+    status_code: int
+
+
+# *** contexts
+
+# ** context: error_template_context
+class ErrorTemplateContext(object):
+    '''
+    A context formatting feature errors from precompiled templates, so error
+    responses skip the error lookups and the TiferetAPIError raise.
+    '''
+
+    # * attribute: get_error_handler
+    get_error_handler: Callable
+
+    # * attribute: get_status_code_handler
+    get_status_code_handler: Callable
+
+    # * attribute: templates
+    templates: Dict[str, ErrorTemplate | None]
+
+    # * init
+    def __init__(self,
+            get_error_handler: Callable,
+            get_status_code_handler: Callable,
+            error_codes: Iterable[str] = (),
+        ):
+        '''
+        Initialize the context, compiling the templates of the given error codes.
+
+        :param get_error_handler: Loads an Error domain object by its code (e.g. the get_error_evt handler).
+        :type get_error_handler: Callable
+        :param get_status_code_handler: Maps an error code to its HTTP status code.
+        :type get_status_code_handler: Callable
+        :param error_codes: The error codes to compile up front, e.g. those mapped in openapi.yml.
+        :type error_codes: Iterable[str]
+        '''
+
+        # Set the handlers and compile the known error codes.
+        self.get_error_handler = get_error_handler
+        self.get_status_code_handler = get_status_code_handler
+        self.templates = {}
+        for error_code in error_codes:
+            self.load_template(error_code)
+
+    # * method: load_template
+    def load_template(self, error_code: str) -> ErrorTemplate | None:
+        '''
+        Compile and store the template of an error code.
+
+        :param error_code: The error code.
+        :type error_code: str
+        :return: The template, or None if the error is not defined.
+        :rtype: ErrorTemplate | None
+        '''
+
+        # Load the error definition, remembering undefined codes as well.
+        try:
+            error = self.get_error_handler(error_code, include_defaults=True)
+        except TiferetError:
+            error = None
+        if error is None:
+            self.templates[error_code] = None
+            return None
+
+        # Compile the message texts by language and the status code.
+        template = ErrorTemplate(
+            error_code=error.id,
+            name=error.name,
+            messages={message.lang: message.text for message in error.message},
+            status_code=self.get_status_code_handler(error_code=error_code),
+        )
+        self.templates[error_code] = template
+        return template
+
+    # * method: format_error
+    def format_error(self, error: TiferetError, lang: str = 'en_US') -> Tuple[ErrorResponse, int] | None:
+        '''
+        Format a feature error as its response payload and status code.
+
+        :param error: The feature error.
+        :type error: TiferetError
+        :param lang: The language of the error message.
+        :type lang: str
+        :return: The error payload and status code, or None if the error has no template or message.
+        :rtype: Tuple[ErrorResponse, int] | None
+        '''
+
+        # Look up the template, compiling it on first use for codes not known at build time.
+        error_code = error.error_code
+        try:
+            template = self.templates[error_code]
+        except KeyError:
+            template = self.load_template(error_code)
+        if template is None:
+            return None
+
+        # Format the message like Error.format_response.
+        text = template.messages.get(lang)
+        if not text:
+            return None
+        kwargs = error.kwargs
+        message = text.format(**kwargs) if kwargs else text
+
+        # Return the payload with the mapped status code.
+        return ErrorResponse(
+            error_code=template.error_code,
+            name=template.name,
+            message=message,
+            **kwargs,
+        ), template.status_code
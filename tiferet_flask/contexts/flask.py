@@ -2,9 +2,29 @@
 
 # *** imports
 
+# ** core
+import gzip
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
 # ** infra
-from flask import Blueprint, Response, jsonify
-from tiferet_openapi import OpenApiContext
+from flask import Blueprint, Response, request
+from tiferet import TiferetError
+from tiferet_openapi import ApiRouter, OpenApiContext
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ** app
+from .dispatch import DispatchContext
+from .error import ErrorTemplateContext
+from .metrics import MetricsContext
+from .request import FlaskRequestContext, PooledRequestContext, RequestContextPool
+from .schema import RequestSchemaContext
 
 
 # *** contexts
@@ -15,8 +35,488 @@ class FlaskApiContext(OpenApiContext):
     A Flask-specific API context extending the shared OpenAPI context.
     '''
 
+    # * attribute: dispatch
+    dispatch: DispatchContext = None
+
+    # * attribute: raw_models
+    raw_models: bool = False
+
+    # * attribute: metrics
+    metrics: MetricsContext = None
+
+    # * attribute: error_templates
+    error_templates: ErrorTemplateContext = None
+
+    # * attribute: request_pool
+    request_pool: RequestContextPool = None
+
+    # * attribute: request_schemas
+    request_schemas: RequestSchemaContext = None
+
+    # * attribute: spec_variants
+    spec_variants: Dict[Tuple[str, str, str], Dict[str, Tuple[bytes, str]]] = None
+
+    # * method: parse_request
+    def parse_request(self, headers: dict = {}, data: dict = {}, feature_id: str = None, **kwargs) -> FlaskRequestContext | PooledRequestContext:
+        '''
+        Parse the incoming request into a FlaskRequestContext, or a pooled context if a request pool is set.
+
+        :param headers: The request headers.
+        :type headers: dict
+        :param data: The request data.
+        :type data: dict
+        :param feature_id: The feature ID.
+        :type feature_id: str
+        :param kwargs: Additional keyword arguments.
+        :type kwargs: dict
+        :return: The request context, keeping pydantic results as models if raw_models is set.
+        :rtype: FlaskRequestContext | PooledRequestContext
+        '''
+
+        # Take a request context from the pool if set.
+        started = time.perf_counter()
+        if self.request_pool is not None:
+            request = self.request_pool.acquire(headers, data, feature_id, self.raw_models)
+
+        # Otherwise create the request context.
+        else:
+            request = FlaskRequestContext(
+                headers=headers,
+                data=data,
+                feature_id=feature_id,
+            )
+            request.raw_models = self.raw_models
+
+        # Record the phase if metrics are enabled.
+        if self.metrics is not None:
+            self.metrics.record(feature_id, 'parse_request', started)
+        return request
+
+    # * method: record_phase
+    @contextmanager
+    def record_phase(self, feature_id: str, phase: str) -> Iterator[None]:
+        '''
+        Record the duration of a request phase if metrics are enabled, whether or not it raises.
+
+        :param feature_id: The feature identifier.
+        :type feature_id: str
+        :param phase: The phase name.
+        :type phase: str
+        '''
+
+        # Run the phase directly if metrics are disabled.
+        if self.metrics is None:
+            yield
+            return
+
+        # Record the phase once it finishes.
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.metrics.record(feature_id, phase, started)
+
+    # * method: start_run
+    def start_run(self, feature_id: str, headers: Dict[str, str], data: Dict[str, Any]) -> Tuple[Any, FlaskRequestContext | PooledRequestContext, float]:
+        '''
+        Start a feature run: build the logger and parse the request.
+
+        :param feature_id: The feature identifier.
+        :type feature_id: str
+        :param headers: The request headers.
+        :type headers: dict
+        :param data: The request data.
+        :type data: dict
+        :return: The logger, the request context and the run start time.
+        :rtype: Tuple[Any, FlaskRequestContext | PooledRequestContext, float]
+        '''
+
+        # Start timing, then create the logger and parse the request.
+        start_time = time.perf_counter()
+        logger = self.logging.build_logger()
+        logger.debug(f'Parsing request for feature: {feature_id}')
+        request = self.parse_request(headers, data, feature_id)
+        logger.debug(f'Executing feature: {feature_id} with request: {request.data}')
+        return logger, request, start_time
+
+    # * method: fail_run
+    def fail_run(self, logger: Any, feature_id: str, error: TiferetError, **kwargs) -> Any:
+        '''
+        Log a feature error and handle it.
+
+        :param logger: The run logger.
+        :type logger: Any
+        :param feature_id: The feature identifier.
+        :type feature_id: str
+        :param error: The feature error.
+        :type error: TiferetError
+        :param kwargs: Additional keyword arguments.
+        :type kwargs: dict
+        :return: The error response and status code.
+        :rtype: Any
+        '''
+
+        # Log and handle the error.
+        logger.error(f'Error executing feature {feature_id}: {str(error)}')
+        return self.handle_error(error, **kwargs)
+
+    # * method: finish_run
+    def finish_run(self, logger: Any, feature_id: str, request: FlaskRequestContext, start_time: float) -> Any:
+        '''
+        Log a successful feature run with its timing and handle the response.
+
+        :param logger: The run logger.
+        :type logger: Any
+        :param feature_id: The feature identifier.
+        :type feature_id: str
+        :param request: The request context.
+        :type request: FlaskRequestContext
+        :param start_time: The run start time, from time.perf_counter().
+        :type start_time: float
+        :return: The response and status code.
+        :rtype: Any
+        '''
+
+        # Log successful execution with timing.
+        duration_ms = round((time.perf_counter() - start_time) * 1000)
+        logger.debug(f'Feature {feature_id} executed successfully, handling response.')
+        logger.info(f'Executed Feature - {feature_id} ({duration_ms}ms)')
+
+        # Handle response.
+        return self.handle_response(request)
+
+    # * method: run
+    def run(self, feature_id: str, headers: Dict[str, str] = {}, data: Dict[str, Any] = {}, **kwargs) -> Any:
+        '''
+        Run the feature, returning pooled request contexts to the pool afterwards.
+
+        :param feature_id: The feature identifier.
+        :type feature_id: str
+        :param headers: The request headers.
+        :type headers: dict
+        :param data: The request data.
+        :type data: dict
+        :param kwargs: Additional keyword arguments.
+        :type kwargs: dict
+        :return: The response and status code.
+        :rtype: Any
+        '''
+
+        # Mark the pool, so the contexts acquired by this run are released even if it raises.
+        mark = self.request_pool.mark() if self.request_pool is not None else None
+        try:
+            logger, request, start_time = self.start_run(feature_id, headers, data)
+
+            # Execute the feature, handling its errors.
+            try:
+                self.execute_feature(feature_id=feature_id, request=request, logger=logger, **kwargs)
+            except TiferetError as e:
+                return self.fail_run(logger, feature_id, e, **kwargs)
+            return self.finish_run(logger, feature_id, request, start_time)
+
+        # Return the pooled request contexts to the pool.
+        finally:
+            if mark is not None:
+                self.request_pool.release_to(mark)
+
+    # * method: run_async
+    async def run_async(self,
+            feature_id: str,
+            headers: Dict[str, str] = {},
+            data: Dict[str, Any] = {},
+            **kwargs) -> Any:
+        '''
+        Run the feature on the event loop, awaiting its async commands.
+
+        Shares every step with run except the feature execution. Since runs
+        interleave on the loop, only the run's own pooled request context is
+        returned to the pool afterwards.
+
+        :param feature_id: The feature identifier.
+        :type feature_id: str
+        :param headers: The request headers.
+        :type headers: dict
+        :param data: The request data.
+        :type data: dict
+        :param kwargs: Additional keyword arguments.
+        :type kwargs: dict
+        :return: The response and status code.
+        :rtype: Any
+        '''
+
+        # Start the run.
+        logger, request, start_time = self.start_run(feature_id, headers, data)
+        try:
+
+            # Await the feature, handling its errors.
+            try:
+                await self.execute_feature_async(feature_id=feature_id, request=request, logger=logger, **kwargs)
+            except TiferetError as e:
+                return self.fail_run(logger, feature_id, e, **kwargs)
+            return self.finish_run(logger, feature_id, request, start_time)
+
+        # Return a pooled request context to the pool.
+        finally:
+            if self.request_pool is not None:
+                self.request_pool.release(request)
+
+    # * method: execute_feature
+    def execute_feature(self, feature_id: str, request: FlaskRequestContext, **kwargs):
+        '''
+        Execute the feature request, recording its duration if metrics are enabled.
+
+        :param feature_id: The feature identifier.
+        :type feature_id: str
+        :param request: The request context object.
+        :type request: FlaskRequestContext
+        :param kwargs: Additional keyword arguments.
+        :type kwargs: dict
+        '''
+
+        # Execute the feature within the phase.
+        with self.record_phase(feature_id, 'execute_feature'):
+            return super().execute_feature(feature_id, request, **kwargs)
+
+    # * method: execute_feature_async
+    async def execute_feature_async(self, feature_id: str, request: FlaskRequestContext, **kwargs):
+        '''
+        Execute the feature request, awaiting async commands on the running loop and recording its duration if metrics are enabled.
+
+        :param feature_id: The feature identifier.
+        :type feature_id: str
+        :param request: The request context object.
+        :type request: FlaskRequestContext
+        :param kwargs: Additional keyword arguments.
+        :type kwargs: dict
+        '''
+
+        # Add the feature id to the request headers, as execute_feature does, and await the feature within the phase.
+        with self.record_phase(feature_id, 'execute_feature'):
+            request.headers.update(dict(feature_id=feature_id))
+            await self.features.execute_feature_async(feature_id, request, **kwargs)
+
+    # * method: handle_response
+    def handle_response(self, request: FlaskRequestContext, **kwargs) -> Any:
+        '''
+        Handle the response from the request context, recording its duration if metrics are enabled.
+
+        :param request: The request context.
+        :type request: FlaskRequestContext
+        :param kwargs: Additional keyword arguments.
+        :type kwargs: dict
+        :return: The response and status code.
+        :rtype: Any
+        '''
+
+        # Handle the response within the phase.
+        with self.record_phase(request.feature_id, 'handle_response'):
+            return super().handle_response(request, **kwargs)
+
+    # * method: compile_dispatch
+    def compile_dispatch(self,
+            routers: List[ApiRouter] = None,
+            errors: Dict[str, int] = None,
+            options: Dict[str, Dict[str, Any]] = None,
+        ) -> DispatchContext:
+        '''
+        Compile an immutable dispatch table and route lookups through it.
+
+        :param routers: The routers to compile; loaded via the routers handler if None.
+        :type routers: List[ApiRouter]
+        :param errors: The error code to status code map; status codes stay event-backed if None.
+        :type errors: Dict[str, int]
+        :param options: The Flask route options from openapi.yml, keyed by endpoint.
+        :type options: Dict[str, Dict[str, Any]]
+        :return: The compiled dispatch table.
+        :rtype: DispatchContext
+        '''
+
+        # Load the routers via the domain event handler if none are given.
+        if routers is None:
+            routers = self.get_routers_handler()
+
+        # Compile the dispatch table.
+        dispatch = DispatchContext(routers, errors, options)
+
+        # Keep the event-backed handlers so the table can be invalidated.
+        if self.dispatch is None:
+            self._get_route_evt_handler = self.get_route_handler
+            self._get_status_code_evt_handler = self.get_status_code_handler
+
+        # Swap the handlers to the dict-backed lookups.
+        self.get_route_handler = dispatch.get_route
+        self.get_status_code_handler = dispatch.get_status_code if errors is not None else self._get_status_code_evt_handler
+        self.dispatch = dispatch
+
+        # Recompile the error templates against the new status codes.
+        if self.error_templates is not None:
+            self.compile_error_templates()
+
+        # Return the compiled dispatch table.
+        return dispatch
+
+    # * method: invalidate_dispatch
+    def invalidate_dispatch(self):
+        '''
+        Drop the compiled dispatch table and restore the event-backed handlers.
+        '''
+
+        # Nothing to do if no table is compiled.
+        if self.dispatch is None:
+            return
+
+        # Restore the event-backed handlers and drop the table.
+        self.get_route_handler = self._get_route_evt_handler
+        self.get_status_code_handler = self._get_status_code_evt_handler
+        self.dispatch = None
+
+        # Recompile the error templates against the event-backed status codes.
+        if self.error_templates is not None:
+            self.compile_error_templates()
+
+    # * method: compile_error_templates
+    def compile_error_templates(self) -> ErrorTemplateContext:
+        '''
+        Precompile the error templates and status codes, so handle_error returns
+        error responses instead of raising TiferetAPIError.
+
+        :return: The compiled error templates.
+        :rtype: ErrorTemplateContext
+        '''
+
+        # Compile the error codes mapped in the dispatch table; others compile on first use.
+        self.error_templates = ErrorTemplateContext(
+            self.errors.get_error_handler,
+            self.get_status_code_handler,
+            error_codes=self.dispatch.errors if self.dispatch else (),
+        )
+        return self.error_templates
+
+    # * method: handle_error
+    def handle_error(self, error: Exception, **kwargs) -> Any:
+        '''
+        Handle the error, returning the precompiled error response if available.
+
+        :param error: The error to handle.
+        :type error: Exception
+        :param kwargs: Additional keyword arguments.
+        :type kwargs: dict
+        :return: The ErrorResponse payload and status code.
+        :rtype: Tuple[ErrorResponse, int]
+        :raises TiferetAPIError: If the error templates are not compiled or do not cover the error.
+        '''
+
+        # Return the templated error response without raising.
+        if self.error_templates is not None and isinstance(error, TiferetError):
+            response = self.error_templates.format_error(error)
+            if response is not None:
+                return response
+
+        # Otherwise format and raise the error as usual.
+        return super().handle_error(error, **kwargs)
+
+    # * method: generate_spec
+    def generate_spec(self, title: str = 'API', version: str = '1.0.0', description: str = '') -> dict:
+        '''
+        Generate an OpenAPI 3.0 specification, describing the request models of the routes if compiled.
+
+        :param title: The API title.
+        :type title: str
+        :param version: The API version.
+        :type version: str
+        :param description: The API description.
+        :type description: str
+        :return: An OpenAPI 3.0 spec dict.
+        :rtype: dict
+        '''
+
+        # Generate the spec, then add the compiled request schemas.
+        spec = super().generate_spec(title=title, version=version, description=description)
+        if self.request_schemas is not None:
+            self.request_schemas.add_to_spec(spec)
+        return spec
+
+    # * method: serialize_spec
+    def serialize_spec(self, spec: Dict[str, Any], spec_path: str = None) -> Dict[str, Tuple[bytes, str]]:
+        '''
+        Serialize an OpenAPI spec once into its identity, gzip and brotli encodings.
+
+        :param spec: The OpenAPI spec dict.
+        :type spec: Dict[str, Any]
+        :param spec_path: Optional file path to write the encoded spec files to.
+        :type spec_path: str
+        :return: A map of content encoding to (body, strong ETag) pairs.
+        :rtype: Dict[str, Tuple[bytes, str]]
+        '''
+
+        # Serialize the spec to compact JSON bytes and derive the base ETag.
+        body = json.dumps(spec, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:32]
+
+        # Build the encoded variants, each with its own strong ETag.
+        variants = {
+            'identity': (body, f'"{digest}"'),
+            'gzip': (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gzip"'),
+        }
+        if brotli:
+            variants['br'] = (brotli.compress(body), f'"{digest}-br"')
+
+        # Write the encoded files for a reverse proxy to serve directly.
+        if spec_path:
+            suffixes = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+            for encoding, (content, _) in variants.items():
+                with open(f'{spec_path}{suffixes[encoding]}', 'wb') as spec_file:
+                    spec_file.write(content)
+
+        # Return the encoded variants.
+        return variants
+
+    # * method: get_spec_variants
+    def get_spec_variants(self, title: str = 'API', version: str = '1.0.0', description: str = '', spec_path: str = None) -> Dict[str, Tuple[bytes, str]]:
+        '''
+        Get the encoded variants of the OpenAPI spec, generating and serializing it once per title, version and description.
+
+        :param title: The API title.
+        :type title: str
+        :param version: The API version.
+        :type version: str
+        :param description: The API description.
+        :type description: str
+        :param spec_path: Optional file path to write the encoded spec files to when first serialized.
+        :type spec_path: str
+        :return: A map of content encoding to (body, strong ETag) pairs.
+        :rtype: Dict[str, Tuple[bytes, str]]
+        '''
+
+        # Return the variants serialized already.
+        key = (title, version, description)
+        spec_variants = self.spec_variants or {}
+        if key in spec_variants:
+            return spec_variants[key]
+
+        # Otherwise generate and serialize the spec, swapping in the extended cache.
+        spec = self.generate_spec(title=title, version=version, description=description)
+        variants = self.serialize_spec(spec, spec_path=spec_path)
+        self.spec_variants = {**spec_variants, key: variants}
+        return variants
+
+    # * method: clear_spec_variants
+    def clear_spec_variants(self):
+        '''
+        Drop the serialized spec variants, e.g. after the routes change.
+        '''
+
+        # Reset the cache.
+        self.spec_variants = None
+
     # * method: create_swagger_blueprint
-    def create_swagger_blueprint(self, title: str = 'API', version: str = '1.0.0', description: str = '') -> Blueprint:
+    def create_swagger_blueprint(self,
+            title: str = 'API',
+            version: str = '1.0.0',
+            description: str = '',
+            cache_max_age: int = 3600,
+            spec_path: str = None,
+        ) -> Blueprint:
         '''
         Create a Flask Blueprint serving Swagger UI and the OpenAPI spec.
 
@@ -26,20 +526,47 @@ class FlaskApiContext(OpenApiContext):
         :type version: str
         :param description: The API description.
         :type description: str
+        :param cache_max_age: The Cache-Control max-age for the spec, in seconds.
+        :type cache_max_age: int
+        :param spec_path: Optional file path to write the encoded spec files to at build time.
+        :type spec_path: str
         :return: A Flask Blueprint serving /docs and /docs/openapi.json.
         :rtype: Blueprint
         '''
 
-        # Generate the OpenAPI spec.
-        spec = self.generate_spec(title=title, version=version, description=description)
+        # Get the OpenAPI spec, serialized once (e.g. by preload before forking).
+        variants = self.get_spec_variants(title=title, version=version, description=description, spec_path=spec_path)
+        cache_control = f'public, max-age={cache_max_age}'
 
         # Create the swagger blueprint.
         swagger_bp = Blueprint('swagger', __name__, url_prefix='/docs')
 
-        # Register the JSON spec endpoint.
+        # Register the JSON spec endpoint serving the pre-encoded bytes.
         @swagger_bp.route('/openapi.json')
         def openapi_json():
-            return jsonify(spec)
+
+            # Select the preferred encoding the client accepts.
+            encoding = next(
+                (name for name in ('br', 'gzip') if name in variants and request.accept_encodings[name]),
+                'identity',
+            )
+            body, etag = variants[encoding]
+
+            # Build the headers shared by full and not-modified responses.
+            headers = {
+                'ETag': etag,
+                'Cache-Control': cache_control,
+                'Vary': 'Accept-Encoding',
+            }
+
+            # Return not modified if the client already holds this variant.
+            if request.if_none_match.contains_weak(etag.strip('"')):
+                return Response(status=304, headers=headers)
+
+            # Return the encoded spec.
+            if encoding != 'identity':
+                headers['Content-Encoding'] = encoding
+            return Response(body, content_type='application/json', headers=headers)
 
         # Register the Swagger UI endpoint (CDN-hosted, no extra dependency).
         @swagger_bp.route('/')
@@ -0,0 +1,149 @@
+'''Flask JSON provider.'''
+
+# *** imports
+
+# ** core
+import json
+from typing import Any
+
+# ** infra
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel
+from pydantic_core import to_json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# *** contexts
+
+# ** context: flask_json_provider
+class FlaskJsonProvider(DefaultJSONProvider):
+    '''
+    A Flask JSON provider writing responses straight to bytes, with orjson
+    when available and pydantic results serialized without an intermediate dict.
+    '''
+
+    # * attribute: sort_keys
+    sort_keys = False
+
+    # * method: default
+    @staticmethod
+    def default(obj: Any) -> Any:
+        '''
+        Convert objects the JSON encoder does not support natively.
+
+        :param obj: The object to convert.
+        :type obj: Any
+        :return: A JSON-serializable value.
+        :rtype: Any
+        '''
+
+        # Dump nested pydantic models in JSON mode.
+        if isinstance(obj, BaseModel):
+            return obj.model_dump(mode='json')
+
+        # Fall back to the Flask conversions (HTTP dates, decimals, uuids, dataclasses).
+        return DefaultJSONProvider.default(obj)
+
+    # * method: dump_bytes
+    def dump_bytes(self, obj: Any) -> bytes:
+        '''
+        Serialize an object to JSON bytes.
+
+        orjson writes infinities and NaN as null, where the standard library
+        and pydantic write the non-standard Infinity and NaN literals.
+
+        :param obj: The object to serialize.
+        :type obj: Any
+        :return: The JSON bytes.
+        :rtype: bytes
+        '''
+
+        # Serialize pydantic models directly.
+        if isinstance(obj, BaseModel):
+            return obj.model_dump_json().encode('utf-8')
+
+        # Serialize lists and dicts of models in a single pydantic pass.
+        if isinstance(obj, (list, tuple)) and any(isinstance(item, BaseModel) for item in obj):
+            return to_json(obj)
+        if isinstance(obj, dict) and any(isinstance(value, BaseModel) for value in obj.values()):
+            return to_json(obj)
+
+        # Serialize everything else with orjson, falling back to the standard library if it is not installed or rejects the data (e.g. ints beyond 64 bits).
+        if orjson:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                return orjson.dumps(obj, default=self.default, option=option)
+            except TypeError:
+                pass
+        return json.dumps(
+            obj,
+            default=self.default,
+            ensure_ascii=self.ensure_ascii,
+            sort_keys=self.sort_keys,
+            separators=(',', ':'),
+        ).encode('utf-8')
+
+    # * method: dumps
+    def dumps(self, obj: Any, **kwargs) -> str:
+        '''
+        Serialize an object to a JSON string.
+
+        :param obj: The object to serialize.
+        :type obj: Any
+        :param kwargs: Standard library json.dumps options; when given, the default provider handles the call.
+        :type kwargs: dict
+        :return: The JSON string.
+        :rtype: str
+        '''
+
+        # Defer custom formatting options to the default provider.
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+
+        # Decode the fast byte serialization.
+        return self.dump_bytes(obj).decode('utf-8')
+
+    # * method: loads
+    def loads(self, s: str | bytes, **kwargs) -> Any:
+        '''
+        Deserialize JSON data.
+
+        :param s: The JSON text or bytes.
+        :type s: str | bytes
+        :param kwargs: Standard library json.loads options.
+        :type kwargs: dict
+        :return: The deserialized data.
+        :rtype: Any
+        '''
+
+        # Parse with orjson when available and no custom options are given.
+        if orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    # * method: response
+    def response(self, *args, **kwargs) -> Response:
+        '''
+        Serialize the given arguments into a JSON response without an intermediate string.
+
+        :param args: A single value to serialize, or multiple values to serialize as a list.
+        :type args: tuple
+        :param kwargs: Values to serialize as a dict.
+        :type kwargs: dict
+        :return: The JSON response.
+        :rtype: Response
+        '''
+
+        # Collect the response object like jsonify.
+        if args and kwargs:
+            raise TypeError('app.json.response() takes either args or kwargs, not both')
+        obj = kwargs or (args[0] if len(args) == 1 else args or None)
+
+        # Build the response from the serialized bytes.
+        return self._app.response_class(self.dump_bytes(obj), mimetype=self.mimetype)
@@ -0,0 +1,85 @@
+'''Flask lazy API context.'''
+
+# *** imports
+
+# ** core
+import threading
+from typing import Any, Callable
+
+
+# *** contexts
+
+# ** context: lazy_api_context
+class LazyApiContext(object):
+    '''
+    A proxy for an app interface context that defers realizing it (and its
+    feature and event dependencies) until an attribute is first accessed.
+    '''
+
+    # * attribute: loader
+    loader: Callable[[], Any]
+
+    # * attribute: context
+    context: Any
+
+    # * attribute: lock
+    lock: threading.Lock
+
+    # * init
+    def __init__(self, loader: Callable[[], Any]):
+        '''
+        Initialize the lazy API context.
+
+        :param loader: A callable realizing and returning the interface context.
+        :type loader: Callable[[], Any]
+        '''
+
+        # Keep the loader; the context is realized on first use.
+        self.loader = loader
+        self.context = None
+        self.lock = threading.Lock()
+
+    # * property: loaded
+    @property
+    def loaded(self) -> bool:
+        '''
+        Whether the interface context has been realized.
+
+        :return: True if the context is realized.
+        :rtype: bool
+        '''
+
+        # Return whether the context exists.
+        return self.context is not None
+
+    # * method: load
+    def load(self) -> Any:
+        '''
+        Realize the interface context once, even under concurrent first requests.
+
+        :return: The realized interface context.
+        :rtype: Any
+        '''
+
+        # Realize the context under the lock if it does not exist yet.
+        if self.context is None:
+            with self.lock:
+                if self.context is None:
+                    self.context = self.loader()
+
+        # Return the realized context.
+        return self.context
+
+    # * method: __getattr__
+    def __getattr__(self, name: str) -> Any:
+        '''
+        Delegate attribute access to the realized interface context.
+
+        :param name: The attribute name.
+        :type name: str
+        :return: The attribute of the realized context.
+        :rtype: Any
+        '''
+
+        # Realize the context and delegate.
+        return getattr(self.load(), name)
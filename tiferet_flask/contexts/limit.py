@@ -0,0 +1,760 @@
+'''Flask rate limit context.'''
+
+# *** imports
+
+# ** core
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, NamedTuple, Tuple
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ** infra
+from tiferet_openapi import ApiRouter
+
+# ** app
+from ..interfaces import RateLimitService
+
+
+# *** constants
+
+# ** constant: shared_slot
+SHARED_SLOT = struct.Struct('=Qddq')
+
+# ** constant: shared_pid
+SHARED_PID = struct.Struct('=q')
+
+# ** constant: shared_count
+SHARED_COUNT = struct.Struct('=i')
+
+
+# *** classes
+
+# ** class: limit_response
+class LimitResponse(NamedTuple):
+    '''
+    A precompiled rejection response.
+    '''
+
+    # * attribute: status_code
+    status_code: int
+
+    # * attribute: body
+    body: bytes
+
+    # * attribute: headers
+    headers: Tuple[Tuple[str, str], ...]
+
+
+# ** class: limit_policy
+class LimitPolicy(NamedTuple):
+    '''
+    A compiled router or route limit with its precompiled rejection responses.
+    '''
+
+    # * attribute: key
+    key: str
+
+    # * attribute: rate
+    rate: float | None
+
+    # * attribute: burst
+    burst: float
+
+    # * attribute: concurrency
+    concurrency: int | None
+
+    # * attribute: rate_response
+    rate_response: LimitResponse
+
+    # * attribute: concurrency_response
+    concurrency_response: LimitResponse
+
+
+# ** class: memory_rate_limiter
+class MemoryRateLimiter(RateLimitService):
+    '''
+    An in-process rate limit backend; each worker process keeps its own limits.
+    '''
+
+    # * attribute: buckets
+    buckets: Dict[str, List[float]]
+
+    # * attribute: active
+    active: Dict[str, int]
+
+    # * attribute: lock
+    lock: threading.Lock
+
+    # * init
+    def __init__(self):
+        '''
+        Initialize the in-process backend.
+        '''
+
+        # Create the buckets, the in-flight counters and their lock.
+        self.buckets = {}
+        self.active = {}
+        self.lock = threading.Lock()
+
+    # * method: consume
+    def consume(self, key: str, rate: float, burst: float) -> bool:
+        '''
+        Take a token from a bucket refilling at rate tokens per second.
+
+        :param key: The limit key.
+        :type key: str
+        :param rate: The refill rate, in tokens per second.
+        :type rate: float
+        :param burst: The bucket capacity, which a new bucket starts with.
+        :type burst: float
+        :return: True if a token was taken, False if the bucket is empty.
+        :rtype: bool
+        '''
+
+        # Refill the bucket for the time elapsed since its last update, then take a token.
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = [burst, now]
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                return False
+            bucket[0] = tokens - 1
+            return True
+
+    # * method: refund
+    def refund(self, key: str, burst: float):
+        '''
+        Return a token taken with consume, e.g. when a later limit rejects the request.
+
+        :param key: The limit key.
+        :type key: str
+        :param burst: The bucket capacity, which the bucket is not refilled above.
+        :type burst: float
+        '''
+
+        # Add the token back to an existing bucket.
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(burst, bucket[0] + 1)
+
+    # * method: enter
+    def enter(self, key: str, limit: int) -> bool:
+        '''
+        Count a request in flight, unless the limit is reached.
+
+        :param key: The limit key.
+        :type key: str
+        :param limit: The maximum number of requests in flight.
+        :type limit: int
+        :return: True if the request was counted, False if the limit is reached.
+        :rtype: bool
+        '''
+
+        # Increment the counter below the limit.
+        with self.lock:
+            active = self.active.get(key, 0)
+            if active >= limit:
+                return False
+            self.active[key] = active + 1
+            return True
+
+    # * method: exit
+    def exit(self, key: str):
+        '''
+        Count a request entered with enter as finished.
+
+        :param key: The limit key.
+        :type key: str
+        '''
+
+        # Decrement the counter, never below zero (e.g. after clear).
+        with self.lock:
+            self.active[key] = max(self.active.get(key, 0) - 1, 0)
+
+    # * method: clear
+    def clear(self):
+        '''
+        Reset all buckets and in-flight counters.
+        '''
+
+        # Clear the buckets and counters.
+        with self.lock:
+            self.buckets.clear()
+            self.active.clear()
+
+
+# ** class: shared_memory_rate_limiter
+class SharedMemoryRateLimiter(RateLimitService):
+    '''
+    A rate limit backend in an anonymous shared memory map, so the limits
+    hold across the worker processes forked from the process creating it.
+
+    Each key is stored in a fixed-size slot (digest, tokens, updated, in
+    flight) found by open addressing on a digest of the key. Each process
+    also claims a row recording the in-flight requests it holds per slot, so
+    the counts of a worker that dies mid-request are given back by reap. The
+    slots are updated under a record lock on an unlinked file, which the
+    kernel releases when its holder dies. Create the backend before forking
+    the workers, e.g. by building the app in the prefork master.
+    '''
+
+    # * attribute: slots
+    slots: int
+
+    # * attribute: processes
+    processes: int
+
+    # * attribute: memory
+    memory: mmap.mmap
+
+    # * attribute: lock_file
+    lock_file: Any
+
+    # * attribute: thread_lock
+    thread_lock: Tuple[int, threading.Lock]
+
+    # * attribute: row
+    row: Tuple[int, int | None]
+
+    # * attribute: offsets
+    offsets: Dict[str, Tuple[int, int]]
+
+    # * init
+    def __init__(self, slots: int = 1024, processes: int = 256):
+        '''
+        Initialize the shared backend.
+
+        :param slots: The maximum number of limit keys.
+        :type slots: int
+        :param processes: The maximum number of live processes whose in-flight requests are tracked for reap.
+        :type processes: int
+        '''
+
+        # Map the shared slots, followed by one in-flight row (pid, count per slot) per process.
+        self.slots = slots
+        self.processes = processes
+        self.memory = mmap.mmap(-1, slots * SHARED_SLOT.size + processes * self.get_row_size())
+        self.offsets = {}
+        self.row = (0, None)
+
+        # Create the process lock file, inherited by forked children, and this process's thread lock.
+        self.lock_file = tempfile.TemporaryFile() if fcntl else None
+        self.thread_lock = (os.getpid(), threading.Lock())
+
+    # * method: get_row_size
+    def get_row_size(self) -> int:
+        '''
+        Get the size of a process row: its pid and an in-flight count per slot.
+
+        :return: The row size in bytes.
+        :rtype: int
+        '''
+
+        # Size the pid and the counts.
+        return SHARED_PID.size + self.slots * SHARED_COUNT.size
+
+    # * method: lock
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        '''
+        Hold the shared lock: this process's thread lock, then the file record lock across processes.
+        '''
+
+        # Replace the thread lock inherited over fork, which a parent thread may have held.
+        pid, thread_lock = self.thread_lock
+        if pid != os.getpid():
+            thread_lock = threading.Lock()
+            self.thread_lock = (os.getpid(), thread_lock)
+
+        # Lock the threads of this process, then the processes; a dead holder's record lock is released by the kernel.
+        with thread_lock:
+            if self.lock_file is None:
+                yield
+                return
+            fcntl.lockf(self.lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self.lock_file, fcntl.LOCK_UN)
+
+    # * method: get_offset
+    def get_offset(self, key: str) -> int | None:
+        '''
+        Find or claim the slot of a key; called under the lock.
+
+        :param key: The limit key.
+        :type key: str
+        :return: The slot offset, or None if all slots are taken by other keys.
+        :rtype: int | None
+        '''
+
+        # Reuse the known slot while it still holds the key, since clear may have reset it.
+        cached = self.offsets.get(key)
+        if cached is not None and SHARED_SLOT.unpack_from(self.memory, cached[0])[0] == cached[1]:
+            return cached[0]
+
+        # Probe from the slot of the key digest, where zero marks an empty slot.
+        digest = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+        start = digest % self.slots
+        for probe in range(self.slots):
+            offset = (start + probe) % self.slots * SHARED_SLOT.size
+            stored = SHARED_SLOT.unpack_from(self.memory, offset)[0]
+            if stored == 0:
+                SHARED_SLOT.pack_into(self.memory, offset, digest, 0.0, 0.0, 0)
+            elif stored != digest:
+                continue
+            self.offsets[key] = (offset, digest)
+            return offset
+        return None
+
+    # * method: find_row
+    def find_row(self, pid: int) -> int | None:
+        '''
+        Find the row of a process; called under the lock.
+
+        :param pid: The process ID.
+        :type pid: int
+        :return: The row offset, or None if the process holds no row.
+        :rtype: int | None
+        '''
+
+        # Scan the rows for the pid.
+        base, size = self.slots * SHARED_SLOT.size, self.get_row_size()
+        for index in range(self.processes):
+            offset = base + index * size
+            if SHARED_PID.unpack_from(self.memory, offset)[0] == pid:
+                return offset
+        return None
+
+    # * method: get_row
+    def get_row(self) -> int | None:
+        '''
+        Find or claim the row of this process; called under the lock.
+
+        :return: The row offset, or None if every row is held by a live process.
+        :rtype: int | None
+        '''
+
+        # Reuse this process's row while it still holds its pid, since clear and reap reset rows.
+        pid = os.getpid()
+        cached_pid, offset = self.row
+        if cached_pid == pid and offset is not None and SHARED_PID.unpack_from(self.memory, offset)[0] == pid:
+            return offset
+
+        # Claim a free row, or reap the row of a process that has exited.
+        offset = self.find_row(0)
+        if offset is None:
+            base, size = self.slots * SHARED_SLOT.size, self.get_row_size()
+            for index in range(self.processes):
+                holder = SHARED_PID.unpack_from(self.memory, base + index * size)[0]
+                if not self.is_alive(holder):
+                    offset = self.reap_row(base + index * size)
+                    break
+        if offset is not None:
+            SHARED_PID.pack_into(self.memory, offset, pid)
+        self.row = (pid, offset)
+        return offset
+
+    # * method: is_alive
+    @staticmethod
+    def is_alive(pid: int) -> bool:
+        '''
+        Check whether a process exists.
+
+        :param pid: The process ID.
+        :type pid: int
+        :return: False if no process has the pid.
+        :rtype: bool
+        '''
+
+        # Probe the process with the null signal.
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass
+        return True
+
+    # * method: reap_row
+    def reap_row(self, row: int) -> int:
+        '''
+        Give back the in-flight counts of a process row and free it; called under the lock.
+
+        :param row: The row offset.
+        :type row: int
+        :return: The row offset.
+        :rtype: int
+        '''
+
+        # Subtract each count held by the row from its slot.
+        for index in range(self.slots):
+            count_offset = row + SHARED_PID.size + index * SHARED_COUNT.size
+            count = SHARED_COUNT.unpack_from(self.memory, count_offset)[0]
+            if not count:
+                continue
+            offset = index * SHARED_SLOT.size
+            digest, tokens, updated, active = SHARED_SLOT.unpack_from(self.memory, offset)
+            SHARED_SLOT.pack_into(self.memory, offset, digest, tokens, updated, max(active - count, 0))
+
+        # Zero the row.
+        self.memory[row:row + self.get_row_size()] = bytes(self.get_row_size())
+        return row
+
+    # * method: reap
+    def reap(self, pid: int) -> bool:
+        '''
+        Give back the in-flight requests of an exited process, e.g. a worker killed mid-request.
+
+        :param pid: The process ID, reaped by its parent.
+        :type pid: int
+        :return: True if the process held a row.
+        :rtype: bool
+        '''
+
+        # Reap the row of the process.
+        with self.lock():
+            row = self.find_row(pid)
+            if row is None:
+                return False
+            self.reap_row(row)
+            return True
+
+    # * method: update
+    def update(self, key: str, apply: Callable[[float, float, int], Tuple[float, float, int, bool]], held: int = 0) -> bool:
+        '''
+        Update the slot of a key under the shared lock.
+
+        :param key: The limit key.
+        :type key: str
+        :param apply: Maps the slot tokens, updated time and in-flight count to their new values and the result.
+        :type apply: Callable[[float, float, int], Tuple[float, float, int, bool]]
+        :param held: The change in the in-flight count held by this process, applied if the result is True.
+        :type held: int
+        :return: The result, or True (admitting the request) if all slots are taken.
+        :rtype: bool
+        '''
+
+        # Apply the update to the slot of the key.
+        with self.lock():
+            offset = self.get_offset(key)
+            if offset is None:
+                return True
+            digest, tokens, updated, active = SHARED_SLOT.unpack_from(self.memory, offset)
+            tokens, updated, active, result = apply(tokens, updated, active)
+            SHARED_SLOT.pack_into(self.memory, offset, digest, tokens, updated, active)
+
+            # Record the in-flight change in this process's row, never below zero (e.g. after clear).
+            row = self.get_row() if held and result else None
+            if row is not None:
+                count_offset = row + SHARED_PID.size + offset // SHARED_SLOT.size * SHARED_COUNT.size
+                count = SHARED_COUNT.unpack_from(self.memory, count_offset)[0]
+                SHARED_COUNT.pack_into(self.memory, count_offset, max(count + held, 0))
+            return result
+
+    # * method: consume
+    def consume(self, key: str, rate: float, burst: float) -> bool:
+        '''
+        Take a token from a bucket refilling at rate tokens per second.
+
+        :param key: The limit key.
+        :type key: str
+        :param rate: The refill rate, in tokens per second.
+        :type rate: float
+        :param burst: The bucket capacity, which a new bucket starts with.
+        :type burst: float
+        :return: True if a token was taken, False if the bucket is empty.
+        :rtype: bool
+        '''
+
+        # Refill the bucket on the system-wide monotonic clock, starting new buckets full.
+        now = time.monotonic()
+        def apply(tokens: float, updated: float, active: int):
+            tokens = min(burst, tokens + (now - updated) * rate) if updated else burst
+            if tokens < 1:
+                return tokens, now, active, False
+            return tokens - 1, now, active, True
+        return self.update(key, apply)
+
+    # * method: refund
+    def refund(self, key: str, burst: float):
+        '''
+        Return a token taken with consume, e.g. when a later limit rejects the request.
+
+        :param key: The limit key.
+        :type key: str
+        :param burst: The bucket capacity, which the bucket is not refilled above.
+        :type burst: float
+        '''
+
+        # Add the token back to a started bucket.
+        self.update(key, lambda tokens, updated, active: (min(burst, tokens + 1) if updated else tokens, updated, active, True))
+
+    # * method: enter
+    def enter(self, key: str, limit: int) -> bool:
+        '''
+        Count a request in flight, unless the limit is reached.
+
+        :param key: The limit key.
+        :type key: str
+        :param limit: The maximum number of requests in flight.
+        :type limit: int
+        :return: True if the request was counted, False if the limit is reached.
+        :rtype: bool
+        '''
+
+        # Increment the counter below the limit.
+        def apply(tokens: float, updated: float, active: int):
+            if active >= limit:
+                return tokens, updated, active, False
+            return tokens, updated, active + 1, True
+        return self.update(key, apply, held=1)
+
+    # * method: exit
+    def exit(self, key: str):
+        '''
+        Count a request entered with enter as finished.
+
+        :param key: The limit key.
+        :type key: str
+        '''
+
+        # Decrement the counter, never below zero (e.g. after clear).
+        self.update(key, lambda tokens, updated, active: (tokens, updated, max(active - 1, 0), True), held=-1)
+
+    # * method: clear
+    def clear(self):
+        '''
+        Reset all buckets and in-flight counters.
+        '''
+
+        # Zero the shared slots and rows.
+        with self.lock():
+            self.memory[:] = bytes(len(self.memory))
+            self.offsets.clear()
+
+
+# *** contexts
+
+# ** context: rate_limit_context
+class RateLimitContext(object):
+    '''
+    A context admitting requests against the token-bucket rate limits and
+    concurrency caps of their router and route, so requests over a limit
+    are rejected with a precompiled 429 or 503 before the feature runs.
+
+    Limits come from the `limits` blocks (rate, burst, concurrency) of the
+    routers and routes in openapi.yml. A router limit is shared by all of
+    its routes, so a burst on one router cannot starve the others. A route
+    `limits: false` block exempts the route from its router limit.
+    '''
+
+    # * attribute: backend
+    backend: RateLimitService
+
+    # * attribute: policies
+    policies: Mapping[str, Tuple[LimitPolicy, ...]]
+
+    # * init
+    def __init__(self,
+            routers: List[ApiRouter] = (),
+            options: Dict[str, Dict[str, Any]] = None,
+            backend: RateLimitService = None,
+        ):
+        '''
+        Initialize the context, compiling the limits of the given routes.
+
+        :param routers: The ApiRouter domain objects to compile limits for.
+        :type routers: List[ApiRouter]
+        :param options: The Flask route options from openapi.yml, keyed by endpoint.
+        :type options: Dict[str, Dict[str, Any]]
+        :param backend: The rate limit backend; in-process if None.
+        :type backend: RateLimitService
+        '''
+
+        # Set the backend and compile the policies.
+        self.backend = backend or MemoryRateLimiter()
+        self.policies = MappingProxyType({})
+        self.compile(routers, options)
+
+    # * method: compile
+    def compile(self, routers: List[ApiRouter], options: Dict[str, Dict[str, Any]] = None) -> Mapping[str, Tuple[LimitPolicy, ...]]:
+        '''
+        Compile the router and route limits, replacing the previous ones in a single assignment.
+
+        :param routers: The ApiRouter domain objects to compile limits for.
+        :type routers: List[ApiRouter]
+        :param options: The Flask route options from openapi.yml, keyed by endpoint.
+        :type options: Dict[str, Dict[str, Any]]
+        :return: The compiled router and route policies, keyed by endpoint.
+        :rtype: Mapping[str, Tuple[LimitPolicy, ...]]
+        '''
+
+        # Compile the router policy once and the route policy of each limited route.
+        options = options or {}
+        policies = {}
+        for router in routers:
+            router_policy = None
+            for route in router.routes:
+                route_options = options.get(route.endpoint, {})
+                limits = route_options.get('limits')
+                if limits is False:
+                    continue
+                if router_policy is None and route_options.get('router_limits'):
+                    router_policy = self.compile_policy(f'router:{router.name}', **route_options['router_limits'])
+                route_policies = (router_policy, self.compile_policy(f'route:{route.endpoint}', **(limits or {})))
+                route_policies = tuple(policy for policy in route_policies if policy)
+                if route_policies:
+                    policies[route.endpoint] = route_policies
+
+        # Swap in the compiled policies.
+        self.policies = MappingProxyType(policies)
+        return self.policies
+
+    # * method: compile_response
+    @staticmethod
+    def compile_response(status_code: int, retry_after: int, **payload) -> LimitResponse:
+        '''
+        Compile a JSON rejection response.
+
+        :param status_code: The response status code.
+        :type status_code: int
+        :param retry_after: The seconds the client should wait before retrying.
+        :type retry_after: int
+        :param payload: The error payload fields.
+        :type payload: dict
+        :return: The precompiled response.
+        :rtype: LimitResponse
+        '''
+
+        # Serialize the payload once.
+        body = json.dumps(dict(payload, retry_after=retry_after), separators=(',', ':')).encode('utf-8')
+        return LimitResponse(status_code, body, (
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(body))),
+            ('Retry-After', str(retry_after)),
+        ))
+
+    # * method: compile_policy
+    @staticmethod
+    def compile_policy(
+            key: str,
+            rate: float = None,
+            burst: float = None,
+            concurrency: int = None,
+            retry_after: int = None,
+            enabled: bool = True,
+        ) -> LimitPolicy | None:
+        '''
+        Compile a limit policy.
+
+        :param key: The backend key of the limit.
+        :type key: str
+        :param rate: The sustained requests per second; no rate limit if None.
+        :type rate: float
+        :param burst: The requests allowed at once above the rate; defaults to the rate (and at least 1).
+        :type burst: float
+        :param concurrency: The maximum requests in flight; no cap if None.
+        :type concurrency: int
+        :param retry_after: The Retry-After seconds of rate limited responses; defaults to the time to refill one token.
+        :type retry_after: int
+        :param enabled: Whether the limit is enabled.
+        :type enabled: bool
+        :return: The compiled policy, or None if the limit is disabled or empty.
+        :rtype: LimitPolicy | None
+        '''
+
+        # Skip disabled and empty limits.
+        if not enabled or not (rate or concurrency):
+            return None
+
+        # Compile the policy with its 429 and 503 responses.
+        if retry_after is None:
+            retry_after = math.ceil(1 / rate) if rate else 1
+        return LimitPolicy(
+            key=key,
+            rate=float(rate) if rate else None,
+            burst=float(max(burst or rate or 1, 1)),
+            concurrency=int(concurrency) if concurrency else None,
+            rate_response=RateLimitContext.compile_response(
+                429, retry_after,
+                error_code='RATE_LIMITED',
+                name='Rate Limited',
+                message='Too many requests; retry later.',
+            ),
+            concurrency_response=RateLimitContext.compile_response(
+                503, 1,
+                error_code='SERVICE_OVERLOADED',
+                name='Service Overloaded',
+                message='Too many requests in flight; retry shortly.',
+            ),
+        )
+
+    # * method: admit
+    def admit(self, endpoint: str | None) -> Tuple[Tuple[str, ...], LimitResponse | None]:
+        '''
+        Admit a request against the limits of its endpoint.
+
+        :param endpoint: The Flask endpoint, or None for unmatched requests.
+        :type endpoint: str | None
+        :return: The concurrency keys to release once the request finishes, and the rejection response, or None if admitted.
+        :rtype: Tuple[Tuple[str, ...], LimitResponse | None]
+        '''
+
+        # Admit endpoints without limits.
+        policies = self.policies.get(endpoint)
+        if not policies:
+            return (), None
+
+        # Enter the concurrency caps and take the rate tokens, router first.
+        entered, consumed = [], []
+        for policy in policies:
+            rejected = None
+            if policy.concurrency:
+                if self.backend.enter(policy.key, policy.concurrency):
+                    entered.append(policy.key)
+                else:
+                    rejected = policy.concurrency_response
+            if rejected is None and policy.rate:
+                if self.backend.consume(policy.key, policy.rate, policy.burst):
+                    consumed.append(policy)
+                else:
+                    rejected = policy.rate_response
+
+            # On rejection, release the caps entered and give back the tokens taken for the earlier limits.
+            if rejected is not None:
+                self.release(entered)
+                for taken in consumed:
+                    self.backend.refund(taken.key, taken.burst)
+                return (), rejected
+        return tuple(entered), None
+
+    # * method: release
+    def release(self, entered: Tuple[str, ...]):
+        '''
+        Release the concurrency caps entered by an admitted request.
+
+        :param entered: The concurrency keys returned by admit.
+        :type entered: Tuple[str, ...]
+        '''
+
+        # Exit each entered cap.
+        for key in entered:
+            self.backend.exit(key)
@@ -0,0 +1,243 @@
+'''Flask metrics context.'''
+
+# *** imports
+
+# ** core
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Dict, Tuple
+
+
+# *** constants
+
+# ** constant: default_buckets
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# *** classes
+
+# ** class: shard_owner
+class ShardOwner(object):
+    '''
+    A thread-local token whose collection, when its thread exits, retires the thread's shard.
+    '''
+
+    __slots__ = ('__weakref__',)
+
+
+# *** contexts
+
+# ** context: metrics_context
+class MetricsContext(object):
+    '''
+    A context recording per-endpoint phase latency histograms and response
+    counters without locks: each thread writes only to its own shard, and
+    shards are summed when the metrics are collected. When a thread exits,
+    its shard is folded into the retired totals and dropped, so the shards
+    stay bounded by the live threads.
+    '''
+
+    # * attribute: buckets
+    buckets: Tuple[float, ...]
+
+    # * attribute: local
+    local: threading.local
+
+    # * attribute: shards
+    shards: Dict[int, Dict[tuple, list]]
+
+    # * attribute: retired
+    retired: Dict[tuple, list]
+
+    # * attribute: lock
+    lock: threading.Lock
+
+    # * init
+    def __init__(self, buckets: Tuple[float, ...] = None):
+        '''
+        Initialize the metrics context.
+
+        :param buckets: The histogram bucket upper bounds, in seconds; DEFAULT_BUCKETS if None.
+        :type buckets: Tuple[float, ...]
+        '''
+
+        # Set the buckets, the per-thread shard registry and the retired totals.
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        self.local = threading.local()
+        self.shards = {}
+        self.retired = {}
+        self.lock = threading.Lock()
+
+    # * method: get_shard
+    def get_shard(self) -> Dict[tuple, list]:
+        '''
+        Get the calling thread's shard, registering it on first use.
+
+        :return: The thread's series map.
+        :rtype: Dict[tuple, list]
+        '''
+
+        # Return the thread's shard if registered.
+        try:
+            return self.local.shard
+        except AttributeError:
+            pass
+
+        # Register the shard, retiring it once the thread exits and drops its owner token.
+        shard = self.local.shard = {}
+        owner = self.local.owner = ShardOwner()
+        with self.lock:
+            self.shards[id(shard)] = shard
+        weakref.finalize(owner, self.retire, shard)
+        return shard
+
+    # * method: retire
+    def retire(self, shard: Dict[tuple, list]):
+        '''
+        Fold the shard of an exited thread into the retired totals and drop it.
+
+        :param shard: The exited thread's series map.
+        :type shard: Dict[tuple, list]
+        '''
+
+        # Merge and unregister the shard together, so collect counts it exactly once.
+        with self.lock:
+            self.merge(self.retired, shard)
+            self.shards.pop(id(shard), None)
+
+    # * method: merge
+    @staticmethod
+    def merge(target: Dict[tuple, list], shard: Dict[tuple, list]) -> Dict[tuple, list]:
+        '''
+        Add a shard's histogram series and response counts to a target map.
+
+        :param target: The map to add to.
+        :type target: Dict[tuple, list]
+        :param shard: The series map to add.
+        :type shard: Dict[tuple, list]
+        :return: The target map.
+        :rtype: Dict[tuple, list]
+        '''
+
+        # Sum a snapshot of the shard (dict.copy is atomic under the GIL).
+        for key, value in shard.copy().items():
+            if isinstance(value, list):
+                merged = target.setdefault(key, [0] * len(value))
+                for index, count in enumerate(value):
+                    merged[index] += count
+            else:
+                target[key] = target.get(key, 0) + value
+        return target
+
+    # * method: record
+    def record(self, endpoint: str, phase: str, started: float) -> float:
+        '''
+        Record the time elapsed since started for an endpoint phase.
+
+        :param endpoint: The Flask endpoint.
+        :type endpoint: str
+        :param phase: The phase name.
+        :type phase: str
+        :param started: The phase start, from time.perf_counter().
+        :type started: float
+        :return: The current time, to start the next phase from.
+        :rtype: float
+        '''
+
+        # Compute the elapsed time.
+        now = time.perf_counter()
+        elapsed = now - started
+
+        # Get or create the series: bucket counts, +Inf count, sum and count.
+        shard = self.get_shard()
+        series = shard.get((endpoint, phase))
+        if series is None:
+            series = shard[(endpoint, phase)] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+
+        # Count the observation in its bucket and update the sum and count.
+        series[bisect_left(self.buckets, elapsed)] += 1
+        series[-2] += elapsed
+        series[-1] += 1
+        return now
+
+    # * method: record_response
+    def record_response(self, endpoint: str, status_code: int, started: float):
+        '''
+        Record a completed response: its total latency and its status code.
+
+        :param endpoint: The Flask endpoint.
+        :type endpoint: str
+        :param status_code: The response status code.
+        :type status_code: int
+        :param started: The request start, from time.perf_counter().
+        :type started: float
+        '''
+
+        # Record the total latency.
+        self.record(endpoint, 'total', started)
+
+        # Count the response by status code.
+        shard = self.get_shard()
+        key = (endpoint, int(status_code))
+        shard[key] = shard.get(key, 0) + 1
+
+    # * method: collect
+    def collect(self) -> Tuple[Dict[tuple, list], Dict[tuple, int]]:
+        '''
+        Sum the shards of the live threads and the retired totals.
+
+        :return: The histogram series keyed by (endpoint, phase) and the response counts keyed by (endpoint, status_code).
+        :rtype: Tuple[Dict[tuple, list], Dict[tuple, int]]
+        '''
+
+        # Merge the retired totals and each live shard under the lock, so no shard is retired mid-merge.
+        merged = {}
+        with self.lock:
+            self.merge(merged, self.retired)
+            for shard in self.shards.values():
+                self.merge(merged, shard)
+
+        # Split the histogram series from the response counts.
+        histograms, responses = {}, {}
+        for key, value in merged.items():
+            if isinstance(value, list):
+                histograms[key] = value
+            else:
+                responses[key] = value
+        return histograms, responses
+
+    # * method: render_prometheus
+    def render_prometheus(self) -> str:
+        '''
+        Render the metrics in the Prometheus text exposition format.
+
+        :return: The metrics text.
+        :rtype: str
+        '''
+
+        # Write the phase histograms with cumulative buckets.
+        histograms, responses = self.collect()
+        lines = [
+            '# HELP tiferet_flask_phase_seconds Request phase latency per endpoint.',
+            '# TYPE tiferet_flask_phase_seconds histogram',
+        ]
+        bounds = [repr(float(bound)) for bound in self.buckets] + ['+Inf']
+        for (endpoint, phase), series in sorted(histograms.items()):
+            labels = f'endpoint="{endpoint}",phase="{phase}"'
+            cumulative = 0
+            for bound, count in zip(bounds, series[:-2]):
+                cumulative += count
+                lines.append(f'tiferet_flask_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'tiferet_flask_phase_seconds_sum{{{labels}}} {series[-2]!r}')
+            lines.append(f'tiferet_flask_phase_seconds_count{{{labels}}} {series[-1]}')
+
+        # Write the response counters.
+        lines.extend([
+            '# HELP tiferet_flask_responses_total Responses per endpoint and status code.',
+            '# TYPE tiferet_flask_responses_total counter',
+        ])
+        for (endpoint, status_code), count in sorted(responses.items()):
+            lines.append(f'tiferet_flask_responses_total{{endpoint="{endpoint}",status="{status_code}"}} {count}')
+        return '\n'.join(lines) + '\n'
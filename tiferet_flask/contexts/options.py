@@ -0,0 +1,95 @@
+'''Flask app options.'''
+
+# *** imports
+
+# ** core
+from typing import Any, Callable, Dict, NamedTuple
+
+# ** app
+from ..interfaces import RateLimitService
+
+
+# *** classes
+
+# ** class: flask_app_options
+class FlaskAppOptions(NamedTuple):
+    '''
+    The optional features of a Flask app assembled by build_flask_app.
+
+    New features are off by default, so an app only picks up new behavior,
+    including new rejection paths such as rate limits and request
+    validation, when it opts in. CORS stays on, allowing any origin unless
+    openapi.yml declares a policy, as the app always did. Each *_options
+    field holds the keyword options of its feature. With fast_errors, the
+    built-in views handle precompiled ErrorResponse results; custom views
+    and direct callers of run must handle them too.
+    '''
+
+    # * attribute: swagger_options
+    swagger_options: Dict[str, Any] = None
+
+    # * attribute: async_mode
+    async_mode: bool = False
+
+    # * attribute: batch
+    batch: bool = False
+
+    # * attribute: batch_options
+    batch_options: Dict[str, Any] = None
+
+    # * attribute: lazy
+    lazy: bool = False
+
+    # * attribute: snapshot
+    snapshot: bool = False
+
+    # * attribute: snapshot_path
+    snapshot_path: str = None
+
+    # * attribute: cache_backend
+    cache_backend: Callable = None
+
+    # * attribute: fast_json
+    fast_json: bool = False
+
+    # * attribute: metrics
+    metrics: bool = False
+
+    # * attribute: metrics_options
+    metrics_options: Dict[str, Any] = None
+
+    # * attribute: profile
+    profile: bool = False
+
+    # * attribute: profile_options
+    profile_options: Dict[str, Any] = None
+
+    # * attribute: fast_errors
+    fast_errors: bool = False
+
+    # * attribute: cors
+    cors: bool = True
+
+    # * attribute: cors_options
+    cors_options: Dict[str, Any] = None
+
+    # * attribute: reload
+    reload: bool = False
+
+    # * attribute: reload_options
+    reload_options: Dict[str, Any] = None
+
+    # * attribute: pool_requests
+    pool_requests: bool = False
+
+    # * attribute: pool_options
+    pool_options: Dict[str, Any] = None
+
+    # * attribute: limits
+    limits: bool = False
+
+    # * attribute: limit_backend
+    limit_backend: RateLimitService = None
+
+    # * attribute: validate_requests
+    validate_requests: bool = False
@@ -0,0 +1,136 @@
+'''Flask command profile context.'''
+
+# *** imports
+
+# ** core
+import random
+import time
+from contextvars import ContextVar, Token
+from typing import Any, List, Tuple
+
+
+# *** contexts
+
+# ** context: command_profiler
+class CommandProfiler(object):
+    '''
+    A context timing each command a feature executes, on a sample of requests.
+
+    The feature context's command handlers are wrapped once; unsampled
+    requests only pay for a context variable lookup per command.
+    '''
+
+    # * attribute: sample_rate
+    sample_rate: float
+
+    # * attribute: timings
+    timings: ContextVar
+
+    # * init
+    def __init__(self, sample_rate: float = 1.0):
+        '''
+        Initialize the command profiler.
+
+        :param sample_rate: The fraction of requests to profile, from 0.0 to 1.0.
+        :type sample_rate: float
+        '''
+
+        # Set the sample rate and the per-request timings variable.
+        self.sample_rate = sample_rate
+        self.timings = ContextVar('tiferet_flask_command_timings', default=None)
+
+    # * method: install
+    def install(self, features: Any) -> Any:
+        '''
+        Wrap the command handlers of a feature context to record the timings of profiled requests.
+
+        :param features: The feature context.
+        :type features: FeatureContext
+        :return: The feature context.
+        :rtype: FeatureContext
+        '''
+
+        # Install the wrappers only once per feature context.
+        if getattr(features, '_command_profiler', None) is self:
+            return features
+        handle_command = features.handle_command
+        handle_command_async = getattr(features, 'handle_command_async', None)
+
+        # Define the sync handler, timing the command when the request is profiled.
+        def profiled_handle_command(command: Any, *args, **kwargs):
+            timings = self.timings.get()
+            if timings is None:
+                return handle_command(command, *args, **kwargs)
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                return handle_command(command, *args, **kwargs)
+            finally:
+                timings.append((type(command).__name__, time.perf_counter() - wall, time.thread_time() - cpu))
+
+        # Define the async handler, timing the command when the request is profiled.
+        async def profiled_handle_command_async(command: Any, *args, **kwargs):
+            timings = self.timings.get()
+            if timings is None:
+                return await handle_command_async(command, *args, **kwargs)
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                return await handle_command_async(command, *args, **kwargs)
+            finally:
+                timings.append((type(command).__name__, time.perf_counter() - wall, time.thread_time() - cpu))
+
+        # Replace the handlers on the instance.
+        features.handle_command = profiled_handle_command
+        if handle_command_async is not None:
+            features.handle_command_async = profiled_handle_command_async
+        features._command_profiler = self
+        return features
+
+    # * method: start
+    def start(self) -> Token | None:
+        '''
+        Start profiling the current request if it is sampled.
+
+        :return: The token to stop the profile with, or None if the request is not sampled.
+        :rtype: Token | None
+        '''
+
+        # Skip requests outside the sample.
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return None
+
+        # Collect the command timings of this request.
+        return self.timings.set([])
+
+    # * method: stop
+    def stop(self, token: Token) -> List[Tuple[str, float, float]]:
+        '''
+        Stop profiling the current request.
+
+        :param token: The token returned by start.
+        :type token: Token
+        :return: The command name, wall time and CPU time (in seconds) of each executed command.
+        :rtype: List[Tuple[str, float, float]]
+        '''
+
+        # Take the timings and restore the unprofiled state.
+        timings = self.timings.get()
+        self.timings.reset(token)
+        return timings
+
+    # * method: format_server_timing
+    @staticmethod
+    def format_server_timing(timings: List[Tuple[str, float, float]]) -> str:
+        '''
+        Format command timings as a Server-Timing header value.
+
+        :param timings: The command name, wall time and CPU time (in seconds) of each executed command.
+        :type timings: List[Tuple[str, float, float]]
+        :return: The header value, with one metric per command in execution order.
+        :rtype: str
+        '''
+
+        # Write the wall time as the duration and the step and CPU time as the description.
+        return ', '.join(
+            f'{name};dur={wall * 1000:.3f};desc="step {index} cpu {cpu * 1000:.3f}ms"'
+            for index, (name, wall, cpu) in enumerate(timings)
+        )
@@ -0,0 +1,157 @@
+'''Flask config watch context.'''
+
+# *** imports
+
+# ** core
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Tuple
+
+
+# *** contexts
+
+# ** context: config_watch_context
+class ConfigWatchContext(object):
+    '''
+    A context polling configuration files for changes and reporting the
+    changed files to a callback, from a daemon thread.
+
+    Threads do not survive a fork, so a forked child (e.g. a prefork
+    worker) calls restart to poll for its own copy of the app.
+    '''
+
+    # * attribute: files
+    files: Dict[str, str]
+
+    # * attribute: on_change
+    on_change: Callable[[List[str]], None]
+
+    # * attribute: interval
+    interval: float
+
+    # * attribute: signatures
+    signatures: Dict[str, Tuple[int, int, int] | None]
+
+    # * attribute: stopped
+    stopped: threading.Event
+
+    # * attribute: thread
+    thread: threading.Thread | None
+
+    # * attribute: logger
+    logger: logging.Logger
+
+    # * init
+    def __init__(self, files: Dict[str, str], on_change: Callable[[List[str]], None], interval: float = 1.0):
+        '''
+        Initialize the watcher, recording the current state of each file.
+
+        :param files: The watched file paths, keyed by name (e.g. openapi, features, errors).
+        :type files: Dict[str, str]
+        :param on_change: Called with the names of the changed files.
+        :type on_change: Callable[[List[str]], None]
+        :param interval: The seconds between polls.
+        :type interval: float
+        '''
+
+        # Set the files and record their current signatures.
+        self.files = dict(files)
+        self.on_change = on_change
+        self.interval = interval
+        self.signatures = {name: self.get_signature(path) for name, path in self.files.items()}
+        self.stopped = threading.Event()
+        self.thread = None
+        self.logger = logging.getLogger('tiferet_flask.reload')
+
+    # * method: get_signature
+    @staticmethod
+    def get_signature(path: str) -> Tuple[int, int, int] | None:
+        '''
+        Get the change signature of a file.
+
+        :param path: The file path.
+        :type path: str
+        :return: The modification time, size and inode (so atomic replaces are seen), or None if the file is missing.
+        :rtype: Tuple[int, int, int] | None
+        '''
+
+        # Stat the file.
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    # * method: check
+    def check(self) -> List[str]:
+        '''
+        Poll the files once, calling on_change if any changed.
+
+        :return: The names of the changed files.
+        :rtype: List[str]
+        '''
+
+        # Compare each file against its last signature.
+        changed = []
+        for name, path in self.files.items():
+            signature = self.get_signature(path)
+            if signature != self.signatures[name]:
+                self.signatures[name] = signature
+                changed.append(name)
+
+        # Report the changes, keeping the watcher alive if the reload fails.
+        if changed:
+            try:
+                self.on_change(changed)
+            except Exception:
+                self.logger.exception('Failed to reload %s', ', '.join(changed))
+        return changed
+
+    # * method: run
+    def run(self):
+        '''
+        Poll the files until stopped.
+        '''
+
+        # Check on each interval.
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    # * method: start
+    def start(self) -> 'ConfigWatchContext':
+        '''
+        Start polling on a daemon thread.
+
+        :return: The watcher.
+        :rtype: ConfigWatchContext
+        '''
+
+        # Start the thread once.
+        if self.thread is None or not self.thread.is_alive():
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, name='tiferet-flask-reload', daemon=True)
+            self.thread.start()
+        return self
+
+    # * method: restart
+    def restart(self):
+        '''
+        Restart polling in a forked child if the watcher was running in the parent.
+        '''
+
+        # Start a new thread unless the watcher was stopped.
+        if self.thread is not None and not self.stopped.is_set():
+            self.thread = None
+            self.start()
+
+    # * method: stop
+    def stop(self):
+        '''
+        Stop polling.
+        '''
+
+        # Signal the thread and wait for it to exit.
+        self.stopped.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
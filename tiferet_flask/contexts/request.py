@@ -2,12 +2,430 @@
 
 # *** imports
 
+# ** core
+import threading
+from collections.abc import Iterator, MutableMapping
+from typing import Any, Dict, List, Mapping, Tuple
+from uuid import uuid4
+
 # ** infra
+from pydantic import BaseModel
 from tiferet_openapi import OpenApiRequestContext
 
 
+# *** classes
+
+# ** class: lazy_headers
+class LazyHeaders(MutableMapping):
+    '''
+    A request header mapping that reads through to the Flask headers and only
+    copies them into a dict when the full mapping is iterated.
+    '''
+
+    # * attribute: source
+    source: Mapping[str, str]
+
+    # * attribute: headers
+    headers: Dict[str, Any]
+
+    # * attribute: loaded
+    loaded: bool
+
+    # * init
+    def __init__(self, source: Mapping[str, str]):
+        '''
+        Initialize the lazy header mapping.
+
+        :param source: The source headers (e.g. flask.request.headers).
+        :type source: Mapping[str, str]
+        '''
+
+        # Keep the source and an overlay for header writes.
+        self.source = source
+        self.headers = {}
+        self.loaded = False
+
+    # * method: load
+    def load(self) -> Dict[str, Any]:
+        '''
+        Copy the source headers under the overlay into a plain dict.
+
+        :return: The loaded headers.
+        :rtype: Dict[str, Any]
+        '''
+
+        # Merge the source headers once, keeping overlay writes on top.
+        if not self.loaded:
+            self.headers = {**dict(self.source), **self.headers}
+            self.loaded = True
+        return self.headers
+
+    # * method: __getitem__
+    def __getitem__(self, key: str) -> Any:
+        '''
+        Get a header value, reading overlay writes before the source.
+
+        :param key: The header name.
+        :type key: str
+        :return: The header value.
+        :rtype: Any
+        '''
+
+        # Read overlay writes first, then fall through to the source.
+        if self.loaded or key in self.headers:
+            return self.headers[key]
+        return self.source[key]
+
+    # * method: __setitem__
+    def __setitem__(self, key: str, value: Any):
+        '''
+        Set a header value on the overlay without loading the source.
+
+        :param key: The header name.
+        :type key: str
+        :param value: The header value.
+        :type value: Any
+        '''
+
+        # Write to the overlay.
+        self.headers[key] = value
+
+    # * method: __delitem__
+    def __delitem__(self, key: str):
+        '''
+        Delete a header value.
+
+        :param key: The header name.
+        :type key: str
+        '''
+
+        # Load the full mapping and delete the header.
+        del self.load()[key]
+
+    # * method: __iter__
+    def __iter__(self) -> Iterator[str]:
+        '''
+        Iterate over the header names.
+
+        :return: An iterator over the header names.
+        :rtype: Iterator[str]
+        '''
+
+        # Load the full mapping and iterate it.
+        return iter(self.load())
+
+    # * method: __len__
+    def __len__(self) -> int:
+        '''
+        Count the headers.
+
+        :return: The number of headers.
+        :rtype: int
+        '''
+
+        # Load the full mapping and count it.
+        return len(self.load())
+
+
 # *** contexts
 
 # ** context: flask_request_context
-FlaskRequestContext = OpenApiRequestContext
+class FlaskRequestContext(OpenApiRequestContext):
+    '''
+    An OpenAPI request context that can keep pydantic results as models for
+    the fast JSON provider to serialize directly.
+    '''
+
+    # * attribute: raw_models
+    raw_models: bool = False
+
+    # * method: format_result
+    @staticmethod
+    def format_result(result: Any, raw_models: bool = False) -> Any:
+        '''
+        Format a final result like OpenApiRequestContext: no result becomes an
+        empty response, and models (or lists and dicts of models) become dicts.
+
+        :param result: The result to format.
+        :type result: Any
+        :param raw_models: Whether to keep the result as-is for the JSON provider to serialize.
+        :type raw_models: bool
+        :return: The formatted result.
+        :rtype: Any
+        '''
+
+        # Keep the result as-is when models are serialized by the JSON provider.
+        if raw_models and result is not None:
+            return result
+
+        # Otherwise convert models to dicts, and no result to an empty response.
+        if result is None:
+            return ''
+        if isinstance(result, BaseModel):
+            return result.model_dump()
+        if isinstance(result, list) and all(isinstance(item, BaseModel) for item in result):
+            return [item.model_dump() for item in result]
+        if isinstance(result, dict) and all(isinstance(value, BaseModel) for value in result.values()):
+            return {key: value.model_dump() for key, value in result.items()}
+        return result
+
+    # * method: set_result
+    def set_result(self, result: Any, data_key: str = None):
+        '''
+        Set the result of the request context.
+
+        :param result: The result to set.
+        :type result: Any
+        :param data_key: The key in the request data to set the result to.
+        :type data_key: str
+        '''
+
+        # Store the raw result in the request data for downstream commands.
+        if data_key:
+            super().set_result(result, data_key=data_key)
+            return
+
+        # Otherwise format the final result.
+        self.result = self.format_result(result, self.raw_models)
+
+
+# ** context: pooled_request_context
+class PooledRequestContext(object):
+    '''
+    A slotted request context with the FlaskRequestContext result semantics,
+    reset and reused from a RequestContextPool instead of being allocated
+    per request. The session ID is only generated when it is read.
+    '''
+
+    # * attribute: __slots__
+    __slots__ = ('feature_id', 'headers', 'data', 'result', 'raw_models', '_session_id')
+
+    # * init
+    def __init__(self, headers: Dict[str, str] = None, data: Dict[str, Any] = None, session_id: str = None, feature_id: str = None):
+        '''
+        Initialize the request context.
+
+        :param headers: The request headers.
+        :type headers: dict
+        :param data: The request data.
+        :type data: dict
+        :param session_id: The session ID; generated on first read if None.
+        :type session_id: str
+        :param feature_id: The feature ID.
+        :type feature_id: str
+        '''
+
+        # Set the request state.
+        self.reset(headers, data, feature_id)
+        self._session_id = session_id
+
+    # * method: reset
+    def reset(self, headers: Dict[str, str] = None, data: Dict[str, Any] = None, feature_id: str = None, raw_models: bool = False):
+        '''
+        Reset the context for a new request.
+
+        :param headers: The request headers.
+        :type headers: dict
+        :param data: The request data.
+        :type data: dict
+        :param feature_id: The feature ID.
+        :type feature_id: str
+        :param raw_models: Whether to keep pydantic results as models.
+        :type raw_models: bool
+        '''
+
+        # Replace the request state without copying the mappings.
+        self.headers = headers if headers is not None else {}
+        self.data = data if data is not None else {}
+        self.feature_id = feature_id
+        self.result = None
+        self.raw_models = raw_models
+        self._session_id = None
+
+    # * method: session_id
+    @property
+    def session_id(self) -> str:
+        '''
+        Get the session ID, generating it on first read.
+
+        :return: The session ID.
+        :rtype: str
+        '''
+
+        # Generate the session ID lazily.
+        if self._session_id is None:
+            self._session_id = str(uuid4())
+        return self._session_id
+
+    # * method: session_id (setter)
+    @session_id.setter
+    def session_id(self, session_id: str):
+        '''
+        Set the session ID.
+
+        :param session_id: The session ID.
+        :type session_id: str
+        '''
+
+        # Set the session ID.
+        self._session_id = session_id
+
+    # * method: handle_response
+    def handle_response(self) -> Any:
+        '''
+        Handle the response, formatting the result like OpenApiRequestContext.
+
+        :return: The response.
+        :rtype: Any
+        '''
+
+        # Format and return the result.
+        self.set_result(self.result)
+        return self.result
+
+    # * method: set_result
+    def set_result(self, result: Any, data_key: str = None):
+        '''
+        Set the result of the request context.
+
+        :param result: The result to set.
+        :type result: Any
+        :param data_key: The key in the request data to set the result to.
+        :type data_key: str
+        '''
+
+        # Store the raw result in the request data for downstream commands.
+        if data_key:
+            self.data[data_key] = result
+            return
+
+        # Otherwise format the final result like FlaskRequestContext.
+        self.result = FlaskRequestContext.format_result(result, self.raw_models)
+
+
+# ** context: request_context_pool
+class RequestContextPool(object):
+    '''
+    A per-thread pool of pooled request contexts.
+
+    Each thread keeps its free contexts and a stack of the contexts it has
+    handed out, so a sync run can release what it acquired without holding
+    a reference to it.
+    '''
+
+    # * attribute: max_size
+    max_size: int
+
+    # * attribute: local
+    local: threading.local
+
+    # * init
+    def __init__(self, max_size: int = 64):
+        '''
+        Initialize the pool.
+
+        :param max_size: The most free contexts kept per thread.
+        :type max_size: int
+        '''
+
+        # Set the size and the per-thread state.
+        self.max_size = max_size
+        self.local = threading.local()
+
+    # * method: get_state
+    def get_state(self) -> Tuple[List[PooledRequestContext], List[PooledRequestContext]]:
+        '''
+        Get the free and in-use contexts of the current thread.
+
+        :return: The free list and the in-use stack.
+        :rtype: Tuple[List[PooledRequestContext], List[PooledRequestContext]]
+        '''
+
+        # Create the lists on first use in the thread.
+        try:
+            return self.local.free, self.local.in_use
+        except AttributeError:
+            self.local.free, self.local.in_use = [], []
+            return self.local.free, self.local.in_use
+
+    # * method: acquire
+    def acquire(self, headers: Dict[str, str] = None, data: Dict[str, Any] = None, feature_id: str = None, raw_models: bool = False) -> PooledRequestContext:
+        '''
+        Take a reset context from the pool, or create one if the pool is empty.
+
+        :param headers: The request headers.
+        :type headers: dict
+        :param data: The request data.
+        :type data: dict
+        :param feature_id: The feature ID.
+        :type feature_id: str
+        :param raw_models: Whether to keep pydantic results as models.
+        :type raw_models: bool
+        :return: The request context.
+        :rtype: PooledRequestContext
+        '''
+
+        # Reuse a free context or create one.
+        free, in_use = self.get_state()
+        if free:
+            request = free.pop()
+            request.reset(headers, data, feature_id, raw_models)
+        else:
+            request = PooledRequestContext(headers, data, feature_id=feature_id)
+            request.raw_models = raw_models
+
+        # Track it as in use.
+        in_use.append(request)
+        return request
+
+    # * method: mark
+    def mark(self) -> int:
+        '''
+        Mark the in-use stack of the current thread.
+
+        :return: The current stack depth.
+        :rtype: int
+        '''
+
+        # Return the depth.
+        return len(self.get_state()[1])
+
+    # * method: release
+    def release(self, request: PooledRequestContext):
+        '''
+        Return a context to the pool of the current thread.
+
+        Contexts holding a lazy (iterator) result are dropped instead, since
+        the result may still read from them after the run returns.
+
+        :param request: The request context.
+        :type request: PooledRequestContext
+        '''
+
+        # Stop tracking the context.
+        free, in_use = self.get_state()
+        try:
+            in_use.remove(request)
+        except ValueError:
+            pass
+
+        # Drop the request references, keeping the context if the pool has room.
+        if isinstance(request.result, Iterator):
+            return
+        request.reset()
+        if len(free) < self.max_size:
+            free.append(request)
+
+    # * method: release_to
+    def release_to(self, mark: int):
+        '''
+        Release the contexts acquired by the current thread since a mark.
+
+        :param mark: The stack depth returned by mark.
+        :type mark: int
+        '''
 
+        # Release from the top of the stack down to the mark.
+        in_use = self.get_state()[1]
+        while len(in_use) > mark:
+            self.release(in_use[-1])
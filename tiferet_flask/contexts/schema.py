@@ -0,0 +1,215 @@
+'''Flask request schema context.'''
+
+# *** imports
+
+# ** core
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Tuple
+
+# ** infra
+from pydantic import TypeAdapter, ValidationError
+from tiferet.events import ImportDependency
+from tiferet_openapi import ApiRouter
+
+
+# *** constants
+
+# ** constant: schema_ref_template
+SCHEMA_REF_TEMPLATE = '#/components/schemas/{model}'
+
+
+# *** classes
+
+# ** class: request_schema
+class RequestSchema(NamedTuple):
+    '''
+    A compiled request schema: the validator of a route's request model and its JSON schema.
+    '''
+
+    # * attribute: name
+    name: str
+
+    # * attribute: adapter
+    adapter: TypeAdapter
+
+    # * attribute: json_schema
+    json_schema: Dict[str, Any]
+
+
+# *** contexts
+
+# ** context: request_schema_context
+class RequestSchemaContext(object):
+    '''
+    A context compiling the `request_model` of each route in openapi.yml into
+    a pydantic TypeAdapter once, so request data is validated before the
+    feature runs and invalid requests are rejected with a 422.
+
+    A request model is the dotted import path of a pydantic model (or any
+    type a TypeAdapter accepts). It validates the feature request data: the
+    JSON body, query params and route params. Routes sharing a model share
+    its adapter.
+    '''
+
+    # * attribute: schemas
+    schemas: Mapping[str, RequestSchema]
+
+    # * init
+    def __init__(self, routers: List[ApiRouter] = ()):
+        '''
+        Initialize the context, compiling the request schemas of the given routes.
+
+        :param routers: The ApiRouter domain objects to compile schemas for.
+        :type routers: List[ApiRouter]
+        '''
+
+        # Compile the route schemas.
+        self.schemas = MappingProxyType({})
+        self.compile(routers)
+
+    # * method: compile
+    def compile(self, routers: List[ApiRouter]) -> Mapping[str, RequestSchema]:
+        '''
+        Compile the route schemas, replacing the previous ones in a single assignment.
+
+        :param routers: The ApiRouter domain objects to compile schemas for.
+        :type routers: List[ApiRouter]
+        :return: The compiled schemas, keyed by endpoint.
+        :rtype: Mapping[str, RequestSchema]
+        :raises TiferetError: If a request model cannot be imported.
+        '''
+
+        # Compile each request model once, keyed by the endpoints declaring it.
+        compiled = {}
+        schemas = {}
+        for router in routers:
+            for route in router.routes:
+                if not route.request_model:
+                    continue
+                if route.request_model not in compiled:
+                    compiled[route.request_model] = self.compile_schema(route.request_model)
+                schemas[route.endpoint] = compiled[route.request_model]
+
+        # Swap in the compiled schemas.
+        self.schemas = MappingProxyType(schemas)
+        return self.schemas
+
+    # * method: compile_schema
+    @staticmethod
+    def compile_schema(request_model: str | Any) -> RequestSchema:
+        '''
+        Compile a request model into a validator and its JSON schema.
+
+        :param request_model: The dotted import path of the request model, or the model itself.
+        :type request_model: str | Any
+        :return: The compiled schema.
+        :rtype: RequestSchema
+        :raises TiferetError: If the request model cannot be imported.
+        '''
+
+        # Import the model from its dotted path.
+        model = request_model
+        if isinstance(request_model, str):
+            module_path, _, class_name = request_model.rpartition('.')
+            model = ImportDependency.execute(module_path, class_name)
+
+        # Build the adapter and generate the JSON schema, referencing nested models from the spec components.
+        adapter = TypeAdapter(model)
+        return RequestSchema(
+            name=getattr(model, '__name__', str(model)),
+            adapter=adapter,
+            json_schema=adapter.json_schema(ref_template=SCHEMA_REF_TEMPLATE),
+        )
+
+    # * method: get_schema
+    def get_schema(self, endpoint: str | None) -> RequestSchema | None:
+        '''
+        Get the compiled request schema of an endpoint.
+
+        :param endpoint: The Flask endpoint, or None for unmatched requests.
+        :type endpoint: str | None
+        :return: The compiled schema, or None if the route declares no request model.
+        :rtype: RequestSchema | None
+        '''
+
+        # Return the compiled schema.
+        return self.schemas.get(endpoint)
+
+    # * method: validate
+    def validate(self, endpoint: str | None, data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]] | None]:
+        '''
+        Validate the request data of an endpoint against its request model.
+
+        The validated fields replace the raw ones (e.g. with defaults filled
+        in); other data, such as a streamed body iterator, is kept as is.
+
+        :param endpoint: The Flask endpoint.
+        :type endpoint: str | None
+        :param data: The feature request data.
+        :type data: Dict[str, Any]
+        :return: The validated data, and the validation errors (type, loc, msg) or None if valid.
+        :rtype: Tuple[Dict[str, Any], List[Dict[str, Any]] | None]
+        '''
+
+        # Pass the data through for routes without a request model.
+        schema = self.schemas.get(endpoint)
+        if schema is None:
+            return data, None
+
+        # Validate the data, returning the errors without their inputs.
+        try:
+            validated = schema.adapter.validate_python(data)
+        except ValidationError as error:
+            return data, error.errors(include_url=False, include_context=False, include_input=False)
+
+        # Merge the validated fields over the data.
+        validated = schema.adapter.dump_python(validated)
+        return {**data, **validated} if isinstance(validated, dict) else data, None
+
+    # * method: add_to_spec
+    def add_to_spec(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        '''
+        Describe the request models in an OpenAPI spec generated from the same routers.
+
+        Each model is added to the spec components. Operations with a body
+        (POST, PUT, PATCH) reference it as their JSON request body; others
+        list its properties as query parameters.
+
+        :param spec: The OpenAPI spec, whose operation IDs are the Flask endpoints.
+        :type spec: Dict[str, Any]
+        :return: The spec, updated in place.
+        :rtype: Dict[str, Any]
+        '''
+
+        # Skip specs without request models.
+        if not self.schemas:
+            return spec
+        components = spec.setdefault('components', {}).setdefault('schemas', {})
+
+        # Document the request model of each operation.
+        for path_item in spec.get('paths', {}).values():
+            for method, operation in path_item.items():
+                schema = self.schemas.get(operation.get('operationId'))
+                if schema is None:
+                    continue
+
+                # Add the model and its nested models to the components.
+                json_schema = dict(schema.json_schema)
+                components.update(json_schema.pop('$defs', {}))
+                components[schema.name] = json_schema
+
+                # Reference the model as the JSON body of operations with a body.
+                if method in ('post', 'put', 'patch'):
+                    operation['requestBody'] = {
+                        'required': True,
+                        'content': {'application/json': {'schema': {'$ref': SCHEMA_REF_TEMPLATE.format(model=schema.name)}}},
+                    }
+                    continue
+
+                # Otherwise list the model properties as query parameters.
+                required = set(json_schema.get('required', ()))
+                operation['parameters'] = [
+                    {'name': name, 'in': 'query', 'required': name in required, 'schema': property_schema}
+                    for name, property_schema in json_schema.get('properties', {}).items()
+                ]
+        return spec
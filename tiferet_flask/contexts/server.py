@@ -0,0 +1,584 @@
+'''Flask prefork server context.'''
+
+# *** imports
+
+# ** core
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# ** infra
+from flask import Flask
+from werkzeug.serving import WSGIRequestHandler, make_server
+from werkzeug.wsgi import ClosingIterator
+
+
+# *** constants
+
+# ** constant: worker_pid
+WORKER_PID = struct.Struct('=q')
+
+
+# *** classes
+
+# ** class: quiet_request_handler
+class QuietRequestHandler(WSGIRequestHandler):
+    '''
+    A werkzeug request handler that skips the per-request access log line.
+    '''
+
+    # * method: log_request
+    def log_request(self, *args, **kwargs):
+        '''
+        Skip the access log line.
+        '''
+
+        pass
+
+
+# ** class: worker_app
+class WorkerApp(object):
+    '''
+    A WSGI wrapper counting the requests a worker serves and the requests in flight.
+    '''
+
+    # * attribute: app
+    app: Callable
+
+    # * attribute: served
+    served: int
+
+    # * attribute: active
+    active: int
+
+    # * attribute: lock
+    lock: threading.Lock
+
+    # * attribute: on_request
+    on_request: Callable[[int], None]
+
+    # * init
+    def __init__(self, app: Callable, on_request: Callable[[int], None] = None):
+        '''
+        Initialize the wrapper.
+
+        :param app: The WSGI application.
+        :type app: Callable
+        :param on_request: Called with the served request count after each request starts.
+        :type on_request: Callable[[int], None]
+        '''
+
+        # Set the application and the counters.
+        self.app = app
+        self.served = 0
+        self.active = 0
+        self.lock = threading.Lock()
+        self.on_request = on_request
+
+    # * method: finish
+    def finish(self):
+        '''
+        Mark a request as finished once its response has been sent.
+        '''
+
+        # Decrement the in-flight count.
+        with self.lock:
+            self.active -= 1
+
+    # * method: __call__
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        '''
+        Serve a request, counting it until its response iterable is closed.
+        '''
+
+        # Count the request.
+        with self.lock:
+            self.served += 1
+            self.active += 1
+            served = self.served
+        if self.on_request:
+            self.on_request(served)
+
+        # Serve the request, finishing it when the server closes the response.
+        try:
+            return ClosingIterator(self.app(environ, start_response), [self.finish])
+        except BaseException:
+            self.finish()
+            raise
+
+
+# *** contexts
+
+# ** context: prefork_server_context
+class PreforkServerContext(object):
+    '''
+    A prefork WSGI server: the master binds one listening socket and forks
+    workers that share it, replacing workers that exit, reach their request
+    limit or exceed their memory cap, and stopping them gracefully on SIGTERM
+    or SIGINT. SIGHUP replaces all workers with a rolling restart.
+
+    Workers serve with werkzeug's WSGI server, which is a development server:
+    it has no protection against slow clients and is not hardened for
+    untrusted traffic. In production, put it behind a reverse proxy, or run
+    the preloaded app under a production WSGI server such as gunicorn.
+    '''
+
+    # * attribute: app
+    app: Flask
+
+    # * attribute: host
+    host: str
+
+    # * attribute: port
+    port: int
+
+    # * attribute: workers
+    workers: int
+
+    # * attribute: threaded
+    threaded: bool
+
+    # * attribute: max_requests
+    max_requests: int
+
+    # * attribute: max_requests_jitter
+    max_requests_jitter: int
+
+    # * attribute: max_memory_mb
+    max_memory_mb: float | None
+
+    # * attribute: graceful_timeout
+    graceful_timeout: float
+
+    # * attribute: backlog
+    backlog: int
+
+    # * attribute: access_log
+    access_log: bool
+
+    # * attribute: on_worker_start
+    on_worker_start: Callable[[], Any] | None
+
+    # * attribute: on_worker_exit
+    on_worker_exit: Callable[[int], Any] | None
+
+    # * attribute: socket
+    socket: socket.socket | None
+
+    # * attribute: pids
+    pids: Dict[int, float]
+
+    # * attribute: retiring
+    retiring: Dict[int, float]
+
+    # * attribute: pipe
+    pipe: Tuple[int, int] | None
+
+    # * attribute: stopping
+    stopping: bool
+
+    # * attribute: logger
+    logger: logging.Logger
+
+    # * init
+    def __init__(self,
+            app: Flask,
+            bind: str = '127.0.0.1:5000',
+            workers: int = None,
+            threaded: bool = False,
+            max_requests: int = 0,
+            max_requests_jitter: int = 0,
+            max_memory_mb: float = None,
+            graceful_timeout: float = 30.0,
+            backlog: int = 2048,
+            access_log: bool = False,
+            on_worker_start: Callable[[], Any] = None,
+            on_worker_exit: Callable[[int], Any] = None,
+        ):
+        '''
+        Initialize the prefork server.
+
+        :param app: The WSGI application, ideally built with preload before forking.
+        :type app: Flask
+        :param bind: The host and port to listen on (host:port).
+        :type bind: str
+        :param workers: The number of worker processes; the number of usable CPUs if None.
+        :type workers: int
+        :param threaded: Whether each worker serves requests on threads instead of one at a time.
+        :type threaded: bool
+        :param max_requests: Recycle a worker after this many requests; never if 0.
+        :type max_requests: int
+        :param max_requests_jitter: Add up to this many requests to each worker's limit, so workers do not recycle together.
+        :type max_requests_jitter: int
+        :param max_memory_mb: Recycle a worker once its resident memory exceeds this many MiB; never if None.
+        :type max_memory_mb: float
+        :param graceful_timeout: Seconds to let workers finish in-flight requests on shutdown before killing them.
+        :type graceful_timeout: float
+        :param backlog: The listening socket backlog.
+        :type backlog: int
+        :param access_log: Whether workers log each request.
+        :type access_log: bool
+        :param on_worker_start: Called in each worker after it is forked, before it serves, e.g. to restart the threads of the app.
+        :type on_worker_start: Callable[[], Any]
+        :param on_worker_exit: Called in the master with the pid of each reaped worker, e.g. to give back its rate limit counts.
+        :type on_worker_exit: Callable[[int], Any]
+        '''
+
+        # Set the server options.
+        host, _, port = bind.rpartition(':')
+        self.app = app
+        self.host = host.strip('[]') or '127.0.0.1'
+        self.port = int(port)
+        self.workers = workers or self.get_cpu_count()
+        self.threaded = threaded
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.max_memory_mb = max_memory_mb
+        self.graceful_timeout = graceful_timeout
+        self.backlog = backlog
+        self.access_log = access_log
+        self.on_worker_start = on_worker_start
+        self.on_worker_exit = on_worker_exit
+        self.socket = None
+        self.pids = {}
+        self.retiring = {}
+        self.pipe = None
+        self.stopping = False
+        self.logger = logging.getLogger('tiferet_flask.server')
+
+    # * method: get_cpu_count
+    @staticmethod
+    def get_cpu_count() -> int:
+        '''
+        Get the number of CPUs this process may run on.
+
+        :return: The usable CPU count.
+        :rtype: int
+        '''
+
+        # Prefer the scheduler affinity, which honors container CPU sets.
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0)) or 1
+        return os.cpu_count() or 1
+
+    # * method: get_memory_mb
+    @staticmethod
+    def get_memory_mb() -> float:
+        '''
+        Get the resident memory of the current process.
+
+        :return: The resident memory in MiB (the peak where the current value is unavailable).
+        :rtype: float
+        '''
+
+        # Read the current resident set size on Linux.
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1048576
+        except (OSError, ValueError, IndexError):
+            pass
+
+        # Fall back to the peak resident size (KiB on Linux, bytes on macOS).
+        if resource is None:
+            return 0.0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1048576 if peak > 1 << 32 else peak / 1024
+
+    # * method: bind
+    def bind(self) -> socket.socket:
+        '''
+        Bind the shared listening socket.
+
+        :return: The listening socket; its port is assigned by the system if the configured port is 0.
+        :rtype: socket.socket
+        '''
+
+        # Bind once; forked workers inherit the socket.
+        if self.socket is None:
+            family = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+            self.socket = socket.create_server((self.host, self.port), family=family, backlog=self.backlog)
+            self.port = self.socket.getsockname()[1]
+        return self.socket
+
+    # * method: spawn_worker
+    def spawn_worker(self) -> int:
+        '''
+        Fork a worker process.
+
+        :return: The worker pid.
+        :rtype: int
+        '''
+
+        # Fork; the child serves until it is recycled or stopped.
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                if self.pipe:
+                    os.close(self.pipe[0])
+                self.run_worker()
+            except BaseException:
+                self.logger.exception('Worker %s failed', os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+
+        # Track the worker in the master.
+        self.pids[pid] = time.monotonic()
+        self.logger.info('Booted worker %s', pid)
+        return pid
+
+    # * method: notify_retiring
+    def notify_retiring(self):
+        '''
+        Tell the master this worker is retiring, so it boots a replacement while this one drains.
+        '''
+
+        # Write the worker pid to the master pipe (one atomic write).
+        if self.pipe:
+            try:
+                os.write(self.pipe[1], WORKER_PID.pack(os.getpid()))
+            except OSError:
+                pass
+
+    # * method: run_worker
+    def run_worker(self):
+        '''
+        Serve requests in a worker until it is stopped, recycled or orphaned.
+        '''
+
+        # Stop on SIGTERM; the master handles SIGINT for the process group.
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_DFL)
+
+        # Initialize the worker, e.g. restarting the threads that did not survive the fork.
+        if self.on_worker_start:
+            self.on_worker_start()
+
+        # Recycle after the request limit, offset by the jitter, telling the master at once.
+        limit = self.max_requests + random.randint(0, self.max_requests_jitter) if self.max_requests else 0
+        def on_request(served: int):
+            if limit and served == limit:
+                self.notify_retiring()
+                stop.set()
+        worker_app = WorkerApp(self.app, on_request)
+
+        # Serve on the inherited socket in a background thread.
+        server = make_server(
+            self.host,
+            self.port,
+            worker_app,
+            threaded=self.threaded,
+            request_handler=None if self.access_log else QuietRequestHandler,
+            fd=self.socket.fileno(),
+        )
+        thread = threading.Thread(target=server.serve_forever, kwargs=dict(poll_interval=0.1), daemon=True)
+        thread.start()
+
+        # Wait for a stop, checking the memory cap and that the master is still alive.
+        master_pid = os.getppid()
+        while not stop.wait(0.5):
+            if self.max_memory_mb and self.get_memory_mb() > self.max_memory_mb:
+                self.logger.info('Worker %s exceeded %s MiB; recycling', os.getpid(), self.max_memory_mb)
+                self.notify_retiring()
+                break
+            if os.getppid() != master_pid:
+                break
+
+        # Stop accepting, then let in-flight requests finish within the graceful timeout.
+        server.shutdown()
+        deadline = time.monotonic() + self.graceful_timeout
+        while worker_app.active > 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    # * method: reap_workers
+    def reap_workers(self) -> int:
+        '''
+        Collect exited workers without blocking.
+
+        :return: The number of workers reaped.
+        :rtype: int
+        '''
+
+        # Wait on each exited child.
+        reaped = 0
+        while self.pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.pids.clear()
+                break
+            if pid == 0:
+                break
+            self.retiring.pop(pid, None)
+            if self.pids.pop(pid, None) is not None:
+                reaped += 1
+                self.logger.info('Worker %s exited with status %s', pid, os.waitstatus_to_exitcode(status))
+                if self.on_worker_exit:
+                    self.on_worker_exit(pid)
+        return reaped
+
+    # * method: read_retiring
+    def read_retiring(self, timeout: float = 0.0) -> List[int]:
+        '''
+        Read the pids of the workers that announced they are retiring.
+
+        :param timeout: The seconds to wait for an announcement.
+        :type timeout: float
+        :return: The retiring pids, which no longer count toward the running workers.
+        :rtype: List[int]
+        '''
+
+        # Wait for the pipe to be readable, then read the whole pids written so far.
+        if not self.pipe or not select.select([self.pipe[0]], [], [], timeout)[0]:
+            return []
+        try:
+            data = os.read(self.pipe[0], WORKER_PID.size * 256)
+        except BlockingIOError:
+            return []
+
+        # Mark the running workers among them as retiring; they stop themselves.
+        pids = []
+        for (pid,) in WORKER_PID.iter_unpack(data[:len(data) - len(data) % WORKER_PID.size]):
+            if pid in self.pids and pid not in self.retiring:
+                self.retiring[pid] = time.monotonic() + self.graceful_timeout + 1.0
+                pids.append(pid)
+        return pids
+
+    # * method: retire_workers
+    def retire_workers(self, pids: Iterable[int]):
+        '''
+        Ask workers to stop gracefully, without waiting for them.
+
+        :param pids: The worker pids.
+        :type pids: Iterable[int]
+        '''
+
+        # Signal each worker and give it the graceful timeout to drain.
+        deadline = time.monotonic() + self.graceful_timeout + 1.0
+        for pid in pids:
+            self.retiring[pid] = deadline
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    # * method: reload_workers
+    def reload_workers(self):
+        '''
+        Replace all workers with a rolling restart: boot the new workers first, then drain the old ones.
+        '''
+
+        # Boot a full set of workers alongside the running ones.
+        running = [pid for pid in self.pids if pid not in self.retiring]
+        for _ in range(self.workers):
+            self.spawn_worker()
+
+        # Then ask the old workers to finish their requests and exit.
+        self.retire_workers(running)
+
+    # * method: kill_overdue
+    def kill_overdue(self):
+        '''
+        Kill retiring workers that are still running after their graceful timeout.
+        '''
+
+        # Kill the workers past their deadline.
+        now = time.monotonic()
+        for pid, deadline in list(self.retiring.items()):
+            if now > deadline:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+    # * method: stop_workers
+    def stop_workers(self, timeout: float = None):
+        '''
+        Gracefully stop all workers, killing those still running after the timeout.
+
+        :param timeout: The seconds to wait; the graceful timeout if None.
+        :type timeout: float
+        '''
+
+        # Ask each worker to stop.
+        for pid in list(self.pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        # Wait for them to exit, then kill the rest.
+        deadline = time.monotonic() + (self.graceful_timeout if timeout is None else timeout) + 1.0
+        while self.pids and time.monotonic() < deadline:
+            self.reap_workers()
+            time.sleep(0.05)
+        for pid in list(self.pids):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        while self.pids:
+            self.reap_workers()
+            time.sleep(0.01)
+
+    # * method: serve
+    def serve(self):
+        '''
+        Bind the socket, fork the workers and supervise them until SIGTERM or SIGINT.
+
+        Without os.fork (e.g. on Windows) the app is served in this process.
+        '''
+
+        # Serve in-process where forking is unavailable.
+        sock = self.bind()
+        if not hasattr(os, 'fork'):
+            server = make_server(self.host, self.port, self.app, threaded=True, fd=sock.fileno())
+            return server.serve_forever()
+
+        # Stop on SIGTERM or SIGINT and replace all workers on SIGHUP.
+        def handle_stop(signum, frame):
+            self.stopping = True
+        reload = threading.Event()
+        signal.signal(signal.SIGTERM, handle_stop)
+        signal.signal(signal.SIGINT, handle_stop)
+        signal.signal(signal.SIGHUP, lambda signum, frame: reload.set())
+        self.logger.info('Listening on %s:%s with %s workers', self.host, self.port, self.workers)
+
+        # Open the pipe retiring workers announce themselves on.
+        self.pipe = os.pipe()
+        os.set_blocking(self.pipe[0], False)
+
+        # Keep the configured number of workers serving, replacing retiring workers as soon as they announce it.
+        try:
+            while not self.stopping:
+                if reload.is_set():
+                    reload.clear()
+                    self.reload_workers()
+                self.reap_workers()
+                self.kill_overdue()
+                while len(self.pids) - len(self.retiring) < self.workers and not self.stopping:
+                    self.spawn_worker()
+                self.read_retiring(timeout=0.1)
+
+        # Stop the workers gracefully and release the socket and pipe.
+        finally:
+            self.stop_workers()
+            sock.close()
+            for fd in self.pipe:
+                os.close(fd)
+            self.pipe = None
+            self.logger.info('Shut down')
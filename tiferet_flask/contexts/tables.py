@@ -0,0 +1,47 @@
+'''Flask route tables.'''
+
+# *** imports
+
+# ** core
+from typing import NamedTuple, Tuple
+
+# ** infra
+from tiferet_openapi import ApiRouter
+from werkzeug.routing import Map
+
+# ** app
+from .cors import CorsContext
+from .dispatch import DispatchContext
+from .limit import RateLimitContext
+from .schema import RequestSchemaContext
+
+
+# *** classes
+
+# ** class: route_tables
+class RouteTables(NamedTuple):
+    '''
+    An immutable snapshot of the compiled route tables of a Flask app.
+
+    The tables are compiled together and published with a single
+    assignment, and each request reads the snapshot it was matched against,
+    so a reload never mixes old and new tables within a request.
+    '''
+
+    # * attribute: routers
+    routers: Tuple[ApiRouter, ...]
+
+    # * attribute: dispatch
+    dispatch: DispatchContext | None
+
+    # * attribute: cors
+    cors: CorsContext | None
+
+    # * attribute: limits
+    limits: RateLimitContext | None
+
+    # * attribute: schemas
+    schemas: RequestSchemaContext | None
+
+    # * attribute: url_map
+    url_map: Map
@@ -0,0 +1,192 @@
+# *** imports
+
+# ** core
+import asyncio
+
+# ** infra
+import pytest
+from unittest import mock
+from tiferet_openapi import ApiRoute, ApiRouter
+
+# ** app
+from ..cache import MemoryResponseCache, ResponseCacheContext
+from ..dispatch import DispatchContext
+
+
+# *** fixtures
+
+# ** fixture: dispatch
+@pytest.fixture
+def dispatch() -> DispatchContext:
+    '''
+    Fixture to provide a dispatch table with a cached and an uncached route.
+    '''
+
+    return DispatchContext(
+        routers=[ApiRouter(name='calc', prefix='/calc', routes=[
+            ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['POST'], status_code=200),
+            ApiRoute(id='sqrt', endpoint='calc.sqrt', path='/sqrt', methods=['POST'], status_code=200),
+        ])],
+        options={'calc.add': {'cache': {'ttl': 60, 'max_entries': 2, 'key': ['a', 'b']}}},
+    )
+
+
+# ** fixture: run_feature
+@pytest.fixture
+def run_feature() -> mock.Mock:
+    '''
+    Fixture to provide a feature runner returning a response and status code.
+    '''
+
+    return mock.Mock(return_value=(3, 200))
+
+
+# *** tests
+
+# ** test: memory_response_cache_lru
+def test_memory_response_cache_lru():
+    '''
+    Test the in-process cache evicts the least recently used entry.
+    '''
+
+    # Fill the cache and touch the first entry.
+    cache = MemoryResponseCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+
+    # Add a third entry and assert the untouched one was evicted.
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+
+# ** test: memory_response_cache_ttl
+def test_memory_response_cache_ttl():
+    '''
+    Test the in-process cache expires entries after their TTL.
+    '''
+
+    # Store an entry at a fixed clock.
+    cache = MemoryResponseCache()
+    with mock.patch('tiferet_flask.contexts.cache.time.monotonic', return_value=100.0):
+        cache.set('a', 1, ttl=10)
+        assert cache.get('a') == 1
+
+    # Advance the clock past the TTL and assert the entry expired.
+    with mock.patch('tiferet_flask.contexts.cache.time.monotonic', return_value=110.0):
+        assert cache.get('a') is None
+    assert not cache.entries
+
+
+# ** test: response_cache_context_run
+def test_response_cache_context_run(dispatch: DispatchContext, run_feature: mock.Mock):
+    '''
+    Test the cache runs the feature on a miss, serves hits and keys on the configured fields.
+    '''
+
+    # Run the same request twice, plus one differing only in a non-key field.
+    cache = ResponseCacheContext()
+    entry = dispatch.get_entry('calc.add')
+    assert cache.run(entry, {'a': 1, 'b': 2}, run_feature) == (3, 200)
+    assert cache.run(entry, {'a': 1, 'b': 2}, run_feature) == (3, 200)
+    assert cache.run(entry, {'b': 2, 'a': 1, 'trace': 'x'}, run_feature) == (3, 200)
+
+    # Assert the feature ran once and the counters reflect it.
+    run_feature.assert_called_once()
+    assert cache.get_stats() == {'calc.add': {'hits': 2, 'misses': 1}}
+
+
+# ** test: response_cache_context_clear_during_run
+def test_response_cache_context_clear_during_run(dispatch: DispatchContext):
+    '''
+    Test a clear between a request's backend lookup and its count does not fail the request.
+    '''
+
+    # Clear the cache while the feature runs, after the miss was looked up.
+    cache = ResponseCacheContext()
+    entry = dispatch.get_entry('calc.add')
+    get_backend = cache.get_backend
+    def get_backend_then_clear(endpoint, options):
+        backend = get_backend(endpoint, options)
+        cache.clear()
+        return backend
+    cache.get_backend = get_backend_then_clear
+    assert cache.run(entry, {'a': 1, 'b': 2}, mock.Mock(return_value=(3, 200))) == (3, 200)
+
+    # Assert the miss was counted afresh.
+    assert cache.get_stats() == {'calc.add': {'hits': 0, 'misses': 1}}
+
+
+# ** test: response_cache_context_uncached_route
+def test_response_cache_context_uncached_route(dispatch: DispatchContext, run_feature: mock.Mock):
+    '''
+    Test routes without a cache block always run the feature.
+    '''
+
+    # Run an uncached route twice.
+    cache = ResponseCacheContext()
+    entry = dispatch.get_entry('calc.sqrt')
+    cache.run(entry, {'a': 4}, run_feature)
+    cache.run(entry, {'a': 4}, run_feature)
+
+    # Assert the feature ran each time and no counters exist.
+    assert run_feature.call_count == 2
+    assert cache.get_stats() == {}
+
+
+# ** test: response_cache_context_errors_not_cached
+def test_response_cache_context_errors_not_cached(dispatch: DispatchContext):
+    '''
+    Test errors raised by the feature are not cached.
+    '''
+
+    # Run a failing feature twice.
+    cache = ResponseCacheContext()
+    entry = dispatch.get_entry('calc.add')
+    run_feature = mock.Mock(side_effect=ValueError('boom'))
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.run(entry, {'a': 1, 'b': 0}, run_feature)
+
+    # Assert both calls reached the feature.
+    assert run_feature.call_count == 2
+
+
+# ** test: response_cache_context_backend_factory
+def test_response_cache_context_backend_factory(dispatch: DispatchContext, run_feature: mock.Mock):
+    '''
+    Test a custom backend factory receives the endpoint and cache options.
+    '''
+
+    # Create the cache with a custom backend.
+    backend = MemoryResponseCache()
+    factory = mock.Mock(return_value=backend)
+    cache = ResponseCacheContext(factory)
+
+    # Run a request and assert the backend was created and used.
+    cache.run(dispatch.get_entry('calc.add'), {'a': 1, 'b': 2}, run_feature)
+    factory.assert_called_once_with('calc.add', {'ttl': 60, 'max_entries': 2, 'key': ['a', 'b']})
+    assert len(backend.entries) == 1
+
+    # Clear the cache and assert the backend and counters are dropped.
+    cache.clear()
+    assert not backend.entries
+    assert cache.get_stats() == {}
+
+
+# ** test: response_cache_context_run_async
+def test_response_cache_context_run_async(dispatch: DispatchContext):
+    '''
+    Test the async path caches awaited responses.
+    '''
+
+    # Await the same request twice.
+    cache = ResponseCacheContext()
+    entry = dispatch.get_entry('calc.add')
+    run_feature = mock.AsyncMock(return_value=(3, 200))
+    for _ in range(2):
+        assert asyncio.run(cache.run_async(entry, {'a': 1, 'b': 2}, run_feature)) == (3, 200)
+
+    # Assert the feature was awaited once.
+    run_feature.assert_awaited_once()
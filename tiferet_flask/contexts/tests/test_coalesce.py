@@ -0,0 +1,166 @@
+# *** imports
+
+# ** core
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ** infra
+import pytest
+from tiferet.assets.exceptions import TiferetAPIError
+from tiferet_openapi import ApiRoute, ApiRouter
+
+# ** app
+from ..coalesce import CoalesceContext
+from ..dispatch import DispatchContext
+
+
+# *** fixtures
+
+# ** fixture: dispatch
+@pytest.fixture
+def dispatch() -> DispatchContext:
+    '''
+    Fixture to provide a dispatch table with a coalesced and a plain route.
+    '''
+
+    return DispatchContext(
+        routers=[ApiRouter(name='calc', prefix='/calc', routes=[
+            ApiRoute(id='sqrt', endpoint='calc.sqrt', path='/sqrt', methods=['POST'], status_code=200),
+            ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['POST'], status_code=200),
+        ])],
+        options={'calc.sqrt': {'coalesce': True}},
+    )
+
+
+# *** tests
+
+# ** test: coalesce_context_run
+def test_coalesce_context_run(dispatch: DispatchContext):
+    '''
+    Test identical concurrent requests share one execution, while other data and plain routes run separately.
+    '''
+
+    # Run a feature that blocks until all identical requests are waiting on it.
+    coalescer = CoalesceContext()
+    entry = dispatch.get_entry('calc.sqrt')
+    release = threading.Event()
+    calls = []
+    def run_feature(value):
+        calls.append(value)
+        release.wait(5)
+        return {'value': value}, 200
+
+    # Start the first request, join it with identical ones, then let it finish.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(coalescer.run, entry, {'a': 16}, lambda: run_feature(16))]
+        while not coalescer.calls:
+            pass
+        futures += [executor.submit(coalescer.run, entry, {'a': 16}, lambda: run_feature(16)) for _ in range(2)]
+        time.sleep(0.2)
+        release.set()
+        results = [future.result() for future in futures]
+
+    # Assert the joined requests shared the response.
+    assert results == [({'value': 16}, 200)] * 3
+    assert calls == [16]
+    assert coalescer.get_stats() == {'calc.sqrt': {'executed': 1, 'coalesced': 2}}
+    assert not coalescer.calls
+
+    # Assert plain routes are not coalesced or counted.
+    assert coalescer.run(dispatch.get_entry('calc.add'), {'a': 1}, lambda: (1, 200)) == (1, 200)
+    assert 'calc.add' not in coalescer.get_stats()
+
+
+# ** test: coalesce_context_run_error
+def test_coalesce_context_run_error(dispatch: DispatchContext):
+    '''
+    Test an error raised by the shared execution is raised for every joined request.
+    '''
+
+    # Join a request to one that raises once the follower waits.
+    coalescer = CoalesceContext()
+    entry = dispatch.get_entry('calc.sqrt')
+    joined = threading.Event()
+    def run_feature():
+        joined.wait(5)
+        raise TiferetAPIError('INVALID_INPUT', 'Invalid Input', 'Value must be a number.', status_code=422)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(coalescer.run, entry, {'a': 'x'}, run_feature)
+        while not coalescer.calls:
+            pass
+        follower = executor.submit(coalescer.run, entry, {'a': 'x'}, lambda: (None, 200))
+        time.sleep(0.2)
+        joined.set()
+
+        # Assert both raise the error, each its own instance.
+        with pytest.raises(TiferetAPIError) as leader_error:
+            leader.result()
+        with pytest.raises(TiferetAPIError) as follower_error:
+            follower.result()
+    assert follower_error.value is not leader_error.value
+    assert follower_error.value.error_code == 'INVALID_INPUT'
+    assert follower_error.value.kwargs == {'status_code': 422}
+
+
+# ** test: coalesce_context_run_async
+def test_coalesce_context_run_async(dispatch: DispatchContext):
+    '''
+    Test identical concurrent requests on an event loop share one awaited execution.
+    '''
+
+    # Await a feature that yields to the loop, from three identical requests and a different one.
+    coalescer = CoalesceContext()
+    entry = dispatch.get_entry('calc.sqrt')
+    calls = []
+    async def run_feature(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return {'value': value}, 200
+    async def run_all():
+        return await asyncio.gather(*[
+            coalescer.run_async(entry, {'a': value}, lambda value=value: run_feature(value))
+            for value in (16, 16, 16, 9)
+        ])
+    results = asyncio.run(run_all())
+
+    # Assert one execution per distinct input.
+    assert [result[0]['value'] for result in results] == [16, 16, 16, 9]
+    assert calls == [16, 9]
+    assert coalescer.get_stats() == {'calc.sqrt': {'executed': 2, 'coalesced': 2}}
+    assert 'tiferet_flask_coalesced_requests_total{endpoint="calc.sqrt",outcome="coalesced"} 2' in coalescer.render_prometheus()
+
+
+# ** test: coalesce_context_run_async_loops
+def test_coalesce_context_run_async_loops(dispatch: DispatchContext):
+    '''
+    Test identical requests on separate event loops, as Flask runs async views, share one execution.
+    '''
+
+    # Await a feature that blocks its loop's thread until the identical requests are waiting on it.
+    coalescer = CoalesceContext()
+    entry = dispatch.get_entry('calc.sqrt')
+    release = threading.Event()
+    calls = []
+    async def run_feature(value):
+        calls.append(value)
+        await asyncio.to_thread(release.wait, 5)
+        return {'value': value}, 200
+    def run_on_loop():
+        return asyncio.run(coalescer.run_async(entry, {'a': 16}, lambda: run_feature(16)))
+
+    # Start the first request on its own loop, join it from two more loops, then let it finish.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(run_on_loop)]
+        while not coalescer.calls:
+            pass
+        futures += [executor.submit(run_on_loop) for _ in range(2)]
+        time.sleep(0.2)
+        release.set()
+        results = [future.result() for future in futures]
+
+    # Assert the requests shared one execution.
+    assert results == [({'value': 16}, 200)] * 3
+    assert calls == [16]
+    assert coalescer.get_stats() == {'calc.sqrt': {'executed': 1, 'coalesced': 2}}
@@ -0,0 +1,105 @@
+# *** imports
+
+# ** infra
+import pytest
+from tiferet_openapi import ApiRoute, ApiRouter
+
+# ** app
+from ..cors import CorsContext
+
+
+# *** fixtures
+
+# ** fixture: router
+@pytest.fixture
+def router() -> ApiRouter:
+    '''
+    Fixture to provide a calc router.
+    '''
+
+    return ApiRouter(
+        name='calc',
+        prefix='/calc',
+        routes=[
+            ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['POST'], status_code=200),
+            ApiRoute(id='sqrt', endpoint='calc.sqrt', path='/sqrt', methods=['GET'], status_code=200),
+        ],
+    )
+
+
+# *** tests
+
+# ** test: cors_context_defaults
+def test_cors_context_defaults(router: ApiRouter):
+    '''
+    Test the default policy allows any origin with precompiled headers, limited to each route's methods.
+    '''
+
+    # Compile the policies with the defaults.
+    cors = CorsContext([router])
+
+    # Assert the route preflight headers.
+    assert cors.get_preflight_headers('calc.add', 'https://a.example') == [
+        ('Access-Control-Allow-Origin', '*'),
+        ('Access-Control-Allow-Methods', 'POST, OPTIONS'),
+        ('Access-Control-Allow-Headers', '*'),
+        ('Access-Control-Max-Age', '7200'),
+    ]
+    assert ('Access-Control-Allow-Methods', 'GET, OPTIONS, HEAD') in cors.get_preflight_headers('calc.sqrt', 'https://a.example')
+
+    # Assert endpoints outside the routers use the default policy.
+    assert cors.get_response_headers('swagger.spec', 'https://a.example') == [('Access-Control-Allow-Origin', '*')]
+
+
+# ** test: cors_context_origins
+def test_cors_context_origins(router: ApiRouter):
+    '''
+    Test route policies echo allowed origins only, and echo the requested headers with credentials.
+    '''
+
+    # Restrict one route to an origin with credentials and disable the other.
+    cors = CorsContext([router], options={
+        'calc.add': {'cors': {'origins': ['https://a.example'], 'credentials': True, 'expose_headers': ['Server-Timing']}},
+        'calc.sqrt': {'cors': False},
+    })
+
+    # Assert the allowed origin is echoed with the requested headers.
+    headers = dict(cors.get_preflight_headers('calc.add', 'https://a.example', 'Content-Type'))
+    assert headers['Access-Control-Allow-Origin'] == 'https://a.example'
+    assert headers['Access-Control-Allow-Credentials'] == 'true'
+    assert headers['Access-Control-Allow-Headers'] == 'Content-Type'
+    assert headers['Vary'] == 'Origin'
+    assert ('Access-Control-Expose-Headers', 'Server-Timing') in cors.get_response_headers('calc.add', 'https://a.example')
+
+    # Assert other origins and disabled routes get no CORS headers.
+    assert cors.get_preflight_headers('calc.add', 'https://b.example') == []
+    assert cors.get_response_headers('calc.add', 'https://b.example') == []
+    assert cors.get_preflight_headers('calc.sqrt', 'https://a.example') is None
+
+
+# ** test: cors_context_compile
+def test_cors_context_compile(router: ApiRouter):
+    '''
+    Test compile replaces the route policies.
+    '''
+
+    # Compile, then recompile with a new max age.
+    cors = CorsContext([router])
+    cors.compile([router], {'calc.add': {'cors': {'max_age': 60}}})
+
+    # Assert the new policy.
+    assert ('Access-Control-Max-Age', '60') in cors.get_preflight_headers('calc.add', 'https://a.example')
+
+
+# ** test: cors_context_route_methods
+def test_cors_context_route_methods(router: ApiRouter):
+    '''
+    Test a route cors block may override the allowed methods.
+    '''
+
+    # Compile with the add route allowing POST only.
+    cors = CorsContext([router], {'calc.add': {'cors': {'methods': ['POST']}}})
+
+    # Assert the override replaces the route methods, and other routes keep theirs.
+    assert ('Access-Control-Allow-Methods', 'POST') in cors.get_preflight_headers('calc.add', 'https://a.example')
+    assert ('Access-Control-Allow-Methods', 'GET, OPTIONS, HEAD') in cors.get_preflight_headers('calc.sqrt', 'https://a.example')
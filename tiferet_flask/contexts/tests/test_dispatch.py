@@ -0,0 +1,117 @@
+# *** imports
+
+# ** infra
+import pytest
+from tiferet_openapi import ApiRoute, ApiRouter
+
+# ** app
+from ..dispatch import DispatchContext, DispatchEntry
+
+
+# *** fixtures
+
+# ** fixture: routers
+@pytest.fixture
+def routers() -> list:
+    '''
+    Fixture to provide sample routers.
+    '''
+
+    return [
+        ApiRouter(
+            name='calc',
+            prefix='/calc',
+            routes=[
+                ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['POST'], status_code=200),
+                ApiRoute(id='create', endpoint='calc.create', path='/create', methods=['POST'], status_code=201),
+            ],
+        ),
+        ApiRouter(
+            name='health',
+            routes=[ApiRoute(id='ping', endpoint='health.ping', path='/ping', methods=['GET'], status_code=204)],
+        ),
+    ]
+
+
+# ** fixture: dispatch_context
+@pytest.fixture
+def dispatch_context(routers: list) -> DispatchContext:
+    '''
+    Fixture to provide a compiled DispatchContext.
+    '''
+
+    return DispatchContext(
+        routers,
+        errors={'DIVISION_BY_ZERO': 400},
+        options={'calc.add': {'params': ['a', 'b']}},
+    )
+
+
+# *** tests
+
+# ** test: dispatch_context_get_entry
+def test_dispatch_context_get_entry(dispatch_context: DispatchContext, routers: list):
+    '''
+    Test that every route is compiled into a dispatch entry keyed by endpoint.
+    '''
+
+    # Assert all endpoints are compiled.
+    assert set(dispatch_context.routes) == {'calc.add', 'calc.create', 'health.ping'}
+
+    # Assert the entry carries the route, status code and feature id.
+    entry = dispatch_context.get_entry('calc.create')
+    assert isinstance(entry, DispatchEntry)
+    assert entry.route is routers[0].routes[1]
+    assert entry.status_code == 201
+    assert entry.feature_id == 'calc.create'
+
+    # Assert unknown endpoints return None.
+    assert dispatch_context.get_entry('calc.unknown') is None
+
+
+# ** test: dispatch_context_route_options
+def test_dispatch_context_route_options(dispatch_context: DispatchContext):
+    '''
+    Test that route options and declared params are compiled into the entry.
+    '''
+
+    # Assert the declared params are precomputed as a tuple.
+    entry = dispatch_context.get_entry('calc.add')
+    assert entry.params == ('a', 'b')
+    assert entry.options['params'] == ['a', 'b']
+
+    # Assert routes without options pass all params.
+    assert dispatch_context.get_entry('calc.create').params is None
+    assert dict(dispatch_context.get_entry('calc.create').options) == {}
+
+
+# ** test: dispatch_context_get_route
+def test_dispatch_context_get_route(dispatch_context: DispatchContext):
+    '''
+    Test the GetRoute-compatible lookup.
+    '''
+
+    assert dispatch_context.get_route(endpoint='health.ping').status_code == 204
+    assert dispatch_context.get_route(endpoint='health.unknown') is None
+
+
+# ** test: dispatch_context_get_status_code
+def test_dispatch_context_get_status_code(dispatch_context: DispatchContext):
+    '''
+    Test the GetStatusCode-compatible lookup with its 500 default.
+    '''
+
+    assert dispatch_context.get_status_code(error_code='DIVISION_BY_ZERO') == 400
+    assert dispatch_context.get_status_code(error_code='UNKNOWN') == 500
+
+
+# ** test: dispatch_context_immutable
+def test_dispatch_context_immutable(dispatch_context: DispatchContext):
+    '''
+    Test that the compiled maps are read-only.
+    '''
+
+    with pytest.raises(TypeError):
+        dispatch_context.routes['calc.add'] = None
+    with pytest.raises(TypeError):
+        dispatch_context.errors['NEW_ERROR'] = 418
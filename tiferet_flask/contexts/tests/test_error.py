@@ -0,0 +1,111 @@
+# *** imports
+
+# ** infra
+import pytest
+from unittest import mock
+from tiferet import TiferetError
+from tiferet.domain import Error, ErrorMessage
+
+# ** app
+from ..error import ErrorResponse, ErrorTemplateContext
+
+
+# *** fixtures
+
+# ** fixture: get_error_handler
+@pytest.fixture
+def get_error_handler() -> mock.Mock:
+    '''
+    Fixture to provide an error loader defining DIVISION_BY_ZERO and INVALID_INPUT.
+    '''
+
+    # Define the errors by code, raising for undefined codes like GetError.
+    errors = {
+        'DIVISION_BY_ZERO': Error(id='DIVISION_BY_ZERO', name='Division By Zero', message=[
+            ErrorMessage(lang='en_US', text='Cannot divide by zero'),
+        ]),
+        'INVALID_INPUT': Error(id='INVALID_INPUT', name='Invalid Numeric Input', message=[
+            ErrorMessage(lang='en_US', text='Value {value} must be a number'),
+            ErrorMessage(lang='fr_FR', text='La valeur {value} doit être un nombre'),
+        ]),
+    }
+    def get_error(error_code, include_defaults=False, **kwargs):
+        if error_code not in errors:
+            raise TiferetError('ERROR_NOT_FOUND', f'Error not found: {error_code}.')
+        return errors[error_code]
+    return mock.Mock(side_effect=get_error)
+
+
+# ** fixture: error_templates
+@pytest.fixture
+def error_templates(get_error_handler: mock.Mock) -> ErrorTemplateContext:
+    '''
+    Fixture to provide templates compiled for the openapi.yml error map.
+    '''
+
+    status_codes = {'DIVISION_BY_ZERO': 400, 'INVALID_INPUT': 422}
+    return ErrorTemplateContext(
+        get_error_handler,
+        lambda error_code: status_codes.get(error_code, 500),
+        error_codes=status_codes,
+    )
+
+
+# *** tests
+
+# ** test: error_template_context_compile
+def test_error_template_context_compile(error_templates: ErrorTemplateContext, get_error_handler: mock.Mock):
+    '''
+    Test the mapped error codes are compiled with their messages and status codes up front.
+    '''
+
+    # Assert the templates.
+    template = error_templates.templates['INVALID_INPUT']
+    assert template.name == 'Invalid Numeric Input'
+    assert template.messages['fr_FR'] == 'La valeur {value} doit être un nombre'
+    assert template.status_code == 422
+    assert get_error_handler.call_count == 2
+
+
+# ** test: error_template_context_format_error
+def test_error_template_context_format_error(error_templates: ErrorTemplateContext, get_error_handler: mock.Mock):
+    '''
+    Test errors are formatted like Error.format_response without further lookups.
+    '''
+
+    # Format an error with and without format arguments.
+    response, status_code = error_templates.format_error(TiferetError('INVALID_INPUT', value='abc'))
+    plain, plain_status_code = error_templates.format_error(TiferetError('DIVISION_BY_ZERO'))
+
+    # Assert the payloads and status codes.
+    assert isinstance(response, ErrorResponse)
+    assert response == {
+        'error_code': 'INVALID_INPUT',
+        'name': 'Invalid Numeric Input',
+        'message': 'Value abc must be a number',
+        'value': 'abc',
+    }
+    assert status_code == 422
+    assert plain == {'error_code': 'DIVISION_BY_ZERO', 'name': 'Division By Zero', 'message': 'Cannot divide by zero'}
+    assert plain_status_code == 400
+    assert get_error_handler.call_count == 2
+
+    # Assert other languages use their own text.
+    response, _ = error_templates.format_error(TiferetError('INVALID_INPUT', value='x'), lang='fr_FR')
+    assert response['message'] == 'La valeur x doit être un nombre'
+
+
+# ** test: error_template_context_unknown_error
+def test_error_template_context_unknown_error(error_templates: ErrorTemplateContext, get_error_handler: mock.Mock):
+    '''
+    Test undefined errors and missing languages fall back, and are looked up only once.
+    '''
+
+    # Format an undefined error twice.
+    assert error_templates.format_error(TiferetError('UNKNOWN')) is None
+    assert error_templates.format_error(TiferetError('UNKNOWN')) is None
+    assert error_templates.templates['UNKNOWN'] is None
+    assert get_error_handler.call_count == 3
+
+    # Format an error without a message in the requested language.
+    assert error_templates.format_error(TiferetError('DIVISION_BY_ZERO'), lang='de_DE') is None
@@ -1,20 +1,30 @@
 # *** imports
 
+# ** core
+import asyncio
+import gzip
+import json
+
 # ** infra
 import pytest
 from unittest import mock
-from flask import Blueprint
+from flask import Blueprint, Flask
 from tiferet.assets.exceptions import TiferetAPIError
 from tiferet.contexts.error import ErrorContext
 from tiferet.contexts.feature import FeatureContext
 from tiferet.contexts.logging import LoggingContext
 from tiferet import TiferetError
+from tiferet.domain import Error, ErrorMessage
 from tiferet.events import DomainEvent
 from tiferet_openapi import ApiRoute, ApiRouter
 
 # ** app
+from ..dispatch import DispatchContext
+from ..error import ErrorResponse
 from ..flask import FlaskApiContext
-from ..request import FlaskRequestContext
+from ..metrics import MetricsContext
+from ..request import FlaskRequestContext, PooledRequestContext, RequestContextPool
+from ..schema import RequestSchemaContext
 
 # *** fixtures
 
@@ -90,6 +100,20 @@ def test_flask_api_parse_request(flask_api_context: FlaskApiContext):
     assert request_context.data == sample_data
     assert request_context.feature_id == 'test_feature'
 
+# ** test: flask_api_parse_request_raw_models
+def test_flask_api_parse_request_raw_models(flask_api_context: FlaskApiContext):
+    '''
+    Test parse_request passes the raw_models setting to the request context.
+    '''
+
+    # Assert raw models are off by default.
+    assert not flask_api_context.parse_request(data={}, feature_id='test_feature').raw_models
+
+    # Enable raw models and assert the request context inherits it.
+    flask_api_context.raw_models = True
+    assert flask_api_context.parse_request(data={}, feature_id='test_feature').raw_models
+
+
 # ** test: flask_api_context_handle_error
 def test_flask_api_context_handle_error(flask_api_context: FlaskApiContext):
     '''
@@ -213,6 +237,28 @@ def test_flask_api_context_generate_spec_multi_router(flask_api_context: FlaskAp
     assert '/ping' in spec['paths']
     assert spec['info']['title'] == 'API'
 
+# ** test: flask_api_context_generate_spec_request_schemas
+def test_flask_api_context_generate_spec_request_schemas(flask_api_context: FlaskApiContext):
+    '''
+    Test generate_spec describes the compiled request models of the routes.
+    '''
+
+    # Compile a request model for the add route.
+    routers = [ApiRouter(
+        name='calc',
+        prefix='/calc',
+        routes=[ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['POST'], request_model='tiferet_openapi.ApiRoute')],
+    )]
+    flask_api_context.get_routers_handler = mock.Mock(return_value=routers)
+    flask_api_context.request_schemas = RequestSchemaContext(routers)
+
+    # Generate the spec.
+    spec = flask_api_context.generate_spec()
+
+    # Assert the route body references the model component.
+    assert spec['paths']['/calc/add']['post']['requestBody']['content']['application/json']['schema'] == {'$ref': '#/components/schemas/ApiRoute'}
+    assert spec['components']['schemas']['ApiRoute']['type'] == 'object'
+
 # ** test: flask_api_context_create_swagger_blueprint
 def test_flask_api_context_create_swagger_blueprint(flask_api_context: FlaskApiContext):
     '''
@@ -249,3 +295,258 @@ def test_flask_api_context_create_docs_handler(flask_api_context: FlaskApiContex
     # Assert it returns a Blueprint.
     assert isinstance(result, Blueprint)
     assert result.name == 'swagger'
+
+# ** test: flask_api_context_compile_dispatch
+def test_flask_api_context_compile_dispatch(flask_api_context: FlaskApiContext, sample_route: ApiRoute):
+    '''
+    Test compile_dispatch routes lookups through the compiled table.
+    '''
+
+    # Keep the event-backed handlers for later assertions.
+    get_route_evt_handler = flask_api_context.get_route_handler
+    get_status_code_evt_handler = flask_api_context.get_status_code_handler
+
+    # Compile the dispatch table.
+    router = ApiRouter(name='sample_router', routes=[sample_route])
+    dispatch = flask_api_context.compile_dispatch(routers=[router], errors={'TEST_ERROR': 418})
+
+    # Assert the table is stored and the handlers are swapped.
+    assert isinstance(dispatch, DispatchContext)
+    assert flask_api_context.dispatch is dispatch
+
+    # Handle a response and assert the status code comes from the table.
+    request_context = flask_api_context.parse_request(feature_id='sample_router.sample_route')
+    request_context.set_result('ok')
+    assert flask_api_context.handle_response(request_context) == ('ok', 269)
+
+    # Handle an error and assert the status code comes from the table.
+    with pytest.raises(TiferetAPIError) as exc_info:
+        flask_api_context.handle_error(TiferetError('TEST_ERROR', 'A test error.'))
+    assert exc_info.value.status_code == 418
+
+    # Assert the event-backed handlers were not called.
+    get_route_evt_handler.assert_not_called()
+    get_status_code_evt_handler.assert_not_called()
+
+# ** test: flask_api_context_compile_dispatch_without_errors
+def test_flask_api_context_compile_dispatch_without_errors(flask_api_context: FlaskApiContext):
+    '''
+    Test compile_dispatch keeps event-backed status codes when no error map is given.
+    '''
+
+    # Compile the dispatch table from the routers handler.
+    flask_api_context.compile_dispatch()
+
+    # Assert the routers handler was used and status codes remain event-backed.
+    flask_api_context.get_routers_handler.assert_called_once()
+    assert flask_api_context.get_status_code_handler(error_code='TEST_ERROR') == 420
+
+# ** test: flask_api_context_invalidate_dispatch
+def test_flask_api_context_invalidate_dispatch(flask_api_context: FlaskApiContext):
+    '''
+    Test invalidate_dispatch restores the event-backed handlers.
+    '''
+
+    # Compile and then invalidate the dispatch table.
+    get_route_evt_handler = flask_api_context.get_route_handler
+    get_status_code_evt_handler = flask_api_context.get_status_code_handler
+    flask_api_context.compile_dispatch(routers=[], errors={})
+    flask_api_context.invalidate_dispatch()
+
+    # Assert the original handlers are restored.
+    assert flask_api_context.dispatch is None
+    assert flask_api_context.get_route_handler is get_route_evt_handler
+    assert flask_api_context.get_status_code_handler is get_status_code_evt_handler
+
+# ** test: flask_api_context_error_templates
+def test_flask_api_context_error_templates(flask_api_context: FlaskApiContext):
+    '''
+    Test run returns precompiled error responses instead of raising once error templates are compiled.
+    '''
+
+    # Compile the dispatch table and the error templates.
+    flask_api_context.errors.get_error_handler = mock.Mock(return_value=Error(
+        id='TEST_ERROR',
+        name='Test Error',
+        message=[ErrorMessage(lang='en_US', text='Test failed for {item}.')],
+    ))
+    flask_api_context.compile_dispatch(routers=[], errors={'TEST_ERROR': 418})
+    flask_api_context.compile_error_templates()
+    flask_api_context.features.execute_feature.side_effect = TiferetError('TEST_ERROR', 'Failed.', item='a')
+
+    # Run the failing feature twice without catching.
+    for _ in range(2):
+        response, status_code = flask_api_context.run('sample_router.sample_route')
+        assert isinstance(response, ErrorResponse)
+        assert response == {'error_code': 'TEST_ERROR', 'name': 'Test Error', 'message': 'Test failed for a.', 'item': 'a'}
+        assert status_code == 418
+
+    # Assert the error was loaded once, at compile time, and never formatted by the error context.
+    flask_api_context.errors.get_error_handler.assert_called_once_with('TEST_ERROR', include_defaults=True)
+    flask_api_context.errors.handle_error.assert_not_called()
+
+    # Assert recompiling the dispatch table refreshes the status codes.
+    flask_api_context.compile_dispatch(routers=[], errors={'TEST_ERROR': 409})
+    assert flask_api_context.run('sample_router.sample_route')[1] == 409
+
+# ** test: flask_api_context_openapi_json_etag
+def test_flask_api_context_openapi_json_etag(flask_api_context: FlaskApiContext):
+    '''
+    Test the spec endpoint serves pre-serialized bytes with ETag and cache headers.
+    '''
+
+    # Register the swagger blueprint on a Flask app.
+    flask_api_context.get_routers_handler = mock.Mock(return_value=[])
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(flask_api_context.create_swagger_blueprint(title='Test API', cache_max_age=60))
+    client = flask_app.test_client()
+
+    # Fetch the spec without compression.
+    response = client.get('/docs/openapi.json', headers={'Accept-Encoding': 'identity'})
+    assert response.status_code == 200
+    assert response.json['info']['title'] == 'Test API'
+    assert response.headers['Cache-Control'] == 'public, max-age=60'
+    assert 'Content-Encoding' not in response.headers
+    etag = response.headers['ETag']
+
+    # Assert the spec is only generated once across requests.
+    client.get('/docs/openapi.json')
+    flask_api_context.get_routers_handler.assert_called_once()
+
+    # Revalidate with the ETag and expect not modified.
+    response = client.get('/docs/openapi.json', headers={'Accept-Encoding': 'identity', 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.data == b''
+
+# ** test: flask_api_context_openapi_json_gzip
+def test_flask_api_context_openapi_json_gzip(flask_api_context: FlaskApiContext):
+    '''
+    Test the spec endpoint serves the gzip variant with its own strong ETag.
+    '''
+
+    # Register the swagger blueprint on a Flask app.
+    flask_api_context.get_routers_handler = mock.Mock(return_value=[])
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(flask_api_context.create_swagger_blueprint())
+    client = flask_app.test_client()
+
+    # Fetch the spec with gzip compression.
+    response = client.get('/docs/openapi.json', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'].endswith('-gzip"')
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert json.loads(gzip.decompress(response.data))['openapi'] == '3.0.3'
+
+# ** test: flask_api_context_serialize_spec_to_disk
+def test_flask_api_context_serialize_spec_to_disk(flask_api_context: FlaskApiContext, tmp_path):
+    '''
+    Test serialize_spec writes the encoded spec files for a reverse proxy.
+    '''
+
+    # Serialize the spec to disk.
+    spec_path = tmp_path / 'openapi.json'
+    variants = flask_api_context.serialize_spec({'openapi': '3.0.3'}, spec_path=str(spec_path))
+
+    # Assert the identity and gzip files match the served variants.
+    assert spec_path.read_bytes() == variants['identity'][0]
+    assert gzip.decompress((tmp_path / 'openapi.json.gz').read_bytes()) == variants['identity'][0]
+
+# ** test: flask_api_context_get_spec_variants
+def test_flask_api_context_get_spec_variants(flask_api_context: FlaskApiContext):
+    '''
+    Test the spec variants are serialized once per title, version and description, and the swagger blueprint reuses them.
+    '''
+
+    # Serialize the variants twice with the same settings and once with another title.
+    with mock.patch.object(flask_api_context, 'serialize_spec', wraps=flask_api_context.serialize_spec) as serialize_spec:
+        variants = flask_api_context.get_spec_variants(title='Calc')
+        assert flask_api_context.get_spec_variants(title='Calc') is variants
+        flask_api_context.create_swagger_blueprint(title='Calc')
+        assert flask_api_context.get_spec_variants(title='Other') is not variants
+        assert serialize_spec.call_count == 2
+
+    # Assert clearing the cache serializes the spec again.
+    flask_api_context.clear_spec_variants()
+    assert flask_api_context.get_spec_variants(title='Calc') is not variants
+
+# ** test: flask_api_context_run_async
+def test_flask_api_context_run_async(flask_api_context: FlaskApiContext):
+    '''
+    Test run_async awaits the async feature execution and handles the response.
+    '''
+
+    # Set up the async feature execution to set a result.
+    async def execute_feature_async(feature_id, request, **kwargs):
+        request.set_result({'feature_id': request.headers['feature_id']})
+    flask_api_context.features.execute_feature_async = mock.AsyncMock(side_effect=execute_feature_async)
+
+    # Run the feature on an event loop.
+    response, status_code = asyncio.run(flask_api_context.run_async('sample_router.sample_route', headers={}, data={}))
+
+    # Assert the response and the route status code.
+    assert response == {'feature_id': 'sample_router.sample_route'}
+    assert status_code == 269
+
+# ** test: flask_api_context_run_async_error
+def test_flask_api_context_run_async_error(flask_api_context: FlaskApiContext):
+    '''
+    Test run_async maps feature errors to TiferetAPIError with a status code.
+    '''
+
+    # Set up the async feature execution to raise.
+    flask_api_context.features.execute_feature_async = mock.AsyncMock(side_effect=TiferetError('TEST_ERROR', 'A test error.'))
+
+    # Run the feature and expect TiferetAPIError.
+    with pytest.raises(TiferetAPIError) as exc_info:
+        asyncio.run(flask_api_context.run_async('sample_router.sample_route', headers={}, data={}))
+    assert exc_info.value.status_code == 420
+
+# ** test: flask_api_context_run_metrics
+def test_flask_api_context_run_metrics(flask_api_context: FlaskApiContext):
+    '''
+    Test run and run_async record the same phases through the shared run steps.
+    '''
+
+    # Set up the sync and async feature executions to set a result.
+    def execute_feature(feature_id, request, **kwargs):
+        request.set_result({'a': 1})
+    async def execute_feature_async(feature_id, request, **kwargs):
+        request.set_result({'a': 1})
+    flask_api_context.features.execute_feature = mock.Mock(side_effect=execute_feature)
+    flask_api_context.features.execute_feature_async = mock.AsyncMock(side_effect=execute_feature_async)
+    flask_api_context.metrics = MetricsContext()
+
+    # Run the feature once each way.
+    assert flask_api_context.run('sample_router.sample_route', headers={}, data={}) == ({'a': 1}, 269)
+    assert asyncio.run(flask_api_context.run_async('sample_router.sample_route', headers={}, data={})) == ({'a': 1}, 269)
+
+    # Assert both runs recorded each phase.
+    histograms, _ = flask_api_context.metrics.collect()
+    for phase in ('parse_request', 'execute_feature', 'handle_response'):
+        assert histograms[('sample_router.sample_route', phase)][-1] == 2
+
+# ** test: flask_api_context_run_pooled
+def test_flask_api_context_run_pooled(flask_api_context: FlaskApiContext):
+    '''
+    Test pooled runs reuse one request context, returning it to the pool after each run.
+    '''
+
+    # Set a request pool and a feature execution recording its request.
+    flask_api_context.request_pool = RequestContextPool()
+    requests = []
+    def execute_feature(feature_id, request, **kwargs):
+        requests.append(request)
+        request.set_result({'a': request.data['a']})
+    flask_api_context.features.execute_feature.side_effect = execute_feature
+
+    # Run the feature twice.
+    first = flask_api_context.run('sample_router.sample_route', headers={}, data={'a': 1})
+    second = flask_api_context.run('sample_router.sample_route', headers={}, data={'a': 2})
+
+    # Assert the responses and the reused, released context.
+    assert first == ({'a': 1}, 269)
+    assert second == ({'a': 2}, 269)
+    assert isinstance(requests[0], PooledRequestContext)
+    assert requests[0] is requests[1]
+    assert flask_api_context.request_pool.get_state() == ([requests[0]], [])
@@ -0,0 +1,124 @@
+# *** imports
+
+# ** core
+import datetime
+import decimal
+import json
+
+# ** infra
+import pytest
+from flask import Flask, jsonify
+from pydantic import BaseModel
+
+# ** app
+from ..json import FlaskJsonProvider
+
+
+# *** classes
+
+# ** class: item
+class Item(BaseModel):
+    '''
+    A sample response model.
+    '''
+
+    id: int
+    name: str
+    created: datetime.date
+
+
+# *** fixtures
+
+# ** fixture: flask_app
+@pytest.fixture
+def flask_app() -> Flask:
+    '''
+    Fixture to provide a Flask app with the fast JSON provider installed.
+    '''
+
+    # Create the app and install the provider.
+    flask_app = Flask(__name__)
+    flask_app.json = FlaskJsonProvider(flask_app)
+    return flask_app
+
+
+# ** fixture: items
+@pytest.fixture
+def items() -> list:
+    '''
+    Fixture to provide a list of response models.
+    '''
+
+    return [Item(id=i, name=f'item {i}', created=datetime.date(2024, 1, 1)) for i in range(3)]
+
+
+# *** tests
+
+# ** test: flask_json_provider_models
+def test_flask_json_provider_models(flask_app: Flask, items: list):
+    '''
+    Test models, lists and dicts of models serialize directly like model_dump(mode='json').
+    '''
+
+    # Serialize a model, a list and a dict of models.
+    provider = flask_app.json
+    expected = [item.model_dump(mode='json') for item in items]
+
+    # Assert each matches the pydantic JSON dump.
+    assert json.loads(provider.dump_bytes(items[0])) == expected[0]
+    assert json.loads(provider.dump_bytes(items)) == expected
+    assert json.loads(provider.dump_bytes({'first': items[0]})) == {'first': expected[0]}
+
+
+# ** test: flask_json_provider_plain_data
+def test_flask_json_provider_plain_data(flask_app: Flask, items: list):
+    '''
+    Test plain data keeps the Flask conversions and nested models are dumped.
+    '''
+
+    # Serialize plain data with Flask-specific types and a nested model.
+    data = {
+        'when': datetime.datetime(2024, 1, 1, 12, 0, tzinfo=datetime.timezone.utc),
+        'amount': decimal.Decimal('1.50'),
+        1: 'one',
+        'batch': [{'data': items[0]}],
+    }
+    result = json.loads(flask_app.json.dumps(data))
+
+    # Assert the conversions match the default provider.
+    assert result['when'] == 'Mon, 01 Jan 2024 12:00:00 GMT'
+    assert result['amount'] == '1.50'
+    assert result['1'] == 'one'
+    assert result['batch'][0]['data'] == items[0].model_dump(mode='json')
+
+
+# ** test: flask_json_provider_large_ints
+def test_flask_json_provider_large_ints(flask_app: Flask):
+    '''
+    Test ints beyond 64 bits serialize exactly, falling back to the standard library.
+    '''
+
+    # Serialize ints beyond the 64-bit range.
+    data = {'big': 2 ** 70, 'small': -(2 ** 64), 'items': [2 ** 100]}
+
+    # Assert they round trip through the standard library parser unchanged.
+    assert json.loads(flask_app.json.dump_bytes(data)) == data
+    assert json.loads(flask_app.json.dumps([2 ** 70])) == [2 ** 70]
+
+
+# ** test: flask_json_provider_response
+def test_flask_json_provider_response(flask_app: Flask, items: list):
+    '''
+    Test jsonify builds a JSON response from the serialized bytes.
+    '''
+
+    # Build responses with jsonify and parse a request body.
+    with flask_app.app_context():
+        response = jsonify(items)
+        kwargs_response = jsonify(a=1)
+        assert flask_app.json.loads(b'{"a": 1}') == {'a': 1}
+
+    # Assert the responses carry the JSON payloads.
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == [item.model_dump(mode='json') for item in items]
+    assert kwargs_response.get_json() == {'a': 1}
@@ -0,0 +1,62 @@
+# *** imports
+
+# ** core
+import threading
+
+# ** infra
+import pytest
+from unittest import mock
+
+# ** app
+from ..lazy import LazyApiContext
+
+
+# *** fixtures
+
+# ** fixture: loader
+@pytest.fixture
+def loader() -> mock.Mock:
+    '''
+    Fixture to provide a loader returning a mock interface context.
+    '''
+
+    return mock.Mock(return_value=mock.Mock(interface_id='calc_api'))
+
+
+# *** tests
+
+# ** test: lazy_api_context_defers_loading
+def test_lazy_api_context_defers_loading(loader: mock.Mock):
+    '''
+    Test the context is only realized on first attribute access.
+    '''
+
+    # Create the lazy context.
+    context = LazyApiContext(loader)
+
+    # Assert nothing is realized yet.
+    assert not context.loaded
+    loader.assert_not_called()
+
+    # Access an attribute and assert it is delegated.
+    assert context.interface_id == 'calc_api'
+    assert context.loaded
+    loader.assert_called_once()
+
+
+# ** test: lazy_api_context_loads_once
+def test_lazy_api_context_loads_once(loader: mock.Mock):
+    '''
+    Test concurrent first accesses realize the context exactly once.
+    '''
+
+    # Access the context from many threads at once.
+    context = LazyApiContext(loader)
+    threads = [threading.Thread(target=lambda: context.interface_id) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert the loader ran once.
+    loader.assert_called_once()
@@ -0,0 +1,168 @@
+# *** imports
+
+# ** core
+import os
+import sys
+import time
+
+# ** infra
+import pytest
+from tiferet_openapi import ApiRoute, ApiRouter
+
+# ** app
+from ..limit import MemoryRateLimiter, RateLimitContext, SharedMemoryRateLimiter
+
+
+# *** fixtures
+
+# ** fixture: router
+@pytest.fixture
+def router() -> ApiRouter:
+    '''
+    Fixture to provide a calc router.
+    '''
+
+    return ApiRouter(
+        name='calc',
+        prefix='/calc',
+        routes=[
+            ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['POST'], status_code=200),
+            ApiRoute(id='sqrt', endpoint='calc.sqrt', path='/sqrt', methods=['GET'], status_code=200),
+        ],
+    )
+
+
+# *** tests
+
+# ** test: rate_limiters
+@pytest.mark.parametrize('limiter_type', [MemoryRateLimiter, SharedMemoryRateLimiter])
+def test_rate_limiters(limiter_type):
+    '''
+    Test the backends empty token buckets and cap the requests in flight per key.
+    '''
+
+    # Take the burst tokens from a slowly refilling bucket.
+    limiter = limiter_type()
+    assert limiter.consume('route:calc.add', 0.001, 2)
+    assert limiter.consume('route:calc.add', 0.001, 2)
+    assert not limiter.consume('route:calc.add', 0.001, 2)
+    assert limiter.consume('route:calc.sqrt', 0.001, 2)
+
+    # Enter up to the concurrency cap, then exit.
+    assert limiter.enter('router:calc', 1)
+    assert not limiter.enter('router:calc', 1)
+    limiter.exit('router:calc')
+    assert limiter.enter('router:calc', 1)
+
+    # Assert a refund gives a token back, up to the burst.
+    limiter.refund('route:calc.add', 2)
+    assert limiter.consume('route:calc.add', 0.001, 2)
+    assert not limiter.consume('route:calc.add', 0.001, 2)
+
+    # Assert clear resets the buckets and counters.
+    limiter.clear()
+    assert limiter.consume('route:calc.add', 0.001, 2)
+    assert limiter.enter('router:calc', 1)
+
+
+# ** test: shared_memory_rate_limiter_fork
+@pytest.mark.skipif(not hasattr(os, 'fork') or sys.platform == 'darwin', reason='requires fork')
+def test_shared_memory_rate_limiter_fork():
+    '''
+    Test forked processes share the token buckets and in-flight counters.
+    '''
+
+    # Take a token and enter the cap in a forked child.
+    limiter = SharedMemoryRateLimiter(slots=8)
+    child = os.fork()
+    if child == 0:
+        admitted = limiter.consume('router:calc', 0.001, 1) and limiter.enter('router:calc', 1)
+        os._exit(0 if admitted else 1)
+    assert os.waitpid(child, 0)[1] == 0
+
+    # Assert the parent sees the emptied bucket and the entered cap.
+    assert not limiter.consume('router:calc', 0.001, 1)
+    assert not limiter.enter('router:calc', 1)
+
+    # Assert reaping the exited child gives back its in-flight request.
+    assert limiter.reap(child)
+    assert not limiter.reap(child)
+    assert limiter.enter('router:calc', 1)
+
+
+# ** test: shared_memory_rate_limiter_dead_lock_holder
+@pytest.mark.skipif(not hasattr(os, 'fork') or sys.platform == 'darwin', reason='requires fork')
+def test_shared_memory_rate_limiter_dead_lock_holder():
+    '''
+    Test a process dying while holding the shared lock does not block the others.
+    '''
+
+    # Exit a forked child while it holds the lock.
+    limiter = SharedMemoryRateLimiter(slots=8)
+    child = os.fork()
+    if child == 0:
+        with limiter.lock():
+            os._exit(0)
+    os.waitpid(child, 0)
+
+    # Assert the parent takes the lock at once and the limits still apply.
+    started = time.monotonic()
+    assert limiter.enter('router:calc', 1)
+    assert not limiter.enter('router:calc', 1)
+    assert time.monotonic() - started < 0.5
+
+
+# ** test: rate_limit_context_admit
+def test_rate_limit_context_admit(router: ApiRouter):
+    '''
+    Test a router limit is shared by its routes, and rejections come from the precompiled responses.
+    '''
+
+    # Cap the router at one request in flight, limit one route's rate and exempt the other.
+    limits = RateLimitContext([router], options={
+        'calc.add': {'router_limits': {'concurrency': 1}, 'limits': {'rate': 0.5, 'burst': 1}},
+        'calc.sqrt': {'router_limits': {'concurrency': 1}, 'limits': False},
+    })
+    assert [policy.key for policy in limits.policies['calc.add']] == ['router:calc', 'route:calc.add']
+    assert 'calc.sqrt' not in limits.policies
+
+    # Admit one request, then assert the router cap sheds the next.
+    entered, rejected = limits.admit('calc.add')
+    assert entered == ('router:calc',)
+    assert rejected is None
+    _, rejected = limits.admit('calc.add')
+    assert rejected.status_code == 503
+    assert dict(rejected.headers)['Retry-After'] == '1'
+
+    # Release it, then assert the empty route bucket rejects with a 429.
+    limits.release(entered)
+    entered, rejected = limits.admit('calc.add')
+    assert entered == ()
+    assert rejected.status_code == 429
+    assert rejected.body == b'{"error_code":"RATE_LIMITED","name":"Rate Limited","message":"Too many requests; retry later.","retry_after":2}'
+
+    # Assert the rejection released the router cap, and endpoints without limits are admitted.
+    assert limits.backend.enter('router:calc', 1)
+    assert limits.admit('calc.sqrt') == ((), None)
+    assert limits.admit(None) == ((), None)
+
+
+# ** test: rate_limit_context_admit_refund
+def test_rate_limit_context_admit_refund(router: ApiRouter):
+    '''
+    Test a router token is given back when the route limit rejects the request.
+    '''
+
+    # Give the router two tokens and the add route one.
+    limits = RateLimitContext([router], options={
+        'calc.add': {'router_limits': {'rate': 0.001, 'burst': 2}, 'limits': {'rate': 0.001, 'burst': 1}},
+        'calc.sqrt': {'router_limits': {'rate': 0.001, 'burst': 2}},
+    })
+
+    # Admit one add request, then assert the route rejects the next.
+    assert limits.admit('calc.add') == ((), None)
+    assert limits.admit('calc.add')[1].status_code == 429
+
+    # Assert the rejected request's router token was given back to the other route.
+    assert limits.admit('calc.sqrt') == ((), None)
+    assert limits.admit('calc.sqrt')[1].status_code == 429
@@ -0,0 +1,91 @@
+# *** imports
+
+# ** core
+import threading
+import time
+
+# ** infra
+import pytest
+
+# ** app
+from ..metrics import MetricsContext
+
+
+# *** fixtures
+
+# ** fixture: metrics
+@pytest.fixture
+def metrics() -> MetricsContext:
+    '''
+    Fixture to provide a metrics context with three buckets.
+    '''
+
+    return MetricsContext(buckets=(0.01, 0.1, 1.0))
+
+
+# *** tests
+
+# ** test: metrics_context_record
+def test_metrics_context_record(metrics: MetricsContext):
+    '''
+    Test record counts the elapsed time in its bucket and returns the current time.
+    '''
+
+    # Record a fast and a slow observation.
+    now = time.perf_counter()
+    assert metrics.record('calc.add', 'execute_feature', now) >= now
+    metrics.record('calc.add', 'execute_feature', now - 0.5)
+
+    # Assert the bucket counts, sum and count.
+    histograms, _ = metrics.collect()
+    series = histograms[('calc.add', 'execute_feature')]
+    assert series[:4] == [1, 0, 1, 0]
+    assert 0.5 <= series[-2] < 1.0
+    assert series[-1] == 2
+
+
+# ** test: metrics_context_collect_threads
+def test_metrics_context_collect_threads(metrics: MetricsContext):
+    '''
+    Test collect sums the shards written by each thread, including the retired shards of exited threads.
+    '''
+
+    # Record from several threads, each into its own shard.
+    def record():
+        for _ in range(100):
+            metrics.record_response('calc.add', 200, time.perf_counter())
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert the exited threads' shards were retired and every observation was counted once.
+    metrics.record_response('calc.add', 200, time.perf_counter())
+    histograms, responses = metrics.collect()
+    assert len(metrics.shards) == 1
+    assert histograms[('calc.add', 'total')][-1] == 401
+    assert responses == {('calc.add', 200): 401}
+
+
+# ** test: metrics_context_render_prometheus
+def test_metrics_context_render_prometheus(metrics: MetricsContext):
+    '''
+    Test render_prometheus writes cumulative buckets, sums, counts and response counters.
+    '''
+
+    # Record a fast and a slow response.
+    now = time.perf_counter()
+    metrics.record_response('calc.add', 200, now)
+    metrics.record_response('calc.add', 400, now - 0.5)
+
+    # Assert the histogram and counter lines.
+    lines = metrics.render_prometheus().splitlines()
+    labels = 'endpoint="calc.add",phase="total"'
+    assert '# TYPE tiferet_flask_phase_seconds histogram' in lines
+    assert f'tiferet_flask_phase_seconds_bucket{{{labels},le="0.01"}} 1' in lines
+    assert f'tiferet_flask_phase_seconds_bucket{{{labels},le="0.1"}} 1' in lines
+    assert f'tiferet_flask_phase_seconds_bucket{{{labels},le="1.0"}} 2' in lines
+    assert f'tiferet_flask_phase_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+    assert f'tiferet_flask_phase_seconds_count{{{labels}}} 2' in lines
+    assert 'tiferet_flask_responses_total{endpoint="calc.add",status="400"} 1' in lines
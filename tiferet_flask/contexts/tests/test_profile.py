@@ -0,0 +1,130 @@
+# *** imports
+
+# ** core
+import asyncio
+
+# ** infra
+import pytest
+from unittest import mock
+from tiferet.contexts.feature import FeatureContext
+from tiferet.events import DomainEvent
+
+# ** app
+from ..profile import CommandProfiler
+from ..request import FlaskRequestContext
+
+
+# *** classes
+
+# ** class: add_number
+class AddNumber(object):
+    '''
+    A sample command adding two numbers.
+    '''
+
+    # * method: execute
+    def execute(self, a: int, b: int, **kwargs) -> int:
+        '''
+        Add the numbers.
+        '''
+
+        return a + b
+
+
+# *** fixtures
+
+# ** fixture: features
+@pytest.fixture
+def features() -> FeatureContext:
+    '''
+    Fixture to provide a feature context with mocked events and services.
+    '''
+
+    return FeatureContext(get_feature_evt=mock.Mock(spec=DomainEvent), services=mock.Mock())
+
+
+# ** fixture: request_context
+@pytest.fixture
+def request_context() -> FlaskRequestContext:
+    '''
+    Fixture to provide a request context with the command inputs.
+    '''
+
+    return FlaskRequestContext(headers={}, data={'a': 1, 'b': 2}, feature_id='calc.add')
+
+
+# *** tests
+
+# ** test: command_profiler_profiled_request
+def test_command_profiler_profiled_request(features: FeatureContext, request_context: FlaskRequestContext):
+    '''
+    Test a profiled request records the name, wall time and CPU time of each command.
+    '''
+
+    # Install the profiler and run two commands in a profiled request.
+    profiler = CommandProfiler()
+    profiler.install(features)
+    profiler.install(features)
+    token = profiler.start()
+    features.handle_command(AddNumber(), request_context)
+    features.handle_command(AddNumber(), request_context, data_key='sum')
+    timings = profiler.stop(token)
+
+    # Assert the commands ran and were each timed once.
+    assert request_context.data['sum'] == 3
+    assert [name for name, _, _ in timings] == ['AddNumber', 'AddNumber']
+    assert all(wall >= 0 and cpu >= 0 for _, wall, cpu in timings)
+    assert profiler.timings.get() is None
+
+
+# ** test: command_profiler_unsampled_request
+def test_command_profiler_unsampled_request(features: FeatureContext, request_context: FlaskRequestContext):
+    '''
+    Test requests outside the sample run their commands without recording timings.
+    '''
+
+    # Install a profiler that samples no requests.
+    profiler = CommandProfiler(sample_rate=0.0)
+    profiler.install(features)
+
+    # Assert the request is not profiled and the command still runs.
+    assert profiler.start() is None
+    features.handle_command(AddNumber(), request_context, data_key='sum')
+    assert request_context.data['sum'] == 3
+    assert profiler.timings.get() is None
+
+
+# ** test: command_profiler_async
+def test_command_profiler_async(features: FeatureContext, request_context: FlaskRequestContext):
+    '''
+    Test async command handling is timed within the profiled task.
+    '''
+
+    # Install the profiler and run the command in a profiled task.
+    profiler = CommandProfiler()
+    profiler.install(features)
+    async def run():
+        token = profiler.start()
+        await features.handle_command_async(AddNumber(), request_context, data_key='sum')
+        return profiler.stop(token)
+    timings = asyncio.run(run())
+
+    # Assert the command ran and was timed.
+    assert request_context.data['sum'] == 3
+    assert [name for name, _, _ in timings] == ['AddNumber']
+
+
+# ** test: command_profiler_format_server_timing
+def test_command_profiler_format_server_timing():
+    '''
+    Test the timings are formatted as Server-Timing metrics in execution order.
+    '''
+
+    # Format two command timings.
+    header = CommandProfiler.format_server_timing([('AddNumber', 0.0015, 0.001), ('ExponentiateNumber', 0.002, 0.0)])
+
+    # Assert the header value.
+    assert header == (
+        'AddNumber;dur=1.500;desc="step 0 cpu 1.000ms", '
+        'ExponentiateNumber;dur=2.000;desc="step 1 cpu 0.000ms"'
+    )
@@ -0,0 +1,117 @@
+# *** imports
+
+# ** core
+import threading
+import time
+from unittest import mock
+
+# ** infra
+import pytest
+
+# ** app
+from ..reload import ConfigWatchContext
+
+
+# *** fixtures
+
+# ** fixture: config_file
+@pytest.fixture
+def config_file(tmp_path) -> str:
+    '''
+    Fixture to provide a configuration file.
+    '''
+
+    path = tmp_path / 'openapi.yml'
+    path.write_text('openapi: {}\n')
+    return str(path)
+
+
+# *** tests
+
+# ** test: config_watch_context_check
+def test_config_watch_context_check(config_file: str):
+    '''
+    Test check reports the files changed since the last poll.
+    '''
+
+    # Watch the file.
+    changes = []
+    watcher = ConfigWatchContext(dict(openapi=config_file, features='missing.yml'), changes.append)
+    assert watcher.check() == []
+
+    # Change the file and assert the change is reported once.
+    with open(config_file, 'a') as file:
+        file.write('# changed\n')
+    assert watcher.check() == ['openapi']
+    assert watcher.check() == []
+    assert changes == [['openapi']]
+
+
+# ** test: config_watch_context_failed_reload
+def test_config_watch_context_failed_reload(config_file: str):
+    '''
+    Test a failing reload is logged without stopping the watcher.
+    '''
+
+    # Watch the file with a failing callback.
+    def on_change(changed):
+        raise ValueError('invalid YAML')
+    watcher = ConfigWatchContext(dict(openapi=config_file), on_change)
+
+    # Assert the change is still reported.
+    with open(config_file, 'a') as file:
+        file.write('routers: [\n')
+    assert watcher.check() == ['openapi']
+
+
+# ** test: config_watch_context_thread
+def test_config_watch_context_thread(config_file: str):
+    '''
+    Test the polling thread reports changes until stopped.
+    '''
+
+    # Start polling.
+    changes = []
+    watcher = ConfigWatchContext(dict(openapi=config_file), changes.append, interval=0.01).start()
+    try:
+
+        # Change the file and wait for the poll.
+        with open(config_file, 'a') as file:
+            file.write('# changed\n')
+        deadline = time.monotonic() + 5.0
+        while not changes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert changes == [['openapi']]
+
+    # Assert the thread stops.
+    finally:
+        watcher.stop()
+    assert not watcher.thread.is_alive()
+
+
+# ** test: config_watch_context_restart
+def test_config_watch_context_restart(config_file: str):
+    '''
+    Test restart resumes polling where the running thread did not survive a fork, without registering fork hooks.
+    '''
+
+    # Create a watcher whose thread was inherited from the parent and is no longer running.
+    with mock.patch('os.register_at_fork') as register_at_fork:
+        watcher = ConfigWatchContext(dict(openapi=config_file), lambda changed: None, interval=0.01)
+    register_at_fork.assert_not_called()
+    inherited = threading.Thread(target=lambda: None)
+    inherited.start()
+    inherited.join()
+    watcher.thread = inherited
+
+    # Assert restart starts a new polling thread.
+    try:
+        watcher.restart()
+        assert watcher.thread is not inherited
+        assert watcher.thread.is_alive()
+    finally:
+        watcher.stop()
+
+    # Assert a stopped watcher is not restarted.
+    watcher.restart()
+    assert not watcher.thread.is_alive()
@@ -5,21 +5,21 @@ import pytest
 from pydantic import BaseModel, Field
 
 # ** app
-from ..request import FlaskRequestContext
+from ..request import FlaskRequestContext, LazyHeaders, PooledRequestContext, RequestContextPool
 
 # *** fixtures
 
 # ** fixture: request_context
-@pytest.fixture
-def request_context() -> FlaskRequestContext:
+@pytest.fixture(params=[FlaskRequestContext, PooledRequestContext])
+def request_context(request) -> FlaskRequestContext:
     '''
-    Fixture to provide a FlaskRequestContext for testing.
+    Fixture to provide a FlaskRequestContext, and a PooledRequestContext with the same semantics, for testing.
 
-    :return: A FlaskRequestContext instance.
+    :return: A FlaskRequestContext or PooledRequestContext instance.
     :rtype: FlaskRequestContext
     '''
 
-    return FlaskRequestContext(
+    return request.param(
         data=dict(
             key='value',
             another_key='another_value',
@@ -152,3 +152,101 @@ def test_request_context_handle_response_base_model_dict(request_context: FlaskR
     assert len(response) == 2
     assert response['item1'].get('name') == 'item1'
     assert response['item2'].get('name') == 'item2'
+
+# ** test: lazy_headers_read_through
+def test_lazy_headers_read_through():
+    '''
+    Test LazyHeaders reads through to the source and keeps writes on an overlay.
+    '''
+
+    # Create lazy headers over a source mapping.
+    headers = LazyHeaders({'Content-Type': 'application/json'})
+    headers.update(dict(feature_id='calc.add'))
+
+    # Assert reads and writes do not load the source.
+    assert headers['Content-Type'] == 'application/json'
+    assert headers['feature_id'] == 'calc.add'
+    assert headers.get('Missing') is None
+    assert not headers.loaded
+
+# ** test: lazy_headers_load
+def test_lazy_headers_load():
+    '''
+    Test LazyHeaders loads the merged mapping when iterated.
+    '''
+
+    # Create lazy headers with an overlay write.
+    headers = LazyHeaders({'Content-Type': 'application/json'})
+    headers['interface_id'] = 'calc_api'
+
+    # Assert the full mapping merges the source and the overlay.
+    assert dict(headers) == {'Content-Type': 'application/json', 'interface_id': 'calc_api'}
+    assert headers.loaded
+    assert len(headers) == 2
+
+# ** test: request_context_raw_models
+def test_request_context_raw_models(request_context: FlaskRequestContext):
+    '''
+    Test raw_models keeps the final result as models but converts None and data key results as usual.
+    '''
+
+    # Create a BaseModel subclass to simulate a response.
+    class Data(BaseModel):
+        key: str = Field(default='default_value')
+
+    # Set a list of models with raw models enabled.
+    request_context.raw_models = True
+    models = [Data(key='a'), Data(key='b')]
+    request_context.set_result(models)
+
+    # Assert the models are kept as-is.
+    assert request_context.handle_response() is models
+
+    # Assert None still becomes an empty response and data keys still store the raw result.
+    request_context.set_result(None)
+    assert request_context.handle_response() == ''
+    request_context.set_result(models[0], data_key='data')
+    assert request_context.data['data'] is models[0]
+
+# ** test: request_context_pool_reuse
+def test_request_context_pool_reuse():
+    '''
+    Test released contexts are reset and reused by the same thread.
+    '''
+
+    # Acquire a context and set its result.
+    pool = RequestContextPool()
+    request = pool.acquire(dict(a='1'), dict(b=2), 'calc.add', raw_models=True)
+    request.set_result(dict(c=3))
+    session_id = request.session_id
+
+    # Release it and assert the next acquire resets and reuses it.
+    pool.release(request)
+    reused = pool.acquire(data=dict(d=4), feature_id='calc.sqrt')
+    assert reused is request
+    assert reused.headers == {}
+    assert reused.data == dict(d=4)
+    assert reused.feature_id == 'calc.sqrt'
+    assert reused.result is None
+    assert reused.raw_models is False
+    assert reused.session_id != session_id
+
+# ** test: request_context_pool_release_to
+def test_request_context_pool_release_to():
+    '''
+    Test release_to releases the contexts acquired since a mark, dropping those with iterator results.
+    '''
+
+    # Acquire two contexts after a mark, one with a lazy result.
+    pool = RequestContextPool()
+    mark = pool.mark()
+    first = pool.acquire()
+    second = pool.acquire()
+    second.set_result(iter([1, 2]))
+
+    # Release them and assert only the first is pooled.
+    pool.release_to(mark)
+    assert pool.mark() == mark
+    assert pool.get_state()[0] == [first]
+    assert not hasattr(second, '__dict__')
+
@@ -0,0 +1,134 @@
+# *** imports
+
+# ** core
+from typing import List
+
+# ** infra
+import pytest
+from pydantic import BaseModel
+from tiferet import TiferetError
+from tiferet_openapi import ApiRoute, ApiRouter
+
+# ** app
+from ..schema import RequestSchemaContext
+
+
+# *** classes
+
+# ** class: operand
+class Operand(BaseModel):
+    '''
+    A sample nested request model.
+    '''
+
+    value: float
+
+
+# ** class: add_request
+class AddRequest(BaseModel):
+    '''
+    A sample request model.
+    '''
+
+    a: int
+    b: int = 0
+    extra: List[Operand] = []
+
+
+# *** fixtures
+
+# ** fixture: router
+@pytest.fixture
+def router() -> ApiRouter:
+    '''
+    Fixture to provide a calc router with two routes sharing a request model and one without.
+    '''
+
+    return ApiRouter(
+        name='calc',
+        prefix='/calc',
+        routes=[
+            ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['POST'], status_code=200, request_model=f'{__name__}.AddRequest'),
+            ApiRoute(id='sum', endpoint='calc.sum', path='/sum', methods=['GET'], status_code=200, request_model=f'{__name__}.AddRequest'),
+            ApiRoute(id='sqrt', endpoint='calc.sqrt', path='/sqrt', methods=['POST'], status_code=200),
+        ],
+    )
+
+
+# *** tests
+
+# ** test: request_schema_context_validate
+def test_request_schema_context_validate(router: ApiRouter):
+    '''
+    Test request data is validated against the route model, keeping data the model does not declare.
+    '''
+
+    # Compile the routes and assert the routes sharing a model share its adapter.
+    schemas = RequestSchemaContext([router])
+    assert schemas.get_schema('calc.add') is schemas.get_schema('calc.sum')
+    assert schemas.get_schema('calc.sqrt') is None
+
+    # Assert valid data is coerced, with the defaults filled in and other data kept.
+    data, errors = schemas.validate('calc.add', {'a': '1', 'rows': 'kept'})
+    assert errors is None
+    assert data == {'a': 1, 'b': 0, 'extra': [], 'rows': 'kept'}
+
+    # Assert invalid data returns the errors without their inputs.
+    data, errors = schemas.validate('calc.add', {'a': 'x', 'extra': [{}]})
+    assert data == {'a': 'x', 'extra': [{}]}
+    assert [(error['loc'], error['type']) for error in errors] == [
+        (('a',), 'int_parsing'),
+        (('extra', 0, 'value'), 'missing'),
+    ]
+    assert 'input' not in errors[0]
+
+    # Assert routes without a model pass the data through.
+    assert schemas.validate('calc.sqrt', {'a': 'x'}) == ({'a': 'x'}, None)
+    assert schemas.validate(None, {}) == ({}, None)
+
+
+# ** test: request_schema_context_compile_error
+def test_request_schema_context_compile_error():
+    '''
+    Test a request model that cannot be imported fails the compilation.
+    '''
+
+    # Compile a route with a missing model.
+    router = ApiRouter(name='calc', routes=[
+        ApiRoute(id='add', endpoint='calc.add', path='/add', methods=['POST'], request_model=f'{__name__}.MissingRequest'),
+    ])
+
+    # Assert the import error is raised.
+    with pytest.raises(TiferetError):
+        RequestSchemaContext([router])
+
+
+# ** test: request_schema_context_add_to_spec
+def test_request_schema_context_add_to_spec(router: ApiRouter):
+    '''
+    Test the request models are described as JSON request bodies or query parameters in the spec.
+    '''
+
+    # Add the schemas to a spec of the routes.
+    spec = {'paths': {
+        '/calc/add': {'post': {'operationId': 'calc.add'}},
+        '/calc/sum': {'get': {'operationId': 'calc.sum'}},
+        '/calc/sqrt': {'post': {'operationId': 'calc.sqrt'}},
+    }}
+    RequestSchemaContext([router]).add_to_spec(spec)
+
+    # Assert the model and its nested model are components, referenced by the body of the POST route.
+    schemas = spec['components']['schemas']
+    assert schemas['AddRequest']['required'] == ['a']
+    assert schemas['AddRequest']['properties']['extra']['items'] == {'$ref': '#/components/schemas/Operand'}
+    assert 'Operand' in schemas
+    assert spec['paths']['/calc/add']['post']['requestBody']['content']['application/json']['schema'] == {'$ref': '#/components/schemas/AddRequest'}
+
+    # Assert the GET route lists the model properties as query parameters, and the route without a model is unchanged.
+    parameters = spec['paths']['/calc/sum']['get']['parameters']
+    assert [(parameter['name'], parameter['in'], parameter['required']) for parameter in parameters] == [
+        ('a', 'query', True),
+        ('b', 'query', False),
+        ('extra', 'query', False),
+    ]
+    assert spec['paths']['/calc/sqrt']['post'] == {'operationId': 'calc.sqrt'}
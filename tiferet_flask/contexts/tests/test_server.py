@@ -0,0 +1,190 @@
+# *** imports
+
+# ** core
+import http.client
+import os
+import signal
+import sys
+import time
+
+# ** infra
+import pytest
+
+# ** app
+from ..server import WORKER_PID, PreforkServerContext, WorkerApp
+
+
+# *** fixtures
+
+# ** fixture: pid_app
+@pytest.fixture
+def pid_app():
+    '''
+    Fixture to provide a WSGI app responding with the pid of the process serving it.
+    '''
+
+    def app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [str(os.getpid()).encode()]
+    return app
+
+
+# *** tests
+
+# ** test: worker_app
+def test_worker_app(pid_app):
+    '''
+    Test the worker app counts served requests and keeps them in flight until the response is closed.
+    '''
+
+    # Serve a request, recording the served counts.
+    counts = []
+    worker_app = WorkerApp(pid_app, counts.append)
+    response = worker_app({}, lambda status, headers: None)
+    assert worker_app.served == 1
+    assert worker_app.active == 1
+    assert counts == [1]
+
+    # Assert closing the response finishes the request.
+    assert b''.join(response) == str(os.getpid()).encode()
+    response.close()
+    assert worker_app.active == 0
+
+
+# ** test: prefork_server_context_init
+def test_prefork_server_context_init(pid_app):
+    '''
+    Test the server parses the bind address and defaults to one worker per usable CPU.
+    '''
+
+    # Create the server without binding.
+    server = PreforkServerContext(pid_app, bind='0.0.0.0:8000')
+
+    # Assert the options.
+    assert server.host == '0.0.0.0'
+    assert server.port == 8000
+    assert server.workers == PreforkServerContext.get_cpu_count() >= 1
+    assert PreforkServerContext.get_memory_mb() > 0
+
+
+# ** test: prefork_server_context_reload_workers
+def test_prefork_server_context_reload_workers(pid_app, monkeypatch):
+    '''
+    Test a reload boots the new workers before asking the old ones to stop, and retiring workers announced on the pipe are replaced.
+    '''
+
+    # Record the spawned and signalled workers in order.
+    server = PreforkServerContext(pid_app, workers=2)
+    server.pids = {101: 0.0, 102: 0.0}
+    events = []
+    def spawn_worker():
+        pid = 200 + len(server.pids)
+        server.pids[pid] = 0.0
+        events.append(('spawn', pid))
+        return pid
+    monkeypatch.setattr(server, 'spawn_worker', spawn_worker)
+    monkeypatch.setattr(os, 'kill', lambda pid, signum: events.append(('kill', pid, signum)))
+
+    # Assert the new workers boot first, then the old ones drain.
+    server.reload_workers()
+    assert events == [('spawn', 202), ('spawn', 203), ('kill', 101, signal.SIGTERM), ('kill', 102, signal.SIGTERM)]
+    assert sorted(server.retiring) == [101, 102]
+
+    # Announce a retiring worker on the pipe, then assert it no longer counts as serving.
+    server.pipe = os.pipe()
+    try:
+        os.write(server.pipe[1], WORKER_PID.pack(202) + WORKER_PID.pack(999))
+        assert server.read_retiring(timeout=1.0) == [202]
+        assert len(server.pids) - len(server.retiring) == 1
+    finally:
+        for fd in server.pipe:
+            os.close(fd)
+
+
+# ** test: prefork_server_context_serve
+@pytest.mark.skipif(not hasattr(os, 'fork') or sys.platform == 'darwin', reason='requires fork')
+def test_prefork_server_context_serve(pid_app):
+    '''
+    Test the master forks workers on a shared socket, recycles them after their request limit and shuts down on SIGTERM.
+    '''
+
+    # Bind an ephemeral port, then run the master in a child process.
+    server = PreforkServerContext(pid_app, bind='127.0.0.1:0', workers=2, max_requests=2, graceful_timeout=2.0)
+    port = server.bind().getsockname()[1]
+    master = os.fork()
+    if master == 0:
+        status = 1
+        try:
+            server.serve()
+            status = 0
+        finally:
+            os._exit(status)
+    server.socket.close()
+
+    # Send requests, each on a new connection, collecting the worker pids.
+    try:
+        pids = set()
+        deadline = time.monotonic() + 10.0
+        while len(pids) < 3 and time.monotonic() < deadline:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/')
+            response = connection.getresponse()
+            assert response.status == 200
+            pids.add(int(response.read()))
+            connection.close()
+
+        # Assert more workers served than run at once, so workers were recycled.
+        assert len(pids) >= 3
+        assert master not in pids
+
+    # Assert the master shuts down cleanly.
+    finally:
+        os.kill(master, signal.SIGTERM)
+        assert os.waitpid(master, 0)[1] == 0
+
+
+# ** test: prefork_server_context_serve_reload
+@pytest.mark.skipif(not hasattr(os, 'fork') or sys.platform == 'darwin', reason='requires fork')
+def test_prefork_server_context_serve_reload(pid_app):
+    '''
+    Test SIGHUP replaces the workers while requests keep being served.
+    '''
+
+    # Run the master with one worker in a child process.
+    server = PreforkServerContext(pid_app, bind='127.0.0.1:0', workers=1, graceful_timeout=2.0)
+    port = server.bind().getsockname()[1]
+    master = os.fork()
+    if master == 0:
+        status = 1
+        try:
+            server.serve()
+            status = 0
+        finally:
+            os._exit(status)
+    server.socket.close()
+
+    # Send a request, returning the pid of the worker serving it.
+    def request() -> int:
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        try:
+            connection.request('GET', '/')
+            response = connection.getresponse()
+            assert response.status == 200
+            return int(response.read())
+        finally:
+            connection.close()
+
+    # Reload, then assert a new worker serves the requests.
+    try:
+        first = request()
+        os.kill(master, signal.SIGHUP)
+        deadline = time.monotonic() + 10.0
+        pid = first
+        while pid == first and time.monotonic() < deadline:
+            pid = request()
+        assert pid not in (first, master)
+
+    # Assert the master shuts down cleanly.
+    finally:
+        os.kill(master, signal.SIGTERM)
+        assert os.waitpid(master, 0)[1] == 0
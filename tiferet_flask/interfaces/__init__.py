@@ -0,0 +1,7 @@
+"""Flask interfaces."""
+
+# *** exports
+
+# ** app
+from .cache import ResponseCacheService
+from .limit import RateLimitService
@@ -0,0 +1,62 @@
+"""Flask Response Cache Interface"""
+
+# *** imports
+
+# ** core
+from abc import abstractmethod
+from typing import Any
+
+# ** infra
+from tiferet.interfaces import Service
+
+
+# *** interfaces
+
+# ** interface: response_cache_service
+class ResponseCacheService(Service):
+    '''
+    Abstract service interface for a route response cache backend.
+
+    Backends store (response, status_code) tuples by key and are created
+    per cached route, so max_entries applies to each route separately.
+    Implementations must be safe to call from multiple threads.
+    '''
+
+    # * method: get
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        '''
+        Get a cached value.
+
+        :param key: The cache key.
+        :type key: str
+        :return: The cached value, or None on a miss or after it expires.
+        :rtype: Any | None
+        '''
+
+        raise NotImplementedError()
+
+    # * method: set
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float | None = None):
+        '''
+        Store a value.
+
+        :param key: The cache key.
+        :type key: str
+        :param value: The value to cache.
+        :type value: Any
+        :param ttl: The time to live in seconds; no expiry if None.
+        :type ttl: float | None
+        '''
+
+        raise NotImplementedError()
+
+    # * method: clear
+    @abstractmethod
+    def clear(self):
+        '''
+        Remove all cached values.
+        '''
+
+        raise NotImplementedError()
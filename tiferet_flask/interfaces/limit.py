@@ -0,0 +1,91 @@
+"""Flask Rate Limit Interface"""
+
+# *** imports
+
+# ** core
+from abc import abstractmethod
+
+# ** infra
+from tiferet.interfaces import Service
+
+
+# *** interfaces
+
+# ** interface: rate_limit_service
+class RateLimitService(Service):
+    '''
+    Abstract service interface for a rate limit backend.
+
+    Backends keep a token bucket and an in-flight counter per key, where a
+    key names a router or route limit. Implementations must be safe to call
+    from multiple threads, and shared backends from multiple processes.
+    '''
+
+    # * method: consume
+    @abstractmethod
+    def consume(self, key: str, rate: float, burst: float) -> bool:
+        '''
+        Take a token from a bucket refilling at rate tokens per second.
+
+        :param key: The limit key.
+        :type key: str
+        :param rate: The refill rate, in tokens per second.
+        :type rate: float
+        :param burst: The bucket capacity, which a new bucket starts with.
+        :type burst: float
+        :return: True if a token was taken, False if the bucket is empty.
+        :rtype: bool
+        '''
+
+        raise NotImplementedError()
+
+    # * method: refund
+    @abstractmethod
+    def refund(self, key: str, burst: float):
+        '''
+        Return a token taken with consume, e.g. when a later limit rejects the request.
+
+        :param key: The limit key.
+        :type key: str
+        :param burst: The bucket capacity, which the bucket is not refilled above.
+        :type burst: float
+        '''
+
+        raise NotImplementedError()
+
+    # * method: enter
+    @abstractmethod
+    def enter(self, key: str, limit: int) -> bool:
+        '''
+        Count a request in flight, unless the limit is reached.
+
+        :param key: The limit key.
+        :type key: str
+        :param limit: The maximum number of requests in flight.
+        :type limit: int
+        :return: True if the request was counted, False if the limit is reached.
+        :rtype: bool
+        '''
+
+        raise NotImplementedError()
+
+    # * method: exit
+    @abstractmethod
+    def exit(self, key: str):
+        '''
+        Count a request entered with enter as finished.
+
+        :param key: The limit key.
+        :type key: str
+        '''
+
+        raise NotImplementedError()
+
+    # * method: clear
+    @abstractmethod
+    def clear(self):
+        '''
+        Reset all buckets and in-flight counters.
+        '''
+
+        raise NotImplementedError()